@@ -0,0 +1,87 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# Benchmark for asyncdecode.py: decode a large bundle of certificates
+# from a coroutine while another coroutine ticks every millisecond, and
+# report the time of the decode and the longest time that the ticker
+# was held up.  The bundle is decoded inline, in a thread executor, and
+# in a process executor.
+#
+#   PYTHONPATH=. python benchmarks/asyncdecode.py [--count 300] [--runs 3]
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+
+import argparse
+import asyncio
+import time
+from concurrent import futures
+
+from pyasn1.codec.der.decoder import decode as der_decoder
+from pyasn1.codec.der.encoder import encode as der_encoder
+
+from pyasn1_alt_modules import asyncdecode
+from pyasn1_alt_modules import pem
+from pyasn1_alt_modules import rfc5055
+from pyasn1_alt_modules import rfc5280
+
+from tests import test_certfields
+
+
+async def ticker(stop, delays):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.001)
+        delays.append(time.perf_counter() - start - 0.001)
+
+
+async def decodeWhileTicking(codec, substrate):
+    stop = asyncio.Event()
+    delays = []
+    tick = asyncio.ensure_future(ticker(stop, delays))
+    await asyncio.sleep(0.01)
+    start = time.perf_counter()
+    await codec.decode(substrate, asn1Spec=rfc5055.CertBundle())
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await tick
+    return elapsed, max(delays)
+
+
+def measure(label, codec, substrate, runs):
+    results = [asyncio.run(decodeWhileTicking(codec, substrate))
+               for run in range(runs)]
+    print('%-16s %8.1f ms decode %8.1f ms longest stall' % (
+        label, min(elapsed for elapsed, stall in results) * 1000,
+        min(stall for elapsed, stall in results) * 1000))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=300)
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    certificate, rest = der_decoder(
+        pem.readBase64fromText(
+            test_certfields.CertificateFieldsTestCase.pem_text),
+        asn1Spec=rfc5280.Certificate())
+    bundle = rfc5055.CertBundle()
+    for index in range(args.count):
+        bundle.append(certificate)
+    substrate = der_encoder(bundle)
+    print('%d certificates, %d octets' % (args.count, len(substrate)))
+
+    measure('inline', asyncdecode.AsyncCodec(threshold=None),
+            substrate, args.runs)
+    with futures.ThreadPoolExecutor(1) as executor:
+        measure('thread', asyncdecode.AsyncCodec(executor, threshold=0),
+                substrate, args.runs)
+    with futures.ProcessPoolExecutor(1) as executor:
+        measure('process', asyncdecode.AsyncCodec(executor, threshold=0),
+                substrate, args.runs)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# Benchmark for compact.py: decode copies of a certificate both with
+# pyasn1 and into compact views, and report the time and the memory
+# held per certificate, as measured by tracemalloc.  The DER buffers
+# are allocated before measuring, so they are not counted.
+#
+#   PYTHONPATH=. python benchmarks/compact.py [--count 1000] [cert.pem]
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+
+import argparse
+import time
+import tracemalloc
+
+from pyasn1.codec.der.decoder import decode as der_decoder
+
+from pyasn1_alt_modules import compact
+from pyasn1_alt_modules import pem
+from pyasn1_alt_modules import rfc5280
+
+
+def measure(label, function, substrates):
+    start = time.perf_counter()
+    for substrate in substrates:
+        function(substrate)
+    elapsed = time.perf_counter() - start
+
+    # Decode again under tracemalloc, which would distort the timing.
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    results = [function(substrate) for substrate in substrates]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    held = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    print('%-24s %8.2f ms %10.0f octets per certificate' % (
+        label, elapsed * 1000 / len(substrates), held / len(substrates)))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=1000)
+    parser.add_argument('certificate', nargs='?')
+    args = parser.parse_args()
+
+    if args.certificate:
+        with open(args.certificate) as fileObj:
+            substrate = pem.readPemFromFile(fileObj)
+    else:
+        # The certificate of the certfields tests, when run from the
+        # top of the source tree.
+        from tests import test_certfields
+        substrate = pem.readBase64fromText(
+            test_certfields.CertificateFieldsTestCase.pem_text)
+    substrates = [bytes(bytearray(substrate)) for _ in range(args.count)]
+    print('%d certificates of %d octets' % (args.count, len(substrate)))
+
+    # Generate the view classes before measuring.
+    compact.decode(substrate, rfc5280.Certificate())
+
+    measure('pyasn1 decode', lambda substrate: der_decoder(
+        substrate, asn1Spec=rfc5280.Certificate())[0], substrates)
+    measure('compact views', lambda substrate: compact.decode(
+        substrate, rfc5280.Certificate()), substrates)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# Benchmark for depgraph.py: find the smallest set of modules that
+# decodes the given OIDs, print the import statements for it, and report
+# the time that fresh Python processes take to import that set and to
+# import all of the rfc modules.  By default the OIDs are those of an
+# RPKI relying party: the ROA, manifest, and signed checklist content
+# types and the IP address and AS identifier extensions.
+#
+#   PYTHONPATH=. python benchmarks/depgraph.py [--runs 5] [OID ...]
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+
+import argparse
+import subprocess
+import sys
+
+from pyasn1_alt_modules import depgraph
+
+
+DEFAULT_OIDS = (
+    '1.2.840.113549.1.9.16.1.24', '1.2.840.113549.1.9.16.1.26',
+    '1.2.840.113549.1.9.16.1.48', '1.3.6.1.5.5.7.1.7', '1.3.6.1.5.5.7.1.8',
+)
+
+STARTUP = '''
+import sys
+import time
+start = time.perf_counter()
+exec(sys.stdin.read())
+print(time.perf_counter() - start)
+'''
+
+
+def measure(label, imports, runs):
+    times = []
+    for run in range(runs):
+        output = subprocess.run(
+            (sys.executable, '-c', STARTUP), input=imports, check=True,
+            stdout=subprocess.PIPE, universal_newlines=True).stdout
+        times.append(float(output))
+    print('%-24s %8.1f ms best %8.1f ms mean' % (
+        label, min(times) * 1000, sum(times) / len(times) * 1000))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('oids', nargs='*', default=DEFAULT_OIDS)
+    args = parser.parse_args()
+
+    graph = depgraph.DependencyGraph()
+    imports = graph.importList(args.oids)
+    print(imports)
+
+    everything = ''.join(
+        'from pyasn1_alt_modules import %s\n' % name
+        for name in graph.order())
+    measure('%d modules' % len(imports.splitlines()), imports, args.runs)
+    measure('%d modules' % len(graph.imports), everything, args.runs)
+
+
+if __name__ == '__main__':
+    main()
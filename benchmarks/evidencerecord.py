@@ -0,0 +1,95 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# Benchmark for evidencerecord.py: build the hash tree over a generated
+# archive, encode an EvidenceRecord for a sample of its objects, and
+# verify the sample with and without the node cache shared between the
+# records.
+#
+#   python benchmarks/evidencerecord.py [--objects 1000000] [--sample N]
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+
+import argparse
+import random
+import time
+
+from pyasn1.codec.der.encoder import encode as der_encoder
+from pyasn1.type import univ
+from pyasn1.type import useful
+
+from pyasn1_alt_modules import evidencerecord
+from pyasn1_alt_modules import rfc3161
+from pyasn1_alt_modules import rfc4055
+from pyasn1_alt_modules import rfc5652
+
+
+def timeStampToken(digest):
+    """An unsigned RFC 3161 token over digest."""
+    tstInfo = rfc3161.TSTInfo()
+    tstInfo['version'] = 1
+    tstInfo['policy'] = univ.ObjectIdentifier('1.2.3.4.5')
+    tstInfo['messageImprint']['hashAlgorithm']['algorithm'] = \
+        rfc4055.id_sha256
+    tstInfo['messageImprint']['hashedMessage'] = digest
+    tstInfo['serialNumber'] = 1
+    tstInfo['genTime'] = useful.GeneralizedTime('20260101000000Z')
+
+    signedData = rfc5652.SignedData()
+    signedData['version'] = 3
+    signedData['digestAlgorithms'].clear()
+    signedData['encapContentInfo']['eContentType'] = rfc3161.id_ct_TSTInfo
+    signedData['encapContentInfo']['eContent'] = der_encoder(tstInfo)
+    signedData['signerInfos'].clear()
+
+    contentInfo = rfc5652.ContentInfo()
+    contentInfo['contentType'] = rfc5652.id_signedData
+    contentInfo['content'] = der_encoder(signedData)
+    return der_encoder(contentInfo)
+
+
+def timed(label, function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    print('%-40s %8.2f s' % (label, time.perf_counter() - start))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--objects', type=int, default=1000000)
+    parser.add_argument('--sample', type=int, default=100000)
+    parser.add_argument('--branching', type=int, default=2)
+    args = parser.parse_args()
+
+    builder = evidencerecord.HashtreeBuilder(branching=args.branching)
+    objects = (b'archived object %d' % number
+               for number in range(args.objects))
+    timed('hash %d objects' % args.objects, builder.extend, objects)
+    root = timed('build the hash tree', builder.build)
+    timeStamp = timeStampToken(root)
+
+    sample = sorted(random.sample(range(args.objects),
+                                  min(args.sample, args.objects)))
+    records = timed('encode %d evidence records' % len(sample), lambda: [
+        builder.encodeEvidenceRecord(index, timeStamp) for index in sample])
+    pairs = [(record, b'archived object %d' % index)
+             for record, index in zip(records, sample)]
+
+    uncached = evidencerecord.EvidenceRecordVerifier(
+        cache=evidencerecord.NodeCache(maxSize=1))
+    results = timed('verify without the node cache',
+                    uncached.verifyMany, pairs)
+    assert all(results)
+
+    verifier = evidencerecord.EvidenceRecordVerifier()
+    results = timed('verify with the node cache', verifier.verifyMany, pairs)
+    assert all(results)
+    print('node cache: %d hits, %d misses' % (
+        verifier.cache.hits, verifier.cache.misses))
+
+
+if __name__ == '__main__':
+    main()
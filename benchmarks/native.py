@@ -0,0 +1,78 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# Benchmark for native.py: convert a decoded certificate to plain Python
+# values with a generic walk through the pyasn1 accessors and with a
+# native.Converter.  The certificate is decoded with decodeOpenTypes=True
+# and the converter does not decode the extension values, so that both
+# convert the same tree.
+#
+#   PYTHONPATH=. python benchmarks/native.py [--count 2000] [--runs 5]
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+
+import argparse
+import time
+
+from pyasn1.codec.der.decoder import decode as der_decoder
+from pyasn1.type import univ
+
+from pyasn1_alt_modules import native
+from pyasn1_alt_modules import pem
+from pyasn1_alt_modules import rfc5280
+
+from tests import test_native
+
+
+def best(function, runs):
+    times = []
+    for run in range(runs):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def walk(value):
+    if isinstance(value, univ.Choice):
+        return {value.getName(): walk(value.getComponent())}
+    if isinstance(value, (univ.Sequence, univ.Set)):
+        result = {}
+        for position, namedType in enumerate(
+                value.componentType.namedTypes):
+            component = value.getComponentByPosition(position)
+            if component.isValue:
+                result[namedType.name] = walk(component)
+        return result
+    if isinstance(value, (univ.SequenceOf, univ.SetOf)):
+        return [walk(item) for item in value]
+    return value.prettyPrint()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=2000)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    certificate, rest = der_decoder(
+        pem.readBase64fromText(
+            test_native.CertificateToNativeTestCase.pem_text),
+        asn1Spec=rfc5280.Certificate(), decodeOpenTypes=True)
+    converter = native.Converter(openTypes=False)
+
+    walkTime = best(lambda: [walk(certificate)
+                             for index in range(args.count)], args.runs)
+    convertTime = best(lambda: [converter.toNative(certificate)
+                                for index in range(args.count)], args.runs)
+    print('%d conversions of a certificate' % args.count)
+    print('%-20s %10.2f ms' % ('generic walk', walkTime * 1000))
+    print('%-20s %10.2f ms  %.1fx' % ('native.Converter',
+                                      convertTime * 1000,
+                                      walkTime / convertTime))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# Benchmark for sannames.py: read the names of a subjectAltName
+# extension with thousands of dNSName entries, as in a multi-domain
+# certificate, by decoding it as rfc5280.SubjectAltName and with
+# sannames.parseGeneralNames, and check hostnames and a name constraint
+# against the names by scanning the list and with a HostnameIndex.
+#
+#   PYTHONPATH=. python benchmarks/sannames.py [--count 5000] [--runs 5]
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+
+import argparse
+import time
+
+from pyasn1.codec.der.decoder import decode as der_decoder
+from pyasn1.codec.der.encoder import encode as der_encoder
+
+from pyasn1_alt_modules import rfc5280
+from pyasn1_alt_modules import sannames
+
+
+def best(function, runs):
+    times = []
+    for run in range(runs):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def fullDecode(substrate):
+    asn1Object, rest = der_decoder(
+        substrate, asn1Spec=rfc5280.SubjectAltName())
+    return [str(generalName['dNSName']) for generalName in asn1Object
+            if generalName.getName() == 'dNSName']
+
+
+def scan(names, hostname):
+    for name in names:
+        if name == hostname:
+            return True
+        if name.startswith('*.') and \
+                hostname.partition('.')[2] == name[2:]:
+            return True
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=5000)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    generalNames = rfc5280.SubjectAltName()
+    for number in range(args.count):
+        generalName = rfc5280.GeneralName()
+        if number % 10:
+            generalName['dNSName'] = 'host%d.site%d.example' % (
+                number, number % 100)
+        else:
+            generalName['dNSName'] = '*.site%d.example' % number
+        generalNames.append(generalName)
+    substrate = der_encoder(generalNames)
+    print('%d dNSName entries, %d octets' % (args.count, len(substrate)))
+
+    decodeTime = best(lambda: fullDecode(substrate), args.runs)
+    parseTime = best(lambda: sannames.parseGeneralNames(substrate),
+                     args.runs)
+    print('%-28s %10.2f ms' % ('rfc5280.SubjectAltName', decodeTime * 1000))
+    print('%-28s %10.2f ms  %.0fx' % ('parseGeneralNames',
+                                      parseTime * 1000,
+                                      decodeTime / parseTime))
+
+    names = sannames.parseGeneralNames(substrate)
+    hostnames = ['host%d.site%d.example' % (number, number % 100)
+                 for number in range(0, args.count, 7)] + \
+        ['www.site%d.example' % number for number in range(0, 1000, 7)]
+    index = names.hostnameIndex()
+    scanTime = best(lambda: [scan(names.dns, hostname)
+                             for hostname in hostnames], 1)
+    indexTime = best(lambda: [hostname in index
+                              for hostname in hostnames], args.runs)
+    print('%-28s %10.2f ms' % ('%d lookups, scan' % len(hostnames),
+                               scanTime * 1000))
+    print('%-28s %10.2f ms' % ('%d lookups, index' % len(hostnames),
+                               indexTime * 1000))
+
+    subtreeTime = best(lambda: index.outside(['site1.example']), args.runs)
+    print('%-28s %10.2f ms' % ('name constraint, index',
+                               subtreeTime * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# Benchmark for snapshot.py: start fresh Python processes that either
+# import all of the rfc modules or load them from a snapshot, and report
+# the time that each takes within the process.  The snapshot is built
+# first, if it cannot be loaded.
+#
+#   PYTHONPATH=. python benchmarks/snapshot.py [--runs 5] [--path FILE]
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+from pyasn1_alt_modules import snapshot
+
+
+STARTUP = '''
+import sys
+import time
+start = time.perf_counter()
+from pyasn1_alt_modules import snapshot
+if sys.argv[1] == 'import':
+    for name in snapshot.allModules():
+        __import__('pyasn1_alt_modules.' + name)
+elif not snapshot.load(sys.argv[1]):
+    raise SystemExit('The snapshot cannot be loaded')
+print(time.perf_counter() - start)
+'''
+
+
+def measure(label, argument, runs):
+    times = []
+    for run in range(runs):
+        output = subprocess.run(
+            (sys.executable, '-c', STARTUP, argument), check=True,
+            stdout=subprocess.PIPE, universal_newlines=True).stdout
+        times.append(float(output))
+    print('%-24s %8.1f ms best %8.1f ms mean' % (
+        label, min(times) * 1000, sum(times) / len(times) * 1000))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument(
+        '--path', default=os.path.join(tempfile.gettempdir(),
+                                       'pyasn1-alt-modules.snapshot'))
+    args = parser.parse_args()
+
+    subprocess.run(
+        (sys.executable, '-c',
+         'import sys; from pyasn1_alt_modules import snapshot;'
+         'snapshot.loadOrBuild(sys.argv[1])', args.path), check=True)
+    print('%d modules, snapshot of %d octets' % (
+        len(snapshot.allModules()), os.path.getsize(args.path)))
+
+    measure('import', 'import', args.runs)
+    measure('snapshot', args.path, args.runs)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# Benchmark for zerocopy.py: decode a chain of post-quantum certificates
+# (ML-DSA, SLH-DSA, HSS/LMS, XMSS, and XMSS^MT) with pyasn1 and with
+# the zerocopy decoder, take the octets of every public key and
+# signature as a verifier would, and encode the certificates again.
+# Reports the time of each step and the memory held per chain, as
+# measured by tracemalloc.  The DER buffers are allocated before
+# measuring, so they are not counted.
+#
+#   PYTHONPATH=. python benchmarks/zerocopy.py [--count 200] [cert.pem ...]
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+from pyasn1.codec.der.decoder import decode as der_decoder
+from pyasn1.codec.der.encoder import encode as der_encoder
+
+from pyasn1_alt_modules import pem
+from pyasn1_alt_modules import rfc5280
+from pyasn1_alt_modules import zerocopy
+
+
+def octets(certificate):
+    key = certificate['tbsCertificate']['subjectPublicKeyInfo'][
+        'subjectPublicKey']
+    return len(key.asOctets()) + len(certificate['signature'].asOctets())
+
+
+def measure(label, decode, chains):
+    gc.collect()
+    start = time.perf_counter()
+    decoded = [[decode(substrate) for substrate in chain] for chain in chains]
+    decodeTime = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for chain in decoded:
+        for certificate in chain:
+            octets(certificate)
+    octetsTime = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for chain in decoded:
+        for certificate in chain:
+            der_encoder(certificate)
+    encodeTime = time.perf_counter() - start
+    del decoded
+
+    # Decode again under tracemalloc, which would distort the timing.
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    results = [[decode(substrate) for substrate in chain] for chain in chains]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    held = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    count = len(chains)
+    print('%-16s %8.2f ms %8.3f ms %8.2f ms %10.0f' % (
+        label, decodeTime * 1000 / count, octetsTime * 1000 / count,
+        encodeTime * 1000 / count, held / count))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=200)
+    parser.add_argument('certificates', nargs='*')
+    args = parser.parse_args()
+
+    chain = []
+    for name in args.certificates:
+        with open(name) as fileObj:
+            chain.append(pem.readPemFromFile(fileObj))
+    if not chain:
+        # The certificates of the tests, when run from the top of the
+        # source tree.
+        from tests import test_rfc9802
+        from tests import test_rfc9881
+        from tests import test_rfc9909
+        for testCase in (test_rfc9881.MLDSACertificateTestCase,
+                         test_rfc9909.SLHDSACertificateTestCase,
+                         test_rfc9802.HSSLMSCertificateTestCase,
+                         test_rfc9802.XMSSCertificateTestCase,
+                         test_rfc9802.XMSSMTCertificateTestCase):
+            chain.append(pem.readBase64fromText(testCase.pem_text))
+
+    chains = [[bytes(bytearray(substrate)) for substrate in chain]
+              for _ in range(args.count)]
+    print('%d chains of %d certificates, %d octets' % (
+        args.count, len(chain), sum(len(substrate) for substrate in chain)))
+    print('%-16s %11s %11s %11s %10s' % (
+        '', 'decode', 'octets', 'encode', 'held'))
+
+    measure('pyasn1', lambda substrate: der_decoder(
+        substrate, asn1Spec=rfc5280.Certificate())[0], chains)
+    measure('zerocopy', lambda substrate: zerocopy.decode(
+        substrate, asn1Spec=rfc5280.Certificate())[0], chains)
+
+
+if __name__ == '__main__':
+    main()
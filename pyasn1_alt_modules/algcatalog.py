@@ -0,0 +1,305 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# A catalogue of well-known AlgorithmIdentifier values by their exact
+# DER encoding.  It is generated from the AlgorithmIdentifier constants
+# that the ASN.1 modules define, such as rfc4055.sha256Identifier and
+# rfc9881.sa_ml_dsa_65, from the algorithms whose parameters are NULL
+# in the algorithmIdentifierMap, and from a few algorithms whose
+# parameters are always absent.  A signatureAlgorithm or digestAlgorithm
+# is then recognised with one dict lookup on its TLV, and the encoder
+# puts in the catalogued encoding instead of encoding it again.
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+
+import importlib
+import sys
+
+from pyasn1 import error
+from pyasn1.codec.der import encoder
+from pyasn1.type import univ
+
+from pyasn1_alt_modules import opentypemap
+from pyasn1_alt_modules import rfc5280
+from pyasn1_alt_modules import tlv
+
+
+# The modules that are imported to fill the catalogue.  The constants
+# of any other module that has been imported are catalogued as well.
+DEFAULT_MODULES = (
+    'rfc3274', 'rfc3279', 'rfc3370', 'rfc3565', 'rfc4055', 'rfc4357',
+    'rfc5480', 'rfc5794', 'rfc5990', 'rfc7836', 'rfc8018', 'rfc8410',
+    'rfc8419', 'rfc8619', 'rfc8692', 'rfc8702', 'rfc9044', 'rfc9548',
+    'rfc9579', 'rfc9688', 'rfc9690', 'rfc9802', 'rfc9814', 'rfc9881',
+    'rfc9909', 'rfc9935', 'rfc9936',
+)
+
+# Algorithms with absent parameters for which the modules define no
+# AlgorithmIdentifier constant.
+_ABSENT_PARAMETERS = (
+    'rfc8410.id_X25519', 'rfc8410.id_X448', 'rfc8410.id_Ed25519',
+    'rfc8410.id_Ed448', 'rfc9935.id_alg_ml_kem_512',
+    'rfc9935.id_alg_ml_kem_768', 'rfc9935.id_alg_ml_kem_1024',
+)
+
+_PREFIX = 'pyasn1_alt_modules.'
+
+
+class AlgorithmDescriptor(object):
+    """A well-known AlgorithmIdentifier.
+
+    The name is the module and the constant, or the OID when the module
+    defines no AlgorithmIdentifier for it, such as 'rfc4055.sha256Identifier'
+    or 'rfc5480.sha1WithRSAEncryption'.  The algorithm is the
+    ObjectIdentifier, parameters is the DER of the parameters or None
+    when they are absent, and encoding is the DER AlgorithmIdentifier.
+    """
+
+    __slots__ = ('name', 'algorithm', 'parameters', 'encoding')
+
+    def __init__(self, name, algorithm, parameters, encoding):
+        self.name = name
+        self.algorithm = algorithm
+        self.parameters = parameters
+        self.encoding = encoding
+
+    def __repr__(self):
+        return '%s(%s, %s)' % (self.__class__.__name__, self.name,
+                               self.algorithm)
+
+
+_COMPONENT_NAMES = frozenset(('algorithm', 'parameters'))
+
+# The answers by the id of the componentType, which is kept with them so
+# that the id is not reused.  The class is not enough, as many schemas
+# use plain univ.Sequence objects with their own componentType.
+_algorithmIdentifierTypes = {}
+
+
+def _isAlgorithmIdentifier(value):
+    """Return True for a SEQUENCE with an OBJECT IDENTIFIER component
+    named algorithm and an optional one named parameters."""
+    if not isinstance(value, univ.Sequence):
+        return False
+    componentType = value.componentType
+    try:
+        isType = _algorithmIdentifierTypes[id(componentType)][1]
+    except KeyError:
+        isType = componentType is not None and \
+            componentType.keys() == _COMPONENT_NAMES and \
+            isinstance(componentType['algorithm'].asn1Object,
+                       univ.ObjectIdentifier)
+        if len(_algorithmIdentifierTypes) < 1024:
+            _algorithmIdentifierTypes[id(componentType)] = (
+                componentType, isType)
+    return isType and value.tagSet == rfc5280.AlgorithmIdentifier.tagSet
+
+
+class _CatalogItemEncoder(encoder.SingleItemEncoder):
+    """The DER item encoder, which pyasn1 calls back for every
+    component, answering from the catalogue for AlgorithmIdentifier
+    values."""
+
+    def __init__(self, catalog, **options):
+        encoder.SingleItemEncoder.__init__(self, **options)
+        self._catalog = catalog
+
+    def __call__(self, value, asn1Spec=None, **options):
+        if asn1Spec is None and 'wrapType' not in options and \
+                _isAlgorithmIdentifier(value):
+            descriptor = self._catalog.match(value)
+            if descriptor is not None:
+                return descriptor.encoding
+        return encoder.SingleItemEncoder.__call__(
+            self, value, asn1Spec, **options)
+
+
+class _CatalogEncoder(encoder.Encoder):
+    SINGLE_ITEM_ENCODER = _CatalogItemEncoder
+
+
+def _hashable(encoding):
+    # Only read-only buffers can be dictionary keys.
+    if isinstance(encoding, memoryview) and encoding.readonly:
+        return encoding
+    if isinstance(encoding, (bytearray, memoryview)):
+        return bytes(encoding)
+    return encoding
+
+
+class AlgorithmCatalog(object):
+    """The well-known AlgorithmIdentifier values of a set of modules,
+    by their DER encoding, their name, and their algorithm.
+
+    The modules are imported first; the constants of every module that
+    has been imported, and the NULL parameters in the
+    algorithmIdentifierMap, are then catalogued.  When two constants
+    have the same encoding, the name is taken from the given modules
+    first, then from the module that sorts first.
+    """
+
+    def __init__(self, modules=DEFAULT_MODULES):
+        self._byEncoding = {}
+        self._byName = {}
+        self._byAlgorithm = {}
+        self._byValue = {}
+        self._encoder = _CatalogEncoder(catalog=self)
+
+        # The names are taken from the given modules before the others,
+        # as a module may import the constants of another.
+        modules = [(name, importlib.import_module(_PREFIX + name))
+                   for name in sorted(modules)]
+        given = set(name for name, module in modules)
+        modules.extend(sorted(
+            (name[len(_PREFIX):], module)
+            for name, module in list(sys.modules.items())
+            if name.startswith(_PREFIX + 'rfc') and module is not None and
+            name[len(_PREFIX):] not in given))
+
+        oidNames = {}
+        for moduleName, module in modules:
+            for name, value in sorted(vars(module).items()):
+                if isinstance(value, univ.ObjectIdentifier):
+                    oidNames.setdefault(value, moduleName + '.' + name)
+                elif _isAlgorithmIdentifier(value) and value.isValue:
+                    self._add(moduleName + '.' + name, value)
+
+        algorithmIdentifierMap = opentypemap.get('algorithmIdentifierMap')
+        for algorithm, parameters in algorithmIdentifierMap.items():
+            if isinstance(parameters, univ.Null) and algorithm in oidNames:
+                self._add(oidNames[algorithm], rfc5280.AlgorithmIdentifier(),
+                          algorithm, univ.Null(''))
+
+        for name in _ABSENT_PARAMETERS:
+            moduleName, attribute = name.split('.')
+            module = sys.modules.get(_PREFIX + moduleName)
+            if module is not None:
+                self._add(name, rfc5280.AlgorithmIdentifier(),
+                          getattr(module, attribute))
+
+    def _add(self, name, value, algorithm=None, parameters=None):
+        if algorithm is not None:
+            value['algorithm'] = algorithm
+            if parameters is not None:
+                value['parameters'] = parameters
+        try:
+            encoding = encoder.encode(value)
+        except error.PyAsn1Error:
+            return
+        if encoding in self._byEncoding:
+            return
+
+        members = tlv.children(encoding)
+        algorithmTlv = encoding[members[0][0]:members[0][4]]
+        parameters = None
+        if len(members) > 1:
+            parameters = encoding[members[1][0]:members[1][4]]
+        descriptor = AlgorithmDescriptor(
+            name, univ.ObjectIdentifier(value['algorithm']), parameters,
+            encoding)
+
+        self._byEncoding[encoding] = descriptor
+        self._byName.setdefault(name, descriptor)
+        self._byAlgorithm.setdefault(algorithmTlv, descriptor)
+        self._byValue[descriptor.algorithm.asTuple(), parameters] = descriptor
+
+    def lookup(self, encoding):
+        """Return the descriptor of a DER AlgorithmIdentifier, which may be
+        bytes, a bytearray or a memoryview, or None when it is not
+        catalogued."""
+        return self._byEncoding.get(_hashable(encoding))
+
+    def describe(self, substrate, offset=0):
+        """Return the descriptor of the AlgorithmIdentifier TLV at offset
+        in substrate, or None when it is not catalogued."""
+        tag, valueOffset, valueEnd, tlvEnd = tlv.readTlv(substrate, offset)
+        if tag != tlv.SEQUENCE:
+            raise error.PyAsn1Error('AlgorithmIdentifier must be a SEQUENCE')
+        return self._byEncoding.get(
+            _hashable(memoryview(substrate)[offset:tlvEnd]))
+
+    def match(self, algorithmIdentifier):
+        """Return the descriptor for a decoded AlgorithmIdentifier, or
+        None when it is not catalogued."""
+        algorithm = algorithmIdentifier['algorithm']
+        if not algorithm.isValue:
+            return None
+        parameters = algorithmIdentifier['parameters']
+        if not parameters.isValue:
+            parameters = None
+        elif parameters.tagSet == univ.Any.tagSet:
+            # An open type holds its encoding.
+            parameters = parameters.asOctets()
+        else:
+            parameters = encoder.encode(parameters)
+        return self._byValue.get((algorithm.asTuple(), parameters))
+
+    def encoding(self, algorithm):
+        """Return the catalogued DER AlgorithmIdentifier for a descriptor
+        name or for an algorithm OID.
+
+        For an OID, this is the first encoding catalogued for it.  A
+        PyAsn1Error is raised when there is none.
+        """
+        if isinstance(algorithm, str) and algorithm in self._byName:
+            return self._byName[algorithm].encoding
+        try:
+            descriptor = self._byAlgorithm.get(
+                encoder.encode(univ.ObjectIdentifier(algorithm)))
+        except error.PyAsn1Error:
+            descriptor = None
+        if descriptor is None:
+            raise error.PyAsn1Error(
+                'No catalogued AlgorithmIdentifier for %s' % (algorithm,))
+        return descriptor.encoding
+
+    def encode(self, asn1Object):
+        """Return the DER encoding of asn1Object with the catalogued
+        encodings put in for its AlgorithmIdentifier components.
+
+        The result is the same as der_encoder(asn1Object).
+        """
+        return self._encoder(asn1Object)
+
+    def __len__(self):
+        return len(self._byEncoding)
+
+    def __iter__(self):
+        return iter(self._byEncoding.values())
+
+
+_defaultCatalog = None
+
+
+def _catalog():
+    global _defaultCatalog
+    # The modules are only imported when the catalogue is first used.
+    if _defaultCatalog is None:
+        _defaultCatalog = AlgorithmCatalog()
+    return _defaultCatalog
+
+
+def lookup(encoding):
+    """Return the descriptor of a DER AlgorithmIdentifier, using a shared
+    AlgorithmCatalog."""
+    return _catalog().lookup(encoding)
+
+
+def describe(substrate, offset=0):
+    """Return the descriptor of the AlgorithmIdentifier TLV at offset,
+    using a shared AlgorithmCatalog."""
+    return _catalog().describe(substrate, offset)
+
+
+def encoding(algorithm):
+    """Return the catalogued DER AlgorithmIdentifier for a name or an
+    OID, using a shared AlgorithmCatalog."""
+    return _catalog().encoding(algorithm)
+
+
+def encode(asn1Object):
+    """Return the DER encoding of asn1Object with catalogued
+    AlgorithmIdentifier encodings, using a shared AlgorithmCatalog."""
+    return _catalog().encode(asn1Object)
@@ -0,0 +1,302 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# Decoding and encoding for asyncio services.  Decoding a large CMS
+# message, CRL or manifest takes long enough to hold up the event loop,
+# so an AsyncCodec hands the substrates above a size threshold to a
+# thread or process executor and decodes the small ones inline, where
+# the cost of a hand-off would be more than the decoding.  Values to be
+# encoded are sized up the same way.  decodeStream() reads concatenated
+# DER objects, such as a certificate bundle or a stream of LDAP or SNMP
+# messages, from an asyncio.StreamReader and yields them as they are
+# decoded.
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+
+import asyncio
+import functools
+import importlib
+import io
+import pickle
+import sys
+from concurrent import futures
+
+from pyasn1 import error
+from pyasn1.codec.ber.decoder import decode as ber_decoder
+from pyasn1.codec.ber.encoder import encode as ber_encoder
+from pyasn1.codec.cer.decoder import decode as cer_decoder
+from pyasn1.codec.cer.encoder import encode as cer_encoder
+from pyasn1.codec.der.decoder import decode as der_decoder
+from pyasn1.codec.der.encoder import encode as der_encoder
+from pyasn1.type import base
+from pyasn1.type import univ
+
+from pyasn1_alt_modules import tlv
+
+
+# The codecs by name; the workers of a process executor look them up by
+# name, since the name is what is sent to them.
+CODECS = {
+    'ber': (ber_decoder, ber_encoder),
+    'cer': (cer_decoder, cer_encoder),
+    'der': (der_decoder, der_encoder),
+}
+
+# Substrates of this many octets or more are decoded in the executor.
+DEFAULT_THRESHOLD = 65536
+
+
+def _decode(codec, substrate, asn1Spec, options):
+    return CODECS[codec][0](substrate, asn1Spec=asn1Spec, **options)
+
+
+def _encode(codec, asn1Object, options):
+    return CODECS[codec][1](asn1Object, **options)
+
+
+# The componentType of each class of the loaded rfc modules, by id, with
+# the name of the class.
+_schemaObjects = {}
+_schemaModules = set()
+
+
+def _schemaReferences():
+    modules = set(name for name, module in list(sys.modules.items())
+                  if name.startswith('pyasn1_alt_modules.rfc') and
+                  module is not None)
+    for moduleName in modules - _schemaModules:
+        module = sys.modules[moduleName]
+        for name, value in list(vars(module).items()):
+            if isinstance(value, type) and \
+                    issubclass(value, base.Asn1Type) and \
+                    value.__module__ == moduleName:
+                componentType = value.__dict__.get('componentType')
+                if componentType is not None:
+                    _schemaObjects[id(componentType)] = (
+                        componentType, moduleName, name)
+        _schemaModules.add(moduleName)
+    return _schemaObjects
+
+
+def _schemaObject(moduleName, name):
+    return getattr(importlib.import_module(moduleName), name).componentType
+
+
+class _SchemaPickler(pickle.Pickler):
+    """Pickle the schema of the values by the name of its class.
+
+    Every value refers to the componentType of its class, which refers
+    in turn to the opentype maps and through them to most of the types
+    that are loaded, so without this pickling one value pickles much of
+    the schema as well.
+    """
+
+    def reducer_override(self, obj):
+        entry = self.references.get(id(obj))
+        if entry is not None and entry[0] is obj:
+            return _schemaObject, entry[1:]
+        return NotImplemented
+
+
+def _dumps(obj):
+    buffer = io.BytesIO()
+    pickler = _SchemaPickler(buffer, pickle.HIGHEST_PROTOCOL)
+    pickler.references = _schemaReferences()
+    pickler.dump(obj)
+    return buffer.getvalue()
+
+
+def _decodeInProcess(codec, substrate, asn1Spec, options):
+    # The asn1Spec and the result go both ways through _SchemaPickler.
+    return _dumps(_decode(codec, substrate, pickle.loads(asn1Spec),
+                          pickle.loads(options)))
+
+
+def _encodeInProcess(codec, asn1Object, options):
+    return _encode(codec, pickle.loads(asn1Object), pickle.loads(options))
+
+
+def estimateSize(asn1Object, limit=None):
+    """Return a rough size of the encoding of asn1Object in octets.
+
+    The string values are counted by their length and other values as
+    a few octets each.  The walk stops as soon as the size reaches
+    limit, so that a large value is not walked to the end just to learn
+    that it is large.
+    """
+    size = 0
+    stack = [asn1Object]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, univ.SequenceAndSetBase):
+            if value.isValue:
+                stack.extend(value.values())
+            size += 4
+        elif isinstance(value, univ.SequenceOfAndSetOfBase):
+            if value.isValue:
+                stack.extend(value)
+            size += 4
+        elif isinstance(value, univ.Choice):
+            if value.isValue:
+                stack.append(value.getComponent())
+            size += 2
+        elif isinstance(value, univ.OctetString):
+            size += len(value) + 4 if value.isValue else 0
+        elif isinstance(value, univ.BitString):
+            size += len(value) // 8 + 5 if value.isValue else 0
+        else:
+            size += 6
+        if limit is not None and size >= limit:
+            break
+    return size
+
+
+class AsyncCodec(object):
+    """Decode and encode from a coroutine without blocking the loop.
+
+    The executor is a concurrent.futures executor, or None for the
+    default executor of the event loop, which is a thread pool.  With a
+    ProcessPoolExecutor the decoding does not share the interpreter
+    lock with the loop, but the asn1Spec and the decoded value are
+    pickled between the processes, with their schema referred to by the
+    names of the classes, and the value is unpickled on the loop.
+    Substrates shorter than threshold octets are decoded inline; a
+    threshold of None never offloads, and 0 always does.  The codec is
+    'der', 'ber' or 'cer'.
+
+    Cancelling a coroutine cancels the work if it has not started yet.
+    A decode that is already running in the executor cannot be stopped;
+    it runs to the end and its result is dropped.
+    """
+
+    def __init__(self, executor=None, threshold=DEFAULT_THRESHOLD,
+                 codec='der'):
+        if codec not in CODECS:
+            raise error.PyAsn1Error('Unknown codec %s' % codec)
+        self.executor = executor
+        self.threshold = threshold
+        self.codec = codec
+        self.inline = 0
+        self.offloaded = 0
+
+    def _offload(self, size):
+        return self.threshold is not None and size >= self.threshold
+
+    async def _run(self, function, *args):
+        self.offloaded += 1
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, functools.partial(function, *args))
+
+    async def decode(self, substrate, asn1Spec=None, **options):
+        """Decode substrate like the decoder of the codec.  Returns
+        (asn1Object, rest)."""
+        if not self._offload(len(substrate)):
+            self.inline += 1
+            return _decode(self.codec, substrate, asn1Spec, options)
+        if isinstance(substrate, (bytearray, memoryview)):
+            substrate = bytes(substrate)
+        if isinstance(self.executor, futures.ProcessPoolExecutor):
+            return pickle.loads(await self._run(
+                _decodeInProcess, self.codec, substrate, _dumps(asn1Spec),
+                _dumps(options)))
+        return await self._run(
+            _decode, self.codec, substrate, asn1Spec, options)
+
+    async def encode(self, asn1Object, offload=None, **options):
+        """Encode asn1Object like the encoder of the codec.
+
+        Unless offload says otherwise, the value is encoded in the
+        executor when estimateSize() reaches the threshold.
+        """
+        if offload is None:
+            offload = self.threshold is not None and self._offload(
+                estimateSize(asn1Object, self.threshold))
+        if not offload:
+            self.inline += 1
+            return _encode(self.codec, asn1Object, options)
+        if isinstance(self.executor, futures.ProcessPoolExecutor):
+            return await self._run(_encodeInProcess, self.codec,
+                                   _dumps(asn1Object), _dumps(options))
+        return await self._run(_encode, self.codec, asn1Object, options)
+
+    async def decodeStream(self, reader, asn1Spec=None, maxSize=None,
+                           **options):
+        """Yield each object read from an asyncio.StreamReader.
+
+        The objects are read one TLV at a time and must use the definite
+        length form.  The stream may end between two objects; ending
+        inside one raises SubstrateUnderrunError.  An object larger than
+        maxSize octets raises PyAsn1Error before its value is read.
+        """
+        while True:
+            substrate = await readObject(reader, maxSize)
+            if substrate is None:
+                return
+            asn1Object, rest = await self.decode(
+                substrate, asn1Spec, **options)
+            yield asn1Object
+
+
+async def _readExactly(reader, count, header):
+    try:
+        return await reader.readexactly(count)
+    except asyncio.IncompleteReadError as exc:
+        raise error.SubstrateUnderrunError(
+            'Stream ended inside an object (%d octets read)' %
+            (len(header) + len(exc.partial)))
+
+
+async def readObject(reader, maxSize=None):
+    """Read the encoding of the next object from an asyncio.StreamReader.
+
+    Returns the octets of the whole TLV, or None at the end of the
+    stream.
+    """
+    try:
+        header = await reader.readexactly(1)
+    except asyncio.IncompleteReadError:
+        return None
+
+    if header[0] & 0x1F == 0x1F:
+        while True:
+            octet = await _readExactly(reader, 1, header)
+            header += octet
+            if not octet[0] & 0x80:
+                break
+
+    header += await _readExactly(reader, 1, header)
+    count = header[-1] & 0x7F
+    if header[-1] & 0x80:
+        if not count:
+            raise error.PyAsn1Error(
+                'The indefinite length form cannot be read from a stream')
+        header += await _readExactly(reader, count, header)
+
+    tag, valueOffset, length = tlv.readHeader(header)
+    if maxSize is not None and valueOffset + length > maxSize:
+        raise error.PyAsn1Error(
+            'Object of %d octets exceeds the limit of %d' %
+            (valueOffset + length, maxSize))
+
+    return header + await _readExactly(reader, length, header)
+
+
+_defaultCodec = AsyncCodec()
+
+
+async def decode(substrate, asn1Spec=None, **options):
+    """Decode DER with a shared AsyncCodec using the default executor."""
+    return await _defaultCodec.decode(substrate, asn1Spec, **options)
+
+
+async def encode(asn1Object, offload=None, **options):
+    """Encode DER with a shared AsyncCodec using the default executor."""
+    return await _defaultCodec.encode(asn1Object, offload, **options)
+
+
+def decodeStream(reader, asn1Spec=None, maxSize=None, **options):
+    """Yield the objects of a stream with a shared AsyncCodec."""
+    return _defaultCodec.decodeStream(reader, asn1Spec, maxSize, **options)
@@ -0,0 +1,105 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# Locate fields of a DER encoded X.509 certificate (RFC 5280) without
+# decoding it.  The results are positions or memoryview slices of the
+# original encoding, which is useful when only one or two fields are
+# needed from a large number of certificates.
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+
+from pyasn1 import error
+from pyasn1.codec.der.encoder import encode as der_encoder
+
+from pyasn1_alt_modules import tlv
+
+
+_TBS_NAMES = ('serialNumber', 'signature', 'issuer', 'validity', 'subject',
+              'subjectPublicKeyInfo')
+
+_TBS_TRAILING_NAMES = {
+    tlv.contextTag(1, False): 'issuerUniqueID',
+    tlv.contextTag(2, False): 'subjectUniqueID',
+    tlv.contextTag(3): 'extensions',
+}
+
+
+def oidTlv(oid):
+    """Return the DER encoding of an OID, for comparing with raw TLVs."""
+    if isinstance(oid, (bytes, bytearray)):
+        return bytes(oid)
+    return der_encoder(oid)
+
+
+def tbsCertificate(substrate, offset=0):
+    """Return (tbsOffset, tbsEnd) for a Certificate or TBSCertificate.
+
+    The offset may point at either the Certificate or the
+    TBSCertificate; the TBSCertificate is recognized by its first
+    component, which is the [0] version or the serialNumber.
+    """
+    tag, valueOffset, valueEnd, tlvEnd = tlv.readTlv(substrate, offset)
+    if tag != tlv.SEQUENCE:
+        raise error.PyAsn1Error('Certificate must be a SEQUENCE')
+
+    firstTag = substrate[valueOffset]
+    if firstTag == tlv.SEQUENCE:
+        return valueOffset, tlv.readTlv(substrate, valueOffset)[3]
+    if firstTag in (tlv.contextTag(0), tlv.INTEGER):
+        return offset, tlvEnd
+
+    raise error.PyAsn1Error('Not a Certificate or TBSCertificate')
+
+
+def tbsFields(substrate, offset=0):
+    """Return the TLVs of the TBSCertificate as a dict of tuples.
+
+    Each value is (offset, tag, valueOffset, valueEnd, tlvEnd) as
+    reported by tlv.iterTlvs.  The keys are the component names of
+    rfc5280.TBSCertificate; absent optional components are left out.
+    """
+    tbsOffset, tbsEnd = tbsCertificate(substrate, offset)
+    items = tlv.children(substrate, tbsOffset)
+    fields = {}
+    if items and items[0][1] == tlv.contextTag(0):
+        fields['version'] = items.pop(0)
+    fields.update(zip(_TBS_NAMES, items))
+    for item in items[len(_TBS_NAMES):]:
+        name = _TBS_TRAILING_NAMES.get(item[1])
+        if name:
+            fields[name] = item
+    return fields
+
+
+def iterExtensions(substrate, offset=0):
+    """Yield (extnID, critical, extnValue, extnOffset, extnEnd).
+
+    The extnID is the DER encoding of the OID and extnValue is the
+    content of the extnValue OCTET STRING, both as memoryview slices.
+    The offset may point at a Certificate or a TBSCertificate.
+    """
+    substrate = memoryview(substrate)
+    extensions = tbsFields(substrate, offset).get('extensions')
+    if extensions is None:
+        return
+
+    sequence = tlv.readTlv(substrate, extensions[2])
+    for extnOffset, tag, valueOffset, valueEnd, extnEnd in tlv.iterTlvs(
+            substrate, sequence[1], sequence[2]):
+        members = list(tlv.iterTlvs(substrate, valueOffset, valueEnd))
+        extnID = substrate[members[0][0]:members[0][4]]
+        critical = len(members) == 3 and substrate[members[1][2]] != 0
+        extnValue = substrate[members[-1][2]:members[-1][3]]
+        yield extnID, critical, extnValue, extnOffset, extnEnd
+
+
+def findExtension(substrate, extnID, offset=0):
+    """Return the extnValue content for extnID as a memoryview, or None."""
+    wanted = oidTlv(extnID)
+    for candidate, critical, extnValue, extnOffset, extnEnd in iterExtensions(
+            substrate, offset):
+        if candidate == wanted:
+            return extnValue
+    return None
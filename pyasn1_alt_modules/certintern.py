@@ -0,0 +1,191 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# Interning of decoded certificates.  A CertificateSet, a PKCS#7 or
+# CMS set of certificates, a CertBundle, or an IKEv2 CertificateBundle
+# often carries the same intermediates as many other messages.  A DER
+# decoder that consults a CertificateInterner decodes a certificate
+# only the first time its encoding is seen; after that the decoded
+# object is looked up by the SHA-256 digest of the encoding, and the
+# same instance is shared by all of the messages.  The most recently
+# used certificates are kept, up to the cache size.
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+
+import hashlib
+import threading
+
+from pyasn1.codec.ber import decoder as ber_decoder
+from pyasn1.codec.der import decoder
+from pyasn1.codec.streaming import readFromStream
+from pyasn1.error import SubstrateUnderrunError
+from pyasn1.type import univ
+
+from pyasn1_alt_modules import rfc5280
+
+
+class _SequencePayloadDecoder(ber_decoder.SequencePayloadDecoder):
+
+    def valueDecoder(self, substrate, asn1Spec,
+                     tagSet=None, length=None, state=None,
+                     decodeFun=None, substrateFun=None,
+                     **options):
+        interner = options.get('_interner')
+        if interner is None or substrateFun or \
+                not isinstance(asn1Spec, interner.types):
+            for chunk in ber_decoder.SequencePayloadDecoder.valueDecoder(
+                    self, substrate, asn1Spec, tagSet, length, state,
+                    decodeFun, substrateFun, **options):
+                yield chunk
+            return
+
+        offset = substrate.tell()
+        for contents in readFromStream(substrate, length, options):
+            if isinstance(contents, SubstrateUnderrunError):
+                yield contents
+
+        # The tags are part of the key, as the decoded object has them,
+        # and so are the options that decide how open types are decoded.
+        # The cache entry keeps the openTypes map alive, so that its id
+        # is not reused while the entry is there.
+        openTypes = options.get('openTypes')
+        key = (asn1Spec.__class__, asn1Spec.tagSet,
+               bool(options.get('decodeOpenTypes')), id(openTypes),
+               hashlib.sha256(contents).digest())
+        asn1Object = interner._lookup(key)
+        if asn1Object is not None:
+            yield asn1Object
+            return
+
+        substrate.seek(offset)
+        for asn1Object in ber_decoder.SequencePayloadDecoder.valueDecoder(
+                self, substrate, asn1Spec, tagSet, length, state,
+                decodeFun, substrateFun, **options):
+            if isinstance(asn1Object, SubstrateUnderrunError):
+                yield asn1Object
+        interner._store(key, asn1Object, openTypes)
+        yield asn1Object
+
+
+TAG_MAP = decoder.TAG_MAP
+
+TYPE_MAP = decoder.TYPE_MAP.copy()
+TYPE_MAP[univ.Sequence.typeId] = _SequencePayloadDecoder()
+
+
+class SingleItemDecoder(decoder.SingleItemDecoder):
+    __doc__ = decoder.SingleItemDecoder.__doc__
+
+    TAG_MAP = TAG_MAP
+    TYPE_MAP = TYPE_MAP
+
+
+class StreamingDecoder(decoder.StreamingDecoder):
+    __doc__ = decoder.StreamingDecoder.__doc__
+
+    SINGLE_ITEM_DECODER = SingleItemDecoder
+
+
+class Decoder(decoder.Decoder):
+    __doc__ = decoder.Decoder.__doc__
+
+    STREAMING_DECODER = StreamingDecoder
+
+
+_decode = Decoder()
+
+
+class CertificateInterner(object):
+    """Share decoded certificates between the messages that carry them.
+
+    The certificates are the values of the given types, which are
+    looked up by a digest of their DER encoding and by the decodeOpenTypes
+    and openTypes options they were decoded with.  The decoded objects
+    that are returned are shared, so they must not be changed; this is
+    not enforced, and a change shows in every message that shares the
+    certificate.  The hits and misses count the certificates that were
+    found in the cache and those that were decoded.
+    """
+
+    def __init__(self, cacheSize=1024, types=(rfc5280.Certificate,)):
+        self.cacheSize = cacheSize
+        self.types = tuple(types)
+        self._cache = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(self, key):
+        cache = self._cache
+        with self._lock:
+            entry = cache.pop(key, None)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            # Inserting again moves the key to the end, which keeps the
+            # dict in the order of the most recent use.
+            cache[key] = entry
+        return entry[0]
+
+    def _store(self, key, asn1Object, openTypes=None):
+        cache = self._cache
+        with self._lock:
+            if key not in cache and cache and len(cache) >= self.cacheSize:
+                del cache[next(iter(cache))]
+            cache[key] = asn1Object, openTypes
+
+    def decode(self, substrate, asn1Spec=None, **options):
+        """Decode DER like pyasn1.codec.der.decoder.decode, sharing the
+        certificates found in it.  Returns (asn1Object, rest)."""
+        options['_interner'] = self
+        return _decode(substrate, asn1Spec, **options)
+
+    def intern(self, certificate, asn1Spec=None):
+        """Return the shared decoded object for a DER certificate.
+
+        The object is shared with every other caller that interns the
+        same certificate, and it is not read-only: it must not be
+        changed.  Decode the certificate with the plain DER decoder to
+        get an object of your own.
+        """
+        if asn1Spec is None:
+            asn1Spec = self.types[0]()
+        return self.decode(bytes(certificate), asn1Spec=asn1Spec)[0]
+
+    def internAll(self, certificates, asn1Spec=None):
+        """Return a list of the shared decoded objects for a sequence of
+        DER certificates, such as a bundle."""
+        return [self.intern(certificate, asn1Spec)
+                for certificate in certificates]
+
+    @property
+    def hitRate(self):
+        """The fraction of the lookups that were found in the cache."""
+        lookups = self.hits + self.misses
+        return float(self.hits) / lookups if lookups else 0.0
+
+    def __len__(self):
+        return len(self._cache)
+
+    def clear(self):
+        """Empty the cache."""
+        with self._lock:
+            self._cache.clear()
+
+
+_defaultInterner = CertificateInterner()
+
+
+def decode(substrate, asn1Spec=None, **options):
+    """Decode DER, sharing the certificates found in it through a shared
+    CertificateInterner.  Returns (asn1Object, rest)."""
+    return _defaultInterner.decode(substrate, asn1Spec, **options)
+
+
+def intern(certificate, asn1Spec=None):
+    """Return the decoded object for a DER certificate from a shared
+    CertificateInterner."""
+    return _defaultInterner.intern(certificate, asn1Spec)
@@ -0,0 +1,385 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# Bulk processing of CMC enrolment requests (RFC 6402).  The
+# TaggedRequests of a PKIData are split into independent RequestView
+# objects with the tlv helpers, and the inputs to each proof-of-
+# possession check (the signed octets, such as the DER
+# certificationRequestInfo of a PKCS #10 request, the signature
+# algorithm, the signature, and the public key) are sliced from the
+# original encoding.  CMCPipeline runs a verification function over the
+# requests, optionally on a concurrent.futures executor, and streams a
+# PKIResponse with one CMCStatusInfoV2 control for each request.
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+
+import itertools
+import shutil
+import tempfile
+
+from pyasn1 import error
+from pyasn1.codec.der.decoder import decode as der_decoder
+from pyasn1.codec.der.encoder import encode as der_encoder
+from pyasn1.type import univ
+
+from pyasn1_alt_modules import certfields
+from pyasn1_alt_modules import rfc6402
+from pyasn1_alt_modules import tlv
+
+
+TCR = tlv.contextTag(0)
+CRM = tlv.contextTag(1)
+ORM = tlv.contextTag(2)
+
+_kinds = {TCR: 'tcr', CRM: 'crm', ORM: 'orm'}
+
+_POP_SIGNATURE = tlv.contextTag(1)
+_POPOSK_INPUT = tlv.contextTag(0)
+_TEMPLATE_PUBLIC_KEY = tlv.contextTag(6)
+
+_STATUS_INFO_V2 = certfields.oidTlv(rfc6402.id_cmc_statusInfoV2)
+
+_statusValues = dict(rfc6402.CMCStatus.namedValues.items())
+_failInfoValues = dict(rfc6402.CMCFailInfo.namedValues.items())
+
+
+def _integer(value):
+    return tlv.encodeTlv(tlv.INTEGER, value.to_bytes(
+        value.bit_length() // 8 + 1, 'big', signed=True))
+
+
+def _retag(substrate, item, tag=tlv.SEQUENCE):
+    """Return the TLV item with its IMPLICIT tag replaced by tag."""
+    return tlv.encodeTlv(tag, bytes(substrate[item[2]:item[3]]))
+
+
+def _bitString(substrate, item):
+    return bytes(substrate[item[2] + 1:item[3]])
+
+
+def _isSuccess(statusInfo):
+    """Tell whether the cMCStatus of a DER CMCStatusInfoV2 is success."""
+    members = tlv.children(statusInfo)
+    if not members or members[0][1] != tlv.INTEGER:
+        raise error.PyAsn1Error('Malformed CMCStatusInfoV2')
+    cMCStatus = members[0]
+    return int.from_bytes(statusInfo[cMCStatus[2]:cMCStatus[3]], 'big',
+                          signed=True) == _statusValues['success']
+
+
+class PopInput(object):
+    """The inputs for verifying a signature proof-of-possession.
+
+    The signature over signedData is checked with subjectPublicKeyInfo
+    and signatureAlgorithm, which are DER encodings.
+    """
+
+    __slots__ = ('signedData', 'signatureAlgorithm', 'signature',
+                 'subjectPublicKeyInfo')
+
+    def __init__(self, signedData, signatureAlgorithm, signature,
+                 subjectPublicKeyInfo):
+        self.signedData = signedData
+        self.signatureAlgorithm = signatureAlgorithm
+        self.signature = signature
+        self.subjectPublicKeyInfo = subjectPublicKeyInfo
+
+
+class RequestView(object):
+    """A view of one TaggedRequest.
+
+    The kind is 'tcr' for a PKCS #10 request, 'crm' for a CRMF
+    CertReqMsg, or 'orm' for another request format.  The bodyPartID
+    of a CRMF request is its certReqId.  Views can be pickled, which
+    sends just the encoding.
+    """
+
+    __slots__ = ('substrate', 'kind', 'bodyPartID', '_members')
+
+    def __init__(self, substrate):
+        self.substrate = substrate = memoryview(substrate)
+        tag = tlv.readHeader(substrate)[0]
+        try:
+            self.kind = _kinds[tag]
+        except KeyError:
+            raise error.PyAsn1Error('Unknown TaggedRequest tag 0x%02X' % tag)
+
+        self._members = members = tlv.children(substrate)
+        if self.kind == 'crm':
+            idItem = tlv.children(substrate, members[0][0])[0]
+        else:
+            idItem = members[0]
+        self.bodyPartID = int.from_bytes(
+            substrate[idItem[2]:idItem[3]], 'big', signed=True)
+
+    def __reduce__(self):
+        return self.__class__, (bytes(self.substrate),)
+
+    def __repr__(self):
+        return '%s(%s, bodyPartID=%d)' % (
+            self.__class__.__name__, self.kind, self.bodyPartID)
+
+    @property
+    def certificationRequest(self):
+        """The DER CertificationRequest of a 'tcr' request."""
+        self._expect('tcr')
+        item = self._members[1]
+        return self.substrate[item[0]:item[4]]
+
+    @property
+    def certificationRequestInfo(self):
+        """The DER certificationRequestInfo of a 'tcr' request, which is
+        the data that its signature covers."""
+        self._expect('tcr')
+        item = tlv.children(self.substrate, self._members[1][0])[0]
+        return self.substrate[item[0]:item[4]]
+
+    @property
+    def certRequest(self):
+        """The DER CertRequest of a 'crm' request."""
+        self._expect('crm')
+        item = self._members[0]
+        return self.substrate[item[0]:item[4]]
+
+    def _expect(self, kind):
+        if self.kind != kind:
+            raise error.PyAsn1Error(
+                'Not available for a %s request' % self.kind)
+
+    def popInput(self):
+        """Return the PopInput for a signature proof-of-possession, or
+        None if the request has none (such as a CRMF request with
+        raVerified or key encipherment POP, or an 'orm' request)."""
+        substrate = self.substrate
+
+        if self.kind == 'tcr':
+            cri, signatureAlgorithm, signature = tlv.children(
+                substrate, self._members[1][0])
+            subjectPublicKeyInfo = tlv.children(substrate, cri[0])[2]
+            return PopInput(
+                bytes(substrate[cri[0]:cri[4]]),
+                bytes(substrate[signatureAlgorithm[0]:signatureAlgorithm[4]]),
+                _bitString(substrate, signature),
+                bytes(substrate[subjectPublicKeyInfo[0]:
+                                subjectPublicKeyInfo[4]]))
+
+        if self.kind != 'crm' or len(self._members) < 2 or \
+                self._members[1][1] != _POP_SIGNATURE:
+            return None
+
+        popo = tlv.children(substrate, self._members[1][0])
+        if popo[0][1] == _POPOSK_INPUT:
+            poposkInput, signatureAlgorithm, signature = popo
+            signedData = _retag(substrate, poposkInput)
+            publicKey = tlv.children(substrate, poposkInput[0])[-1]
+            subjectPublicKeyInfo = bytes(substrate[publicKey[0]:publicKey[4]])
+        else:
+            signatureAlgorithm, signature = popo
+            signedData = bytes(self.certRequest)
+            template = tlv.children(substrate, self._members[0][0])[1]
+            subjectPublicKeyInfo = None
+            for item in tlv.iterTlvs(substrate, template[2], template[3]):
+                if item[1] == _TEMPLATE_PUBLIC_KEY:
+                    subjectPublicKeyInfo = _retag(substrate, item)
+
+        return PopInput(
+            signedData,
+            bytes(substrate[signatureAlgorithm[0]:signatureAlgorithm[4]]),
+            _bitString(substrate, signature), subjectPublicKeyInfo)
+
+    def decode(self):
+        """Decode the request as an rfc6402.TaggedRequest."""
+        asn1Object, rest = der_decoder(
+            bytes(self.substrate), asn1Spec=rfc6402.TaggedRequest())
+        return asn1Object
+
+
+def _sequences(substrate):
+    substrate = memoryview(substrate)
+    members = tlv.children(substrate)
+    if len(members) != 4:
+        raise error.PyAsn1Error('Not a PKIData')
+    return substrate, members
+
+
+def iterRequests(pkiData):
+    """Yield a RequestView for each TaggedRequest of a DER PKIData."""
+    substrate, members = _sequences(pkiData)
+    reqSequence = members[1]
+    for item in tlv.iterTlvs(substrate, reqSequence[2], reqSequence[3]):
+        yield RequestView(substrate[item[0]:item[4]])
+
+
+def iterControls(pkiData):
+    """Yield (bodyPartID, attrType, [encoded values]) for each control
+    of a DER PKIData."""
+    substrate, members = _sequences(pkiData)
+    controlSequence = members[0]
+    for item in tlv.iterTlvs(substrate, controlSequence[2],
+                             controlSequence[3]):
+        bodyPartID, attrType, attrValues = tlv.children(substrate, item[0])
+        oid, rest = der_decoder(bytes(substrate[attrType[0]:attrType[4]]),
+                                asn1Spec=univ.ObjectIdentifier())
+        yield (int.from_bytes(substrate[bodyPartID[2]:bodyPartID[3]], 'big'),
+               oid,
+               [substrate[value[0]:value[4]] for value in tlv.iterTlvs(
+                   substrate, attrValues[2], attrValues[3])])
+
+
+def encodeStatusInfoV2(status, bodyPartIDs, statusString=None,
+                       failInfo=None):
+    """Return the DER CMCStatusInfoV2 for a status name or number that
+    refers to the given bodyPartIDs."""
+    status = _statusValues.get(status, status)
+    parts = [_integer(status),
+             tlv.encodeTlv(tlv.SEQUENCE, b''.join(
+                 _integer(bodyPartID) for bodyPartID in bodyPartIDs))]
+    if statusString is not None:
+        parts.append(tlv.encodeTlv(tlv.UTF8_STRING,
+                                   statusString.encode('utf-8')))
+    if failInfo is not None:
+        parts.append(_integer(_failInfoValues.get(failInfo, failInfo)))
+    return tlv.encodeTlv(tlv.SEQUENCE, b''.join(parts))
+
+
+class PKIResponseWriter(object):
+    """Stream a PKIResponse whose controlSequence is added one
+    TaggedAttribute at a time.
+
+    With der=False, BER indefinite length encoding is written as the
+    controls arrive.  With der=True, the controls are spooled to a
+    temporary file and the DER PKIResponse is written by close().  The
+    fileObj can be a cmsstream.SignedDataWriter with the eContentType
+    id_cct_PKIResponse, which signs the response as it is written.
+    """
+
+    def __init__(self, fileObj, der=False, chunkSize=65536):
+        self._fileObj = fileObj
+        self._der = der
+        self._chunkSize = chunkSize
+        self._length = 0
+        self._bodyPartIDs = itertools.count(1)
+        self._closed = False
+        if der:
+            self._spool = tempfile.TemporaryFile()
+        else:
+            self._spool = None
+            fileObj.write(tlv.encodeHeader(tlv.SEQUENCE, None) +
+                          tlv.encodeHeader(tlv.SEQUENCE, None))
+
+    def addControl(self, attrType, encodedValues, bodyPartID=None):
+        """Add a TaggedAttribute from the DER encodings of its values.
+
+        Controls are numbered from 1 unless bodyPartID is given.
+        """
+        if bodyPartID is None:
+            bodyPartID = next(self._bodyPartIDs)
+        encoded = tlv.encodeTlv(tlv.SEQUENCE, b''.join((
+            _integer(bodyPartID), certfields.oidTlv(attrType),
+            tlv.encodeTlv(tlv.SET, b''.join(sorted(
+                bytes(value) for value in encodedValues))))))
+        if self._der:
+            self._spool.write(encoded)
+        else:
+            self._fileObj.write(encoded)
+        self._length += len(encoded)
+
+    def addStatus(self, status, bodyPartIDs, statusString=None,
+                  failInfo=None):
+        """Add an id_cmc_statusInfoV2 control."""
+        self.addControl(_STATUS_INFO_V2, [encodeStatusInfoV2(
+            status, bodyPartIDs, statusString, failInfo)])
+
+    def close(self):
+        """Finish the PKIResponse with empty cmsSequence and
+        otherMsgSequence."""
+        if self._closed:
+            raise error.PyAsn1Error('The PKIResponse writer is already closed')
+        self._closed = True
+        trailer = tlv.encodeTlv(tlv.SEQUENCE, b'') * 2
+        write = self._fileObj.write
+        if not self._der:
+            write(tlv.EOC + trailer + tlv.EOC)
+            return
+
+        controlSequence = tlv.encodeHeader(tlv.SEQUENCE, self._length)
+        write(tlv.encodeHeader(tlv.SEQUENCE, len(controlSequence) +
+                               self._length + len(trailer)))
+        write(controlSequence)
+        self._spool.seek(0)
+        shutil.copyfileobj(self._spool, self._fileObj, self._chunkSize)
+        self._spool.close()
+        write(trailer)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        elif self._spool is not None:
+            self._spool.close()
+
+
+class CMCPipeline(object):
+    """Verify the requests of a PKIData and answer them in bulk.
+
+    The verify function is called with each RequestView; it returns
+    True when the request is acceptable, False when its
+    proof-of-possession fails, or an rfc6402.CMCStatusInfoV2 (or its
+    DER encoding) to report something else.  With an executor from
+    concurrent.futures, up to window requests are verified at a time;
+    the results still come out in request order, and only one window
+    is held in memory.  A ProcessPoolExecutor needs a verify function
+    that can be pickled, such as a module-level function.
+    """
+
+    def __init__(self, verify, executor=None, window=256):
+        self.verify = verify
+        self.executor = executor
+        self.window = window
+
+    def results(self, pkiData):
+        """Yield (request, result) for each TaggedRequest in order."""
+        requests = iterRequests(pkiData)
+        while True:
+            batch = list(itertools.islice(requests, self.window))
+            if not batch:
+                return
+            if self.executor is None:
+                verified = map(self.verify, batch)
+            else:
+                verified = self.executor.map(self.verify, batch)
+            for request, result in zip(batch, verified):
+                yield request, result
+
+    def statusInfo(self, request, result):
+        """Return the DER CMCStatusInfoV2 for a verification result."""
+        if result is True:
+            return encodeStatusInfoV2('success', [request.bodyPartID])
+        if result is False:
+            return encodeStatusInfoV2(
+                'failed', [request.bodyPartID], failInfo='popFailed')
+        if isinstance(result, rfc6402.CMCStatusInfoV2):
+            return der_encoder(result)
+        return bytes(result)
+
+    def respond(self, pkiData, fileObj, der=False):
+        """Write a PKIResponse with one CMCStatusInfoV2 control for
+        each request to fileObj.
+
+        Returns the number of requests whose cMCStatus is success and
+        the number of the others.
+        """
+        accepted = rejected = 0
+        with PKIResponseWriter(fileObj, der=der) as writer:
+            for request, result in self.results(pkiData):
+                statusInfo = self.statusInfo(request, result)
+                writer.addControl(_STATUS_INFO_V2, [statusInfo])
+                if _isSuccess(statusInfo):
+                    accepted += 1
+                else:
+                    rejected += 1
+        return accepted, rejected
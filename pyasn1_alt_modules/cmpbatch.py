@@ -0,0 +1,279 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# Batch processing of CMP messages (RFC 4210, RFC 9480, and RFC 9810).
+# A PKIMessages sequence, or the NestedMessageContent of a nested body,
+# is split into LazyPKIMessage views with the tlv helpers.  The PKIBody
+# alternative is identified by its tag, so a message can be dispatched
+# to a handler without decoding any of the other alternatives, and the
+# DER ProtectedPart that the protection covers is assembled from the
+# original header and body octets instead of being re-encoded.
+#
+# CMPBatchProcessor runs the handlers on an optional concurrent.futures
+# executor and returns the results in the order of the messages.
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+
+from pyasn1 import error
+from pyasn1.codec.der.decoder import decode as der_decoder
+from pyasn1.type import univ
+
+from pyasn1_alt_modules import rfc9810
+from pyasn1_alt_modules import tlv
+
+
+# The PKIBody alternatives by tag, and the tagged type of each one
+
+bodyNames = {}
+_bodySpecs = {}
+
+for _namedType in rfc9810.PKIBody.componentType.namedTypes:
+    _tag = _namedType.asn1Object.tagSet.superTags[-1]
+    _tag = _tag.tagClass | _tag.tagFormat | _tag.tagId
+    bodyNames[_tag] = _namedType.name
+    _bodySpecs[_tag] = _namedType.asn1Object
+
+del _namedType, _tag
+
+_bodyNameSet = frozenset(bodyNames.values())
+
+
+_PROTECTION = tlv.contextTag(0)
+_EXTRA_CERTS = tlv.contextTag(1)
+
+
+class LazyPKIMessage(object):
+    """A view of one DER encoded PKIMessage.
+
+    Only the positions of the header, body, protection, and extraCerts
+    are found when the view is made; each part is decoded on request.
+    The bodyName is the name of the PKIBody alternative, such as 'ir'
+    or 'genm'.  Views can be pickled, which sends just the encoding.
+    """
+
+    __slots__ = ('substrate', 'bodyTag', '_header', '_body', '_protection',
+                 '_extraCerts', '_decodedHeader')
+
+    def __init__(self, substrate):
+        self.substrate = substrate = memoryview(substrate)
+        members = tlv.children(substrate)
+        if len(members) < 2 or members[0][1] != tlv.SEQUENCE:
+            raise error.PyAsn1Error('Not a PKIMessage')
+
+        self._header = members[0]
+        self._body = members[1]
+        self.bodyTag = members[1][1]
+        if self.bodyTag not in bodyNames:
+            raise error.PyAsn1Error(
+                'Unknown PKIBody tag 0x%02X' % self.bodyTag)
+
+        self._protection = self._extraCerts = None
+        for item in members[2:]:
+            if item[1] == _PROTECTION:
+                self._protection = item
+            elif item[1] == _EXTRA_CERTS:
+                self._extraCerts = item
+        self._decodedHeader = None
+
+    def __reduce__(self):
+        return self.__class__, (bytes(self.substrate),)
+
+    def __repr__(self):
+        return '%s(%s, %d octets)' % (
+            self.__class__.__name__, self.bodyName, len(self.substrate))
+
+    @property
+    def bodyName(self):
+        return bodyNames[self.bodyTag]
+
+    @property
+    def encodedHeader(self):
+        """The DER PKIHeader as a memoryview."""
+        return self.substrate[self._header[0]:self._header[4]]
+
+    @property
+    def encodedBody(self):
+        """The DER PKIBody, including its tag, as a memoryview."""
+        return self.substrate[self._body[0]:self._body[4]]
+
+    @property
+    def protectedPart(self):
+        """The DER ProtectedPart that the protection is computed over."""
+        header = self.encodedHeader
+        body = self.encodedBody
+        return b''.join((
+            tlv.encodeHeader(tlv.SEQUENCE, len(header) + len(body)),
+            header, body))
+
+    @property
+    def protection(self):
+        """The protection bits as bytes, or None if absent."""
+        if self._protection is None:
+            return None
+        bitString = tlv.readTlv(self.substrate, self._protection[2])
+        return bytes(self.substrate[bitString[1] + 1:bitString[2]])
+
+    @property
+    def extraCerts(self):
+        """The DER encoding of each of the extraCerts as a list of
+        memoryview slices."""
+        if self._extraCerts is None:
+            return []
+        sequence = tlv.readTlv(self.substrate, self._extraCerts[2])
+        return [self.substrate[item[0]:item[4]] for item in tlv.iterTlvs(
+            self.substrate, sequence[1], sequence[2])]
+
+    def header(self):
+        """Return the decoded rfc9810.PKIHeader."""
+        if self._decodedHeader is None:
+            self._decodedHeader, rest = der_decoder(
+                bytes(self.encodedHeader), asn1Spec=rfc9810.PKIHeader())
+        return self._decodedHeader
+
+    def body(self, decodeOpenTypes=False):
+        """Return the decoded value of the PKIBody alternative alone,
+        such as the rfc9810.CertReqMessages of an 'ir' body."""
+        asn1Object, rest = der_decoder(
+            bytes(self.encodedBody), asn1Spec=_bodySpecs[self.bodyTag],
+            decodeOpenTypes=decodeOpenTypes)
+        return asn1Object
+
+    def nestedMessages(self):
+        """Return the inner messages of a 'nested' body as views."""
+        if self.bodyName != 'nested':
+            raise error.PyAsn1Error('Not a nested message')
+        return list(iterPKIMessages(self.substrate, self._body[2]))
+
+    def infoTypeAndValues(self):
+        """Return (infoType, infoValue) pairs of a 'genm' or 'genp' body.
+
+        The infoValue is left encoded, or is None when it is absent;
+        decodeInfoValue() decodes it.
+        """
+        if self.bodyName not in ('genm', 'genp'):
+            raise error.PyAsn1Error('Not a general message')
+        return list(iterInfoTypeAndValues(self.substrate, self._body[2]))
+
+    def toAsn1(self):
+        """Decode the complete rfc9810.PKIMessage."""
+        asn1Object, rest = der_decoder(
+            bytes(self.substrate), asn1Spec=rfc9810.PKIMessage())
+        return asn1Object
+
+
+def iterPKIMessages(substrate, offset=0):
+    """Yield a LazyPKIMessage for each PKIMessage in the PKIMessages
+    at offset, which may also be the NestedMessageContent."""
+    substrate = memoryview(substrate)
+    tag, valueOffset, valueEnd, tlvEnd = tlv.readTlv(substrate, offset)
+    for item in tlv.iterTlvs(substrate, valueOffset, valueEnd):
+        yield LazyPKIMessage(substrate[item[0]:item[4]])
+
+
+def iterInfoTypeAndValues(substrate, offset=0):
+    """Yield (infoType, infoValue) for each InfoTypeAndValue in the
+    GenMsgContent or GenRepContent at offset."""
+    substrate = memoryview(substrate)
+    tag, valueOffset, valueEnd, tlvEnd = tlv.readTlv(substrate, offset)
+    for item in tlv.iterTlvs(substrate, valueOffset, valueEnd):
+        members = tlv.children(substrate, item[0])
+        infoType, rest = der_decoder(
+            bytes(substrate[members[0][0]:members[0][4]]),
+            asn1Spec=univ.ObjectIdentifier())
+        infoValue = None
+        if len(members) > 1:
+            infoValue = substrate[members[1][0]:members[1][4]]
+        yield infoType, infoValue
+
+
+def decodeInfoValue(infoType, infoValue):
+    """Decode an infoValue using cmpInfoTypeAndValueMap."""
+    try:
+        asn1Spec = rfc9810.cmpInfoTypeAndValueMap[infoType]
+    except KeyError:
+        raise error.PyAsn1Error('Unknown infoType %s' % (infoType,))
+    asn1Object, rest = der_decoder(bytes(infoValue), asn1Spec=asn1Spec)
+    return asn1Object
+
+
+class CMPBatchProcessor(object):
+    """Dispatch CMP messages to handlers by PKIBody alternative.
+
+    Handlers are registered by body name, such as 'ir', 'cr', or
+    'kur', and are called with a LazyPKIMessage; whatever they return
+    is the result for that message.  A message with no handler goes to
+    defaultHandler, or raises PyAsn1Error when there is none.  Unless a
+    handler is registered for 'nested', a nested message gives the list
+    of the results for its inner messages.
+
+    With an executor from concurrent.futures, the messages of a batch
+    are handled concurrently and the results are still returned in the
+    order of the messages.  A ProcessPoolExecutor needs handlers that
+    can be pickled, such as module-level functions.
+    """
+
+    def __init__(self, handlers=None, defaultHandler=None, executor=None):
+        self.handlers = dict(handlers or {})
+        self.defaultHandler = defaultHandler
+        self.executor = executor
+
+    def __getstate__(self):
+        # The executor stays behind when handle() is sent to a process
+        state = self.__dict__.copy()
+        state['executor'] = None
+        return state
+
+    def register(self, bodyName, handler):
+        """Register the handler for a PKIBody alternative."""
+        if bodyName not in _bodyNameSet:
+            raise error.PyAsn1Error('Unknown PKIBody alternative %s' % bodyName)
+        self.handlers[bodyName] = handler
+
+    def handle(self, message):
+        """Return the result of the handler for one message."""
+        bodyName = bodyNames[message.bodyTag]
+        handler = self.handlers.get(bodyName)
+        if handler is not None:
+            return handler(message)
+        if bodyName == 'nested':
+            return [self.handle(inner) for inner in message.nestedMessages()]
+        if self.defaultHandler is not None:
+            return self.defaultHandler(message)
+        raise error.PyAsn1Error('No handler for %s messages' % bodyName)
+
+    def process(self, messages):
+        """Return the results for LazyPKIMessage views, in order.
+
+        The inner messages of a nested message without a handler are
+        handled as part of the same batch.
+        """
+        messages = list(messages)
+        work = []
+        layout = []
+        for message in messages:
+            if (message.bodyName == 'nested' and
+                    'nested' not in self.handlers):
+                inner = message.nestedMessages()
+                layout.append((len(work), len(inner), True))
+                work.extend(inner)
+            else:
+                layout.append((len(work), 1, False))
+                work.append(message)
+
+        if self.executor is None:
+            results = [self.handle(message) for message in work]
+        else:
+            results = list(self.executor.map(self.handle, work))
+
+        return [results[start:start + count] if nested else results[start]
+                for start, count, nested in layout]
+
+    def processMessages(self, substrate):
+        """Return the results for a DER encoded PKIMessages."""
+        return self.process(iterPKIMessages(substrate))
+
+    def processMessage(self, substrate):
+        """Return the result for one DER encoded PKIMessage."""
+        return self.process([LazyPKIMessage(substrate)])[0]
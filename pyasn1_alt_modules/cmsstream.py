@@ -0,0 +1,843 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# Streaming access to CMS SignedData (RFC 5652) for messages that are
+# too large to decode in one piece, such as S/MIME archives and RFC 4108
+# firmware packages.  The header fields are decoded as they are read,
+# the encapsulated content is handed to the caller as a sequence of
+# chunks, and the certificates, CRLs, and SignerInfos that follow the
+# content are decoded one at a time.  Both DER and BER (including the
+# indefinite length form and constructed OCTET STRINGs) are accepted.
+#
+# The writers go the other way for SignedData, EnvelopedData, and
+# AuthEnvelopedData (RFC 5083).  The content is written in pieces and
+# framed with BER indefinite length encodings as it arrives, or it is
+# spooled to a temporary file so that DER can be produced once all of
+# the lengths are known.  Digests, signatures, and encryption are all
+# supplied by the caller.
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+
+import io
+import tempfile
+
+from pyasn1 import error
+from pyasn1.codec.ber.decoder import decode as ber_decoder
+from pyasn1.codec.der.encoder import encode as der_encoder
+
+from pyasn1_alt_modules import rfc5083
+from pyasn1_alt_modules import rfc5652
+from pyasn1_alt_modules import tlv
+
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_SECTIONS = ('content', 'certificates', 'crls', 'signerInfos', 'done')
+
+
+class _Source(object):
+    """Buffered reader that keeps track of the absolute input position."""
+
+    def __init__(self, fileObj, chunkSize):
+        self._fileObj = fileObj
+        self._chunkSize = chunkSize
+        self._buffer = b''
+        self.position = 0
+
+    def _fill(self, count):
+        while len(self._buffer) < count:
+            data = self._fileObj.read(max(self._chunkSize, count - len(self._buffer)))
+            if not data:
+                raise error.SubstrateUnderrunError(
+                    'Unexpected end of CMS stream at offset %d' %
+                    (self.position + len(self._buffer)))
+            self._buffer += data
+
+    def peek(self, count):
+        try:
+            self._fill(count)
+        except error.SubstrateUnderrunError:
+            pass
+        return self._buffer[:count]
+
+    def read(self, count):
+        self._fill(count)
+        data = self._buffer[:count]
+        self._buffer = self._buffer[count:]
+        self.position += count
+        return data
+
+    def readSome(self, limit):
+        """Return between 1 and limit octets without extra buffering."""
+        if not self._buffer:
+            self._fill(1)
+        data = self._buffer[:limit]
+        self._buffer = self._buffer[len(data):]
+        self.position += len(data)
+        return data
+
+    def readHeader(self):
+        """Read a TLV header; return (tag, length, headerOctets)."""
+        header = self.read(2)
+        if header[0] & 0x1F == 0x1F:
+            while header[-1] & 0x80:
+                header += self.read(1)
+            header += self.read(1)
+        if header[-1] & 0x80 and header[-1] != 0x80:
+            header += self.read(header[-1] & 0x7F)
+        tag, valueOffset, length = tlv.readHeader(header)
+        return tag, length, header
+
+    def readTlv(self):
+        """Read one complete TLV, returning its octets."""
+        tag, length, header = self.readHeader()
+        if length is not None:
+            return header + self.read(length)
+
+        parts = [header]
+        while self.peek(2) != tlv.EOC:
+            parts.append(self.readTlv())
+        parts.append(self.read(2))
+        return b''.join(parts)
+
+    def skipTlv(self):
+        tag, length, header = self.readHeader()
+        if length is None:
+            while self.peek(2) != tlv.EOC:
+                self.skipTlv()
+            self.read(2)
+        else:
+            while length:
+                length -= len(self.readSome(min(length, self._chunkSize)))
+
+    def atEnd(self, end):
+        """Check for the end of an enclosing encoding.
+
+        The end is an absolute position for the definite length form and
+        None for the indefinite length form, in which case the
+        end-of-contents octets are consumed.
+        """
+        if end is not None:
+            if self.position > end:
+                raise error.PyAsn1Error(
+                    'Encoding runs past its enclosing TLV at offset %d' % end)
+            return self.position == end
+        if self.peek(2) == tlv.EOC:
+            self.read(2)
+            return True
+        return False
+
+    def endOf(self, length):
+        return None if length is None else self.position + length
+
+
+class ContentStream(io.RawIOBase):
+    """Readable file object over the chunks of the encapsulated content."""
+
+    def __init__(self, chunks):
+        io.RawIOBase.__init__(self)
+        self._chunks = chunks
+        self._pending = b''
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        if not self._pending:
+            self._pending = next(self._chunks, b'')
+        count = min(len(b), len(self._pending))
+        b[:count] = self._pending[:count]
+        self._pending = self._pending[count:]
+        return count
+
+
+class SignedDataReader(object):
+    """Read a CMS SignedData message incrementally from a file object.
+
+    The input may be a ContentInfo carrying SignedData or a bare
+    SignedData.  Construction reads and decodes everything up to the
+    start of the eContent: version, digestAlgorithms, and eContentType.
+    The content is then available from iterContent() or contentStream(),
+    and the certificates, crls, and signerInfos are available, in that
+    order, from iterCertificates(), iterCrls(), and iterSignerInfos().
+    Any part that the caller does not ask for is skipped, so memory use
+    is bounded by the chunk size and the size of the largest single
+    certificate, CRL, or SignerInfo.
+    """
+
+    def __init__(self, fileObj, chunkSize=DEFAULT_CHUNK_SIZE):
+        self._chunkSize = chunkSize
+        self._source = source = _Source(fileObj, chunkSize)
+        self._ends = []
+        self._busy = False
+        self._active = None
+
+        tag, length, header = source.readHeader()
+        if tag != tlv.SEQUENCE:
+            raise error.PyAsn1Error('CMS message must start with a SEQUENCE')
+
+        if source.peek(1) == bytes((tlv.OBJECT_IDENTIFIER,)):
+            self._ends.append(source.endOf(length))
+            self.contentType = self._decode(rfc5652.ContentType())
+            if self.contentType != rfc5652.id_signedData:
+                raise error.PyAsn1Error(
+                    'Content type %s is not SignedData' % self.contentType)
+            tag, length, header = source.readHeader()
+            if tag != tlv.contextTag(0):
+                raise error.PyAsn1Error('ContentInfo content is missing')
+            self._ends.append(source.endOf(length))
+            tag, length, header = source.readHeader()
+            if tag != tlv.SEQUENCE:
+                raise error.PyAsn1Error('SignedData must be a SEQUENCE')
+        else:
+            self.contentType = rfc5652.id_signedData
+
+        self._ends.append(source.endOf(length))
+        self.version = self._decode(rfc5652.CMSVersion())
+        self.digestAlgorithms = self._decode(rfc5652.DigestAlgorithmIdentifiers())
+
+        tag, length, header = source.readHeader()
+        if tag != tlv.SEQUENCE:
+            raise error.PyAsn1Error('EncapsulatedContentInfo must be a SEQUENCE')
+        self._ends.append(source.endOf(length))
+        self.eContentType = self._decode(rfc5652.ContentType())
+
+        if source.atEnd(self._ends[-1]):
+            self._ends.pop()
+            self.detached = True
+            self._state = 'certificates'
+        else:
+            self.detached = False
+            self._state = 'content'
+
+    def _decode(self, asn1Spec):
+        asn1Object, rest = ber_decoder(self._source.readTlv(), asn1Spec=asn1Spec)
+        return asn1Object
+
+    def _expectEnd(self, what):
+        if not self._source.atEnd(self._ends.pop()):
+            raise error.PyAsn1Error('Unexpected data after %s' % what)
+
+    def _advance(self, section):
+        """Skip everything before section; return False if it was passed."""
+        if self._busy:
+            for item in self._active:
+                pass
+        while self._state != section:
+            if _SECTIONS.index(self._state) > _SECTIONS.index(section):
+                return False
+            for item in self._read(self._state, skip=True):
+                pass
+        return True
+
+    def _start(self, section):
+        if not self._advance(section):
+            return iter(())
+        self._active = self._read(section)
+        self._busy = True
+        return self._active
+
+    def _read(self, section, skip=False):
+        self._busy = True
+        reader = getattr(self, '_read' + section[0].upper() + section[1:])
+        for item in reader(skip):
+            yield item
+        self._busy = False
+        self._state = _SECTIONS[_SECTIONS.index(section) + 1]
+
+    def _segments(self, length, skip):
+        source = self._source
+        end = source.endOf(length)
+        while not source.atEnd(end):
+            tag, segmentLength, header = source.readHeader()
+            if tag == tlv.CONSTRUCTED_OCTET_STRING:
+                for chunk in self._segments(segmentLength, skip):
+                    yield chunk
+            elif tag == tlv.OCTET_STRING:
+                while segmentLength:
+                    chunk = source.readSome(min(segmentLength, self._chunkSize))
+                    segmentLength -= len(chunk)
+                    if not skip:
+                        yield chunk
+            else:
+                raise error.PyAsn1Error(
+                    'Unexpected tag 0x%X inside constructed eContent' % tag)
+
+    def _readContent(self, skip):
+        source = self._source
+        tag, length, header = source.readHeader()
+        if tag != tlv.contextTag(0):
+            raise error.PyAsn1Error('Unexpected tag 0x%X for eContent' % tag)
+        self._ends.append(source.endOf(length))
+
+        tag, length, header = source.readHeader()
+        if tag == tlv.OCTET_STRING:
+            while length:
+                chunk = source.readSome(min(length, self._chunkSize))
+                length -= len(chunk)
+                if not skip:
+                    yield chunk
+        elif tag == tlv.CONSTRUCTED_OCTET_STRING:
+            for chunk in self._segments(length, skip):
+                yield chunk
+        else:
+            raise error.PyAsn1Error('eContent must be an OCTET STRING')
+
+        self._expectEnd('eContent')
+        self._expectEnd('EncapsulatedContentInfo')
+
+    def _readOptionalSet(self, tagId, asn1Spec, skip):
+        source = self._source
+        if source.peek(1) != bytes((tlv.contextTag(tagId),)):
+            return
+        tag, length, header = source.readHeader()
+        end = source.endOf(length)
+        while not source.atEnd(end):
+            if skip:
+                source.skipTlv()
+            else:
+                asn1Object, rest = ber_decoder(
+                    source.readTlv(), asn1Spec=asn1Spec.clone())
+                yield asn1Object
+
+    def _readCertificates(self, skip):
+        return self._readOptionalSet(0, rfc5652.CertificateChoices(), skip)
+
+    def _readCrls(self, skip):
+        return self._readOptionalSet(1, rfc5652.RevocationInfoChoice(), skip)
+
+    def _readSignerInfos(self, skip):
+        source = self._source
+        tag, length, header = source.readHeader()
+        if tag != tlv.SET:
+            raise error.PyAsn1Error('SignerInfos must be a SET')
+        end = source.endOf(length)
+        while not source.atEnd(end):
+            if skip:
+                source.skipTlv()
+            else:
+                asn1Object, rest = ber_decoder(
+                    source.readTlv(), asn1Spec=rfc5652.SignerInfo())
+                yield asn1Object
+        while self._ends:
+            self._expectEnd('SignedData')
+
+    def iterContent(self):
+        """Yield the eContent octets in chunks of at most chunkSize.
+
+        Nothing is yielded for a detached signature, or if the content
+        has already been consumed.
+        """
+        return self._start('content')
+
+    def contentStream(self):
+        """Return a readable file object over the eContent octets."""
+        return io.BufferedReader(
+            ContentStream(self.iterContent()), buffer_size=self._chunkSize)
+
+    def iterCertificates(self):
+        """Yield each CertificateChoices; the content is skipped if unread."""
+        return self._start('certificates')
+
+    def iterCrls(self):
+        """Yield each RevocationInfoChoice, skipping certificates if unread."""
+        return self._start('crls')
+
+    def iterSignerInfos(self):
+        """Yield each SignerInfo, skipping anything unread before them."""
+        return self._start('signerInfos')
+
+
+class _Payload(object):
+    """Placeholder for the streamed content inside a message template.
+
+    The content is written as a constructed string of segments with
+    berTag when streaming BER, and as a primitive string with derTag
+    when producing DER.
+    """
+
+    def __init__(self, berTag, derTag):
+        self.berTag = berTag
+        self.derTag = derTag
+
+
+def _hasPayload(node):
+    """Tell whether a template holds a _Payload outside of callables."""
+    if isinstance(node, _Payload):
+        return True
+    if isinstance(node, tuple):
+        return any(_hasPayload(member) for member in node[1])
+    return False
+
+
+class _StreamingWriter(object):
+    """Write a message template that has one streamed content field.
+
+    Subclasses provide _template(), a nested structure in which each
+    node is either encoded octets, a (tag, [children]) tuple, a
+    _Payload, or a callable returning one of those.  Callables are
+    only evaluated once the writer reaches them, so anything after the
+    payload can depend on the whole content, such as a signature.
+    """
+
+    def __init__(self, fileObj, der=False, chunkSize=DEFAULT_CHUNK_SIZE):
+        self._fileObj = fileObj
+        self._der = der
+        self._chunkSize = chunkSize
+        self._pending = bytearray()
+        self._payloadLength = 0
+        self._closed = False
+        self._berTag = None
+
+        self._walker = None
+        if der:
+            self._spool = tempfile.TemporaryFile()
+        else:
+            self._spool = None
+            template = self._template()
+            # Without a payload, as for detached content, everything is
+            # written by close(), once the callables can be evaluated.
+            if _hasPayload(template):
+                self._walker = self._writeBer(template)
+                next(self._walker, None)
+
+    def _template(self):
+        raise NotImplementedError()
+
+    def _writeBer(self, node):
+        if callable(node):
+            node = node()
+        if isinstance(node, _Payload):
+            self._berTag = node.berTag
+            self._fileObj.write(tlv.encodeHeader(node.berTag, None))
+            yield
+            self._fileObj.write(tlv.EOC)
+        elif isinstance(node, tuple):
+            tag, members = node
+            self._fileObj.write(tlv.encodeHeader(tag, None))
+            for member in members:
+                yield from self._writeBer(member)
+            self._fileObj.write(tlv.EOC)
+        elif node:
+            self._fileObj.write(node)
+
+    def _resolve(self, node):
+        """Evaluate callables; return (node, DER length)."""
+        if callable(node):
+            node = node()
+        if isinstance(node, _Payload):
+            return node, len(tlv.encodeHeader(
+                node.derTag, self._payloadLength)) + self._payloadLength
+        if isinstance(node, tuple):
+            tag, members = node
+            members = [self._resolve(member) for member in members]
+            length = sum(member[1] for member in members)
+            return (tag, members), len(tlv.encodeHeader(tag, length)) + length
+        return node or b'', len(node or b'')
+
+    def _writeDer(self, node, length):
+        write = self._fileObj.write
+        if isinstance(node, _Payload):
+            write(tlv.encodeHeader(node.derTag, self._payloadLength))
+            self._spool.seek(0)
+            for chunk in iter(lambda: self._spool.read(self._chunkSize), b''):
+                write(chunk)
+        elif isinstance(node, tuple):
+            tag, members = node
+            write(tlv.encodeHeader(
+                tag, sum(member[1] for member in members)))
+            for member, memberLength in members:
+                self._writeDer(member, memberLength)
+        else:
+            write(node)
+
+    def _writePayload(self, data, flush=False):
+        self._pending += data
+        if len(self._pending) < self._chunkSize and not flush:
+            return
+        while self._pending:
+            chunk = bytes(self._pending[:self._chunkSize])
+            del self._pending[:self._chunkSize]
+            if self._der:
+                self._spool.write(chunk)
+            else:
+                self._fileObj.write(tlv.encodeTlv(tlv.OCTET_STRING, chunk))
+            self._payloadLength += len(chunk)
+            if not flush and len(self._pending) < self._chunkSize:
+                break
+
+    def _finish(self):
+        if self._closed:
+            raise error.PyAsn1Error('The CMS writer is already closed')
+        self._closed = True
+        self._writePayload(b'', flush=True)
+        if self._der:
+            node, length = self._resolve(self._template())
+            self._writeDer(node, length)
+            self._spool.close()
+        else:
+            if self._walker is None:
+                self._walker = self._writeBer(self._template())
+            next(self._walker, None)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        elif self._spool is not None:
+            self._spool.close()
+
+
+def _encodeSet(encodings, tag=tlv.SET):
+    """Return a DER SET OF (or IMPLICIT tagged SET OF) from member encodings."""
+    return tlv.encodeTlv(tag, b''.join(sorted(encodings)))
+
+
+def _encodeAttributes(attributes, tag):
+    if not attributes:
+        return b''
+    return _encodeSet([der_encoder(attr) for attr in attributes], tag)
+
+
+def _buildAttribute(attrType, value):
+    attr = rfc5652.Attribute()
+    attr['attrType'] = attrType
+    attr['attrValues'].append(der_encoder(value))
+    return attr
+
+
+def _encodeChoices(items, tag, asn1Spec, alternative):
+    """Encode certificates or CRLs given as objects or DER octets."""
+    encodings = []
+    for item in items:
+        if isinstance(item, (bytes, bytearray)):
+            encodings.append(bytes(item))
+        elif isinstance(item, asn1Spec.__class__):
+            encodings.append(der_encoder(item))
+        else:
+            choice = asn1Spec.clone()
+            choice[alternative] = item
+            encodings.append(der_encoder(choice))
+    if not encodings:
+        return b''
+    return _encodeSet(encodings, tag)
+
+
+# The alternatives of CertificateChoices and RevocationInfoChoice by
+# the tag of their encoding.
+_CERTIFICATE_CHOICES = {
+    tlv.SEQUENCE: 'certificate',
+    tlv.contextTag(0): 'extendedCertificate',
+    tlv.contextTag(1): 'v1AttrCert',
+    tlv.contextTag(2): 'v2AttrCert',
+    tlv.contextTag(3): 'other',
+}
+
+_REVOCATION_CHOICES = {
+    tlv.SEQUENCE: 'crl',
+    tlv.contextTag(1): 'other',
+}
+
+
+def _choiceNames(items, asn1Spec, alternative, choices):
+    """Return the set of the alternatives used by certificates or CRLs
+    given as objects or DER octets, as _encodeChoices encodes them."""
+    names = set()
+    for item in items:
+        if isinstance(item, (bytes, bytearray)):
+            names.add(choices.get(item[0]))
+        elif isinstance(item, asn1Spec.__class__):
+            names.add(item.getName())
+        else:
+            names.add(alternative)
+    return names
+
+
+class Signer(object):
+    """One signer for SignedDataWriter.
+
+    The digestFactory is a callable returning a hashlib style object,
+    such as hashlib.sha256.  The signCallback is called with the octets
+    to be signed, which is the DER encoding of the signed attributes
+    (with the SET OF tag, as described in RFC 5652 Section 5.4).  If
+    signedAttrs is False, the signCallback is instead called with the
+    message digest of the content, so it must sign a precomputed hash.
+    Additional signed and unsigned attributes can be provided as lists
+    of rfc5652.Attribute.
+    """
+
+    def __init__(self, sid, digestAlgorithm, signatureAlgorithm,
+                 digestFactory, signCallback, signedAttrs=True,
+                 extraSignedAttrs=(), unsignedAttrs=()):
+        self.sid = sid
+        self.digestAlgorithm = digestAlgorithm
+        self.signatureAlgorithm = signatureAlgorithm
+        self.digestFactory = digestFactory
+        self.signCallback = signCallback
+        self.signedAttrs = signedAttrs
+        self.extraSignedAttrs = list(extraSignedAttrs)
+        self.unsignedAttrs = list(unsignedAttrs)
+
+    def signerInfo(self, eContentType, digest):
+        """Build the rfc5652.SignerInfo for the given content digest."""
+        signerInfo = rfc5652.SignerInfo()
+        if self.sid.getName() == 'subjectKeyIdentifier':
+            signerInfo['version'] = 3
+        else:
+            signerInfo['version'] = 1
+        signerInfo['sid'] = self.sid
+        signerInfo['digestAlgorithm'] = self.digestAlgorithm
+
+        if self.signedAttrs:
+            signedAttrs = signerInfo['signedAttrs']
+            signedAttrs.append(_buildAttribute(
+                rfc5652.id_contentType, rfc5652.ContentType(eContentType)))
+            signedAttrs.append(_buildAttribute(
+                rfc5652.id_messageDigest, rfc5652.MessageDigest(digest)))
+            signedAttrs.extend(self.extraSignedAttrs)
+            toBeSigned = der_encoder(signedAttrs)
+            toBeSigned = bytes((tlv.SET,)) + toBeSigned[1:]
+        else:
+            toBeSigned = digest
+
+        signerInfo['signatureAlgorithm'] = self.signatureAlgorithm
+        signerInfo['signature'] = self.signCallback(toBeSigned)
+        if self.unsignedAttrs:
+            signerInfo['unsignedAttrs'].extend(self.unsignedAttrs)
+        return signerInfo
+
+
+class SignedDataWriter(_StreamingWriter):
+    """Write a CMS SignedData with a streamed eContent.
+
+    Call write() with the content in pieces of any size and then
+    close(); the digests are computed as the content passes through,
+    and the SignerInfos are built by the signers once it is complete.
+    With detached=True, the content is digested but not written.  The
+    certificates and crls can be given as pyasn1 objects or as DER.
+    By default the output is BER with indefinite lengths; der=True
+    spools the content to a temporary file and writes DER on close().
+    The ContentInfo wrapper is left out if contentInfo is False.
+    """
+
+    def __init__(self, fileObj, signers, eContentType=rfc5652.id_data,
+                 certificates=(), crls=(), detached=False, contentInfo=True,
+                 der=False, chunkSize=DEFAULT_CHUNK_SIZE):
+        self.signers = list(signers)
+        self.eContentType = eContentType
+        self.certificates = list(certificates)
+        self.crls = list(crls)
+        self.detached = detached
+        self.contentInfo = contentInfo
+        self._digests = [signer.digestFactory() for signer in self.signers]
+        _StreamingWriter.__init__(self, fileObj, der=der, chunkSize=chunkSize)
+
+    def _version(self):
+        # RFC 5652 Section 5.1
+        certificates = _choiceNames(
+            self.certificates, rfc5652.CertificateChoices(), 'certificate',
+            _CERTIFICATE_CHOICES)
+        crls = _choiceNames(
+            self.crls, rfc5652.RevocationInfoChoice(), 'crl',
+            _REVOCATION_CHOICES)
+        if 'other' in certificates or 'other' in crls:
+            return 5
+        if 'v2AttrCert' in certificates:
+            return 4
+        if ('v1AttrCert' in certificates or
+                self.eContentType != rfc5652.id_data or
+                [signer for signer in self.signers
+                 if signer.sid.getName() == 'subjectKeyIdentifier']):
+            return 3
+        return 1
+
+    def _template(self):
+        version = self._version()
+
+        digestAlgorithms = rfc5652.DigestAlgorithmIdentifiers()
+        for signer in self.signers:
+            if signer.digestAlgorithm not in digestAlgorithms:
+                digestAlgorithms.append(signer.digestAlgorithm)
+
+        encapContentInfo = [der_encoder(rfc5652.ContentType(self.eContentType))]
+        if not self.detached:
+            encapContentInfo.append((tlv.contextTag(0), [
+                _Payload(tlv.CONSTRUCTED_OCTET_STRING, tlv.OCTET_STRING)]))
+
+        signedData = (tlv.SEQUENCE, [
+            der_encoder(rfc5652.CMSVersion(version)),
+            der_encoder(digestAlgorithms),
+            (tlv.SEQUENCE, encapContentInfo),
+            lambda: _encodeChoices(
+                self.certificates, tlv.contextTag(0),
+                rfc5652.CertificateChoices(), 'certificate'),
+            lambda: _encodeChoices(
+                self.crls, tlv.contextTag(1),
+                rfc5652.RevocationInfoChoice(), 'crl'),
+            self._signerInfos,
+        ])
+
+        if not self.contentInfo:
+            return signedData
+
+        return (tlv.SEQUENCE, [
+            der_encoder(rfc5652.id_signedData),
+            (tlv.contextTag(0), [signedData]),
+        ])
+
+    def _signerInfos(self):
+        return _encodeSet([
+            der_encoder(signer.signerInfo(self.eContentType, digest.digest()))
+            for signer, digest in zip(self.signers, self._digests)])
+
+    def write(self, data):
+        """Add the next piece of the content."""
+        for digest in self._digests:
+            digest.update(data)
+        if not self.detached:
+            self._writePayload(data)
+
+    def close(self):
+        """Finish the content and write everything that follows it."""
+        self._finish()
+
+
+class _EncryptingWriter(_StreamingWriter):
+    """Common parts of the EnvelopedData and AuthEnvelopedData writers.
+
+    The encryptor has update(data) and finalize() methods returning
+    ciphertext, like a cipher context from the cryptography package.
+    """
+
+    def __init__(self, fileObj, recipientInfos, contentEncryptionAlgorithm,
+                 encryptor, contentType, originatorInfo, der, chunkSize):
+        self.recipientInfos = list(recipientInfos)
+        self.contentEncryptionAlgorithm = contentEncryptionAlgorithm
+        self.encryptor = encryptor
+        self.contentType = contentType
+        self.originatorInfo = originatorInfo
+        _StreamingWriter.__init__(self, fileObj, der=der, chunkSize=chunkSize)
+
+    def _encryptedContentInfo(self):
+        return (tlv.SEQUENCE, [
+            der_encoder(rfc5652.ContentType(self.contentType)),
+            der_encoder(self.contentEncryptionAlgorithm),
+            _Payload(tlv.contextTag(0), tlv.contextTag(0, False)),
+        ])
+
+    def _header(self, version):
+        header = [der_encoder(rfc5652.CMSVersion(version))]
+        if self.originatorInfo is not None:
+            originatorInfo = der_encoder(self.originatorInfo)
+            header.append(
+                bytes((tlv.contextTag(0),)) + originatorInfo[1:])
+        header.append(_encodeSet(
+            [der_encoder(ri) for ri in self.recipientInfos]))
+        return header
+
+    def write(self, data):
+        """Encrypt and add the next piece of the content."""
+        self._writePayload(self.encryptor.update(data))
+
+    def close(self):
+        """Finish the encryption and write everything that follows it."""
+        self._writePayload(self.encryptor.finalize())
+        self._finish()
+
+
+class EnvelopedDataWriter(_EncryptingWriter):
+    """Write a CMS EnvelopedData with streamed encrypted content.
+
+    The caller builds the RecipientInfos for the content-encryption key
+    and supplies the encryptor for the content.  The version is chosen
+    following RFC 5652 Section 6.1.
+    """
+
+    def __init__(self, fileObj, recipientInfos, contentEncryptionAlgorithm,
+                 encryptor, contentType=rfc5652.id_data, originatorInfo=None,
+                 unprotectedAttrs=(), contentInfo=True, der=False,
+                 chunkSize=DEFAULT_CHUNK_SIZE):
+        self.unprotectedAttrs = list(unprotectedAttrs)
+        self.contentInfo = contentInfo
+        _EncryptingWriter.__init__(
+            self, fileObj, recipientInfos, contentEncryptionAlgorithm,
+            encryptor, contentType, originatorInfo, der, chunkSize)
+
+    def _version(self):
+        # RFC 5652 Section 6.1
+        names = [ri.getName() for ri in self.recipientInfos]
+        certificates = crls = ()
+        if self.originatorInfo is not None:
+            certificates = [choice.getName()
+                            for choice in self.originatorInfo['certs']]
+            crls = [choice.getName()
+                    for choice in self.originatorInfo['crls']]
+        if 'other' in certificates or 'other' in crls:
+            return 4
+        if 'v2AttrCert' in certificates or 'pwri' in names or \
+                'ori' in names:
+            return 3
+        if (self.originatorInfo is not None or self.unprotectedAttrs or
+                [name for name in names if name != 'ktri'] or
+                [ri for ri in self.recipientInfos
+                 if ri.getName() == 'ktri' and ri['ktri']['version'] != 0]):
+            return 2
+        return 0
+
+    def _template(self):
+        envelopedData = (tlv.SEQUENCE, self._header(self._version()) + [
+            self._encryptedContentInfo(),
+            lambda: _encodeAttributes(
+                self.unprotectedAttrs, tlv.contextTag(1)),
+        ])
+
+        if not self.contentInfo:
+            return envelopedData
+
+        return (tlv.SEQUENCE, [
+            der_encoder(rfc5652.id_envelopedData),
+            (tlv.contextTag(0), [envelopedData]),
+        ])
+
+
+class AuthEnvelopedDataWriter(_EncryptingWriter):
+    """Write a CMS AuthEnvelopedData (RFC 5083) with streamed content.
+
+    The macCallback is called after the encryptor is finalized and
+    returns the message authentication code, for example the tag of an
+    AES-GCM encryptor.  Any authAttrs must already have been fed to the
+    encryptor as associated data by the caller.
+    """
+
+    def __init__(self, fileObj, recipientInfos, contentEncryptionAlgorithm,
+                 encryptor, macCallback, contentType=rfc5652.id_data,
+                 originatorInfo=None, authAttrs=(), unauthAttrs=(),
+                 contentInfo=True, der=False, chunkSize=DEFAULT_CHUNK_SIZE):
+        self.macCallback = macCallback
+        self.authAttrs = list(authAttrs)
+        self.unauthAttrs = list(unauthAttrs)
+        self.contentInfo = contentInfo
+        _EncryptingWriter.__init__(
+            self, fileObj, recipientInfos, contentEncryptionAlgorithm,
+            encryptor, contentType, originatorInfo, der, chunkSize)
+
+    def _template(self):
+        authEnvelopedData = (tlv.SEQUENCE, self._header(0) + [
+            self._encryptedContentInfo(),
+            lambda: _encodeAttributes(self.authAttrs, tlv.contextTag(1)),
+            lambda: der_encoder(
+                rfc5652.MessageAuthenticationCode(self.macCallback())),
+            lambda: _encodeAttributes(self.unauthAttrs, tlv.contextTag(2)),
+        ])
+
+        if not self.contentInfo:
+            return authEnvelopedData
+
+        return (tlv.SEQUENCE, [
+            der_encoder(rfc5083.id_ct_authEnvelopedData),
+            (tlv.contextTag(0), [authEnvelopedData]),
+        ])
@@ -0,0 +1,490 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# Compact read-only views of DER encoded values.  For each SEQUENCE,
+# SET, and CHOICE type, a class with __slots__ is generated from its
+# componentType, and values are read straight from the DER into
+# instances of that class: primitive components become int, bool, str,
+# or bytes, SEQUENCE OF and SET OF become tuples, and large OCTET STRING
+# and BIT STRING values are memoryview slices of the original buffer.
+# A view costs a few hundred bytes where the decoded pyasn1 object costs
+# tens of kilobytes, and toAsn1() decodes the DER that the view was read
+# from to give back the full pyasn1 object.
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+
+import re
+
+from pyasn1 import error
+from pyasn1.codec.der.decoder import decode as der_decoder
+from pyasn1.codec.der.encoder import encode as der_encoder
+from pyasn1.type import char
+from pyasn1.type import univ
+from pyasn1.type import useful
+
+from pyasn1_alt_modules import tlv
+
+
+class CompactView(object):
+    """Base class of the generated view classes.
+
+    A view keeps the buffer that it was read from and the position of
+    its own TLV in that buffer.  Components are attributes, or can be
+    looked up by their ASN.1 name with view[name].  An absent DEFAULT
+    component has its default value and an absent OPTIONAL one is None.
+    Views are read-only.
+    """
+
+    __slots__ = ('_buffer', '_start', '_end')
+
+    _schema = None
+    _names = ()
+    _slotNames = {}
+
+    def __setattr__(self, name, value):
+        raise AttributeError('%s is read-only' % self.__class__.__name__)
+
+    def __delattr__(self, name):
+        raise AttributeError('%s is read-only' % self.__class__.__name__)
+
+    def __getitem__(self, name):
+        try:
+            return getattr(self, self._slotNames[name])
+        except KeyError:
+            raise KeyError(name)
+
+    def __contains__(self, name):
+        return name in self._slotNames
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def items(self):
+        """Return (name, value) pairs for the components in schema order."""
+        return [(name, self[name]) for name in self._names]
+
+    def __repr__(self):
+        return '<%s of %d octets>' % (self.__class__.__name__,
+                                      self._end - self._start)
+
+    @property
+    def encoded(self):
+        """The DER encoding of the value, with the tags of its type."""
+        buffer = self._buffer
+        tag, valueOffset, valueEnd, tlvEnd = tlv.readTlv(buffer, self._start)
+        return _retag(self._schema, buffer, self._start, valueOffset,
+                      valueEnd, tlvEnd)
+
+    def toAsn1(self):
+        """Return the full pyasn1 object for the value.
+
+        The DER the view was read from is decoded again, so nothing is
+        lost; the object carries the tags of the view's type rather than
+        any that were applied to the component it was read from.
+        """
+        asn1Object, rest = der_decoder(self.encoded, asn1Spec=self._schema)
+        return asn1Object
+
+
+class CompactChoice(CompactView):
+    """Base class of the generated CHOICE view classes.
+
+    The name is that of the chosen alternative and the value is its
+    compact value.
+    """
+
+    __slots__ = ('name', 'value')
+
+    def __getitem__(self, name):
+        if name != self.name:
+            raise KeyError(name)
+        return self.value
+
+    def __contains__(self, name):
+        return name == self.name
+
+    def __iter__(self):
+        return iter((self.name,))
+
+    def items(self):
+        return [(self.name, self.value)]
+
+    def __repr__(self):
+        return '<%s %s>' % (self.__class__.__name__, self.name)
+
+
+def _wireTag(asn1Tag):
+    """Return the tlv tag number for a pyasn1 Tag."""
+    first = asn1Tag.tagClass | asn1Tag.tagFormat
+    tagId = asn1Tag.tagId
+    if tagId < 31:
+        return first | tagId
+
+    octets = [tagId & 0x7F]
+    tagId >>= 7
+    while tagId:
+        octets.append(0x80 | (tagId & 0x7F))
+        tagId >>= 7
+    tag = first | 0x1F
+    for octet in reversed(octets):
+        tag = (tag << 8) | octet
+    return tag
+
+
+def _encodeTag(tag):
+    octets = []
+    while tag:
+        octets.append(tag & 0xFF)
+        tag >>= 8
+    return bytes(reversed(octets))
+
+
+def _untagged(asn1Object):
+    return isinstance(asn1Object, (univ.Choice, univ.Any))
+
+
+def _retag(schema, buffer, start, valueOffset, valueEnd, tlvEnd):
+    """Return the DER of a value with the tags of schema, reusing the
+    original encoding when the tags are the same."""
+    superTags = schema.tagSet.superTags
+    if _untagged(schema):
+        encoded = bytes(buffer[start:tlvEnd])
+        wrappers = superTags
+    else:
+        innerTag = _encodeTag(_wireTag(superTags[0]))
+        if len(superTags) == 1 and \
+                buffer[start:start + len(innerTag)] == innerTag:
+            return bytes(buffer[start:tlvEnd])
+        encoded = tlv.encodeTlv(_wireTag(superTags[0]),
+                                bytes(buffer[valueOffset:valueEnd]))
+        wrappers = superTags[1:]
+    for asn1Tag in wrappers:
+        encoded = tlv.encodeTlv(_wireTag(asn1Tag), encoded)
+    return encoded
+
+
+_oids = {}
+
+
+def _oid(octets):
+    """Return the dotted string for the contents of an OID, sharing the
+    strings of the OIDs seen most."""
+    try:
+        return _oids[octets]
+    except KeyError:
+        pass
+
+    arcs = []
+    value = 0
+    for octet in octets:
+        value = (value << 7) | (octet & 0x7F)
+        if not octet & 0x80:
+            arcs.append(value)
+            value = 0
+    if not arcs:
+        raise error.PyAsn1Error('Empty OBJECT IDENTIFIER')
+    first = min(arcs[0] // 40, 2)
+    arcs[0:1] = [first, arcs[0] - first * 40]
+    oid = '.'.join(map(str, arcs))
+    if len(_oids) < 1024:
+        _oids[octets] = oid
+    return oid
+
+
+class CompactDecoder(object):
+    """Read DER encodings into compact views.
+
+    OCTET STRING, BIT STRING, and open type values longer than
+    largeValue octets are given as memoryview slices of the buffer the
+    value was read from, and shorter ones are copied into bytes.  BIT
+    STRING values are the octets after the unused-bits count.  Types
+    without a more compact form (REAL, for example) are decoded with
+    pyasn1.
+
+    The view classes and the plans for reading each type are kept for
+    as long as the decoder exists.
+    """
+
+    def __init__(self, largeValue=256):
+        self.largeValue = largeValue
+        self._plans = {}
+
+    def decode(self, substrate, asn1Spec):
+        """Return the compact view of one DER encoded value.
+
+        The substrate is copied into bytes unless it is bytes already;
+        the views share it.  A decoded pyasn1 object is encoded first.
+        """
+        if not isinstance(substrate, (bytes, bytearray, memoryview)):
+            substrate = der_encoder(substrate)
+        buffer = bytes(substrate)
+        if not buffer:
+            raise error.SubstrateUnderrunError('Empty substrate')
+        tag, valueOffset, valueEnd, tlvEnd = tlv.readTlv(buffer, 0)
+        if tlvEnd != len(buffer):
+            raise error.PyAsn1Error(
+                '%d octets left over after the value' % (len(buffer) - tlvEnd))
+        tags, read = self._field(asn1Spec)
+        if tags is not None and tag not in tags:
+            raise error.PyAsn1Error(
+                'Tag 0x%X does not match %s' % (tag, asn1Spec.__class__.__name__))
+        return read(buffer, (0, tag, valueOffset, valueEnd, tlvEnd))
+
+    def viewClass(self, asn1Spec):
+        """Return the view class for a SEQUENCE, SET, or CHOICE type."""
+        if not isinstance(asn1Spec, (univ.Sequence, univ.Set, univ.Choice)):
+            raise error.PyAsn1Error(
+                '%s has no view class' % asn1Spec.__class__.__name__)
+        return self._plan(asn1Spec).viewClass
+
+    # Plans are cached by type and by the identity of the componentType,
+    # as in native.Converter, and keep the schema object alive so that
+    # the identity is not reused.
+
+    def _plan(self, asn1Object):
+        componentType = getattr(asn1Object, 'componentType', None)
+        key = (asn1Object.__class__, id(componentType))
+        try:
+            return self._plans[key][0]
+        except KeyError:
+            pass
+
+        plan = self._buildPlan(asn1Object)
+        self._plans[key] = (plan, componentType)
+        return plan
+
+    def _wireTags(self, asn1Object):
+        """Return the set of outer tags that a component may have on the
+        wire, or None when it may have any tag."""
+        superTags = asn1Object.tagSet.superTags
+        if superTags:
+            return frozenset((_wireTag(superTags[-1]),))
+        if isinstance(asn1Object, univ.Choice):
+            tags = set()
+            for namedType in asn1Object.componentType.namedTypes:
+                alternativeTags = self._wireTags(namedType.asn1Object)
+                if alternativeTags is None:
+                    return None
+                tags.update(alternativeTags)
+            return frozenset(tags)
+        return None
+
+    def _field(self, asn1Object):
+        """Return the tags of a component and the function reading it,
+        which steps inside any explicit tags first."""
+        tags = self._wireTags(asn1Object)
+        explicit = len(asn1Object.tagSet.superTags)
+        if not _untagged(asn1Object):
+            explicit -= 1
+        plan = [None]
+        getPlan = self._plan
+
+        def read(buffer, item):
+            for count in range(explicit):
+                offset = item[2]
+                tag, valueOffset, valueEnd, tlvEnd = tlv.readTlv(buffer, offset)
+                item = (offset, tag, valueOffset, valueEnd, tlvEnd)
+            if plan[0] is None:
+                plan[0] = getPlan(asn1Object)
+            return plan[0](buffer, item)
+
+        return tags, read
+
+    def _buildPlan(self, asn1Object):
+        # Choice is a subclass of Set in pyasn1, so it goes first.
+        if isinstance(asn1Object, univ.Choice):
+            return self._choicePlan(asn1Object)
+        if isinstance(asn1Object, (univ.Sequence, univ.Set)):
+            return self._recordPlan(asn1Object)
+        if isinstance(asn1Object, (univ.SequenceOf, univ.SetOf)):
+            return self._listPlan(asn1Object.componentType)
+        if isinstance(asn1Object, univ.Boolean):
+            return lambda buffer, item: buffer[item[2]] != 0
+        if isinstance(asn1Object, (univ.Integer, univ.Enumerated)):
+            return lambda buffer, item: int.from_bytes(
+                buffer[item[2]:item[3]], 'big', signed=True)
+        if isinstance(asn1Object, univ.ObjectIdentifier):
+            return lambda buffer, item: _oid(buffer[item[2]:item[3]])
+        if isinstance(asn1Object, univ.Null):
+            return lambda buffer, item: None
+        if isinstance(asn1Object, univ.BitString):
+            return self._octetsPlan(1)
+        if isinstance(asn1Object, (char.AbstractCharacterString,
+                                   useful.ObjectDescriptor)):
+            return self._stringPlan(asn1Object.encoding)
+        if isinstance(asn1Object, univ.Any):
+            return self._octetsPlan(0, whole=True)
+        if isinstance(asn1Object, univ.OctetString):
+            return self._octetsPlan(0)
+
+        def convert(buffer, item):
+            offset, tag, valueOffset, valueEnd, tlvEnd = item
+            value, rest = der_decoder(
+                _retag(asn1Object, buffer, offset, valueOffset, valueEnd,
+                       tlvEnd), asn1Spec=asn1Object)
+            return value
+
+        return convert
+
+    def _octetsPlan(self, skip, whole=False):
+        largeValue = self.largeValue
+
+        def convert(buffer, item):
+            if whole:
+                start, end = item[0], item[4]
+            else:
+                start, end = item[2] + skip, item[3]
+            if end - start > largeValue:
+                return memoryview(buffer)[start:end]
+            return buffer[start:end]
+
+        return convert
+
+    def _stringPlan(self, encoding):
+        def convert(buffer, item):
+            octets = buffer[item[2]:item[3]]
+            try:
+                return octets.decode(encoding)
+            except UnicodeDecodeError:
+                return octets.decode('iso-8859-1')
+
+        return convert
+
+    def _listPlan(self, componentType):
+        tags, read = self._field(componentType)
+
+        def convert(buffer, item):
+            return tuple([read(buffer, member) for member in
+                          tlv.iterTlvs(buffer, item[2], item[3])])
+
+        return convert
+
+    def _viewClass(self, asn1Object, base, names):
+        slotNames = {}
+        for name in names:
+            slot = re.sub(r'\W', '_', name)
+            while slot in slotNames.values() or hasattr(base, slot):
+                slot += '_'
+            slotNames[name] = slot
+        # A fresh instance of the type gives the schema without any
+        # tags that were applied to the component.
+        try:
+            schema = asn1Object.__class__(
+                componentType=asn1Object.componentType)
+        except error.PyAsn1Error:
+            schema = asn1Object
+        attributes = {
+            '__slots__': () if base is CompactChoice else tuple(
+                slotNames.values()),
+            '__module__': __name__,
+            '_schema': schema,
+            '_names': tuple(names),
+            '_slotNames': slotNames,
+        }
+        return type('Compact' + asn1Object.__class__.__name__, (base,),
+                    attributes)
+
+    def _recordPlan(self, asn1Object):
+        namedTypes = asn1Object.componentType.namedTypes
+        names = [namedType.name for namedType in namedTypes]
+        cls = self._viewClass(asn1Object, CompactView, names)
+
+        setStart = CompactView._start.__set__
+        setEnd = CompactView._end.__set__
+        setBuffer = CompactView._buffer.__set__
+        setters = [getattr(cls, cls._slotNames[name]).__set__
+                   for name in names]
+        fields = []
+        defaults = []
+        for namedType in namedTypes:
+            tags, read = self._field(namedType.asn1Object)
+            fields.append((tags, read,
+                           namedType.isOptional or namedType.isDefaulted))
+            defaults.append(None)
+            if namedType.isDefaulted:
+                defaults[-1] = self.decode(
+                    der_encoder(namedType.asn1Object), namedType.asn1Object)
+        count = len(fields)
+        ordered = not isinstance(asn1Object, univ.Set)
+
+        def convert(buffer, item):
+            view = object.__new__(cls)
+            setBuffer(view, buffer)
+            setStart(view, item[0])
+            setEnd(view, item[4])
+            values = defaults[:]
+            position = 0
+            for member in tlv.iterTlvs(buffer, item[2], item[3]):
+                tag = member[1]
+                index = position if ordered else 0
+                while index < count:
+                    tags, read, optional = fields[index]
+                    if tags is None or tag in tags:
+                        break
+                    if ordered and not optional:
+                        raise error.PyAsn1Error(
+                            'Tag 0x%X where %s of %s was expected' %
+                            (tag, names[index], cls.__name__))
+                    index += 1
+                else:
+                    # An extension that this schema does not know about.
+                    continue
+                values[index] = read(buffer, member)
+                position = index + 1
+            for setter, value in zip(setters, values):
+                setter(view, value)
+            return view
+
+        convert.viewClass = cls
+        return convert
+
+    def _choicePlan(self, asn1Object):
+        namedTypes = asn1Object.componentType.namedTypes
+        names = [namedType.name for namedType in namedTypes]
+        cls = self._viewClass(asn1Object, CompactChoice, names)
+
+        setStart = CompactView._start.__set__
+        setEnd = CompactView._end.__set__
+        setBuffer = CompactView._buffer.__set__
+        setName = CompactChoice.name.__set__
+        setValue = CompactChoice.value.__set__
+        alternatives = []
+        for namedType in namedTypes:
+            tags, read = self._field(namedType.asn1Object)
+            alternatives.append((namedType.name, tags, read))
+
+        def convert(buffer, item):
+            tag = item[1]
+            for name, tags, read in alternatives:
+                if tags is None or tag in tags:
+                    break
+            else:
+                raise error.PyAsn1Error(
+                    'Tag 0x%X matches no alternative of %s' %
+                    (tag, cls.__name__))
+            view = object.__new__(cls)
+            setBuffer(view, buffer)
+            setStart(view, item[0])
+            setEnd(view, item[4])
+            setName(view, name)
+            setValue(view, read(buffer, item))
+            return view
+
+        convert.viewClass = cls
+        return convert
+
+
+_defaultDecoder = CompactDecoder()
+
+
+def decode(substrate, asn1Spec):
+    """Return the compact view of a DER encoded value, using a shared
+    decoder so that the view classes are generated once."""
+    return _defaultDecoder.decode(substrate, asn1Spec)
+
+
+def viewClass(asn1Spec):
+    """Return the view class that decode() uses for a type."""
+    return _defaultDecoder.viewClass(asn1Spec)
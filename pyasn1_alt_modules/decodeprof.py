@@ -0,0 +1,234 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# A profiler for DER decoding that tells which types of a schema the
+# time goes to.  A DecodeProfiler decodes with a copy of the pyasn1 DER
+# decoder whose payload decoders are wrapped, and records for every
+# class that is decoded, such as rfc5280.AttributeTypeAndValue, the
+# number of values, the time with and without the values within them,
+# the octets of contents, and, when asked for, the memory allocated as
+# seen by tracemalloc.  The times can be written out as folded stacks
+# for flame graph tools.  Decoding with pyasn1 itself is not changed,
+# so there is no cost unless a profiler is used.
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+
+import time
+import tracemalloc
+
+from pyasn1.codec.der import decoder
+from pyasn1.type import base
+
+
+_PREFIX = 'pyasn1_alt_modules.'
+
+
+def _typeName(asn1Spec, payloadDecoder):
+    """Return a name such as 'rfc5280.Certificate' or 'univ.Integer'."""
+    if not isinstance(asn1Spec, base.Asn1Item):
+        asn1Spec = payloadDecoder.protoComponent
+        if asn1Spec is None:
+            # Without a schema a SEQUENCE may yet be a SEQUENCE OF.
+            name = payloadDecoder.__class__.__name__
+            return 'univ.' + name.replace('PayloadDecoder', '')
+    cls = asn1Spec.__class__
+    module = cls.__module__
+    if module.startswith(_PREFIX):
+        module = module[len(_PREFIX):]
+    else:
+        module = module.rsplit('.', 1)[-1]
+    return module + '.' + cls.__name__
+
+
+class _ProfilingPayloadDecoder(object):
+    """Wrap a pyasn1 payload decoder to tell the profiler when a value
+    starts and ends."""
+
+    def __init__(self, payloadDecoder):
+        self._payloadDecoder = payloadDecoder
+
+    def __getattr__(self, name):
+        return getattr(self._payloadDecoder, name)
+
+    def valueDecoder(self, substrate, asn1Spec,
+                     tagSet=None, length=None, state=None,
+                     decodeFun=None, substrateFun=None,
+                     **options):
+        payloadDecoder = self._payloadDecoder
+        profiler = options.get('_profiler')
+        if profiler is None:
+            for value in payloadDecoder.valueDecoder(
+                    substrate, asn1Spec, tagSet, length, state,
+                    decodeFun, substrateFun, **options):
+                yield value
+            return
+
+        profiler._enter(_typeName(asn1Spec, payloadDecoder))
+        try:
+            for value in payloadDecoder.valueDecoder(
+                    substrate, asn1Spec, tagSet, length, state,
+                    decodeFun, substrateFun, **options):
+                yield value
+        finally:
+            profiler._exit(length)
+
+
+def _wrap(payloadDecoders):
+    wrapped = {}
+    return dict(
+        (key, wrapped.setdefault(id(payloadDecoder),
+                                 _ProfilingPayloadDecoder(payloadDecoder)))
+        for key, payloadDecoder in payloadDecoders.items())
+
+
+TAG_MAP = _wrap(decoder.TAG_MAP)
+
+TYPE_MAP = _wrap(decoder.TYPE_MAP)
+
+
+class SingleItemDecoder(decoder.SingleItemDecoder):
+    __doc__ = decoder.SingleItemDecoder.__doc__
+
+    TAG_MAP = TAG_MAP
+    TYPE_MAP = TYPE_MAP
+
+
+class StreamingDecoder(decoder.StreamingDecoder):
+    __doc__ = decoder.StreamingDecoder.__doc__
+
+    SINGLE_ITEM_DECODER = SingleItemDecoder
+
+
+class Decoder(decoder.Decoder):
+    __doc__ = decoder.Decoder.__doc__
+
+    STREAMING_DECODER = StreamingDecoder
+
+
+_decode = Decoder()
+
+
+class TypeStats(object):
+    """What was recorded for one class.
+
+    The calls are the number of values decoded.  The time includes the
+    values within them, and selfTime does not; both are in seconds.  A
+    value within a value of the same class is counted once in the time.
+    The octets are those of the contents, and allocated is the memory
+    still allocated when the values were done, as traced by
+    tracemalloc, or 0 when the allocations are not traced.
+    """
+
+    __slots__ = ('name', 'calls', 'time', 'selfTime', 'octets', 'allocated')
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.time = 0.0
+        self.selfTime = 0.0
+        self.octets = 0
+        self.allocated = 0
+
+    def __repr__(self):
+        return '%s(%s, calls=%d, time=%.6f, selfTime=%.6f)' % (
+            self.__class__.__name__, self.name, self.calls, self.time,
+            self.selfTime)
+
+
+class DecodeProfiler(object):
+    """Record where the time of DER decoding goes.
+
+    Decodes done with the decode method are recorded, and add up until
+    clear is called.  With traceAllocations, tracemalloc is started for
+    each decode, unless it is already tracing, which slows the decoding
+    down a lot.
+    """
+
+    def __init__(self, traceAllocations=False):
+        self.traceAllocations = traceAllocations
+        self._stats = {}
+        self._folded = {}
+        self._stack = []
+        self._active = {}
+
+    def decode(self, substrate, asn1Spec=None, **options):
+        """Decode DER like pyasn1.codec.der.decoder.decode, recording
+        the types decoded.  Returns (asn1Object, rest)."""
+        options['_profiler'] = self
+        started = self.traceAllocations and not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        try:
+            return _decode(substrate, asn1Spec, **options)
+        finally:
+            del self._stack[:]
+            self._active.clear()
+            if started:
+                tracemalloc.stop()
+
+    def _enter(self, name):
+        memory = 0
+        if self.traceAllocations and tracemalloc.is_tracing():
+            memory = tracemalloc.get_traced_memory()[0]
+        path = name
+        if self._stack:
+            path = self._stack[-1][1] + ';' + name
+        # name, path, start, time of the values within, memory
+        self._stack.append([name, path, time.perf_counter(), 0.0, memory])
+        self._active[name] = self._active.get(name, 0) + 1
+
+    def _exit(self, length):
+        now = time.perf_counter()
+        name, path, start, childTime, memory = self._stack.pop()
+        elapsed = now - start
+        if self._stack:
+            self._stack[-1][3] += elapsed
+
+        stats = self._stats.get(name)
+        if stats is None:
+            stats = self._stats[name] = TypeStats(name)
+        stats.calls += 1
+        stats.selfTime += elapsed - childTime
+        stats.octets += length or 0
+        self._active[name] -= 1
+        if not self._active[name]:
+            stats.time += elapsed
+            if memory:
+                stats.allocated += tracemalloc.get_traced_memory()[0] - memory
+        self._folded[path] = self._folded.get(path, 0.0) + elapsed - childTime
+
+    def stats(self):
+        """Return the TypeStats of every class, by name."""
+        return dict(self._stats)
+
+    def top(self, count=10, key='time'):
+        """Return the TypeStats of the count classes with the most of
+        key, which is one of the TypeStats attributes."""
+        return sorted(self._stats.values(),
+                      key=lambda stats: getattr(stats, key),
+                      reverse=True)[:count]
+
+    def report(self, count=20, key='time'):
+        """Return a table of the top count classes as text."""
+        lines = ['%-40s %8s %10s %10s %10s %10s' % (
+            'type', 'calls', 'time ms', 'self ms', 'octets', 'allocated')]
+        for stats in self.top(count, key):
+            lines.append('%-40s %8d %10.3f %10.3f %10d %10d' % (
+                stats.name, stats.calls, stats.time * 1000,
+                stats.selfTime * 1000, stats.octets, stats.allocated))
+        return '\n'.join(lines)
+
+    def foldedStacks(self):
+        """Return the self time of each stack of classes in the folded
+        format that flame graph tools read, one 'a;b;c count' line per
+        stack, where the count is in microseconds."""
+        return ''.join(
+            '%s %d\n' % (path, round(elapsed * 1000000))
+            for path, elapsed in sorted(self._folded.items()))
+
+    def clear(self):
+        """Forget everything recorded so far."""
+        self._stats.clear()
+        self._folded.clear()
@@ -0,0 +1,236 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# The dependencies between the rfc modules, for workers that import only
+# the modules that their traffic needs.  The import graph is read from
+# the source of the modules.  The entries that each module registers in
+# the opentype maps are found by importing the modules one at a time, in
+# the order of the import graph, in a separate Python process, and
+# seeing what each one adds.  A DependencyGraph then searches for the
+# smallest set of modules that decodes the given OIDs, such as content
+# types or certificate extensions, and writes the import statements for
+# them.
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+
+import ast
+import json
+import os
+import subprocess
+import sys
+
+from pyasn1 import error
+from pyasn1.type import univ
+
+
+_PACKAGE = 'pyasn1_alt_modules'
+
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Imports the modules in the given order and writes a JSON line for each
+# entry that a module adds to an opentype map, or replaces.
+_REGISTRATIONS = '''
+import json
+import sys
+from pyasn1_alt_modules import opentypemap
+maps = opentypemap.map_of_opentype_maps
+for name in json.loads(sys.stdin.read()):
+    before = dict((mapName, dict(typeMap)) for mapName, typeMap in maps.items())
+    __import__('pyasn1_alt_modules.' + name)
+    for mapName, typeMap in list(maps.items()):
+        previous = before.get(mapName, {})
+        for key, value in typeMap.items():
+            if previous.get(key) is not value:
+                print(json.dumps([name, mapName, str(key)]))
+'''
+
+
+def _moduleNames():
+    return sorted(
+        name[:-3] for name in os.listdir(_PACKAGE_DIR)
+        if name.startswith('rfc') and name.endswith('.py'))
+
+
+def _imports(source):
+    """Return the rfc modules that a module imports."""
+    imported = set()
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, ast.ImportFrom):
+            if node.module == _PACKAGE:
+                imported.update(alias.name for alias in node.names)
+            elif node.module and node.module.startswith(_PACKAGE + '.'):
+                imported.add(node.module[len(_PACKAGE) + 1:])
+        elif isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.name.startswith(_PACKAGE + '.'):
+                    imported.add(alias.name[len(_PACKAGE) + 1:])
+    return set(name for name in imported if name.startswith('rfc'))
+
+
+def importGraph():
+    """Return the rfc modules that each rfc module imports, by name."""
+    graph = {}
+    for name in _moduleNames():
+        with open(os.path.join(_PACKAGE_DIR, name + '.py')) as source:
+            graph[name] = _imports(source.read())
+    return graph
+
+
+def _oid(oid):
+    try:
+        return str(univ.ObjectIdentifier(oid))
+    except error.PyAsn1Error:
+        return str(oid)
+
+
+class DependencyGraph(object):
+    """The import graph of the rfc modules and the opentype map entries
+    that each one registers.
+
+    The imports are the rfc modules that each module imports, and the
+    registrations are, for each map, the modules that register each
+    key, as a string such as '1.2.840.113549.1.9.16.1.24'.  Several
+    modules may register the same key; any one of them decodes it.
+    """
+
+    def __init__(self):
+        self.imports = importGraph()
+        self.registrations = {}
+
+        environment = dict(os.environ)
+        environment['PYTHONPATH'] = os.pathsep.join(
+            [os.path.dirname(_PACKAGE_DIR)] +
+            [path for path in [environment.get('PYTHONPATH')] if path])
+        output = subprocess.run(
+            [sys.executable, '-c', _REGISTRATIONS],
+            input=json.dumps(self.order()), env=environment, check=True,
+            stdout=subprocess.PIPE, universal_newlines=True).stdout
+        for line in output.splitlines():
+            name, mapName, key = json.loads(line)
+            self.registrations.setdefault(mapName, {}).setdefault(
+                key, []).append(name)
+
+    def order(self, modules=None):
+        """Return the modules, all of them by default, and the modules
+        that they import, each after the modules that it imports."""
+        order = []
+        seen = set()
+        for name in sorted(self.imports if modules is None else modules):
+            stack = [(name, False)]
+            while stack:
+                name, done = stack.pop()
+                if done:
+                    order.append(name)
+                elif name not in seen:
+                    if name not in self.imports:
+                        raise error.PyAsn1Error('Unknown module %s' % name)
+                    seen.add(name)
+                    stack.append((name, True))
+                    stack.extend((imported, False) for imported in
+                                 sorted(self.imports[name], reverse=True))
+        return order
+
+    def closure(self, modules):
+        """Return the sorted names of the modules and of all of the
+        modules that they import."""
+        return sorted(self.order(modules))
+
+    def importers(self, module):
+        """Return the sorted names of the modules that import module."""
+        return sorted(name for name, imported in self.imports.items()
+                      if module in imported)
+
+    def registrants(self, oid, mapName=None):
+        """Return the sorted names of the modules that register the OID,
+        in the named map or in any map."""
+        oid = _oid(oid)
+        names = set()
+        for name, registrations in self.registrations.items():
+            if mapName is None or name == mapName:
+                names.update(registrations.get(oid, ()))
+        return sorted(names)
+
+    def minimalModules(self, oids, mapName=None, searchLimit=10000):
+        """Return the sorted names of a smallest set of modules that
+        registers all of the OIDs, with the modules that they import.
+
+        The choice of a registering module for each OID is searched with
+        branch and bound, starting from the greedy choice of the module
+        that adds the fewest modules.  The result is exact unless the
+        search takes more than searchLimit steps, as it may for many
+        OIDs with many registrants each; the smallest set found by then
+        is returned, which is no larger than the greedy one.  A
+        PyAsn1Error is raised for an OID that no module registers.
+        """
+        closures = {}
+        choices = []
+        for oid in oids:
+            registrants = self.registrants(oid, mapName)
+            if not registrants:
+                raise error.PyAsn1Error(
+                    'No module registers %s' % _oid(oid))
+            for name in registrants:
+                if name not in closures:
+                    closures[name] = frozenset(self.closure([name]))
+            choices.append(registrants)
+
+        best = frozenset()
+        for registrants in choices:
+            if best.intersection(registrants):
+                continue
+            name = min(registrants, key=lambda name: (
+                len(closures[name] - best), name))
+            best |= closures[name]
+
+        # The OIDs with the fewest registrants are decided first.
+        choices.sort(key=len)
+        stack = [(0, frozenset())]
+        steps = 0
+        while stack and steps < searchLimit:
+            index, modules = stack.pop()
+            if len(modules) >= len(best):
+                continue
+            while index < len(choices) and \
+                    modules.intersection(choices[index]):
+                index += 1
+            if index == len(choices):
+                best = modules
+                continue
+            steps += 1
+            # The modules that add the fewest are tried first.
+            for name in sorted(choices[index], key=lambda name: (
+                    len(closures[name] - modules), name), reverse=True):
+                stack.append((index + 1, modules | closures[name]))
+        return sorted(best)
+
+    def importList(self, oids, mapName=None):
+        """Return the import statements of minimalModules(oids), in the
+        order of the import graph, as Python source."""
+        return ''.join(
+            'from %s import %s\n' % (_PACKAGE, name)
+            for name in self.order(self.minimalModules(oids, mapName)))
+
+
+_defaultGraph = None
+
+
+def _graph():
+    global _defaultGraph
+    # The modules are imported in another process when first needed.
+    if _defaultGraph is None:
+        _defaultGraph = DependencyGraph()
+    return _defaultGraph
+
+
+def minimalModules(oids, mapName=None, searchLimit=10000):
+    """Return a smallest set of modules that registers the OIDs, using a
+    shared DependencyGraph; see DependencyGraph.minimalModules."""
+    return _graph().minimalModules(oids, mapName, searchLimit)
+
+
+def importList(oids, mapName=None):
+    """Return the import statements for the modules that register the
+    OIDs, using a shared DependencyGraph."""
+    return _graph().importList(oids, mapName)
@@ -0,0 +1,191 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# DER re-encoding of a decoded template that splices in the cached
+# encodings of the parts that did not change.  Every component encoded
+# through an EncodingCache remembers its DER and the component objects
+# it held at the time.  Changing a component replaces an object in its
+# parent (pyasn1 values are immutable), so a component is dirty when it
+# holds other objects than it did, or when one of them is dirty, and
+# clean components are not encoded again.  The layout is still done by
+# the pyasn1 DER encoder, so the output is the same as a full encode.
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+
+from pyasn1.codec.der import encoder
+from pyasn1.codec.der.decoder import decode as der_decoder
+from pyasn1.type import base
+from pyasn1.type import univ
+
+
+def _components(value):
+    """Return the component objects of a constructed value, or None for
+    a simple value."""
+    if isinstance(value, univ.Choice):
+        if value.getName() is None:
+            return ()
+        return (value.getComponent(),)
+    if isinstance(value, (univ.Sequence, univ.Set)):
+        return tuple(value.values())
+    if isinstance(value, (univ.SequenceOf, univ.SetOf)):
+        # An empty list and an absent one differ only in isValue.
+        return (value.isValue,) + tuple(value)
+    return None
+
+
+class _CachingItemEncoder(encoder.SingleItemEncoder):
+    """The DER item encoder, which pyasn1 calls back for every
+    component, answering from the cache for clean components."""
+
+    def __init__(self, cache, **options):
+        encoder.SingleItemEncoder.__init__(self, **options)
+        self._cache = cache
+
+    def __call__(self, value, asn1Spec=None, **options):
+        cache = self._cache
+        # Open type wrapping changes the encoding of the same value, so
+        # it is not cached.  The encoder asks for OPTIONAL components to
+        # be left out when their contents are empty, so the encodings
+        # are kept with that option.
+        if asn1Spec is not None or 'wrapType' in options or \
+                not isinstance(value, base.Asn1Item):
+            return encoder.SingleItemEncoder.__call__(
+                self, value, asn1Spec, **options)
+
+        ifNotEmpty = bool(options.get('ifNotEmpty'))
+        if cache.isClean(value):
+            encodings = cache._entries[id(value)][2]
+            if ifNotEmpty in encodings:
+                cache.hits += 1
+                return encodings[ifNotEmpty]
+
+        cache.misses += 1
+        substrate = encoder.SingleItemEncoder.__call__(
+            self, value, asn1Spec, **options)
+        cache._store(value, substrate, ifNotEmpty)
+        return substrate
+
+
+class _CachingEncoder(encoder.Encoder):
+    SINGLE_ITEM_ENCODER = _CachingItemEncoder
+
+
+class EncodingCache(object):
+    """Re-encode a decoded template, splicing in the DER of the
+    components that did not change.
+
+    One cache follows one tree: after each encode, the entries of the
+    components that are no longer part of the encoded value are
+    dropped.  The hits and misses count the components that were
+    spliced in and those that were encoded.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._clean = {}
+        self._visited = None
+        self._encoder = _CachingEncoder(cache=self)
+        self.hits = 0
+        self.misses = 0
+
+    def decode(self, substrate, asn1Spec):
+        """Decode a DER template and remember the encodings of all of its
+        components.  Returns the decoded object."""
+        asn1Object, rest = der_decoder(bytes(substrate), asn1Spec=asn1Spec)
+        self.encode(asn1Object)
+        return asn1Object
+
+    def encode(self, asn1Object):
+        """Return the DER encoding of asn1Object.
+
+        The result is the same as der_encoder(asn1Object).
+        """
+        self._clean = {}
+        self._visited = set()
+        try:
+            return self._encoder(asn1Object)
+        finally:
+            visited = self._visited
+            self._entries = dict(
+                (key, entry) for key, entry in self._entries.items()
+                if key in visited)
+            self._clean = {}
+            self._visited = None
+
+    def isClean(self, value):
+        """Return True if value has been encoded through this cache and
+        neither it nor any of its components has changed since."""
+        entry = self._entries.get(id(value))
+        if entry is None or entry[0] is not value or not entry[2]:
+            return False
+        if self._visited is None:
+            # Outside of encode() the tree may have changed since the
+            # last call.
+            self._clean = {}
+        return self._unchanged(value)
+
+    def _unchanged(self, value):
+        key = id(value)
+        try:
+            return self._clean[key]
+        except KeyError:
+            pass
+
+        entry = self._entries.get(key)
+        if entry is None or entry[0] is not value:
+            # A simple value cannot change in place; its parent notices
+            # when it is replaced.
+            unchanged = _components(value) is None
+            entry = None
+        elif entry[1] is None:
+            unchanged = True
+        else:
+            components = _components(value)
+            unchanged = len(components) == len(entry[1]) and all(
+                component is known
+                for component, known in zip(components, entry[1]))
+            # Every component is looked at, so that the entries of an
+            # unchanged subtree stay in the cache.
+            for component in components:
+                if not self._unchanged(component):
+                    unchanged = False
+
+        self._clean[key] = unchanged
+        if entry is not None and self._visited is not None:
+            self._visited.add(key)
+        return unchanged
+
+    def _store(self, value, substrate, ifNotEmpty):
+        # The components are taken after encoding, as the encoder fills
+        # in any components of a SEQUENCE that were not instantiated.
+        key = id(value)
+        entry = self._entries.get(key)
+        if entry is None or entry[0] is not value or \
+                not self._clean.get(key):
+            entry = self._track(value)
+        entry[2][ifNotEmpty] = substrate
+
+    def _track(self, value):
+        """Record the components of value, and of those components that
+        the encoder left out, so that later changes to them are seen."""
+        key = id(value)
+        components = _components(value)
+        entry = self._entries[key] = (value, components, {})
+        self._clean[key] = True
+        if self._visited is not None:
+            self._visited.add(key)
+        for component in components or ():
+            known = self._entries.get(id(component))
+            if known is None or known[0] is not component:
+                if _components(component) is not None:
+                    self._track(component)
+        return entry
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        """Forget all of the cached encodings."""
+        self._entries = {}
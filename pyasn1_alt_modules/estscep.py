@@ -0,0 +1,360 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# Server-side helpers for EST (RFC 7030) and SCEP (RFC 8894) enrolment.
+# The responses that are the same for every client, the CsrAttrs and the
+# degenerate certs-only SignedData that carries the CA certificates, are
+# encoded once by EnrolmentCache and rebuilt only when the CA bundle
+# changes.  The SCEP attributes of a pkiMessage are read straight from
+# the signedAttrs of its SignerInfo with the tlv helpers, without
+# decoding the SignedData or the pkcsPKIEnvelope inside it.
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+
+import base64
+import hashlib
+import os
+
+from pyasn1 import error
+from pyasn1.codec.der.encoder import encode as der_encoder
+
+from pyasn1_alt_modules import certfields
+from pyasn1_alt_modules import pem
+from pyasn1_alt_modules import rfc5652
+from pyasn1_alt_modules import rfc8894
+from pyasn1_alt_modules import tlv
+
+
+# SCEP messageType and pkiStatus values
+
+messageTypes = {
+    3: 'CertRep',
+    17: 'RenewalReq',
+    19: 'PKCSReq',
+    20: 'CertPoll',
+    21: 'GetCert',
+    22: 'GetCRL',
+}
+
+pkiStatuses = {
+    0: 'SUCCESS',
+    2: 'FAILURE',
+    3: 'PENDING',
+}
+
+failInfos = {
+    0: 'badAlg',
+    1: 'badMessageCheck',
+    2: 'badRequest',
+    3: 'badTime',
+    4: 'badCertId',
+}
+
+_SIGNED_DATA = certfields.oidTlv(rfc5652.id_signedData)
+_DATA = certfields.oidTlv(rfc5652.id_data)
+_SIGNED_ATTRS = tlv.contextTag(0)
+
+_MESSAGE_TYPE = certfields.oidTlv(rfc8894.id_messageType)
+_PKI_STATUS = certfields.oidTlv(rfc8894.id_pkiStatus)
+_FAIL_INFO = certfields.oidTlv(rfc8894.id_failInfo)
+_SENDER_NONCE = certfields.oidTlv(rfc8894.id_senderNonce)
+_RECIPIENT_NONCE = certfields.oidTlv(rfc8894.id_recipientNonce)
+_TRANSACTION_ID = certfields.oidTlv(rfc8894.id_transactionID)
+_MESSAGE_DIGEST = certfields.oidTlv(rfc5652.id_messageDigest)
+
+
+def _encodeSet(encodings, tag=tlv.SET):
+    """Return a DER SET OF with the encodings in DER order."""
+    return tlv.encodeTlv(tag, b''.join(sorted(
+        bytes(encoding) for encoding in encodings)))
+
+
+def certsOnly(certificates, crls=()):
+    """Return the DER ContentInfo of a degenerate certs-only SignedData.
+
+    The certificates and crls are DER encodings.  This is the body of
+    an EST /cacerts response (before base64 encoding) and of a SCEP
+    GetCACert response with more than one certificate.
+    """
+    parts = [b'\x02\x01\x01', tlv.encodeTlv(tlv.SET, b''),
+             tlv.encodeTlv(tlv.SEQUENCE, _DATA)]
+    certificates = list(certificates)
+    if certificates:
+        parts.append(_encodeSet(certificates, tlv.contextTag(0)))
+    crls = list(crls)
+    if crls:
+        parts.append(_encodeSet(crls, tlv.contextTag(1)))
+    parts.append(tlv.encodeTlv(tlv.SET, b''))
+    signedData = tlv.encodeTlv(tlv.SEQUENCE, b''.join(parts))
+    return tlv.encodeTlv(tlv.SEQUENCE, _SIGNED_DATA + tlv.encodeTlv(
+        tlv.contextTag(0), signedData))
+
+
+def encodeCsrAttrs(csrAttrs):
+    """Return the DER CsrAttrs for an rfc7030.CsrAttrs, or for a list
+    whose items are ObjectIdentifier objects or (attrType, [encoded
+    values]) pairs."""
+    if not isinstance(csrAttrs, (list, tuple)):
+        return der_encoder(csrAttrs)
+
+    items = []
+    for item in csrAttrs:
+        if isinstance(item, tuple):
+            attrType, values = item
+            items.append(tlv.encodeTlv(tlv.SEQUENCE, certfields.oidTlv(
+                attrType) + _encodeSet(values)))
+        else:
+            items.append(certfields.oidTlv(item))
+    return tlv.encodeTlv(tlv.SEQUENCE, b''.join(items))
+
+
+def bundleFingerprint(certificates):
+    """Return a SHA-256 digest identifying a list of DER certificates."""
+    digest = hashlib.sha256()
+    for certificate in certificates:
+        digest.update(len(certificate).to_bytes(4, 'big'))
+        digest.update(certificate)
+    return digest.digest()
+
+
+def readCertificates(fileObj):
+    """Return the DER encoding of each certificate in a PEM file."""
+    certificates = []
+    while True:
+        idx, substrate = pem.readPemBlocksFromFile(
+            fileObj, ('-----BEGIN CERTIFICATE-----',
+                      '-----END CERTIFICATE-----'))
+        if idx < 0:
+            return certificates
+        certificates.append(substrate)
+
+
+class EnrolmentCache(object):
+    """The static EST and SCEP responses of an enrolment server.
+
+    The CsrAttrs and the certs-only SignedData for the CA certificates
+    are encoded on first use and kept until they are replaced.  The CA
+    certificates come from setCACertificates(), or from a PEM file
+    given as caBundlePath, which is read again whenever its size or
+    modification time changes.  Either way, the responses are only
+    rebuilt when the certificates themselves are different, and the
+    fingerprint of the current bundle can serve as an HTTP ETag.
+    """
+
+    def __init__(self, csrAttrs=None, caCertificates=None,
+                 caBundlePath=None):
+        self.caBundlePath = caBundlePath
+        self._csrAttrs = csrAttrs
+        self._encodedCsrAttrs = None
+        self._certificates = []
+        self._fingerprint = bundleFingerprint([])
+        self._bundleStat = None
+        self._responses = {}
+        if caCertificates is not None:
+            self.setCACertificates(caCertificates)
+
+    def setCsrAttrs(self, csrAttrs):
+        """Replace the CsrAttrs, as for encodeCsrAttrs()."""
+        self._csrAttrs = csrAttrs
+        self._encodedCsrAttrs = None
+        self._responses.pop('csrAttrsBase64', None)
+
+    @property
+    def csrAttrs(self):
+        """The DER CsrAttrs, for the EST /csrattrs response."""
+        if self._encodedCsrAttrs is None:
+            if self._csrAttrs is None:
+                raise error.PyAsn1Error('No CsrAttrs have been set')
+            self._encodedCsrAttrs = encodeCsrAttrs(self._csrAttrs)
+        return self._encodedCsrAttrs
+
+    @property
+    def csrAttrsBase64(self):
+        """The base64 CsrAttrs body of an EST /csrattrs response."""
+        return self._response('csrAttrsBase64', lambda: base64.encodebytes(
+            self.csrAttrs))
+
+    def setCACertificates(self, certificates):
+        """Replace the CA certificates, a list of DER encodings.
+
+        Returns True if the bundle changed and the cached responses
+        were dropped.
+        """
+        certificates = [bytes(certificate) for certificate in certificates]
+        fingerprint = bundleFingerprint(certificates)
+        if fingerprint == self._fingerprint:
+            return False
+        self._certificates = certificates
+        self._fingerprint = fingerprint
+        self._responses.clear()
+        return True
+
+    def _reload(self):
+        if self.caBundlePath is None:
+            return
+        stat = os.stat(self.caBundlePath)
+        bundleStat = (stat.st_size, stat.st_mtime_ns)
+        if bundleStat != self._bundleStat:
+            with open(self.caBundlePath) as fileObj:
+                self.setCACertificates(readCertificates(fileObj))
+            self._bundleStat = bundleStat
+
+    def _response(self, name, build):
+        self._reload()
+        try:
+            return self._responses[name]
+        except KeyError:
+            pass
+        response = self._responses[name] = build()
+        return response
+
+    @property
+    def caCertificates(self):
+        """The current list of DER CA certificates."""
+        self._reload()
+        return list(self._certificates)
+
+    @property
+    def fingerprint(self):
+        """The hex SHA-256 fingerprint of the current CA bundle."""
+        self._reload()
+        return self._fingerprint.hex()
+
+    @property
+    def caCerts(self):
+        """The DER certs-only SignedData of the CA certificates."""
+        return self._response('caCerts', lambda: certsOnly(
+            self._certificates))
+
+    @property
+    def caCertsBase64(self):
+        """The base64 body of an EST /cacerts response."""
+        return self._response('caCertsBase64', lambda: base64.encodebytes(
+            self.caCerts))
+
+    def getCACert(self):
+        """Return (content type, body) for a SCEP GetCACert response.
+
+        A lone CA certificate is sent by itself; a CA with RA
+        certificates, or with several certificates, is sent as a
+        certs-only SignedData.
+        """
+        self._reload()
+        if len(self._certificates) == 1:
+            return 'application/x-x509-ca-cert', self._certificates[0]
+        if not self._certificates:
+            raise error.PyAsn1Error('No CA certificates have been set')
+        return 'application/x-x509-ca-ra-cert', self.caCerts
+
+
+class ScepAttributes(object):
+    """The SCEP signed attributes of a pkiMessage.
+
+    The messageType, pkiStatus, and failInfo are integers, the nonces
+    are bytes, and transactionID is a str; attributes that are absent
+    are None.  The messageDigest is the digest of the pkcsPKIEnvelope,
+    and signedAttrs is the DER SET OF Attribute that the signature
+    covers.
+    """
+
+    __slots__ = ('messageType', 'pkiStatus', 'failInfo', 'senderNonce',
+                 'recipientNonce', 'transactionID', 'messageDigest',
+                 'signedAttrs')
+
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, None)
+
+    def __repr__(self):
+        return '%s(messageType=%s, transactionID=%r)' % (
+            self.__class__.__name__,
+            messageTypes.get(self.messageType, self.messageType),
+            self.transactionID)
+
+    @property
+    def messageTypeName(self):
+        return messageTypes.get(self.messageType)
+
+
+def _printableNumber(substrate, item):
+    try:
+        return int(bytes(substrate[item[2]:item[3]]))
+    except ValueError:
+        raise error.PyAsn1Error('SCEP attribute is not a number')
+
+
+def scepAttributes(signerInfo, offset=0):
+    """Return the ScepAttributes of the DER SignerInfo at offset.
+
+    The signerInfo may also be an rfc5652.SignerInfo object.
+    """
+    if not isinstance(signerInfo, (bytes, bytearray, memoryview)):
+        signerInfo = der_encoder(signerInfo)
+    substrate = memoryview(signerInfo)
+
+    members = tlv.children(substrate, offset)
+    if len(members) < 4 or members[3][1] != _SIGNED_ATTRS:
+        raise error.PyAsn1Error('The SignerInfo has no signedAttrs')
+    signedAttrs = members[3]
+
+    attributes = ScepAttributes()
+    attributes.signedAttrs = tlv.encodeTlv(
+        tlv.SET, bytes(substrate[signedAttrs[2]:signedAttrs[3]]))
+    for item in tlv.iterTlvs(substrate, signedAttrs[2], signedAttrs[3]):
+        attrType, attrValues = tlv.children(substrate, item[0])
+        attrType = substrate[attrType[0]:attrType[4]]
+        value = next(tlv.iterTlvs(substrate, attrValues[2], attrValues[3]),
+                     None)
+        if value is None:
+            continue
+        if attrType == _MESSAGE_TYPE:
+            attributes.messageType = _printableNumber(substrate, value)
+        elif attrType == _PKI_STATUS:
+            attributes.pkiStatus = _printableNumber(substrate, value)
+        elif attrType == _FAIL_INFO:
+            attributes.failInfo = _printableNumber(substrate, value)
+        elif attrType == _SENDER_NONCE:
+            attributes.senderNonce = bytes(substrate[value[2]:value[3]])
+        elif attrType == _RECIPIENT_NONCE:
+            attributes.recipientNonce = bytes(substrate[value[2]:value[3]])
+        elif attrType == _TRANSACTION_ID:
+            attributes.transactionID = bytes(
+                substrate[value[2]:value[3]]).decode('ascii')
+        elif attrType == _MESSAGE_DIGEST:
+            attributes.messageDigest = bytes(substrate[value[2]:value[3]])
+    return attributes
+
+
+def pkiMessage(message):
+    """Return (ScepAttributes, pkcsPKIEnvelope) for a DER SCEP
+    pkiMessage, a ContentInfo holding a SignedData.
+
+    The certificates and the pkcsPKIEnvelope are stepped over; the
+    envelope is returned as a memoryview of its DER encoding, or None
+    for a message without content, such as a failed CertRep.
+    """
+    substrate = memoryview(message)
+    contentInfo = tlv.children(substrate)
+    if bytes(substrate[contentInfo[0][0]:contentInfo[0][4]]) != _SIGNED_DATA:
+        raise error.PyAsn1Error('The pkiMessage is not a SignedData')
+    signedData = tlv.children(
+        substrate, tlv.readTlv(substrate, contentInfo[1][0])[1])
+
+    encapContentInfo = tlv.children(substrate, signedData[2][0])
+    envelope = None
+    if len(encapContentInfo) > 1:
+        eContent = tlv.readTlv(substrate, encapContentInfo[1][0])[1]
+        tag, valueOffset, valueEnd, tlvEnd = tlv.readTlv(substrate, eContent)
+        if tlv.isConstructed(tag):
+            envelope = memoryview(tlv.stringValue(substrate, eContent))
+        else:
+            envelope = substrate[valueOffset:valueEnd]
+
+    signerInfos = signedData[-1]
+    signerInfo = next(tlv.iterTlvs(substrate, signerInfos[2], signerInfos[3]),
+                      None)
+    if signerInfo is None:
+        raise error.PyAsn1Error('The pkiMessage has no SignerInfo')
+    return scepAttributes(substrate, signerInfo[0]), envelope
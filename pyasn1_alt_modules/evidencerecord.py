@@ -0,0 +1,440 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# Hash-tree verification and construction for Evidence Records (RFC 4998).
+# EvidenceRecordVerifier works on the DER encoding of the record, which
+# is sliced with the tlv helpers, so the ArchiveTimeStampChains and the
+# timestamps are hashed as they appear in the record rather than after
+# a round trip through pyasn1.  The hashes of the reduced hash trees are
+# cached, so the upper levels of a tree shared by many records are only
+# computed once, and the messageImprint of each distinct timestamp is
+# only extracted once.  HashtreeBuilder builds the tree for a large set
+# of data objects, keeping each level in a single buffer, and encodes
+# the ArchiveTimeStamp or EvidenceRecord for any one of them.
+#
+# Verifying the signatures on the timestamps is left to a caller-supplied
+# function, since the keys and the policy for them are not known here.
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+
+import hashlib
+import threading
+
+from pyasn1 import error
+from pyasn1.codec.der.encoder import encode as der_encoder
+
+from pyasn1_alt_modules import certfields
+from pyasn1_alt_modules import rfc4055
+from pyasn1_alt_modules import rfc9688
+from pyasn1_alt_modules import tlv
+from pyasn1_alt_modules import tstinfo
+
+
+# The digest algorithms that hashlib provides, by DER OID TLV
+
+digestNames = {}
+
+for _oid, _name in (
+        (rfc4055.id_sha1, 'sha1'),
+        (rfc4055.id_sha224, 'sha224'),
+        (rfc4055.id_sha256, 'sha256'),
+        (rfc4055.id_sha384, 'sha384'),
+        (rfc4055.id_sha512, 'sha512'),
+        (rfc9688.id_sha3_224, 'sha3_224'),
+        (rfc9688.id_sha3_256, 'sha3_256'),
+        (rfc9688.id_sha3_384, 'sha3_384'),
+        (rfc9688.id_sha3_512, 'sha3_512')):
+    digestNames[certfields.oidTlv(_oid)] = _name
+
+del _oid, _name
+
+_DIGEST_ALGORITHM = tlv.contextTag(0)
+_REDUCED_HASHTREE = tlv.contextTag(2)
+
+_hashers = {}
+
+
+def hasher(name):
+    """Return a function computing the hashlib digest called name.
+
+    The function copies a prepared hash object, which is quicker than
+    looking up the constructor for every one of many short inputs.
+    """
+    try:
+        return _hashers[name]
+    except KeyError:
+        pass
+
+    prototype = hashlib.new(name)
+
+    def digest(data):
+        hashObject = prototype.copy()
+        hashObject.update(data)
+        return hashObject.digest()
+
+    _hashers[name] = digest
+    return digest
+
+
+def _digestName(oidTlv):
+    try:
+        return digestNames[bytes(oidTlv)]
+    except KeyError:
+        raise error.PyAsn1Error('Unsupported digest algorithm')
+
+
+def messageImprint(timeStamp):
+    """Return (digest name, hashedMessage) of the TSTInfo inside the DER
+    or BER encoded RFC 3161 timestamp token (a ContentInfo)."""
+    tstInfo = tstinfo.encodedTstInfo(timeStamp)
+    imprint = tlv.children(tstInfo, tlv.children(tstInfo)[2][0])
+    algorithm = tlv.children(tstInfo, imprint[0][0])[0]
+    return (_digestName(tstInfo[algorithm[0]:algorithm[4]]),
+            tstInfo[imprint[1][2]:imprint[1][3]])
+
+
+class NodeCache(object):
+    """A bounded cache of hash tree nodes and timestamp imprints.
+
+    The oldest entries are dropped once maxSize is reached.  A cache
+    can be shared by several verifiers that see records from the same
+    archive, including verifiers running in other threads; hits and
+    misses count the node lookups.
+    """
+
+    def __init__(self, maxSize=1 << 20):
+        self.maxSize = maxSize
+        self.hits = self.misses = 0
+        self._nodes = {}
+        self._timeStamps = {}
+        self._lock = threading.Lock()
+
+    def _store(self, entries, key, value):
+        # Called with the lock held.
+        if len(entries) >= self.maxSize and entries:
+            del entries[next(iter(entries))]
+        entries[key] = value
+
+    def node(self, name, values):
+        """Return the hash of the sorted concatenation of values."""
+        key = (name, b''.join(sorted(values)))
+        with self._lock:
+            result = self._nodes.get(key)
+            if result is not None:
+                self.hits += 1
+                return result
+            self.misses += 1
+
+        result = hasher(name)(key[1])
+        with self._lock:
+            self._store(self._nodes, key, result)
+        return result
+
+    def timeStamp(self, timeStamp, checkTimeStamp):
+        """Return (digest name, hashedMessage, accepted) for a timestamp."""
+        timeStamp = bytes(timeStamp)
+        with self._lock:
+            result = self._timeStamps.get(timeStamp)
+        if result is not None:
+            return result
+
+        name, hashedMessage = messageImprint(timeStamp)
+        accepted = checkTimeStamp is None or bool(checkTimeStamp(timeStamp))
+        result = name, hashedMessage, accepted
+        with self._lock:
+            self._store(self._timeStamps, timeStamp, result)
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._nodes.clear()
+            self._timeStamps.clear()
+            self.hits = self.misses = 0
+
+
+def _archiveTimeStamp(substrate, item):
+    """Return (digest OID TLV or None, [[values]], timeStamp TLV item)."""
+    digestAlgorithm = None
+    partialHashtrees = []
+    timeStamp = None
+    for member in tlv.iterTlvs(substrate, item[2], item[3]):
+        if member[1] == _DIGEST_ALGORITHM:
+            oid = tlv.children(substrate, member[0])[0]
+            digestAlgorithm = substrate[oid[0]:oid[4]]
+        elif member[1] == _REDUCED_HASHTREE:
+            for partial in tlv.iterTlvs(substrate, member[2], member[3]):
+                partialHashtrees.append([
+                    bytes(substrate[value[2]:value[3]])
+                    for value in tlv.iterTlvs(
+                        substrate, partial[2], partial[3])])
+        elif member[1] == tlv.SEQUENCE:
+            timeStamp = member
+    if timeStamp is None:
+        raise error.PyAsn1Error('ArchiveTimeStamp without a timeStamp')
+    return digestAlgorithm, partialHashtrees, timeStamp
+
+
+class EvidenceRecordVerifier(object):
+    """Verify the hash trees of Evidence Records against data objects.
+
+    A record is an rfc4998.EvidenceRecord or its DER encoding, and a data
+    object is either its octets or a dict mapping digest algorithm OIDs
+    to precomputed digests of it.  For every ArchiveTimeStamp, the root
+    of the reduced hash tree has to match the messageImprint of its
+    timestamp, the first timestamp of each chain has to cover the data
+    object (and, after a hash-tree renewal, the earlier chains), and each
+    later timestamp has to cover the previous timestamp.
+
+    checkTimeStamp, if given, is called once with the DER encoding of
+    each distinct timestamp and returns whether its signature and
+    certificates are acceptable.  With an executor from
+    concurrent.futures, verifyMany() checks the records concurrently;
+    hashlib releases the GIL for long inputs, so threads help most when
+    the data objects themselves are hashed here.  A data object is
+    hashed once for each digest algorithm that its record uses.
+    """
+
+    def __init__(self, checkTimeStamp=None, executor=None, cache=None):
+        self.checkTimeStamp = checkTimeStamp
+        self.executor = executor
+        self.cache = NodeCache() if cache is None else cache
+
+    def _chains(self, record):
+        """Return (substrate, chain items) for a record."""
+        if not isinstance(record, (bytes, bytearray, memoryview)):
+            record = der_encoder(record)
+        substrate = memoryview(record)
+        members = tlv.children(substrate)
+        if len(members) < 3 or members[0][1] != tlv.INTEGER:
+            raise error.PyAsn1Error('Not an EvidenceRecord')
+        sequence = members[-1]
+        chains = list(tlv.iterTlvs(substrate, sequence[2], sequence[3]))
+        if not chains:
+            raise error.PyAsn1Error('Empty ArchiveTimeStampSequence')
+        return substrate, chains
+
+    def rootHash(self, name, digest, partialHashtrees):
+        """Return the root of a reduced hash tree over digest."""
+        if not partialHashtrees:
+            return digest
+        if digest not in partialHashtrees[0]:
+            raise error.PyAsn1Error(
+                'The digest is not in the first PartialHashtree')
+        node = self.cache.node(name, partialHashtrees[0])
+        for partialHashtree in partialHashtrees[1:]:
+            node = self.cache.node(name, partialHashtree + [node])
+        return node
+
+    def checkChain(self, substrate, chains, index, dataObject):
+        """Verify one ArchiveTimeStampChain; raise PyAsn1Error if it
+        does not cover the data object."""
+        chain = chains[index]
+        previous = None
+        for item in tlv.iterTlvs(substrate, chain[2], chain[3]):
+            digestAlgorithm, partialHashtrees, timeStamp = \
+                _archiveTimeStamp(substrate, item)
+            encodedTimeStamp = substrate[timeStamp[0]:timeStamp[4]]
+            name, hashedMessage, accepted = self.cache.timeStamp(
+                encodedTimeStamp, self.checkTimeStamp)
+            if digestAlgorithm is not None:
+                name = _digestName(digestAlgorithm)
+            digest = hasher(name)
+
+            if previous is not None:
+                covered = digest(previous)
+            else:
+                covered = self._dataDigest(dataObject, name)
+                if index:
+                    # Hash-tree renewal: H(h(d) + H(atsc)), where atsc
+                    # is the ArchiveTimeStampSequence of the earlier
+                    # chains
+                    earlier = substrate[chains[0][0]:chain[0]]
+                    covered = digest(covered + digest(
+                        tlv.encodeHeader(tlv.SEQUENCE, len(earlier)) +
+                        earlier))
+
+            if self.rootHash(name, covered, partialHashtrees) != \
+                    hashedMessage:
+                raise error.PyAsn1Error(
+                    'ArchiveTimeStamp does not match its timestamp in '
+                    'chain %d' % index)
+            if not accepted:
+                raise error.PyAsn1Error(
+                    'Timestamp rejected in chain %d' % index)
+            previous = encodedTimeStamp
+
+    def _dataDigest(self, dataObject, name):
+        if isinstance(dataObject, dict):
+            for oid, digest in dataObject.items():
+                if digestNames.get(certfields.oidTlv(oid)) == name:
+                    return bytes(digest)
+            raise error.PyAsn1Error('No %s digest of the data object' % name)
+        return hasher(name)(dataObject)
+
+    def check(self, record, dataObject):
+        """Verify a record; raise PyAsn1Error on the first failure."""
+        substrate, chains = self._chains(record)
+        if len(chains) > 1 and not isinstance(dataObject, dict):
+            dataObject = self._digests(substrate, chains, dataObject)
+        for index in range(len(chains)):
+            self.checkChain(substrate, chains, index, dataObject)
+
+    def verify(self, record, dataObject):
+        """Return True if the record covers the data object."""
+        try:
+            self.check(record, dataObject)
+        except error.PyAsn1Error:
+            return False
+        return True
+
+    def _verifyPair(self, pair):
+        return self.verify(*pair)
+
+    def verifyMany(self, pairs):
+        """Return a list of booleans for (record, dataObject) pairs, in
+        order, verifying the records on the executor if there is one."""
+        if self.executor is None:
+            return list(map(self._verifyPair, pairs))
+        return list(self.executor.map(self._verifyPair, pairs))
+
+    def _digests(self, substrate, chains, dataObject):
+        """Hash a data object with the algorithm of each chain."""
+        digests = {}
+        for chain in chains:
+            first = tlv.children(substrate, chain[0])[0]
+            digestAlgorithm, partialHashtrees, timeStamp = \
+                _archiveTimeStamp(substrate, first)
+            if digestAlgorithm is None:
+                name = self.cache.timeStamp(
+                    substrate[timeStamp[0]:timeStamp[4]],
+                    self.checkTimeStamp)[0]
+            else:
+                name = _digestName(digestAlgorithm)
+            if name not in digests:
+                digests[name] = hasher(name)(dataObject)
+
+        return dict((oidTlv, digests[name])
+                    for oidTlv, name in digestNames.items() if name in digests)
+
+
+class HashtreeBuilder(object):
+    """Build the hash tree for a set of data objects (RFC 4998, 4.2).
+
+    Each node covers up to branching nodes of the level below and is the
+    hash of their digests sorted and concatenated.  A node left on its
+    own at the end of a level moves up unchanged.  Every level is held
+    in one buffer, which keeps a tree over millions of objects compact.
+    """
+
+    def __init__(self, digestAlgorithm=rfc4055.id_sha256, branching=2):
+        if branching < 2:
+            raise error.PyAsn1Error('A hash tree needs a branching of 2 or more')
+        self.digestAlgorithm = certfields.oidTlv(digestAlgorithm)
+        self.name = _digestName(self.digestAlgorithm)
+        self.digestSize = hashlib.new(self.name).digest_size
+        self.branching = branching
+        self._leaves = bytearray()
+        self._levels = None
+
+    def __len__(self):
+        return len(self._leaves) // self.digestSize
+
+    def add(self, dataObject):
+        """Hash a data object into the tree and return its index."""
+        return self.addDigest(hasher(self.name)(dataObject))
+
+    def addDigest(self, digest):
+        """Add the digest of a data object and return its index."""
+        if len(digest) != self.digestSize:
+            raise error.PyAsn1Error('Digest of the wrong size')
+        self._leaves += digest
+        self._levels = None
+        return len(self) - 1
+
+    def extend(self, dataObjects):
+        """Hash a batch of data objects into the tree."""
+        digest = hasher(self.name)
+        for dataObject in dataObjects:
+            self._leaves += digest(dataObject)
+        self._levels = None
+
+    def build(self):
+        """Compute the tree and return the root hash."""
+        if not self._leaves:
+            raise error.PyAsn1Error('The hash tree is empty')
+        if self._levels is not None:
+            return bytes(self._levels[-1])
+
+        digest = hasher(self.name)
+        size = self.digestSize
+        stride = size * self.branching
+        level = bytes(self._leaves)
+        levels = [level]
+        while len(level) > size:
+            parents = bytearray()
+            for start in range(0, len(level), stride):
+                group = level[start:start + stride]
+                if len(group) == size:
+                    parents += group
+                else:
+                    parents += digest(b''.join(sorted(
+                        group[offset:offset + size]
+                        for offset in range(0, len(group), size))))
+            level = bytes(parents)
+            levels.append(level)
+
+        self._levels = levels
+        return level
+
+    @property
+    def root(self):
+        return self.build()
+
+    def reducedHashtree(self, index):
+        """Return the reduced hash tree for a data object as a list of
+        lists of digests.  It is empty for a tree of one object."""
+        self.build()
+        if not 0 <= index < len(self):
+            raise IndexError('No data object %d in the hash tree' % index)
+
+        size = self.digestSize
+        partialHashtrees = []
+        for level in self._levels[:-1]:
+            first = index - index % self.branching
+            group = [level[position * size:(position + 1) * size]
+                     for position in range(
+                         first, min(first + self.branching,
+                                    len(level) // size))]
+            if len(group) > 1:
+                if partialHashtrees:
+                    del group[index - first]
+                partialHashtrees.append(group)
+            index //= self.branching
+        return partialHashtrees
+
+    def encodeArchiveTimeStamp(self, index, timeStamp):
+        """Return the DER ArchiveTimeStamp for a data object, given the
+        encoded timestamp over the root hash."""
+        partialHashtrees = self.reducedHashtree(index)
+        parts = [tlv.encodeTlv(_DIGEST_ALGORITHM, self.digestAlgorithm)]
+        if partialHashtrees:
+            parts.append(tlv.encodeTlv(_REDUCED_HASHTREE, b''.join(
+                tlv.encodeTlv(tlv.SEQUENCE, b''.join(
+                    tlv.encodeTlv(tlv.OCTET_STRING, value)
+                    for value in partialHashtree))
+                for partialHashtree in partialHashtrees)))
+        parts.append(bytes(timeStamp))
+        return tlv.encodeTlv(tlv.SEQUENCE, b''.join(parts))
+
+    def encodeEvidenceRecord(self, index, timeStamp):
+        """Return the DER EvidenceRecord with one ArchiveTimeStamp for a
+        data object."""
+        chain = tlv.encodeTlv(tlv.SEQUENCE, self.encodeArchiveTimeStamp(
+            index, timeStamp))
+        return tlv.encodeTlv(tlv.SEQUENCE, b''.join((
+            b'\x02\x01\x01',
+            tlv.encodeTlv(tlv.SEQUENCE, tlv.encodeTlv(
+                tlv.SEQUENCE, self.digestAlgorithm)),
+            tlv.encodeTlv(tlv.SEQUENCE, chain))))
@@ -0,0 +1,266 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# Incremental decoding of LDAP message streams (RFC 2251).  Bytes are
+# fed in chunks of any size; the outer TLV of each LDAPMessage is framed
+# once, without re-parsing the buffered data, and complete messages are
+# decoded as rfc2251.LDAPMessage.  Search result entries can instead be
+# returned as LazySearchResultEntry, which decodes attributes only when
+# they are asked for.  LDAPMessageProtocol wraps the decoder for asyncio
+# and pauses the transport when the consumer falls behind.
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+
+import asyncio
+
+from pyasn1 import error
+from pyasn1.codec.ber.decoder import decode as ber_decoder
+
+from pyasn1_alt_modules import rfc2251
+from pyasn1_alt_modules import tlv
+
+
+SEARCH_RESULT_ENTRY = 0x64
+
+
+class LazySearchResultEntry(object):
+    """A searchResEntry LDAPMessage with its attributes left encoded.
+
+    The messageID and objectName are decoded; each attribute is decoded
+    when iterAttributes() or attribute() reaches it.  The complete
+    rfc2251.LDAPMessage is available from toAsn1().
+    """
+
+    __slots__ = ('substrate', 'messageID', 'objectName', '_attributes',
+                 '_controls')
+
+    def __init__(self, substrate):
+        self.substrate = substrate = memoryview(substrate)
+        members = tlv.children(substrate)
+        self.messageID = int.from_bytes(
+            substrate[members[0][2]:members[0][3]], 'big', signed=True)
+
+        entry = tlv.children(substrate, members[1][0])
+        self.objectName = bytes(substrate[entry[0][2]:entry[0][3]])
+        self._attributes = entry[1]
+        self._controls = members[2] if len(members) > 2 else None
+
+    def iterAttributes(self):
+        """Yield (type, [values]) for each attribute as bytes."""
+        substrate = self.substrate
+        for item in tlv.iterTlvs(substrate, self._attributes[2],
+                                 self._attributes[3]):
+            attrType, attrValues = tlv.children(substrate, item[0])
+            yield (tlv.stringValue(substrate, attrType[0]),
+                   [tlv.stringValue(substrate, value[0])
+                    for value in tlv.iterTlvs(
+                        substrate, attrValues[2], attrValues[3])])
+
+    def attribute(self, attrType):
+        """Return the values of the named attribute, or None.
+
+        Attribute descriptions are compared without regard to case.
+        """
+        if isinstance(attrType, str):
+            attrType = attrType.encode('utf-8')
+        attrType = attrType.lower()
+        for candidate, values in self.iterAttributes():
+            if candidate.lower() == attrType:
+                return values
+        return None
+
+    @property
+    def controls(self):
+        """The encoded controls, or None if there are none."""
+        if self._controls is None:
+            return None
+        return self.substrate[self._controls[0]:self._controls[4]]
+
+    def toAsn1(self):
+        """Decode the complete message as an rfc2251.LDAPMessage."""
+        asn1Object, rest = ber_decoder(
+            bytes(self.substrate), asn1Spec=rfc2251.LDAPMessage())
+        return asn1Object
+
+
+class LDAPMessageDecoder(object):
+    """Frame and decode LDAP messages from arbitrary chunks of bytes.
+
+    Call feed() with each chunk as it arrives; it returns the messages
+    that were completed by that chunk.  With lazyEntries=True, search
+    result entries are returned as LazySearchResultEntry.  A message
+    larger than maxMessageSize raises PyAsn1Error before it is buffered.
+    """
+
+    def __init__(self, lazyEntries=False, maxMessageSize=None):
+        self.lazyEntries = lazyEntries
+        self.maxMessageSize = maxMessageSize
+        self._buffer = bytearray()
+        self._needed = None
+        self._error = None
+
+    @property
+    def pending(self):
+        """The number of buffered octets of incomplete messages."""
+        return len(self._buffer)
+
+    def _frameLength(self):
+        """Return the size of the message at the start of the buffer,
+        or None if its header is not complete yet."""
+        buffer = self._buffer
+        if len(buffer) < 2:
+            return None
+        if buffer[0] != tlv.SEQUENCE:
+            raise error.PyAsn1Error(
+                'LDAPMessage must be a SEQUENCE, not tag 0x%02X' % buffer[0])
+        if buffer[1] == 0x80:
+            raise error.PyAsn1Error(
+                'LDAP does not allow the indefinite length form')
+        if buffer[1] & 0x80 and len(buffer) < 2 + (buffer[1] & 0x7F):
+            return None
+        tag, valueOffset, length = tlv.readHeader(buffer)
+        needed = valueOffset + length
+        if self.maxMessageSize is not None and needed > self.maxMessageSize:
+            raise error.PyAsn1Error(
+                'LDAPMessage of %d octets exceeds the limit of %d' %
+                (needed, self.maxMessageSize))
+        return needed
+
+    def frames(self, data):
+        """Yield the encoding of each LDAPMessage completed by data."""
+        self._buffer += data
+        while True:
+            if self._needed is None:
+                self._needed = self._frameLength()
+                if self._needed is None:
+                    return
+            if len(self._buffer) < self._needed:
+                return
+            frame = bytes(self._buffer[:self._needed])
+            del self._buffer[:self._needed]
+            self._needed = None
+            yield frame
+
+    def decode(self, frame):
+        """Decode one framed message."""
+        if self.lazyEntries:
+            members = tlv.children(frame)
+            if len(members) > 1 and members[1][1] == SEARCH_RESULT_ENTRY:
+                return LazySearchResultEntry(frame)
+        asn1Object, rest = ber_decoder(frame, asn1Spec=rfc2251.LDAPMessage())
+        return asn1Object
+
+    def messages(self, data):
+        """Yield each message completed by data as soon as it is decoded.
+
+        The messages before one that cannot be decoded are all yielded
+        before its error is raised.
+        """
+        for frame in self.frames(data):
+            yield self.decode(frame)
+
+    def feed(self, data):
+        """Return the list of messages completed by data.
+
+        When a message cannot be decoded after others were, the others
+        are returned and the error is raised by the next call to feed()
+        or close().
+        """
+        self._raiseError()
+        messages = []
+        try:
+            for message in self.messages(data):
+                messages.append(message)
+        except error.PyAsn1Error as exc:
+            if not messages:
+                raise
+            self._error = exc
+        return messages
+
+    def _raiseError(self):
+        exc, self._error = self._error, None
+        if exc is not None:
+            raise exc
+
+    def close(self):
+        """Signal the end of the stream; incomplete data is an error."""
+        self._raiseError()
+        if self._buffer:
+            raise error.SubstrateUnderrunError(
+                'LDAP stream ended inside a message (%d octets pending)' %
+                len(self._buffer))
+
+
+class LDAPMessageProtocol(asyncio.Protocol):
+    """An asyncio protocol producing decoded LDAP messages.
+
+    Messages are queued as they are decoded and taken with get(), or by
+    iterating with "async for".  When more than highWater messages are
+    waiting, the transport stops reading until the queue drains to
+    lowWater, so a slow consumer holds back the peer instead of letting
+    the queue grow.  The iteration ends when the connection is closed;
+    a decoding error or a truncated stream is raised from get().
+    """
+
+    def __init__(self, lazyEntries=False, maxMessageSize=None,
+                 highWater=64, lowWater=16):
+        self.decoder = LDAPMessageDecoder(
+            lazyEntries=lazyEntries, maxMessageSize=maxMessageSize)
+        self.highWater = highWater
+        self.lowWater = lowWater
+        self.transport = None
+        self.paused = False
+        self._queue = asyncio.Queue()
+        self._end = object()
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def data_received(self, data):
+        # The messages are queued as they are decoded, so that those
+        # before a message that cannot be decoded are not lost.
+        try:
+            for message in self.decoder.messages(data):
+                self._queue.put_nowait(message)
+        except error.PyAsn1Error as exc:
+            self._queue.put_nowait(exc)
+            self.transport.close()
+            return
+
+        if not self.paused and self._queue.qsize() >= self.highWater:
+            self.paused = True
+            self.transport.pause_reading()
+
+    def connection_lost(self, exc):
+        if exc is None:
+            try:
+                self.decoder.close()
+            except error.PyAsn1Error as closeExc:
+                exc = closeExc
+        if exc is not None:
+            self._queue.put_nowait(exc)
+        self._queue.put_nowait(self._end)
+
+    async def get(self):
+        """Return the next message, or None at the end of the stream."""
+        item = await self._queue.get()
+        if item is self._end:
+            self._queue.put_nowait(item)
+            return None
+        if self.paused and self._queue.qsize() <= self.lowWater:
+            self.paused = False
+            self.transport.resume_reading()
+        if isinstance(item, BaseException):
+            raise item
+        return item
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        message = await self.get()
+        if message is None:
+            raise StopAsyncIteration
+        return message
@@ -0,0 +1,405 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# Convert decoded objects to plain Python values (dict, list, str, int,
+# bool, None, and bytes) suitable for logging, JSON, or msgpack.
+#
+# A conversion plan is computed once for each schema type from its
+# componentType and reused for every value of that type.  Known OIDs
+# are shown with the names of the constants in the modules of this
+# package, and open types are decoded through the maps in opentypemap.
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+
+import base64
+import json
+import sys
+import types
+
+from pyasn1 import error
+from pyasn1.codec.der.decoder import decode as der_decoder
+from pyasn1.type import char
+from pyasn1.type import univ
+from pyasn1.type import useful
+
+from pyasn1_alt_modules import opentypemap
+
+
+# OCTET STRING fields holding DER that is defined by a sibling field,
+# by (governing field name, field name), and the map to decode it with.
+
+wrappedOctetStrings = {
+    ('extnID', 'extnValue'): 'certificateExtensionsMap',
+}
+
+
+_oidIndex = {}
+_oidCandidates = {}
+_moduleImports = {}
+_moduleCount = [0]
+
+
+def _rfcNumber(moduleName):
+    digits = moduleName.rsplit('.', 1)[-1][3:]
+    return int(digits) if digits.isdigit() else 0
+
+
+def _bestName(candidates):
+    """Return the name of an OID given the (module, name, object)
+    candidates for it, in the order in which they were found."""
+    objects = {}
+    for candidate in candidates:
+        objects.setdefault(id(candidate[2]), []).append(candidate)
+
+    best = None
+    for group in objects.values():
+        modules = set(candidate[0] for candidate in group)
+        # The module that defines a constant does not import it from
+        # the other modules that hold the same object.
+        definers = [candidate for candidate in group
+                    if not _moduleImports[candidate[0]] & modules]
+        definer = (definers or group)[0]
+        rank = (len(modules), _rfcNumber(definer[0]))
+        if best is None or rank > best[0]:
+            best = (rank, definer[1])
+    return best[1]
+
+
+def _refreshOidIndex():
+    if len(sys.modules) == _moduleCount[0]:
+        return
+    _moduleCount[0] = len(sys.modules)
+
+    changed = set()
+    for name, module in list(sys.modules.items()):
+        if not name.startswith('pyasn1_alt_modules.rfc'):
+            continue
+        if name in _moduleImports or module is None:
+            continue
+        _moduleImports[name] = set(
+            value.__name__ for value in vars(module).values()
+            if isinstance(value, types.ModuleType))
+        for attr, value in vars(module).items():
+            if (isinstance(value, univ.ObjectIdentifier) and
+                    not attr.startswith('_') and value.isValue):
+                _oidCandidates.setdefault(value, []).append(
+                    (name, attr, value))
+                changed.add(value)
+
+    for oid in changed:
+        _oidIndex[oid] = _bestName(_oidCandidates[oid])
+
+
+def oidName(oid):
+    """Return the constant name of a known OID, or None.
+
+    Only the modules of this package that are already imported are
+    consulted; the index is extended when more modules are imported.
+    The name is the one given by the module that defines the constant,
+    not by the modules that import it under another name.  When several
+    modules define the OID on their own, the definition that the most
+    modules share is used, and then the one from the most recent RFC.
+    """
+    _refreshOidIndex()
+    return _oidIndex.get(oid)
+
+
+# Returned by the plans for components that have no value.
+_ABSENT = object()
+
+
+class Converter(object):
+    """Convert decoded pyasn1 objects to native Python values.
+
+    The bytesMode selects how OCTET STRING values and undecoded open
+    types appear: 'hex' and 'base64' give text for JSON, while 'bytes'
+    keeps them as bytes, which msgpack can carry directly.  With
+    oidNames=True, OIDs with a known constant name are given as that
+    name instead of the dotted string.  With openTypes=True, open types
+    and wrapped extension values are decoded using opentypemap; open
+    types that the decoder has already decoded, as with
+    decodeOpenTypes=True, are converted as they are.
+
+    Every call returns new dicts and lists, which the caller may change.
+    """
+
+    def __init__(self, bytesMode='hex', oidNames=True, openTypes=True):
+        if bytesMode == 'hex':
+            self._bytes = bytes.hex
+        elif bytesMode == 'base64':
+            self._bytes = lambda value: base64.b64encode(value).decode('ascii')
+        elif bytesMode == 'bytes':
+            self._bytes = bytes
+        else:
+            raise error.PyAsn1Error('Unknown bytesMode %r' % (bytesMode,))
+        self.oidNames = oidNames
+        self.openTypes = openTypes
+        self._plans = {}
+        self._oids = {}
+        self._oidModules = 0
+
+    def toNative(self, asn1Object):
+        """Return the native Python value of a pyasn1 object."""
+        if len(sys.modules) != self._oidModules:
+            # More modules may give names to more OIDs.
+            self._oidModules = len(sys.modules)
+            self._oids.clear()
+        result = self._plan(asn1Object)(asn1Object)
+        if result is _ABSENT:
+            return None
+        return result
+
+    def toJson(self, asn1Object, **options):
+        """Return the JSON text for a pyasn1 object."""
+        return json.dumps(self.toNative(asn1Object), **options)
+
+    # Plans are cached by type and by the identity of the schema parts
+    # that they depend on; the schema objects are kept in the cache so
+    # that their identities are not reused.  The plans read the values
+    # of the pyasn1 objects directly, which saves the checks that the
+    # accessors make for every component.
+
+    def _plan(self, asn1Object):
+        componentType = getattr(asn1Object, 'componentType', None)
+        namedValues = getattr(asn1Object, 'namedValues', None)
+        key = (asn1Object.__class__, id(componentType), id(namedValues))
+        try:
+            return self._plans[key][0]
+        except KeyError:
+            pass
+
+        plan = self._buildPlan(asn1Object)
+        self._plans[key] = (plan, componentType, namedValues)
+        return plan
+
+    def _buildPlan(self, asn1Object):
+        if isinstance(asn1Object, (univ.Sequence, univ.Set)):
+            return self._recordPlan(asn1Object.componentType)
+        if isinstance(asn1Object, (univ.SequenceOf, univ.SetOf)):
+            return self._listPlan(asn1Object.componentType)
+        if isinstance(asn1Object, univ.Choice):
+            return self._choicePlan(asn1Object.componentType)
+        if isinstance(asn1Object, univ.Boolean):
+            return self._simplePlan(bool)
+        if isinstance(asn1Object, (univ.Integer, univ.Enumerated)):
+            return self._integerPlan(asn1Object.namedValues)
+        if isinstance(asn1Object, univ.ObjectIdentifier):
+            return self._simplePlan(self._oid)
+        if isinstance(asn1Object, univ.Null):
+            return self._simplePlan(lambda value: None)
+        if isinstance(asn1Object, univ.Real):
+            return lambda value: float(value) if value.isValue else _ABSENT
+        if isinstance(asn1Object, univ.BitString):
+            return self._bitStringPlan(asn1Object.namedValues)
+        if isinstance(asn1Object, (char.AbstractCharacterString,
+                                   useful.ObjectDescriptor)):
+            return self._simplePlan(str)
+        if isinstance(asn1Object, (univ.OctetString, univ.Any)):
+            return self._simplePlan(self._bytes)
+        if isinstance(asn1Object, univ.RelativeOID):
+            return lambda value: str(value) if value.isValue else _ABSENT
+
+        return lambda value: value.prettyPrint() if value.isValue else _ABSENT
+
+    def _simplePlan(self, convertValue):
+        noValue = univ.noValue
+
+        def convert(value):
+            value = value._value
+            if value is noValue:
+                return _ABSENT
+            return convertValue(value)
+
+        return convert
+
+    def _oid(self, arcs):
+        try:
+            return self._oids[arcs]
+        except KeyError:
+            pass
+        text = '.'.join([str(arc) for arc in arcs])
+        if self.oidNames:
+            text = oidName(univ.ObjectIdentifier(arcs)) or text
+        self._oids[arcs] = text
+        return text
+
+    def _integerPlan(self, namedValues):
+        if not namedValues:
+            return self._simplePlan(int)
+
+        names = dict((int(number), name) for name, number in namedValues.items())
+        return self._simplePlan(lambda value: names.get(value, value))
+
+    def _bitStringPlan(self, namedValues):
+        toBytes = self._bytes
+        if namedValues:
+            names = sorted((int(bit), name) for name, bit in namedValues.items())
+
+            def convert(value):
+                if not value.isValue:
+                    return _ABSENT
+                return [name for bit, name in names
+                        if bit < len(value) and value[bit]]
+
+            return convert
+
+        def convert(value):
+            if not value.isValue:
+                return _ABSENT
+            if len(value) % 8:
+                return str(value)
+            return toBytes(value.asOctets())
+
+        return convert
+
+    def _listPlan(self, componentType):
+        plan = self._plan
+        childPlan = [None]
+        noValue = univ.noValue
+        # The items of a SET OF ANY can be decoded to different types.
+        dynamic = isinstance(componentType, univ.Any)
+
+        def convert(value):
+            items = value._componentValues
+            if items is noValue:
+                return _ABSENT
+            if not items:
+                return []
+            try:
+                items = [items[index] for index in range(len(items))]
+            except KeyError:
+                items = list(value)
+            if dynamic:
+                return [plan(item)(item) for item in items]
+            if childPlan[0] is None:
+                childPlan[0] = plan(items[0])
+            convertItem = childPlan[0]
+            return [convertItem(item) for item in items]
+
+        return convert
+
+    def _choicePlan(self, namedTypes):
+        names = [namedType.name for namedType in namedTypes.namedTypes]
+        childPlans = [None] * len(names)
+        plan = self._plan
+
+        def convert(value):
+            index = value._currentIdx
+            if index is None:
+                return _ABSENT
+            component = value._componentValues[index]
+            childPlan = childPlans[index]
+            if childPlan is None:
+                childPlan = childPlans[index] = plan(component)
+            result = childPlan(component)
+            if result is _ABSENT:
+                return _ABSENT
+            return {names[index]: result}
+
+        return convert
+
+    def _recordPlan(self, namedTypes):
+        fields = []
+        for position, namedType in enumerate(namedTypes.namedTypes):
+            openType = namedType.openType
+            typeMap = governing = None
+            wrapped = False
+            if self.openTypes and openType is not None:
+                typeMap = openType
+                governing = namedTypes.getPositionByName(openType.name)
+            elif self.openTypes:
+                for (governingName, fieldName), mapName in wrappedOctetStrings.items():
+                    if fieldName == namedType.name and governingName in namedTypes:
+                        typeMap = opentypemap.get(mapName)
+                        governing = namedTypes.getPositionByName(
+                            governingName)
+                        wrapped = True
+            # An ANY component may hold a value of any decoded type.
+            if typeMap is None and isinstance(namedType.asn1Object, univ.Any):
+                typeMap = False
+            fields.append((position, namedType.name, typeMap, governing,
+                           wrapped))
+
+        # The plans of the components are found on first use, which
+        # also copes with recursive types.
+        childPlans = [None] * len(fields)
+        plan = self._plan
+        openValue = self._openValue
+        noValue = univ.noValue
+
+        def convert(value):
+            components = value._componentValues
+            if components is noValue:
+                return _ABSENT
+            result = {}
+            for component, (index, name, typeMap, governing,
+                            wrapped) in zip(components, fields):
+                if component is noValue:
+                    continue
+                if typeMap is None:
+                    childPlan = childPlans[index]
+                    if childPlan is None:
+                        childPlan = childPlans[index] = plan(component)
+                    converted = childPlan(component)
+                elif typeMap is False:
+                    converted = plan(component)(component)
+                else:
+                    converted = openValue(component, typeMap,
+                                          components[governing], wrapped)
+                if converted is not _ABSENT:
+                    result[name] = converted
+            return result
+
+        return convert
+
+    def _openValue(self, component, typeMap, governingValue, wrapped):
+        if isinstance(component, (univ.SetOf, univ.SequenceOf)):
+            if not component.isValue:
+                return _ABSENT
+            return [self._openValue(item, typeMap, governingValue, wrapped)
+                    for item in component]
+
+        if not wrapped and not isinstance(component, univ.Any):
+            # Decoded already, as with decodeOpenTypes=True.
+            return self._plan(component)(component)
+
+        if not component.isValue:
+            return _ABSENT
+
+        try:
+            asn1Spec = typeMap[governingValue]
+        except (KeyError, TypeError):
+            asn1Spec = None
+
+        if asn1Spec is not None:
+            try:
+                decoded, rest = der_decoder(
+                    component.asOctets(), asn1Spec=asn1Spec)
+            except error.PyAsn1Error:
+                decoded, rest = None, None
+
+            if decoded is not None and not rest:
+                return self._plan(decoded)(decoded)
+
+        return self._bytes(component.asOctets())
+
+
+_defaultConverter = Converter()
+
+
+def toNative(asn1Object, **options):
+    """Return native Python values for a decoded object.
+
+    The options are those of Converter; without options a shared
+    converter is used, so its plans are reused from call to call.
+    """
+    if options:
+        return Converter(**options).toNative(asn1Object)
+    return _defaultConverter.toNative(asn1Object)
+
+
+def toJson(asn1Object, **options):
+    """Return JSON text for a decoded object, using the hex bytesMode."""
+    return json.dumps(_defaultConverter.toNative(asn1Object), **options)
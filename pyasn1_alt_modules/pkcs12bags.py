@@ -0,0 +1,219 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# Walk the SafeBags of a PKCS #12 PFX (RFC 7292) without decoding them.
+# The PFX, its AuthenticatedSafe, and each SafeContents are located with
+# the tlv helpers; a bag is only decoded with pyasn1 when it is asked
+# for, so keystores holding thousands of certificates can be scanned
+# quickly and with little memory.  Encrypted SafeContents are passed to
+# a caller-supplied function, since the keys for them are not known here.
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+
+from pyasn1 import error
+from pyasn1.codec.ber.decoder import decode as ber_decoder
+from pyasn1.codec.der.decoder import decode as der_decoder
+
+from pyasn1_alt_modules import certfields
+from pyasn1_alt_modules import rfc5652
+from pyasn1_alt_modules import rfc7292
+from pyasn1_alt_modules import tlv
+
+
+_DATA = certfields.oidTlv(rfc5652.id_data)
+_CERT_BAG = certfields.oidTlv(rfc7292.id_certBag)
+_SAFE_CONTENTS_BAG = certfields.oidTlv(rfc7292.id_safeContentsBag)
+_X509_CERTIFICATE = certfields.oidTlv(rfc7292.x509Certificate['certId'])
+
+_oids = {}
+
+
+def _oid(encoding):
+    """Return the ObjectIdentifier for a DER OID TLV, reusing the
+    objects for the few OIDs that occur in a keystore."""
+    encoding = bytes(encoding)
+    try:
+        return _oids[encoding]
+    except KeyError:
+        pass
+    oid, rest = der_decoder(encoding, asn1Spec=rfc7292.AttributeType())
+    if len(_oids) < 1024:
+        _oids[encoding] = oid
+    return oid
+
+
+def _content(substrate, offset):
+    """Return the octets of the [0] EXPLICIT OCTET STRING at offset,
+    without copying when the OCTET STRING is primitive."""
+    tag, valueOffset, valueEnd, tlvEnd = tlv.readTlv(substrate, offset)
+    if tag != tlv.contextTag(0):
+        raise error.PyAsn1Error('Expected [0] content at offset %d' % offset)
+    octetString = valueOffset
+    tag, valueOffset, valueEnd, tlvEnd = tlv.readTlv(substrate, octetString)
+    if tag == tlv.OCTET_STRING:
+        return substrate[valueOffset:valueEnd]
+    if tag == tlv.CONSTRUCTED_OCTET_STRING:
+        return memoryview(tlv.stringValue(substrate, octetString))
+    raise error.PyAsn1Error('Expected an OCTET STRING at offset %d' % offset)
+
+
+class LazySafeBag(object):
+    """One SafeBag, with its bagValue left encoded.
+
+    The bagId is an ObjectIdentifier, attributes is a list of
+    (attrType, [encoded values]) pairs, and bagValue is a memoryview of
+    the DER encoding inside the [0] tag.  A LazySafeBag unpacks as the
+    tuple (bagId, attributes, bagValue).
+    """
+
+    __slots__ = ('bagId', 'attributes', 'bagValue')
+
+    def __init__(self, bagId, attributes, bagValue):
+        self.bagId = bagId
+        self.attributes = attributes
+        self.bagValue = bagValue
+
+    def __iter__(self):
+        return iter((self.bagId, self.attributes, self.bagValue))
+
+    def __repr__(self):
+        return '%s(bagId=%s, %d attributes, %d octets)' % (
+            self.__class__.__name__, self.bagId, len(self.attributes),
+            len(self.bagValue))
+
+    def attribute(self, attrType):
+        """Return the encoded values of an attribute, or None."""
+        for candidate, values in self.attributes:
+            if candidate == attrType:
+                return values
+        return None
+
+    @property
+    def friendlyName(self):
+        """The friendlyName attribute as str, or None."""
+        values = self.attribute(rfc7292.pkcs_9_at_friendlyName)
+        if not values:
+            return None
+        return tlv.stringValue(values[0]).decode('utf-16-be')
+
+    @property
+    def localKeyId(self):
+        """The localKeyId attribute as bytes, or None."""
+        values = self.attribute(rfc7292.pkcs_9_at_localKeyId)
+        if not values:
+            return None
+        return tlv.stringValue(values[0])
+
+    def decode(self):
+        """Decode the bagValue using rfc7292 pkcs12BagTypeMap."""
+        try:
+            asn1Spec = rfc7292.pkcs12BagTypeMap[self.bagId]
+        except KeyError:
+            raise error.PyAsn1Error('Unknown bagId %s' % (self.bagId,))
+        if self.bagId == rfc7292.id_safeContentsBag:
+            asn1Spec = rfc7292.SafeContents()
+        asn1Object, rest = ber_decoder(bytes(self.bagValue),
+                                       asn1Spec=asn1Spec)
+        if rest:
+            raise error.PyAsn1Error('Extra octets after the bagValue')
+        return asn1Object
+
+
+def _iterSafeContents(substrate, decrypt):
+    """Yield the SafeContents octets of each ContentInfo in a PFX."""
+    substrate = memoryview(substrate)
+    pfx = tlv.children(substrate)
+    if len(pfx) < 2 or pfx[0][1] != tlv.INTEGER:
+        raise error.PyAsn1Error('Not a PFX')
+
+    authSafe = tlv.children(substrate, pfx[1][0])
+    if bytes(substrate[authSafe[0][0]:authSafe[0][4]]) != _DATA:
+        raise error.PyAsn1Error(
+            'Only the password integrity mode (id-data authSafe) is supported')
+    authenticatedSafe = _content(substrate, authSafe[1][0])
+
+    sequence = tlv.readTlv(authenticatedSafe)
+    for offset, tag, valueOffset, valueEnd, tlvEnd in tlv.iterTlvs(
+            authenticatedSafe, sequence[1], sequence[2]):
+        contentInfo = tlv.children(authenticatedSafe, offset)
+        contentType = authenticatedSafe[contentInfo[0][0]:contentInfo[0][4]]
+        if bytes(contentType) == _DATA:
+            yield _content(authenticatedSafe, contentInfo[1][0])
+        elif decrypt is not None:
+            plaintext = decrypt(_oid(contentType),
+                                authenticatedSafe[offset:tlvEnd])
+            if plaintext is not None:
+                yield memoryview(bytes(plaintext))
+
+
+def _iterBags(safeContents, nested):
+    """Yield (substrate, bagIdTlv, bagValueOffset, attributesItem)."""
+    sequence = tlv.readTlv(safeContents)
+    for offset, tag, valueOffset, valueEnd, tlvEnd in tlv.iterTlvs(
+            safeContents, sequence[1], sequence[2]):
+        members = tlv.children(safeContents, offset)
+        bagId = safeContents[members[0][0]:members[0][4]]
+        if nested and bytes(bagId) == _SAFE_CONTENTS_BAG:
+            inner = tlv.readTlv(safeContents, members[1][0])
+            for bag in _iterBags(safeContents[inner[1]:inner[2]], nested):
+                yield bag
+            continue
+        yield (safeContents, bagId, members[1][0],
+               members[2] if len(members) > 2 else None)
+
+
+def _attributes(substrate, item):
+    if item is None:
+        return []
+    attributes = []
+    for offset, tag, valueOffset, valueEnd, tlvEnd in tlv.iterTlvs(
+            substrate, item[2], item[3]):
+        attrType, attrValues = tlv.children(substrate, offset)
+        attributes.append((
+            _oid(substrate[attrType[0]:attrType[4]]),
+            [substrate[value[0]:value[4]] for value in tlv.iterTlvs(
+                substrate, attrValues[2], attrValues[3])]))
+    return attributes
+
+
+def iterSafeBags(pfx, decrypt=None, nested=True):
+    """Yield a LazySafeBag for each SafeBag of a DER or BER encoded PFX.
+
+    SafeContents in id-data ContentInfo are read directly.  Any other
+    ContentInfo, such as the EncryptedData that most tools use for
+    certificates, is passed to decrypt(contentType, contentInfo) with
+    the encoded ContentInfo; it returns the decrypted SafeContents
+    encoding, or None to skip it.  Without decrypt, encrypted
+    SafeContents are skipped.  With nested=True, the bags inside a
+    safeContentsBag are yielded in place of that bag.
+    """
+    for safeContents in _iterSafeContents(pfx, decrypt):
+        for substrate, bagId, bagValueOffset, attributes in _iterBags(
+                safeContents, nested):
+            tag, valueOffset, valueEnd, tlvEnd = tlv.readTlv(
+                substrate, bagValueOffset)
+            yield LazySafeBag(_oid(bagId), _attributes(substrate, attributes),
+                              substrate[valueOffset:valueEnd])
+
+
+def certificates(pfx, decrypt=None):
+    """Return the DER encoding of every X.509 certificate in a PFX.
+
+    Only certBags are examined; key bags and the other bags are skipped
+    without being decoded.  The decrypt function is as for
+    iterSafeBags().
+    """
+    result = []
+    for safeContents in _iterSafeContents(pfx, decrypt):
+        for substrate, bagId, bagValueOffset, attributes in _iterBags(
+                safeContents, True):
+            if bagId != _CERT_BAG:
+                continue
+            certBag = tlv.readTlv(substrate, bagValueOffset)[1]
+            members = tlv.children(substrate, certBag)
+            if substrate[members[0][0]:members[0][4]] != _X509_CERTIFICATE:
+                continue
+            result.append(bytes(_content(substrate, members[1][0])))
+    return result
@@ -0,0 +1,141 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# Rebuild the TBSCertificate that a Certificate Transparency log signs
+# (RFC 6962 Section 3.2) by splicing the original DER.  Extensions are
+# removed or replaced, and the issuer can be swapped for precertificates
+# that were issued by a Precertificate Signing Certificate.  Only the
+# lengths of the enclosing TLVs are recomputed; everything else is
+# copied from the input, so the result is the same as decoding the
+# certificate, changing it, and encoding it again with DER.
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+
+from pyasn1 import error
+from pyasn1.codec.der.encoder import encode as der_encoder
+
+from pyasn1_alt_modules import certfields
+from pyasn1_alt_modules import rfc5280
+from pyasn1_alt_modules import rfc6962
+from pyasn1_alt_modules import tlv
+
+
+def _encoded(asn1Object):
+    if isinstance(asn1Object, (bytes, bytearray, memoryview)):
+        return bytes(asn1Object)
+    return der_encoder(asn1Object)
+
+
+def rewriteTbs(substrate, removeExtensions=(), replaceExtensions=(),
+               issuer=None, offset=0):
+    """Return a new DER TBSCertificate with the requested changes.
+
+    The substrate holds a DER Certificate or TBSCertificate.  The
+    removeExtensions are extnIDs to drop if present; replaceExtensions
+    are rfc5280.Extension objects (or their DER encodings) that take
+    the place of the extension with the same extnID, which must be
+    present.  The issuer, if given, is an rfc5280.Name or its DER
+    encoding.  If every extension is removed, the extensions field is
+    left out, as DER requires.
+    """
+    substrate = memoryview(substrate)
+    tbsOffset, tbsEnd = certfields.tbsCertificate(substrate, offset)
+    fields = certfields.tbsFields(substrate, offset)
+
+    removals = set(certfields.oidTlv(extnID) for extnID in removeExtensions)
+    replacements = {}
+    for extension in replaceExtensions:
+        encoded = _encoded(extension)
+        extnIDOffset = tlv.readTlv(encoded)[1]
+        extnIDEnd = tlv.readTlv(encoded, extnIDOffset)[3]
+        replacements[encoded[extnIDOffset:extnIDEnd]] = encoded
+
+    changes = []
+
+    if issuer is not None:
+        item = fields['issuer']
+        changes.append((item[0], item[4], _encoded(issuer)))
+
+    if removals or replacements:
+        if 'extensions' not in fields:
+            if replacements:
+                raise error.PyAsn1Error('The certificate has no extensions')
+        else:
+            item = fields['extensions']
+            kept = []
+            for extnID, critical, extnValue, extnOffset, extnEnd in \
+                    certfields.iterExtensions(substrate, offset):
+                extnID = bytes(extnID)
+                if extnID in replacements:
+                    kept.append(replacements.pop(extnID))
+                elif extnID not in removals:
+                    kept.append(substrate[extnOffset:extnEnd])
+            if replacements:
+                raise error.PyAsn1Error(
+                    'The certificate does not have the extensions to replace')
+            if kept:
+                extensions = tlv.encodeTlv(
+                    tlv.contextTag(3),
+                    tlv.encodeTlv(tlv.SEQUENCE, b''.join(kept)))
+            else:
+                extensions = b''
+            changes.append((item[0], item[4], extensions))
+
+    tag, valueOffset, valueEnd, tlvEnd = tlv.readTlv(substrate, tbsOffset)
+    parts = []
+    position = valueOffset
+    for start, end, replacement in sorted(changes, key=lambda x: x[0]):
+        parts.append(substrate[position:start])
+        parts.append(replacement)
+        position = end
+    parts.append(substrate[position:valueEnd])
+
+    return tlv.encodeTlv(tlv.SEQUENCE, b''.join(parts))
+
+
+def removeExtension(substrate, extnID, offset=0):
+    """Return the DER TBSCertificate without the extnID extension."""
+    return rewriteTbs(substrate, removeExtensions=[extnID], offset=offset)
+
+
+def replaceExtension(substrate, extension, offset=0):
+    """Return the DER TBSCertificate with one extension replaced."""
+    return rewriteTbs(substrate, replaceExtensions=[extension], offset=offset)
+
+
+def replaceIssuer(substrate, issuer, offset=0):
+    """Return the DER TBSCertificate with a different issuer Name."""
+    return rewriteTbs(substrate, issuer=issuer, offset=offset)
+
+
+def precertTbs(substrate, issuer=None, authorityKeyIdentifier=None,
+               offset=0):
+    """Return the TBSCertificate that a CT log signs for an SCT.
+
+    The substrate is a final certificate with embedded SCTs or a
+    precertificate; the id_ce_embeddedSCT and id_ce_criticalPoison
+    extensions are removed.  When the precertificate was issued by a
+    Precertificate Signing Certificate, pass the issuer Name and the
+    authority key identifier Extension of that certificate's issuer.
+    """
+    replaceExtensions = []
+    if authorityKeyIdentifier is not None:
+        replaceExtensions.append(authorityKeyIdentifier)
+
+    return rewriteTbs(
+        substrate,
+        removeExtensions=[rfc6962.id_ce_embeddedSCT,
+                          rfc6962.id_ce_criticalPoison],
+        replaceExtensions=replaceExtensions, issuer=issuer, offset=offset)
+
+
+def authorityKeyIdentifierExtension(keyIdentifier):
+    """Return the DER Extension for an authority key identifier."""
+    akid = rfc5280.AuthorityKeyIdentifier()
+    akid['keyIdentifier'] = keyIdentifier
+    extension = rfc5280.Extension()
+    extension['extnID'] = rfc5280.id_ce_authorityKeyIdentifier
+    extension['extnValue'] = der_encoder(akid)
+    return der_encoder(extension)
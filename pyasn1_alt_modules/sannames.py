@@ -0,0 +1,296 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# Fast extraction of the names in a GeneralNames value (RFC 5280), such
+# as the subjectAltName extension of a multi-domain certificate with
+# thousands of dNSName entries.  The GeneralName TLVs are read directly
+# and sorted into typed lists by their tag, without making an
+# rfc5280.GeneralName for each of them; an otherName is kept encoded,
+# by its type-id, until it is decoded through the otherNamesMap.  A
+# HostnameIndex then answers repeated hostname checks, including the
+# wildcard names of RFC 6125, and the subtree checks of DNS name
+# constraints.
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+
+import bisect
+import ipaddress
+
+from pyasn1 import error
+from pyasn1.codec.der.decoder import decode as der_decoder
+from pyasn1.type import univ
+
+from pyasn1_alt_modules import certfields
+from pyasn1_alt_modules import opentypemap
+from pyasn1_alt_modules import rfc5280
+from pyasn1_alt_modules import snmpfast
+from pyasn1_alt_modules import tlv
+
+
+OTHER_NAME = tlv.contextTag(0)
+RFC822_NAME = tlv.contextTag(1, False)
+DNS_NAME = tlv.contextTag(2, False)
+X400_ADDRESS = tlv.contextTag(3)
+DIRECTORY_NAME = tlv.contextTag(4)
+EDI_PARTY_NAME = tlv.contextTag(5)
+URI = tlv.contextTag(6, False)
+IP_ADDRESS = tlv.contextTag(7, False)
+REGISTERED_ID = tlv.contextTag(8, False)
+
+otherNamesMap = opentypemap.get('otherNamesMap')
+
+_oids = {}
+
+
+def _oid(content):
+    """Return the dotted string for the content octets of an OID,
+    reusing the strings for the few type-ids that occur."""
+    content = bytes(content)
+    try:
+        return _oids[content]
+    except KeyError:
+        pass
+    oid = snmpfast.decodeOid(content)
+    if len(_oids) < 1024:
+        _oids[content] = oid
+    return oid
+
+
+def _ia5(substrate, valueOffset, valueEnd):
+    try:
+        return str(substrate[valueOffset:valueEnd], 'ascii')
+    except UnicodeDecodeError:
+        raise error.PyAsn1Error(
+            'IA5String with non-ASCII octets at offset %d' % valueOffset)
+
+
+class SubjectAltNames(object):
+    """The names of a GeneralNames value, sorted by their kind.
+
+    The dns, email and uri lists hold the dNSName, rfc822Name and
+    uniformResourceIdentifier strings, ip holds ipaddress objects, and
+    registeredID holds dotted OID strings.  The directoryName,
+    x400Address and ediPartyName lists hold the TLVs of those names as
+    memoryview slices of the substrate.  The otherName dict maps each
+    type-id, as a dotted string, to the list of the TLVs within the [0]
+    EXPLICIT value of its names.  The names keep the order of the
+    substrate within each list.
+    """
+
+    __slots__ = ('dns', 'ip', 'uri', 'email', 'registeredID',
+                 'directoryName', 'x400Address', 'ediPartyName', 'otherName')
+
+    def __init__(self):
+        self.dns = []
+        self.ip = []
+        self.uri = []
+        self.email = []
+        self.registeredID = []
+        self.directoryName = []
+        self.x400Address = []
+        self.ediPartyName = []
+        self.otherName = {}
+
+    def __len__(self):
+        return (len(self.dns) + len(self.ip) + len(self.uri) +
+                len(self.email) + len(self.registeredID) +
+                len(self.directoryName) + len(self.x400Address) +
+                len(self.ediPartyName) +
+                sum(len(values) for values in self.otherName.values()))
+
+    def __repr__(self):
+        return '%s(dns=%d, ip=%d, uri=%d, email=%d, otherName=%d)' % (
+            self.__class__.__name__, len(self.dns), len(self.ip),
+            len(self.uri), len(self.email),
+            sum(len(values) for values in self.otherName.values()))
+
+    def otherNames(self, typeId):
+        """Return the otherName values of typeId decoded with the type
+        registered for it in the otherNamesMap, or as univ.Any when
+        none is registered."""
+        typeId = univ.ObjectIdentifier(typeId)
+        asn1Spec = otherNamesMap.get(typeId, univ.Any())
+        values = []
+        for value in self.otherName.get(str(typeId), ()):
+            asn1Object, rest = der_decoder(bytes(value), asn1Spec=asn1Spec)
+            values.append(asn1Object)
+        return values
+
+    def directoryNames(self):
+        """Return the directoryName values as rfc5280.Name objects."""
+        return [der_decoder(bytes(value), asn1Spec=rfc5280.Name())[0]
+                for value in self.directoryName]
+
+    def hostnameIndex(self):
+        """Return a HostnameIndex of the dNSName entries."""
+        return HostnameIndex(self.dns)
+
+
+def parseGeneralNames(substrate, offset=0):
+    """Return the SubjectAltNames of the GeneralNames at offset.
+
+    The substrate may be the extnValue of a subjectAltName or
+    issuerAltName extension, as returned by certfields.findExtension.
+    """
+    substrate = memoryview(substrate)
+    tag, valueOffset, valueEnd, tlvEnd = tlv.readTlv(substrate, offset)
+    if tag != tlv.SEQUENCE:
+        raise error.PyAsn1Error('GeneralNames must be a SEQUENCE')
+
+    names = SubjectAltNames()
+    for nameOffset, tag, valueOffset, valueEnd, nameEnd in tlv.iterTlvs(
+            substrate, valueOffset, valueEnd):
+        if tag == DNS_NAME:
+            names.dns.append(_ia5(substrate, valueOffset, valueEnd))
+        elif tag == IP_ADDRESS:
+            if valueEnd - valueOffset not in (4, 16):
+                raise error.PyAsn1Error(
+                    'iPAddress of %d octets at offset %d' %
+                    (valueEnd - valueOffset, nameOffset))
+            names.ip.append(ipaddress.ip_address(
+                bytes(substrate[valueOffset:valueEnd])))
+        elif tag == URI:
+            names.uri.append(_ia5(substrate, valueOffset, valueEnd))
+        elif tag == RFC822_NAME:
+            names.email.append(_ia5(substrate, valueOffset, valueEnd))
+        elif tag == OTHER_NAME:
+            members = tlv.children(substrate, nameOffset)
+            if len(members) != 2 or \
+                    members[0][1] != tlv.OBJECT_IDENTIFIER or \
+                    members[1][1] != tlv.contextTag(0):
+                raise error.PyAsn1Error(
+                    'Malformed otherName at offset %d' % nameOffset)
+            # The [0] EXPLICIT value holds exactly one TLV.
+            value = tlv.children(substrate, members[1][0])
+            if len(value) != 1:
+                raise error.PyAsn1Error(
+                    'Malformed otherName value at offset %d' % nameOffset)
+            names.otherName.setdefault(
+                _oid(substrate[members[0][2]:members[0][3]]), []).append(
+                    substrate[value[0][0]:value[0][4]])
+        elif tag == DIRECTORY_NAME:
+            names.directoryName.append(substrate[valueOffset:valueEnd])
+        elif tag == REGISTERED_ID:
+            names.registeredID.append(_oid(substrate[valueOffset:valueEnd]))
+        elif tag == X400_ADDRESS:
+            names.x400Address.append(substrate[nameOffset:nameEnd])
+        elif tag == EDI_PARTY_NAME:
+            names.ediPartyName.append(substrate[nameOffset:nameEnd])
+        else:
+            raise error.PyAsn1Error(
+                'Unknown GeneralName tag 0x%02X at offset %d' %
+                (tag, nameOffset))
+    return names
+
+
+def subjectAltNames(substrate, offset=0,
+                    extnID=rfc5280.id_ce_subjectAltName):
+    """Return the SubjectAltNames of a DER encoded certificate, or None
+    when it has no subjectAltName extension.  The issuerAltName can be
+    read by giving its extnID instead."""
+    extnValue = certfields.findExtension(substrate, extnID, offset)
+    if extnValue is None:
+        return None
+    return parseGeneralNames(extnValue)
+
+
+def _reversed(name):
+    """Return a key that sorts the names of a subtree together, such as
+    'com.example.www' for 'www.example.com'."""
+    return '.'.join(reversed(name.split('.')))
+
+
+def _normalize(name):
+    return name.lower().rstrip('.')
+
+
+class HostnameIndex(object):
+    """An index of DNS names for hostname and name constraint checks.
+
+    The names are compared without regard to case or a trailing dot.
+    A name of the form '*.example.com' is a wildcard that matches a
+    single label in its place, as in RFC 6125, so it matches
+    'www.example.com' but not 'example.com' or 'a.b.example.com'.
+    Other wildcard forms, such as 'w*.example.com', match only
+    themselves.
+    """
+
+    def __init__(self, names=()):
+        self.exact = set()
+        self.wildcards = set()
+        self._keys = None
+        for name in names:
+            self.add(name)
+
+    def __len__(self):
+        return len(self.exact) + len(self.wildcards)
+
+    def __contains__(self, hostname):
+        return self.match(hostname)
+
+    def add(self, name):
+        """Add a dNSName to the index."""
+        name = _normalize(name)
+        if name.startswith('*.'):
+            self.wildcards.add(name[2:])
+        else:
+            self.exact.add(name)
+        self._keys = None
+
+    def match(self, hostname):
+        """Tell whether a name of the index matches hostname."""
+        hostname = _normalize(hostname)
+        if hostname in self.exact:
+            return True
+        label, dot, parent = hostname.partition('.')
+        return bool(label and parent) and parent in self.wildcards
+
+    def names(self):
+        """Return the sorted names of the index, with the wildcards in
+        their '*.' form."""
+        return sorted(self.exact.union(
+            '*.' + name for name in self.wildcards))
+
+    def _sortedKeys(self):
+        if self._keys is None:
+            self._keys = sorted(
+                (_reversed(name), name) for name in self.names())
+        return self._keys
+
+    def withinSubtree(self, domain):
+        """Return the sorted names that are within a DNS name constraint.
+
+        As in RFC 5280, a name is within the subtree of 'example.com'
+        when it is 'example.com' or ends with '.example.com'.  A
+        constraint with a leading dot, such as '.example.com', leaves
+        out the domain itself.  Wildcard names are within the subtree
+        of their parent domain.
+        """
+        domain = _normalize(domain)
+        keys = self._sortedKeys()
+        if not domain:
+            return [name for key, name in keys]
+
+        subdomainsOnly = domain.startswith('.')
+        root = _reversed(domain.lstrip('.'))
+        names = []
+        if not subdomainsOnly:
+            index = bisect.bisect_left(keys, (root,))
+            if index < len(keys) and keys[index][0] == root:
+                names.append(keys[index][1])
+        prefix = root + '.'
+        index = bisect.bisect_left(keys, (prefix,))
+        while index < len(keys) and keys[index][0].startswith(prefix):
+            names.append(keys[index][1])
+            index += 1
+        return sorted(names)
+
+    def outside(self, domains):
+        """Return the sorted names that are within none of the DNS name
+        constraints, such as the permitted subtrees of a CA."""
+        within = set()
+        for domain in domains:
+            within.update(self.withinSubtree(domain))
+        return sorted(set(self.names()) - within)
@@ -0,0 +1,197 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# Parse and build the TLS encoded contents of the RFC 6962
+# SignedCertificateTimestampList, which rfc6962.py can only expose as an
+# opaque OCTET STRING.  The same list is carried in the id_ce_embeddedSCT
+# certificate extension and in the id_pkix_ocsp_SCT OCSP extension.
+#
+# Parsing does not copy: the logId, extensions, and signature of each
+# SignedCertificateTimestamp are memoryview slices of the input.
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+
+from pyasn1 import error
+
+from pyasn1_alt_modules import certfields
+from pyasn1_alt_modules import rfc6962
+from pyasn1_alt_modules import tlv
+
+
+# Version, HashAlgorithm, and SignatureAlgorithm values from RFC 5246
+# and RFC 6962
+
+v1 = 0
+
+hashAlgorithmNames = {
+    0: 'none', 1: 'md5', 2: 'sha1', 3: 'sha224', 4: 'sha256',
+    5: 'sha384', 6: 'sha512',
+}
+
+signatureAlgorithmNames = {
+    0: 'anonymous', 1: 'rsa', 2: 'dsa', 3: 'ecdsa',
+}
+
+
+class SignedCertificateTimestamp(object):
+    """One SCT from a SignedCertificateTimestampList.
+
+    The timestamp is in milliseconds since the epoch, as in RFC 6962.
+    """
+
+    __slots__ = ('version', 'logId', 'timestamp', 'extensions',
+                 'hashAlgorithm', 'signatureAlgorithm', 'signature')
+
+    def __init__(self, version=v1, logId=b'', timestamp=0, extensions=b'',
+                 hashAlgorithm=4, signatureAlgorithm=3, signature=b''):
+        self.version = version
+        self.logId = logId
+        self.timestamp = timestamp
+        self.extensions = extensions
+        self.hashAlgorithm = hashAlgorithm
+        self.signatureAlgorithm = signatureAlgorithm
+        self.signature = signature
+
+    def __repr__(self):
+        return '%s(version=%d, logId=%s, timestamp=%d, %s/%s)' % (
+            self.__class__.__name__, self.version, bytes(self.logId).hex(),
+            self.timestamp,
+            hashAlgorithmNames.get(self.hashAlgorithm, self.hashAlgorithm),
+            signatureAlgorithmNames.get(self.signatureAlgorithm,
+                                        self.signatureAlgorithm))
+
+    def __eq__(self, other):
+        if not isinstance(other, SignedCertificateTimestamp):
+            return NotImplemented
+        return self.encode() == other.encode()
+
+    def __hash__(self):
+        return hash(self.encode())
+
+    def encode(self):
+        """Return the TLS encoding of this SCT."""
+        if len(self.logId) != 32:
+            raise error.PyAsn1Error('SCT logId must be 32 octets')
+        return b''.join((
+            bytes((self.version,)),
+            bytes(self.logId),
+            self.timestamp.to_bytes(8, 'big'),
+            len(self.extensions).to_bytes(2, 'big'),
+            bytes(self.extensions),
+            bytes((self.hashAlgorithm, self.signatureAlgorithm)),
+            len(self.signature).to_bytes(2, 'big'),
+            bytes(self.signature),
+        ))
+
+
+def _parseSct(data, offset, end):
+    if end - offset < 47:
+        raise error.SubstrateUnderrunError('Short SignedCertificateTimestamp')
+
+    version = data[offset]
+    if version != v1:
+        raise error.PyAsn1Error('Unsupported SCT version %d' % version)
+
+    logId = data[offset + 1:offset + 33]
+    timestamp = int.from_bytes(data[offset + 33:offset + 41], 'big')
+    length = (data[offset + 41] << 8) | data[offset + 42]
+    position = offset + 43 + length
+    extensions = data[offset + 43:position]
+    if position + 4 > end:
+        raise error.SubstrateUnderrunError('Short SignedCertificateTimestamp')
+
+    hashAlgorithm = data[position]
+    signatureAlgorithm = data[position + 1]
+    length = (data[position + 2] << 8) | data[position + 3]
+    signature = data[position + 4:position + 4 + length]
+    if position + 4 + length != end:
+        raise error.PyAsn1Error('SignedCertificateTimestamp length mismatch')
+
+    return SignedCertificateTimestamp(
+        version, logId, timestamp, extensions, hashAlgorithm,
+        signatureAlgorithm, signature)
+
+
+def iterSctList(data):
+    """Yield each SignedCertificateTimestamp in a TLS encoded list."""
+    data = memoryview(data)
+    if len(data) < 2:
+        raise error.SubstrateUnderrunError('Short SignedCertificateTimestampList')
+
+    end = 2 + ((data[0] << 8) | data[1])
+    if end != len(data):
+        raise error.PyAsn1Error('SignedCertificateTimestampList length mismatch')
+
+    offset = 2
+    while offset < end:
+        if offset + 2 > end:
+            raise error.SubstrateUnderrunError('Short SerializedSCT')
+        sctEnd = offset + 2 + ((data[offset] << 8) | data[offset + 1])
+        if sctEnd > end:
+            raise error.SubstrateUnderrunError('Short SerializedSCT')
+        yield _parseSct(data, offset + 2, sctEnd)
+        offset = sctEnd
+
+
+def parseSctList(data):
+    """Return the list of SignedCertificateTimestamps in a TLS encoded list."""
+    return list(iterSctList(data))
+
+
+def parseExtensionValue(extnValue):
+    """Parse the extnValue of an id_ce_embeddedSCT or id_pkix_ocsp_SCT
+    extension, which is the DER encoding of the
+    rfc6962.SignedCertificateTimestampList OCTET STRING.
+    """
+    extnValue = memoryview(extnValue)
+    tag, valueOffset, valueEnd, tlvEnd = tlv.readTlv(extnValue)
+    if tag != tlv.OCTET_STRING or tlvEnd != len(extnValue):
+        raise error.PyAsn1Error('Not a SignedCertificateTimestampList')
+    return parseSctList(extnValue[valueOffset:valueEnd])
+
+
+def buildSctList(scts):
+    """Return the TLS encoded list for a sequence of SCTs."""
+    serialized = []
+    for sct in scts:
+        encoded = sct.encode()
+        serialized.append(len(encoded).to_bytes(2, 'big'))
+        serialized.append(encoded)
+    data = b''.join(serialized)
+    if not data or len(data) > 0xFFFF:
+        raise error.PyAsn1Error(
+            'SignedCertificateTimestampList must hold 1 to 65535 octets')
+    return len(data).to_bytes(2, 'big') + data
+
+
+def buildExtensionValue(scts):
+    """Return the DER extnValue for an id_ce_embeddedSCT extension."""
+    return tlv.encodeTlv(tlv.OCTET_STRING, buildSctList(scts))
+
+
+def certificateScts(certificate):
+    """Return the embedded SCTs of a DER encoded certificate.
+
+    An empty list is returned if the certificate does not have an
+    id_ce_embeddedSCT extension.
+    """
+    extnValue = certfields.findExtension(certificate, _EMBEDDED_SCT)
+    if extnValue is None:
+        return []
+    return parseExtensionValue(extnValue)
+
+
+def scanCertificates(certificates):
+    """Yield (index, sct) for every embedded SCT in many certificates.
+
+    The certificates are DER encodings; none of them is decoded with
+    pyasn1, and the SCT fields refer into the certificate octets.
+    """
+    for index, certificate in enumerate(certificates):
+        for sct in certificateScts(certificate):
+            yield index, sct
+
+
+_EMBEDDED_SCT = certfields.oidTlv(rfc6962.id_ce_embeddedSCT)
@@ -0,0 +1,539 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# A snapshot of the ASN.1 modules as they are once imported, for worker
+# processes that would otherwise spend most of a second importing them.
+# Most of that time goes to pyasn1 working out the tag maps of every
+# NamedTypes, not to Python.  build() writes the classes, the values,
+# and the opentype maps of the modules to a file with marshal, as a
+# table of objects that refer to one another by index, and load() puts
+# them back together without running the modules.  The file is only
+# used when it was built from the same source files, pyasn1 version,
+# and Python version; otherwise load() returns False and the modules
+# are imported as usual.
+#
+# The few functions of the modules are not written as bytecode; the
+# snapshot names them and their lines, and load() compiles them from
+# the source files of the package.  Still, load() makes objects of the
+# classes that the snapshot names and fills them with its data, so the
+# snapshot path must be as trusted as the source of the package: keep
+# it where only the owner of the installation can write.
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+
+import builtins
+import gc
+import hashlib
+import importlib
+import importlib.util
+import inspect
+import marshal
+import os
+import sys
+import types
+
+import pyasn1
+from pyasn1 import error
+from pyasn1.type import constraint
+from pyasn1.type import namedtype
+
+from pyasn1_alt_modules import opentypemap
+
+
+FORMAT = 2
+
+_PREFIX = 'pyasn1_alt_modules.'
+
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# The kinds of entries in the table.
+_ATOM = 0
+_EXTERNAL = 1
+_TUPLE = 2
+_LIST = 3
+_FROZENSET = 4
+_SET = 5
+_DICT = 6
+_CLASS = 7
+_INSTANCE = 8
+_SUBCLASSED = 9
+_FUNCTION = 10
+_MODULE = 11
+_OPENTYPE_MAP = 12
+_POSTPONED = 13
+
+_ATOM_TYPES = (type(None), bool, int, float, complex, str, bytes)
+
+_SKIPPED_MODULE_NAMES = frozenset(
+    ('__builtins__', '__loader__', '__spec__', '__cached__'))
+
+_SKIPPED_CLASS_NAMES = frozenset(('__dict__', '__weakref__'))
+
+_RECOMPUTE = {
+    '_NamedTypes__nameToPosMap':
+        lambda namedTypes: namedTypes._NamedTypes__computeNameToPosMap(),
+    '_NamedTypes__tagToPosMap':
+        lambda namedTypes: namedTypes._NamedTypes__computeTagToPosMap(),
+    '_NamedTypes__uniqueTagMap':
+        lambda namedTypes: namedTypes._NamedTypes__computeTagMaps(True),
+    '_NamedTypes__nonUniqueTagMap':
+        lambda namedTypes: namedTypes._NamedTypes__computeTagMaps(False),
+}
+
+
+class _PostponedError(namedtype.NamedTypes.PostponedError):
+    """The error that a NamedTypes from a snapshot raises for a tag or a
+    name that is not unique.
+
+    pyasn1 makes the message when the NamedTypes is made, and as it
+    describes all of the types within, the messages of a few hundred of
+    them take more than 20 MB.  This one asks the NamedTypes for the
+    message when the error is raised.
+    """
+
+    def __init__(self, namedTypes, attribute):
+        self._namedTypes = namedTypes
+        self._attribute = attribute
+
+    def __getitem__(self, item):
+        return _RECOMPUTE[self._attribute](self._namedTypes)[item]
+
+
+def allModules():
+    """Return the names of all of the rfc modules, such as 'rfc5280'."""
+    return sorted(
+        name[:-3] for name in os.listdir(_PACKAGE_DIR)
+        if name.startswith('rfc') and name.endswith('.py'))
+
+
+def sourceDigest():
+    """Return the SHA-256 digest of the source files of the package."""
+    digest = hashlib.sha256()
+    for name in sorted(os.listdir(_PACKAGE_DIR)):
+        if name.endswith('.py'):
+            with open(os.path.join(_PACKAGE_DIR, name), 'rb') as source:
+                contents = source.read()
+            digest.update(name.encode() + b'\0')
+            digest.update(b'%d\0' % len(contents))
+            digest.update(contents)
+    return digest.digest()
+
+
+def _header(modules):
+    return (FORMAT, importlib.util.MAGIC_NUMBER, pyasn1.__version__,
+            sourceDigest(), tuple(modules))
+
+
+def _externals():
+    """Index the values that are named in the pyasn1 modules, and in the
+    classes there, such as univ.noValue and univ.Integer.tagSet, so that
+    they are referred to rather than copied."""
+    index = {}
+    for moduleName, module in sorted(list(sys.modules.items())):
+        if module is None or not (moduleName == 'pyasn1' or
+                                  moduleName.startswith('pyasn1.')):
+            continue
+        for name, value in sorted(vars(module).items()):
+            index.setdefault(id(value), (moduleName, name))
+            if isinstance(value, type) and value.__module__ == moduleName:
+                for attribute, member in sorted(vars(value).items()):
+                    index.setdefault(
+                        id(member), (moduleName, name + '.' + attribute))
+    return index
+
+
+class _Writer(object):
+
+    def __init__(self, modules):
+        self.modules = dict((id(module), name) for name, module in modules)
+        self.moduleNames = set(module.__name__ for name, module in modules)
+        self.externals = _externals()
+        self.table = []
+        self.index = {}
+        self.atoms = {}
+        self.pending = []
+        self.postponed = []
+        self.owners = {}
+
+    def ref(self, value):
+        """Return the index of value in the table, adding it if needed."""
+        if type(value) in _ATOM_TYPES:
+            key = (type(value), value)
+            try:
+                return self.atoms[key]
+            except KeyError:
+                self.table.append((_ATOM, value))
+                index = self.atoms[key] = len(self.table) - 1
+                return index
+
+        try:
+            return self.index[id(value)][0]
+        except KeyError:
+            pass
+        self.table.append(None)
+        index = len(self.table) - 1
+        # The value is kept so that its id is not reused.
+        self.index[id(value)] = index, value
+        self.pending.append((index, value))
+        return index
+
+    def pairs(self, items):
+        return tuple(index for key, value in items
+                     for index in (self.ref(key), self.ref(value)))
+
+    def entry(self, value):
+        if isinstance(value, types.ModuleType):
+            name = self.modules.get(id(value))
+            if name is None:
+                return _EXTERNAL, value.__name__, ''
+            return _MODULE, name, self.pairs(
+                (key, member) for key, member in vars(value).items()
+                if key not in _SKIPPED_MODULE_NAMES)
+
+        if isinstance(value, (type, types.FunctionType)):
+            if value.__module__ not in self.moduleNames:
+                return _EXTERNAL, value.__module__, value.__qualname__
+
+        external = self.externals.get(id(value))
+        if external is not None:
+            return (_EXTERNAL,) + external
+
+        valueType = type(value)
+        if valueType is tuple:
+            return _TUPLE, tuple(self.ref(item) for item in value)
+        if valueType is list:
+            return _LIST, tuple(self.ref(item) for item in value)
+        if valueType is set:
+            return _SET, tuple(self.ref(item) for item in value)
+        if valueType is frozenset:
+            # These are made before the objects are filled in.
+            for item in value:
+                if not isinstance(item, _ATOM_TYPES + (type,)):
+                    raise error.PyAsn1Error(
+                        'Cannot snapshot a frozenset of %r' % (item,))
+            return _FROZENSET, tuple(self.ref(item) for item in value)
+        if valueType is dict:
+            return _DICT, self.pairs(value.items())
+
+        if isinstance(value, type):
+            if valueType is not type:
+                raise error.PyAsn1Error(
+                    'Cannot snapshot the class %s' % value.__qualname__)
+            return (_CLASS, value.__name__,
+                    tuple(self.ref(base) for base in value.__bases__),
+                    self.pairs(
+                        (key, member) for key, member in vars(value).items()
+                        if key not in _SKIPPED_CLASS_NAMES))
+
+        if valueType is types.FunctionType:
+            if value.__closure__:
+                raise error.PyAsn1Error(
+                    'Cannot snapshot the closure %s' % value.__qualname__)
+            lines, firstLine = inspect.getsourcelines(value)
+            return (_FUNCTION, value.__module__, value.__name__,
+                    value.__qualname__, firstLine, len(lines),
+                    self.ref(value.__defaults__),
+                    self.ref(value.__kwdefaults__))
+
+        state = getattr(value, '__dict__', None)
+        if state is None:
+            raise error.PyAsn1Error('Cannot snapshot %r' % (value,))
+        for base in _ATOM_TYPES[2:]:
+            if isinstance(value, base):
+                return (_SUBCLASSED, self.ref(valueType), base(value),
+                        self.pairs(state.items()))
+        return _INSTANCE, self.ref(valueType), self.pairs(state.items())
+
+    def own(self, index, namedTypes):
+        for attribute, value in vars(namedTypes).items():
+            if attribute in _RECOMPUTE and \
+                    type(value) is namedtype.NamedTypes.PostponedError:
+                self.owners.setdefault(id(value), (index, attribute))
+
+    def write(self, output, header, modules):
+        typeMaps = {}
+        for mapName, typeMap in opentypemap.map_of_opentype_maps.items():
+            self.table.append(None)
+            index = len(self.table) - 1
+            self.index[id(typeMap)] = index, typeMap
+            typeMaps[index] = mapName
+            self.pending.append((index, typeMap))
+
+        roots = tuple(self.ref(module) for name, module in modules)
+
+        while self.pending or self.postponed:
+            while self.pending:
+                index, value = self.pending.pop()
+                if index in typeMaps:
+                    self.table[index] = (_OPENTYPE_MAP, typeMaps[index],
+                                         self.pairs(value.items()))
+                elif type(value) is namedtype.NamedTypes.PostponedError:
+                    self.postponed.append((index, value))
+                else:
+                    self.table[index] = self.entry(value)
+                    if isinstance(value, namedtype.NamedTypes):
+                        self.own(index, value)
+
+            # The owners of the errors are known once all of the
+            # objects have been seen.
+            for index, value in self.postponed:
+                owner = self.owners.get(id(value))
+                if owner is None:
+                    self.table[index] = self.entry(value)
+                else:
+                    self.table[index] = (_POSTPONED, owner[0],
+                                         self.ref(owner[1]))
+            del self.postponed[:]
+
+        marshal.dump(header, output)
+        marshal.dump((roots, tuple(self.table)), output)
+
+
+def build(path, modules=None):
+    """Import the given modules, all of the rfc modules by default, and
+    write a snapshot of them and of the opentype maps to path.
+
+    The snapshot holds every rfc module that has been imported, as the
+    opentype maps hold values from all of them.  Returns the number of
+    objects in the snapshot.
+    """
+    if modules is None:
+        modules = allModules()
+    modules = sorted(modules)
+    for name in modules:
+        importlib.import_module(_PREFIX + name)
+
+    # The modules that these modules import are in the snapshot too.
+    modules = sorted(
+        (name[len(_PREFIX):], module)
+        for name, module in list(sys.modules.items())
+        if name.startswith(_PREFIX + 'rfc') and module is not None)
+
+    writer = _Writer(modules)
+    # The snapshot is renamed into place, so that a worker never reads
+    # one that is half written.
+    partial = '%s.%d' % (path, os.getpid())
+    with open(partial, 'wb') as output:
+        writer.write(output, _header([name for name, module in modules]),
+                     modules)
+    os.replace(partial, path)
+    return len(writer.table)
+
+
+def _resolve(moduleName, path):
+    value = importlib.import_module(moduleName)
+    for name in path.split('.') if path else ():
+        value = getattr(value, name)
+    return value
+
+
+class _Reader(object):
+
+    def __init__(self, table):
+        self.table = table
+        self.objects = [None] * len(table)
+        self.modules = {}
+        self.rehashed = set()
+
+    def pairs(self, indices):
+        objects = self.objects
+        return [(objects[indices[position]], objects[indices[position + 1]])
+                for position in range(0, len(indices), 2)]
+
+    def makeClass(self, index):
+        # The bases are made first, and a class is made before its
+        # attributes, which may be instances of it.
+        if self.objects[index] is None:
+            kind, name, bases, attributes = self.table[index]
+            for base in bases:
+                if self.table[base][0] == _CLASS:
+                    self.makeClass(base)
+            namespace = dict(
+                (key, value) for key, value in self.pairs(attributes)
+                if key in ('__module__', '__qualname__', '__doc__'))
+            self.objects[index] = type(
+                name, tuple(self.objects[base] for base in bases), namespace)
+        return self.objects[index]
+
+    def makeTuple(self, index):
+        # Tuples and frozensets hold the objects they are made of, so
+        # these are made first.
+        entry = self.table[index]
+        if self.objects[index] is None:
+            for item in entry[1]:
+                if self.table[item][0] in (_TUPLE, _FROZENSET):
+                    self.makeTuple(item)
+            items = [self.objects[item] for item in entry[1]]
+            self.objects[index] = (entry[0] == _TUPLE and tuple or
+                                   frozenset)(items)
+        return self.objects[index]
+
+    def read(self):
+        table = self.table
+        objects = self.objects
+        pairs = self.pairs
+
+        byKind = [[] for kind in range(_POSTPONED + 1)]
+        for index, entry in enumerate(table):
+            kind = entry[0]
+            if kind == _ATOM:
+                objects[index] = entry[1]
+            else:
+                byKind[kind].append(index)
+
+        for index in byKind[_EXTERNAL]:
+            objects[index] = _resolve(table[index][1], table[index][2])
+        for index in byKind[_LIST]:
+            objects[index] = []
+        for index in byKind[_DICT]:
+            objects[index] = {}
+        for index in byKind[_SET]:
+            objects[index] = set()
+        for index in byKind[_OPENTYPE_MAP]:
+            objects[index] = opentypemap.get(table[index][1])
+        for index in byKind[_MODULE]:
+            module = objects[index] = types.ModuleType(
+                _PREFIX + table[index][1])
+            self.modules[module.__name__] = module
+
+        for index in byKind[_CLASS]:
+            self.makeClass(index)
+
+        new = object.__new__
+        for index in byKind[_INSTANCE]:
+            objects[index] = new(objects[table[index][1]])
+        for index in byKind[_SUBCLASSED]:
+            kind, cls, value, state = table[index]
+            objects[index] = objects[cls].__new__(objects[cls], value)
+        for index in byKind[_POSTPONED]:
+            kind, namedTypes, attribute = table[index]
+            objects[index] = _PostponedError(
+                objects[namedTypes], objects[attribute])
+
+        for index in byKind[_TUPLE] + byKind[_FROZENSET]:
+            self.makeTuple(index)
+
+        for index in byKind[_FUNCTION]:
+            kind, moduleName, name, qualname, firstLine, lineCount, \
+                defaults, kwdefaults = table[index]
+            function = types.FunctionType(
+                self.compileFunction(moduleName, name, firstLine, lineCount),
+                vars(self.modules[moduleName]), name, objects[defaults])
+            function.__qualname__ = qualname
+            function.__kwdefaults__ = objects[kwdefaults]
+            objects[index] = function
+
+        for index in byKind[_INSTANCE] + byKind[_SUBCLASSED]:
+            objects[index].__dict__.update(pairs(table[index][-1]))
+        for index in byKind[_CLASS]:
+            cls = objects[index]
+            for key, value in pairs(table[index][3]):
+                if key not in ('__module__', '__qualname__', '__doc__'):
+                    setattr(cls, key, value)
+        for index in byKind[_MODULE]:
+            module = objects[index]
+            module.__dict__.update(pairs(table[index][2]))
+            module.__builtins__ = builtins
+            module.__spec__ = importlib.util.spec_from_file_location(
+                module.__name__, module.__file__)
+            module.__loader__ = module.__spec__.loader
+        for index in byKind[_LIST]:
+            objects[index].extend(objects[item] for item in table[index][1])
+
+        # The hash of a constraint is kept in it, and the hash of a str
+        # differs from one process to another.
+        for index in byKind[_INSTANCE]:
+            self.rehash(objects[index])
+
+        # The objects are filled in before the dicts and the sets, as
+        # their hashes may depend on what is in them.
+        for index in byKind[_DICT] + byKind[_OPENTYPE_MAP]:
+            objects[index].update(pairs(table[index][-1]))
+        for index in byKind[_SET]:
+            objects[index].update(objects[item] for item in table[index][1])
+
+    def compileFunction(self, moduleName, name, firstLine, lineCount):
+        """Return the code of a function compiled from its lines in the
+        source file of its module."""
+        if moduleName not in self.modules:
+            raise error.PyAsn1Error('Function of unknown module %s' %
+                                    moduleName)
+        fileName = os.path.join(
+            _PACKAGE_DIR, moduleName[len(_PREFIX):] + '.py')
+        with open(fileName) as source:
+            lines = source.read().splitlines(True)
+        lines = lines[firstLine - 1:firstLine - 1 + lineCount]
+        indent = len(lines[0]) - len(lines[0].lstrip())
+        # The blank lines keep the line numbers of the source file.
+        text = '\n' * (firstLine - 1) + ''.join(
+            line[indent:] for line in lines)
+        # Only the def is compiled; the code of the function is taken
+        # from it without running anything.
+        for code in compile(text, fileName, 'exec').co_consts:
+            if isinstance(code, types.CodeType) and code.co_name == name:
+                return code
+        raise error.PyAsn1Error('No function %s at line %d of %s' %
+                                (name, firstLine, fileName))
+
+    def rehash(self, value):
+        if isinstance(value, constraint.AbstractConstraint) and \
+                id(value) not in self.rehashed:
+            self.rehashed.add(id(value))
+            # The constraints that it is made of are hashed first.
+            for item in value._values:
+                self.rehash(item)
+            value._AbstractConstraint__hash = hash(
+                (value.__class__.__name__, value._values))
+
+
+def load(path):
+    """Put back the modules from the snapshot at path.
+
+    Returns False, and leaves the modules to be imported as usual, when
+    there is no snapshot at path, when it was built from other sources
+    or with another pyasn1 or Python, or when one of its modules has
+    been imported already.
+    """
+    try:
+        with open(path, 'rb') as snapshotFile:
+            header = marshal.load(snapshotFile)
+            if not isinstance(header, tuple) or \
+                    header[:1] != (FORMAT,) or \
+                    header[:-1] != _header(())[:-1]:
+                return False
+            modules = header[-1]
+            if any(_PREFIX + name in sys.modules for name in modules):
+                return False
+            # marshal.load reads a file a little at a time.
+            roots, table = marshal.loads(snapshotFile.read())
+    except (OSError, EOFError, ValueError, TypeError):
+        return False
+
+    # The objects are all kept, so collecting as they are made is waste.
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        reader = _Reader(table)
+        reader.read()
+    finally:
+        if enabled:
+            gc.enable()
+
+    package = sys.modules[_PREFIX[:-1]]
+    for index in roots:
+        module = reader.objects[index]
+        sys.modules[module.__name__] = module
+        setattr(package, module.__name__[len(_PREFIX):], module)
+    return True
+
+
+def loadOrBuild(path, modules=None):
+    """Load the snapshot at path, or import the modules and write a new
+    snapshot to path when it cannot be loaded.  Returns True when the
+    snapshot was loaded."""
+    if load(path):
+        return True
+    build(path, modules)
+    return False
@@ -0,0 +1,634 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# A specialised codec for SNMP messages (RFC 1157, RFC 1901, RFC 1905,
+# RFC 3412, and RFC 3414) for receivers that handle many datagrams per
+# second.  The fixed shape of these messages is walked directly, and
+# the results are plain records with __slots__ instead of pyasn1
+# objects.  Variable bindings are (name, tag, value) tuples, where name
+# is the content octets of the OBJECT IDENTIFIER and value is the
+# content octets of the value, so they can be compared, hashed, and
+# re-encoded without any conversion.
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+
+from pyasn1 import error
+
+from pyasn1_alt_modules import tlv
+
+
+# Message versions
+
+VERSION_1 = 0
+VERSION_2C = 1
+VERSION_3 = 3
+
+
+# PDU tags, with the names used by rfc1157.Pdus and rfc1905.PDUs
+
+GET_REQUEST = 0xA0
+GET_NEXT_REQUEST = 0xA1
+RESPONSE = 0xA2
+SET_REQUEST = 0xA3
+TRAP = 0xA4
+GET_BULK_REQUEST = 0xA5
+INFORM_REQUEST = 0xA6
+SNMPV2_TRAP = 0xA7
+REPORT = 0xA8
+
+pduNames = {
+    GET_REQUEST: 'get-request',
+    GET_NEXT_REQUEST: 'get-next-request',
+    RESPONSE: 'response',
+    SET_REQUEST: 'set-request',
+    TRAP: 'trap',
+    GET_BULK_REQUEST: 'get-bulk-request',
+    INFORM_REQUEST: 'inform-request',
+    SNMPV2_TRAP: 'snmpV2-trap',
+    REPORT: 'report',
+}
+
+
+# Value tags from rfc1902.ObjectSyntax and rfc1905 VarBind
+
+INTEGER = tlv.INTEGER
+OCTET_STRING = tlv.OCTET_STRING
+NULL = tlv.NULL
+OBJECT_IDENTIFIER = tlv.OBJECT_IDENTIFIER
+IP_ADDRESS = 0x40
+COUNTER32 = 0x41
+GAUGE32 = 0x42
+TIME_TICKS = 0x43
+OPAQUE = 0x44
+COUNTER64 = 0x46
+NO_SUCH_OBJECT = 0x80
+NO_SUCH_INSTANCE = 0x81
+END_OF_MIB_VIEW = 0x82
+
+
+# msgFlags bits from RFC 3412
+
+AUTH_FLAG = 0x01
+PRIV_FLAG = 0x02
+REPORTABLE_FLAG = 0x04
+
+USM_SECURITY_MODEL = 3
+
+
+class _Record(object):
+    __slots__ = ()
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name)
+                   for name in self.__slots__)
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    __hash__ = None
+
+    def __repr__(self):
+        return '%s(%s)' % (self.__class__.__name__, ', '.join(
+            '%s=%r' % (name, getattr(self, name)) for name in self.__slots__))
+
+
+class UsmParameters(_Record):
+    """The fields of rfc3414.UsmSecurityParameters."""
+
+    __slots__ = ('engineID', 'engineBoots', 'engineTime', 'userName',
+                 'authParameters', 'privParameters')
+
+    def __init__(self, engineID=b'', engineBoots=0, engineTime=0,
+                 userName=b'', authParameters=b'', privParameters=b''):
+        self.engineID = engineID
+        self.engineBoots = engineBoots
+        self.engineTime = engineTime
+        self.userName = userName
+        self.authParameters = authParameters
+        self.privParameters = privParameters
+
+
+class Pdu(_Record):
+    """A PDU with the rfc1905.PDU shape, which rfc1157 also uses.
+
+    The tag is one of the PDU tags above.  For GET_BULK_REQUEST, the
+    errorStatus and errorIndex fields hold non-repeaters and
+    max-repetitions, which share their positions in rfc1905.BulkPDU.
+    """
+
+    __slots__ = ('tag', 'requestID', 'errorStatus', 'errorIndex',
+                 'varBinds')
+
+    def __init__(self, tag=GET_REQUEST, requestID=0, errorStatus=0,
+                 errorIndex=0, varBinds=()):
+        self.tag = tag
+        self.requestID = requestID
+        self.errorStatus = errorStatus
+        self.errorIndex = errorIndex
+        self.varBinds = list(varBinds)
+
+
+class TrapPdu(_Record):
+    """The fields of an rfc1157.TrapPDU.
+
+    The enterprise is the content octets of the OID and agentAddr is
+    the four octets of the IpAddress.
+    """
+
+    __slots__ = ('tag', 'enterprise', 'agentAddr', 'genericTrap',
+                 'specificTrap', 'timeStamp', 'varBinds')
+
+    def __init__(self, enterprise=b'', agentAddr=b'\x00\x00\x00\x00',
+                 genericTrap=0, specificTrap=0, timeStamp=0, varBinds=()):
+        self.tag = TRAP
+        self.enterprise = enterprise
+        self.agentAddr = agentAddr
+        self.genericTrap = genericTrap
+        self.specificTrap = specificTrap
+        self.timeStamp = timeStamp
+        self.varBinds = list(varBinds)
+
+
+class Message(_Record):
+    """An SNMP message of any version.
+
+    Version 1 and 2c messages use the community.  Version 3 messages
+    use the msg fields of rfc3412.HeaderData, and securityParameters is
+    a UsmParameters record for the user-based security model, or the
+    undecoded octets for any other model.  The pdu is None when the
+    scoped PDU is encrypted; the encryptedPDU octets can be decrypted
+    by the caller and passed to decodeScopedPdu().
+    """
+
+    __slots__ = ('version', 'community', 'msgID', 'msgMaxSize', 'msgFlags',
+                 'msgSecurityModel', 'securityParameters', 'contextEngineID',
+                 'contextName', 'encryptedPDU', 'pdu')
+
+    def __init__(self, version=VERSION_2C, community=b'public', pdu=None,
+                 msgID=0, msgMaxSize=65507, msgFlags=0,
+                 msgSecurityModel=USM_SECURITY_MODEL, securityParameters=None,
+                 contextEngineID=b'', contextName=b'', encryptedPDU=None):
+        self.version = version
+        self.community = community
+        self.msgID = msgID
+        self.msgMaxSize = msgMaxSize
+        self.msgFlags = msgFlags
+        self.msgSecurityModel = msgSecurityModel
+        self.securityParameters = securityParameters
+        self.contextEngineID = contextEngineID
+        self.contextName = contextName
+        self.encryptedPDU = encryptedPDU
+        self.pdu = pdu
+
+
+# Decoding
+
+def _header(data, offset, tag, end):
+    """Return (valueOffset, valueEnd) of the TLV with tag at offset."""
+    if data[offset] != tag:
+        raise error.PyAsn1Error(
+            'Expected tag 0x%02X at offset %d, not 0x%02X' %
+            (tag, offset, data[offset]))
+    length = data[offset + 1]
+    offset += 2
+    if length & 0x80:
+        count = length & 0x7F
+        if not count or count > 4:
+            raise error.PyAsn1Error(
+                'Unsupported length form at offset %d' % (offset - 1))
+        length = int.from_bytes(data[offset:offset + count], 'big')
+        offset += count
+    valueEnd = offset + length
+    if valueEnd > end:
+        raise error.SubstrateUnderrunError(
+            'TLV at offset %d runs past its enclosing encoding' % offset)
+    return offset, valueEnd
+
+
+def _anyHeader(data, offset, end):
+    tag = data[offset]
+    if tag & 0x1F == 0x1F:
+        raise error.PyAsn1Error(
+            'Unexpected high tag number at offset %d' % offset)
+    valueOffset, valueEnd = _header(data, offset, tag, end)
+    return tag, valueOffset, valueEnd
+
+
+def _integer(data, offset, end):
+    valueOffset, valueEnd = _header(data, offset, INTEGER, end)
+    return int.from_bytes(data[valueOffset:valueEnd], 'big',
+                          signed=True), valueEnd
+
+
+def _octets(data, offset, end, tag=OCTET_STRING):
+    valueOffset, valueEnd = _header(data, offset, tag, end)
+    return data[valueOffset:valueEnd], valueEnd
+
+
+def _varBinds(data, offset, end):
+    valueOffset, listEnd = _header(data, offset, tlv.SEQUENCE, end)
+    varBinds = []
+    append = varBinds.append
+    while valueOffset < listEnd:
+        nameOffset, bindEnd = _header(data, valueOffset, tlv.SEQUENCE, listEnd)
+        name, position = _octets(data, nameOffset, bindEnd, OBJECT_IDENTIFIER)
+        tag, valueStart, valueEnd = _anyHeader(data, position, bindEnd)
+        if valueEnd != bindEnd:
+            raise error.PyAsn1Error(
+                'VarBind at offset %d has extra components' % valueOffset)
+        append((name, tag, data[valueStart:valueEnd]))
+        valueOffset = bindEnd
+    return varBinds, listEnd
+
+
+def _unsigned(data, offset, tag, end):
+    valueOffset, valueEnd = _header(data, offset, tag, end)
+    return int.from_bytes(data[valueOffset:valueEnd], 'big'), valueEnd
+
+
+def _pdu(data, offset, end):
+    tag = data[offset]
+    if tag not in pduNames:
+        raise error.PyAsn1Error('Unknown PDU tag 0x%02X' % tag)
+    position, pduEnd = _header(data, offset, tag, end)
+
+    if tag == TRAP:
+        enterprise, position = _octets(data, position, pduEnd,
+                                       OBJECT_IDENTIFIER)
+        agentAddr, position = _octets(data, position, pduEnd, IP_ADDRESS)
+        genericTrap, position = _integer(data, position, pduEnd)
+        specificTrap, position = _integer(data, position, pduEnd)
+        timeStamp, position = _unsigned(data, position, TIME_TICKS, pduEnd)
+        varBinds, position = _varBinds(data, position, pduEnd)
+        pdu = TrapPdu(enterprise, agentAddr, genericTrap, specificTrap,
+                      timeStamp)
+        pdu.varBinds = varBinds
+    else:
+        requestID, position = _integer(data, position, pduEnd)
+        errorStatus, position = _integer(data, position, pduEnd)
+        errorIndex, position = _integer(data, position, pduEnd)
+        varBinds, position = _varBinds(data, position, pduEnd)
+        pdu = Pdu(tag, requestID, errorStatus, errorIndex)
+        pdu.varBinds = varBinds
+
+    if position != pduEnd:
+        raise error.PyAsn1Error('PDU has extra components')
+    return pdu, pduEnd
+
+
+def decodeUsmParameters(data):
+    """Decode rfc3414.UsmSecurityParameters octets to a UsmParameters."""
+    data = bytes(data)
+    end = len(data)
+    try:
+        position, seqEnd = _header(data, 0, tlv.SEQUENCE, end)
+        engineID, position = _octets(data, position, seqEnd)
+        engineBoots, position = _integer(data, position, seqEnd)
+        engineTime, position = _integer(data, position, seqEnd)
+        userName, position = _octets(data, position, seqEnd)
+        authParameters, position = _octets(data, position, seqEnd)
+        privParameters, position = _octets(data, position, seqEnd)
+    except IndexError:
+        raise error.SubstrateUnderrunError('Short UsmSecurityParameters')
+    if position != seqEnd or seqEnd != end:
+        raise error.PyAsn1Error('UsmSecurityParameters has extra octets')
+    return UsmParameters(engineID, engineBoots, engineTime, userName,
+                         authParameters, privParameters)
+
+
+def _scopedPdu(message, data, offset, end):
+    position, scopedEnd = _header(data, offset, tlv.SEQUENCE, end)
+    message.contextEngineID, position = _octets(data, position, scopedEnd)
+    message.contextName, position = _octets(data, position, scopedEnd)
+    message.pdu, position = _pdu(data, position, scopedEnd)
+    if position != scopedEnd:
+        raise error.PyAsn1Error('ScopedPDU has extra components')
+    return scopedEnd
+
+
+def decodeScopedPdu(message, plaintext):
+    """Fill in the context fields and pdu of message from a decrypted
+    ScopedPDU, and return the message."""
+    plaintext = bytes(plaintext)
+    try:
+        # Block ciphers may leave padding after the ScopedPDU
+        _scopedPdu(message, plaintext, 0, len(plaintext))
+    except IndexError:
+        raise error.SubstrateUnderrunError('Short ScopedPDU')
+    return message
+
+
+def _decode(data):
+    end = len(data)
+    position, messageEnd = _header(data, 0, tlv.SEQUENCE, end)
+    if messageEnd != end:
+        raise error.PyAsn1Error('Extra octets after the SNMP message')
+
+    version, position = _integer(data, position, messageEnd)
+    message = Message(version)
+
+    if version in (VERSION_1, VERSION_2C):
+        message.community, position = _octets(data, position, messageEnd)
+        message.pdu, position = _pdu(data, position, messageEnd)
+
+    elif version == VERSION_3:
+        message.community = None
+        position, headerEnd = _header(data, position, tlv.SEQUENCE,
+                                      messageEnd)
+        message.msgID, position = _integer(data, position, headerEnd)
+        message.msgMaxSize, position = _integer(data, position, headerEnd)
+        msgFlags, position = _octets(data, position, headerEnd)
+        if len(msgFlags) != 1:
+            raise error.PyAsn1Error('msgFlags must be one octet')
+        message.msgFlags = msgFlags[0]
+        message.msgSecurityModel, position = _integer(
+            data, position, headerEnd)
+        if position != headerEnd:
+            raise error.PyAsn1Error('HeaderData has extra components')
+
+        securityParameters, position = _octets(data, headerEnd, messageEnd)
+        if message.msgSecurityModel == USM_SECURITY_MODEL:
+            securityParameters = decodeUsmParameters(securityParameters)
+        message.securityParameters = securityParameters
+
+        if data[position] == OCTET_STRING:
+            message.encryptedPDU, position = _octets(
+                data, position, messageEnd)
+        else:
+            position = _scopedPdu(message, data, position, messageEnd)
+
+    else:
+        raise error.PyAsn1Error('Unsupported SNMP version %d' % version)
+
+    if position != messageEnd:
+        raise error.PyAsn1Error('SNMP message has extra components')
+    return message
+
+
+def decodeMessage(datagram):
+    """Decode one SNMP datagram into a Message record."""
+    data = bytes(datagram)
+    try:
+        return _decode(data)
+    except IndexError:
+        raise error.SubstrateUnderrunError('Short SNMP message')
+
+
+# Encoding
+
+def _tlv(tag, value):
+    length = len(value)
+    if length < 0x80:
+        return bytes((tag, length)) + value
+    return tlv.encodeHeader(tag, length) + value
+
+
+def _integerOctets(value):
+    magnitude = value if value >= 0 else ~value
+    return value.to_bytes(magnitude.bit_length() // 8 + 1, 'big', signed=True)
+
+
+def _unsignedOctets(value):
+    return value.to_bytes(value.bit_length() // 8 + 1, 'big')
+
+
+def _encodeVarBinds(varBinds):
+    return _tlv(tlv.SEQUENCE, b''.join(
+        _tlv(tlv.SEQUENCE, _tlv(OBJECT_IDENTIFIER, name) + _tlv(tag, value))
+        for name, tag, value in varBinds))
+
+
+def encodePdu(pdu):
+    """Return the BER encoding of a Pdu or TrapPdu record."""
+    if pdu.tag == TRAP:
+        return _tlv(TRAP, b''.join((
+            _tlv(OBJECT_IDENTIFIER, pdu.enterprise),
+            _tlv(IP_ADDRESS, pdu.agentAddr),
+            _tlv(INTEGER, _integerOctets(pdu.genericTrap)),
+            _tlv(INTEGER, _integerOctets(pdu.specificTrap)),
+            _tlv(TIME_TICKS, _unsignedOctets(pdu.timeStamp)),
+            _encodeVarBinds(pdu.varBinds))))
+
+    return _tlv(pdu.tag, b''.join((
+        _tlv(INTEGER, _integerOctets(pdu.requestID)),
+        _tlv(INTEGER, _integerOctets(pdu.errorStatus)),
+        _tlv(INTEGER, _integerOctets(pdu.errorIndex)),
+        _encodeVarBinds(pdu.varBinds))))
+
+
+def encodeUsmParameters(usm):
+    """Return the BER encoding of a UsmParameters record."""
+    return _tlv(tlv.SEQUENCE, b''.join((
+        _tlv(OCTET_STRING, usm.engineID),
+        _tlv(INTEGER, _integerOctets(usm.engineBoots)),
+        _tlv(INTEGER, _integerOctets(usm.engineTime)),
+        _tlv(OCTET_STRING, usm.userName),
+        _tlv(OCTET_STRING, usm.authParameters),
+        _tlv(OCTET_STRING, usm.privParameters))))
+
+
+def encodeScopedPdu(message):
+    """Return the BER encoding of the ScopedPDU of a version 3 message,
+    for encrypting it."""
+    return _tlv(tlv.SEQUENCE, b''.join((
+        _tlv(OCTET_STRING, message.contextEngineID),
+        _tlv(OCTET_STRING, message.contextName),
+        encodePdu(message.pdu))))
+
+
+def encodeMessage(message):
+    """Return the BER encoding of a Message record."""
+    version = _tlv(INTEGER, _integerOctets(message.version))
+
+    if message.version in (VERSION_1, VERSION_2C):
+        return _tlv(tlv.SEQUENCE, b''.join((
+            version, _tlv(OCTET_STRING, message.community),
+            encodePdu(message.pdu))))
+
+    if message.version != VERSION_3:
+        raise error.PyAsn1Error(
+            'Unsupported SNMP version %d' % message.version)
+
+    securityParameters = message.securityParameters
+    if securityParameters is None:
+        securityParameters = UsmParameters()
+    if isinstance(securityParameters, UsmParameters):
+        securityParameters = encodeUsmParameters(securityParameters)
+
+    if message.encryptedPDU is not None:
+        msgData = _tlv(OCTET_STRING, message.encryptedPDU)
+    else:
+        msgData = encodeScopedPdu(message)
+
+    return _tlv(tlv.SEQUENCE, b''.join((
+        version,
+        _tlv(tlv.SEQUENCE, b''.join((
+            _tlv(INTEGER, _integerOctets(message.msgID)),
+            _tlv(INTEGER, _integerOctets(message.msgMaxSize)),
+            _tlv(OCTET_STRING, bytes((message.msgFlags,))),
+            _tlv(INTEGER, _integerOctets(message.msgSecurityModel))))),
+        _tlv(OCTET_STRING, securityParameters),
+        msgData)))
+
+
+def response(request, varBinds=None, errorStatus=0, errorIndex=0):
+    """Return the Message answering request.
+
+    The request-id, community or version 3 header, and context are
+    copied from the request, and the reportable flag is cleared.  The
+    variable bindings of the request are echoed unless varBinds is
+    given.  Authentication and encryption of a version 3 response are
+    left to the caller.
+    """
+    if request.pdu is None:
+        raise error.PyAsn1Error('The request PDU has not been decrypted')
+    if request.pdu.tag == TRAP:
+        raise error.PyAsn1Error('A version 1 trap has no response')
+    if varBinds is None:
+        varBinds = request.pdu.varBinds
+
+    message = Message(
+        request.version, request.community,
+        Pdu(RESPONSE, request.pdu.requestID, errorStatus, errorIndex,
+            varBinds),
+        request.msgID, request.msgMaxSize,
+        request.msgFlags & ~REPORTABLE_FLAG, request.msgSecurityModel,
+        request.securityParameters, request.contextEngineID,
+        request.contextName)
+    return message
+
+
+# Batches, as delivered by recvmmsg() style receive loops
+
+def decodeBatch(datagrams, strict=False):
+    """Decode a list of datagrams into a list of Message records.
+
+    A datagram that cannot be decoded gives None in its position,
+    unless strict is True, in which case the error is raised.
+    """
+    messages = []
+    append = messages.append
+    for datagram in datagrams:
+        try:
+            append(_decode(bytes(datagram)))
+        except (error.PyAsn1Error, IndexError, ValueError):
+            if strict:
+                raise
+            append(None)
+    return messages
+
+
+def encodeBatch(messages):
+    """Encode a list of Message records; None entries give None."""
+    return [None if message is None else encodeMessage(message)
+            for message in messages]
+
+
+def respondBatch(datagrams, handler):
+    """Decode datagrams, pass each message to handler, and encode the
+    Message records that it returns.
+
+    The result is aligned with datagrams and holds None where the
+    datagram could not be decoded or the handler returned None.
+    """
+    return encodeBatch([None if message is None else handler(message)
+                        for message in decodeBatch(datagrams)])
+
+
+# Conversions for names and values
+
+def encodeOid(oid):
+    """Return the content octets of an OID given as a dotted string or
+    a tuple of integers."""
+    if isinstance(oid, str):
+        oid = [int(arc) for arc in oid.split('.')]
+    else:
+        oid = [int(arc) for arc in oid]
+    if len(oid) < 2 or oid[0] > 2 or (oid[0] < 2 and oid[1] > 39):
+        raise error.PyAsn1Error('Invalid OID %r' % (oid,))
+
+    octets = bytearray()
+    for arc in [oid[0] * 40 + oid[1]] + oid[2:]:
+        if arc < 0x80:
+            octets.append(arc)
+            continue
+        chunk = []
+        while arc:
+            chunk.append((arc & 0x7F) | 0x80)
+            arc >>= 7
+        chunk[0] &= 0x7F
+        octets.extend(reversed(chunk))
+    return bytes(octets)
+
+
+def decodeOid(octets):
+    """Return the dotted string for the content octets of an OID."""
+    arcs = []
+    arc = 0
+    for octet in octets:
+        arc = (arc << 7) | (octet & 0x7F)
+        if not octet & 0x80:
+            arcs.append(arc)
+            arc = 0
+    if not arcs or arc:
+        raise error.PyAsn1Error('Invalid OID encoding')
+    first = arcs[0]
+    if first < 80:
+        prefix = [first // 40, first % 40]
+    else:
+        prefix = [2, first - 80]
+    return '.'.join(str(arc) for arc in prefix + arcs[1:])
+
+
+def decodeValue(tag, value):
+    """Return a Python value for a variable binding value.
+
+    Integers, counters, gauges, and time ticks give int; octet strings
+    and opaque values give bytes; IpAddress gives the dotted quad; OIDs
+    give the dotted string; NULL and the exceptions give None.
+    """
+    if tag == INTEGER:
+        return int.from_bytes(value, 'big', signed=True)
+    if tag in (COUNTER32, GAUGE32, TIME_TICKS, COUNTER64):
+        return int.from_bytes(value, 'big')
+    if tag in (OCTET_STRING, OPAQUE):
+        return bytes(value)
+    if tag == IP_ADDRESS:
+        return '.'.join(str(octet) for octet in value)
+    if tag == OBJECT_IDENTIFIER:
+        return decodeOid(value)
+    if tag in (NULL, NO_SUCH_OBJECT, NO_SUCH_INSTANCE, END_OF_MIB_VIEW):
+        return None
+    raise error.PyAsn1Error('Unknown variable binding tag 0x%02X' % tag)
+
+
+def encodeValue(tag, value):
+    """Return the content octets for a variable binding value; the
+    reverse of decodeValue()."""
+    if tag == INTEGER:
+        return _integerOctets(value)
+    if tag in (COUNTER32, GAUGE32, TIME_TICKS, COUNTER64):
+        return _unsignedOctets(value)
+    if tag in (OCTET_STRING, OPAQUE):
+        return bytes(value)
+    if tag == IP_ADDRESS:
+        if isinstance(value, str):
+            value = [int(octet) for octet in value.split('.')]
+        return bytes(value)
+    if tag == OBJECT_IDENTIFIER:
+        return encodeOid(value)
+    if tag in (NULL, NO_SUCH_OBJECT, NO_SUCH_INSTANCE, END_OF_MIB_VIEW):
+        return b''
+    raise error.PyAsn1Error('Unknown variable binding tag 0x%02X' % tag)
+
+
+def varBind(oid, tag, value):
+    """Return a (name, tag, value) variable binding from Python values."""
+    return encodeOid(oid), tag, encodeValue(tag, value)
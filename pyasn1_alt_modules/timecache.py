@@ -0,0 +1,250 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# Conversion of UTCTime and GeneralizedTime values to seconds since the
+# epoch and to datetime, straight from the encoded time, with the
+# results of the most recent conversions kept in a small LRU cache.
+# The DER forms (YYMMDDHHMMSSZ and YYYYMMDDHHMMSS[.f]Z) are read
+# directly; other forms are left to pyasn1.  The revocation dates of a
+# whole CRL can be converted into an array('q') in one call.
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+
+import datetime
+import re
+import threading
+from array import array
+
+from pyasn1 import error
+from pyasn1.codec.der.encoder import encode as der_encoder
+from pyasn1.type import univ
+from pyasn1.type import useful
+
+from pyasn1_alt_modules import tlv
+
+
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+
+_DIGITS = re.compile(b'[0-9]*')
+
+_Z = 0x5A
+_DOT = 0x2E
+
+
+def _days(year, month, day):
+    """Return the number of days from 1970-01-01 to a civil date."""
+    if month <= 2:
+        year -= 1
+    era = year // 400
+    yearOfEra = year - era * 400
+    dayOfYear = (153 * (month + (-3 if month > 2 else 9)) + 2) // 5 + day - 1
+    dayOfEra = (yearOfEra * 365 + yearOfEra // 4 - yearOfEra // 100 +
+                dayOfYear)
+    return era * 146097 + dayOfEra - 719468
+
+
+def _fromDateTime(value):
+    # pyasn1 gives a naive datetime for a local time without an offset,
+    # which is taken to be UTC.
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=datetime.timezone.utc)
+    value = value.astimezone(datetime.timezone.utc)
+    delta = value - _EPOCH
+    return delta.days * 86400 + delta.seconds, value
+
+
+def _parse(tag, octets):
+    """Return (seconds since the epoch, datetime) for the contents of a
+    UTCTime (tag 0x17) or GeneralizedTime (tag 0x18)."""
+    length = len(octets)
+    if tag == tlv.UTC_TIME and length == 13 and octets[12] == _Z and \
+            octets[:12].isdigit():
+        value = int(octets[:12])
+        fraction = b''
+    elif tag == tlv.GENERALIZED_TIME and length >= 15 and \
+            octets[length - 1] == _Z and octets[:14].isdigit() and \
+            (length == 15 or (length > 16 and octets[14] == _DOT and
+                              octets[15:length - 1].isdigit())):
+        value = int(octets[:14])
+        fraction = octets[15:length - 1]
+    else:
+        return _parseOther(tag, octets)
+
+    value, second = divmod(value, 100)
+    value, minute = divmod(value, 100)
+    value, hour = divmod(value, 100)
+    value, day = divmod(value, 100)
+    year, month = divmod(value, 100)
+    if tag == tlv.UTC_TIME:
+        year += 1900 if year >= 50 else 2000
+    microsecond = int(fraction[:6].ljust(6, b'0')) if fraction else 0
+
+    try:
+        result = datetime.datetime(year, month, day, hour, minute, second,
+                                   microsecond, datetime.timezone.utc)
+    except ValueError:
+        raise error.PyAsn1Error('Invalid time %r' % (bytes(octets),))
+    seconds = (_days(year, month, day) * 86400 + hour * 3600 +
+               minute * 60 + second)
+    return seconds, result
+
+
+def _parseOther(tag, octets):
+    if tag == tlv.UTC_TIME:
+        asn1Type = useful.UTCTime
+    else:
+        asn1Type = useful.GeneralizedTime
+    try:
+        value = asn1Type(bytes(octets).decode('ascii')).asDateTime
+    except (UnicodeDecodeError, ValueError) as exc:
+        raise error.PyAsn1Error('Invalid time %r: %s' % (bytes(octets), exc))
+    return _fromDateTime(value)
+
+
+def _key(value):
+    """Return (tag, contents) for a time in any of the accepted forms."""
+    if value.__class__ is not bytes:
+        if isinstance(value, univ.Choice):
+            value = value.getComponent()
+        if isinstance(value, useful.UTCTime):
+            return tlv.UTC_TIME, value.asOctets()
+        if isinstance(value, useful.GeneralizedTime):
+            return tlv.GENERALIZED_TIME, value.asOctets()
+        if isinstance(value, str):
+            value = value.encode('ascii')
+        else:
+            value = bytes(value)
+
+    if value[:1] in (b'\x17', b'\x18'):
+        tag, valueOffset, valueEnd, tlvEnd = tlv.readTlv(value)
+        return tag, value[valueOffset:valueEnd]
+
+    # Bare contents: two-digit years are only used by UTCTime.
+    digits = _DIGITS.match(value).end()
+    if digits in (10, 12) and value[digits:digits + 1] in (b'Z', b'+', b'-'):
+        return tlv.UTC_TIME, value
+    return tlv.GENERALIZED_TIME, value
+
+
+class TimeDecoder(object):
+    """Convert UTCTime and GeneralizedTime values, remembering the
+    results for the cacheSize values used most recently.
+
+    A value can be a UTCTime or GeneralizedTime object, a CHOICE of them
+    such as rfc5280.Time, the DER TLV, or the contents as bytes or str.
+    Bare contents with a two-digit year are read as UTCTime, which gives
+    years 1950 to 2049 as in RFC 5280.  Times without a UTC offset are
+    taken to be UTC.  The hits and misses count the cache lookups.  A
+    TimeDecoder can be shared between threads.
+    """
+
+    def __init__(self, cacheSize=4096):
+        self.cacheSize = cacheSize
+        self._cache = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(self, tag, octets):
+        key = (tag, octets)
+        cache = self._cache
+        with self._lock:
+            result = cache.pop(key, None)
+            if result is not None:
+                self.hits += 1
+                # Inserting again moves the key to the end, which keeps
+                # the dict in the order of the most recent use.
+                cache[key] = result
+                return result
+            self.misses += 1
+
+        result = _parse(tag, octets)
+        with self._lock:
+            if key not in cache and cache and len(cache) >= self.cacheSize:
+                del cache[next(iter(cache))]
+            cache[key] = result
+        return result
+
+    def toEpoch(self, value):
+        """Return the whole seconds since 1970-01-01T00:00:00Z."""
+        return self._lookup(*_key(value))[0]
+
+    def toDateTime(self, value):
+        """Return a datetime in UTC."""
+        return self._lookup(*_key(value))[1]
+
+    def epochArray(self, values):
+        """Return an array('q') of the seconds since the epoch of each
+        value."""
+        lookup = self._lookup
+        return array('q', [lookup(*_key(value))[0] for value in values])
+
+    def revocationEpochs(self, crl):
+        """Return an array('q') of the revocation dates of a CRL, in the
+        order of its revokedCertificates.
+
+        The CRL is a DER CertificateList or TBSCertList, or a decoded
+        one, which is encoded first.
+        """
+        if not isinstance(crl, (bytes, bytearray, memoryview)):
+            crl = der_encoder(crl)
+        substrate = bytes(crl)
+
+        members = tlv.children(substrate)
+        if len(members) == 3 and members[2][1] == tlv.BIT_STRING:
+            # A CertificateList: step into the TBSCertList.
+            members = tlv.children(substrate, members[0][0])
+
+        position = 3 if members[0][1] == tlv.INTEGER else 2
+        position += 1
+        if position < len(members) and \
+                members[position][1] in (tlv.UTC_TIME, tlv.GENERALIZED_TIME):
+            position += 1
+
+        result = array('q')
+        if position >= len(members) or members[position][1] != tlv.SEQUENCE:
+            return result
+
+        lookup = self._lookup
+        append = result.append
+        readTlv = tlv.readTlv
+        revoked = members[position]
+        for entry in tlv.iterTlvs(substrate, revoked[2], revoked[3]):
+            serialEnd = readTlv(substrate, entry[2])[3]
+            tag, valueOffset, valueEnd, tlvEnd = readTlv(substrate, serialEnd)
+            append(lookup(tag, substrate[valueOffset:valueEnd])[0])
+        return result
+
+    def clear(self):
+        """Empty the cache."""
+        with self._lock:
+            self._cache.clear()
+
+
+_defaultDecoder = TimeDecoder()
+
+
+def toEpoch(value):
+    """Return the whole seconds since the epoch of a time value, using a
+    shared TimeDecoder."""
+    return _defaultDecoder.toEpoch(value)
+
+
+def toDateTime(value):
+    """Return the datetime in UTC of a time value, using a shared
+    TimeDecoder."""
+    return _defaultDecoder.toDateTime(value)
+
+
+def epochArray(values):
+    """Return an array('q') of the seconds since the epoch of each time
+    value, using a shared TimeDecoder."""
+    return _defaultDecoder.epochArray(values)
+
+
+def revocationEpochs(crl):
+    """Return an array('q') of the revocation dates of a CRL, using a
+    shared TimeDecoder."""
+    return _defaultDecoder.revocationEpochs(crl)
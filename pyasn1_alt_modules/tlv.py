@@ -0,0 +1,187 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# Low-level helpers for walking BER and DER encodings one TLV at a
+# time, without building pyasn1 objects.  The helpers work on bytes,
+# bytearray, or memoryview substrates and report positions, so callers
+# can slice out the encodings that they are interested in without
+# copying the rest.
+#
+# Tags are reported as an integer built from all of the identifier
+# octets, so low tag numbers are simply the identifier octet itself
+# (0x30 for SEQUENCE, 0xA0 for [0] constructed, and so on).
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+
+from pyasn1 import error
+
+
+BOOLEAN = 0x01
+INTEGER = 0x02
+BIT_STRING = 0x03
+OCTET_STRING = 0x04
+NULL = 0x05
+OBJECT_IDENTIFIER = 0x06
+ENUMERATED = 0x0A
+UTF8_STRING = 0x0C
+PRINTABLE_STRING = 0x13
+IA5_STRING = 0x16
+UTC_TIME = 0x17
+GENERALIZED_TIME = 0x18
+SEQUENCE = 0x30
+SET = 0x31
+
+CONSTRUCTED_BIT_STRING = 0x23
+CONSTRUCTED_OCTET_STRING = 0x24
+
+EOC = b'\x00\x00'
+
+
+def contextTag(tagId, constructed=True):
+    """Return the tag for a context-specific [tagId] with a low tag number."""
+    return (0xA0 if constructed else 0x80) | tagId
+
+
+def isConstructed(tag):
+    """Return True if the tag has the constructed bit set."""
+    while tag > 0xFF:
+        tag >>= 8
+    return bool(tag & 0x20)
+
+
+def readHeader(substrate, offset=0):
+    """Read the identifier and length octets of the TLV at offset.
+
+    Returns (tag, valueOffset, length) where length is None when the
+    indefinite length form is used.
+    """
+    try:
+        tag = substrate[offset]
+        offset += 1
+        if tag & 0x1F == 0x1F:
+            while True:
+                octet = substrate[offset]
+                offset += 1
+                tag = (tag << 8) | octet
+                if not octet & 0x80:
+                    break
+        length = substrate[offset]
+        offset += 1
+    except IndexError:
+        raise error.SubstrateUnderrunError(
+            'Short substrate for TLV header at offset %d' % offset)
+
+    if length & 0x80:
+        count = length & 0x7F
+        if not count:
+            return tag, offset, None
+        if offset + count > len(substrate):
+            raise error.SubstrateUnderrunError(
+                'Short substrate for long form length at offset %d' % offset)
+        length = int.from_bytes(substrate[offset:offset + count], 'big')
+        offset += count
+
+    return tag, offset, length
+
+
+def readTlv(substrate, offset=0):
+    """Locate the TLV at offset.
+
+    Returns (tag, valueOffset, valueEnd, tlvEnd).  For the indefinite
+    length form, valueEnd is the position of the end-of-contents octets
+    and tlvEnd is the position just after them.
+    """
+    tag, valueOffset, length = readHeader(substrate, offset)
+
+    if length is not None:
+        valueEnd = valueOffset + length
+        if valueEnd > len(substrate):
+            raise error.SubstrateUnderrunError(
+                '%d-octet value at offset %d exceeds the substrate' %
+                (length, valueOffset))
+        return tag, valueOffset, valueEnd, valueEnd
+
+    if not isConstructed(tag):
+        raise error.PyAsn1Error(
+            'Indefinite length used with a primitive encoding at offset %d' %
+            offset)
+
+    position = valueOffset
+    while True:
+        if substrate[position:position + 2] == EOC:
+            return tag, valueOffset, position, position + 2
+        position = readTlv(substrate, position)[3]
+
+
+def iterTlvs(substrate, offset=0, end=None):
+    """Yield (offset, tag, valueOffset, valueEnd, tlvEnd) for consecutive TLVs.
+
+    Iteration stops at end, or at the end of the substrate when end is
+    None.  End-of-contents octets also stop the iteration, which makes
+    it possible to walk the contents of an indefinite length encoding.
+    """
+    if end is None:
+        end = len(substrate)
+
+    while offset < end:
+        if substrate[offset:offset + 2] == EOC:
+            return
+        tag, valueOffset, valueEnd, tlvEnd = readTlv(substrate, offset)
+        if tlvEnd > end:
+            raise error.PyAsn1Error(
+                'TLV at offset %d runs past its enclosing encoding' % offset)
+        yield offset, tag, valueOffset, valueEnd, tlvEnd
+        offset = tlvEnd
+
+
+def children(substrate, offset=0):
+    """Return the list of TLVs inside the constructed TLV at offset."""
+    tag, valueOffset, valueEnd, tlvEnd = readTlv(substrate, offset)
+    return list(iterTlvs(substrate, valueOffset, valueEnd))
+
+
+def stringValue(substrate, offset=0):
+    """Return the value of a string type TLV as bytes.
+
+    The segments of a constructed (BER) encoding are joined together.
+    """
+    tag, valueOffset, valueEnd, tlvEnd = readTlv(substrate, offset)
+    if not isConstructed(tag):
+        return bytes(substrate[valueOffset:valueEnd])
+
+    segments = []
+    offset = valueOffset
+    while offset < valueEnd:
+        segments.append(stringValue(substrate, offset))
+        offset = readTlv(substrate, offset)[3]
+
+    return b''.join(segments)
+
+
+def encodeTag(tag):
+    """Return the identifier octets for a tag reported by readHeader."""
+    if tag <= 0xFF:
+        return bytes((tag,))
+    return tag.to_bytes((tag.bit_length() + 7) // 8, 'big')
+
+
+def encodeLength(length):
+    """Return the length octets; None selects the indefinite form."""
+    if length is None:
+        return b'\x80'
+    if length < 0x80:
+        return bytes((length,))
+    octets = length.to_bytes((length.bit_length() + 7) // 8, 'big')
+    return bytes((0x80 | len(octets),)) + octets
+
+
+def encodeHeader(tag, length):
+    """Return the identifier and length octets for a TLV."""
+    return encodeTag(tag) + encodeLength(length)
+
+
+def encodeTlv(tag, value):
+    """Return a complete definite length TLV."""
+    return encodeHeader(tag, len(value)) + value
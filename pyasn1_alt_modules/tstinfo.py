@@ -0,0 +1,224 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# Direct extraction of the TSTInfo from RFC 3161 time-stamp tokens.  The
+# tlv helpers walk only ContentInfo, SignedData, encapContentInfo, and
+# the TSTInfo inside it, so genTime, serialNumber, and the messageImprint
+# are read without decoding the token three times over.  The signer
+# identifier, the signed attributes, and the signature are sliced out of
+# the first SignerInfo for the caller to verify; certificates and CRLs
+# are stepped over unless they are asked for.
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+
+from pyasn1 import error
+from pyasn1.codec.der.decoder import decode as der_decoder
+from pyasn1.codec.der.encoder import encode as der_encoder
+from pyasn1.type import univ
+
+from pyasn1_alt_modules import certfields
+from pyasn1_alt_modules import rfc3161
+from pyasn1_alt_modules import rfc5652
+from pyasn1_alt_modules import timecache
+from pyasn1_alt_modules import tlv
+
+
+_SIGNED_DATA = certfields.oidTlv(rfc5652.id_signedData)
+_TST_INFO = certfields.oidTlv(rfc3161.id_ct_TSTInfo)
+
+_CERTIFICATES = tlv.contextTag(0)
+_CRLS = tlv.contextTag(1)
+_TSA = tlv.contextTag(0)
+_SIGNED_ATTRS = tlv.contextTag(0)
+
+_oids = {}
+
+
+def _oid(encoding):
+    """Return the ObjectIdentifier for a DER OID TLV, reusing the
+    objects for the few policies and algorithms that a TSA uses."""
+    encoding = bytes(encoding)
+    try:
+        return _oids[encoding]
+    except KeyError:
+        pass
+    oid, rest = der_decoder(encoding, asn1Spec=univ.ObjectIdentifier())
+    if len(_oids) < 1024:
+        _oids[encoding] = oid
+    return oid
+
+
+def _integer(substrate, item):
+    return int.from_bytes(substrate[item[2]:item[3]], 'big', signed=True)
+
+
+class TimeStampInfo(object):
+    """The TSTInfo fields and signer details of a time-stamp token.
+
+    The policy and hashAlgorithm are ObjectIdentifier objects, genTime
+    is the GeneralizedTime string, and nonce is None when absent.  The
+    tstInfo is the DER TSTInfo, which the message-digest attribute
+    covers.  The signerIdentifier, digestAlgorithm, and
+    signatureAlgorithm are DER encodings from the first SignerInfo, and
+    signedAttrs is the DER SET OF Attribute that the signature is
+    computed over.  The certificates and crls are lists of DER
+    encodings, or None if they were not asked for.
+    """
+
+    __slots__ = ('version', 'policy', 'hashAlgorithm', 'hashedMessage',
+                 'serialNumber', 'genTime', 'ordering', 'nonce', 'tsa',
+                 'tstInfo', 'signerIdentifier', 'digestAlgorithm',
+                 'signedAttrs', 'signatureAlgorithm', 'signature',
+                 'certificates', 'crls')
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            setattr(self, name, fields.get(name))
+
+    def __repr__(self):
+        return '%s(serialNumber=%d, genTime=%s, policy=%s)' % (
+            self.__class__.__name__, self.serialNumber, self.genTime,
+            self.policy)
+
+    @property
+    def genTimeAsDateTime(self):
+        """The genTime as a timezone-aware datetime."""
+        return timecache.toDateTime(self.genTime)
+
+
+def _parseTstInfo(tstInfo, info):
+    members = tlv.children(tstInfo)
+    if len(members) < 5 or members[4][1] != tlv.GENERALIZED_TIME:
+        raise error.PyAsn1Error('Not a TSTInfo')
+
+    imprint = tlv.children(tstInfo, members[2][0])
+    algorithm = tlv.children(tstInfo, imprint[0][0])[0]
+    info.version = _integer(tstInfo, members[0])
+    info.policy = _oid(tstInfo[members[1][0]:members[1][4]])
+    info.hashAlgorithm = _oid(tstInfo[algorithm[0]:algorithm[4]])
+    info.hashedMessage = bytes(tstInfo[imprint[1][2]:imprint[1][3]])
+    info.serialNumber = _integer(tstInfo, members[3])
+    info.genTime = bytes(tstInfo[members[4][2]:members[4][3]]).decode('ascii')
+    info.ordering = False
+
+    for item in members[5:]:
+        if item[1] == tlv.BOOLEAN:
+            info.ordering = tstInfo[item[2]] != 0
+        elif item[1] == tlv.INTEGER:
+            info.nonce = _integer(tstInfo, item)
+        elif item[1] == _TSA:
+            info.tsa = bytes(tstInfo[item[2]:item[3]])
+
+
+def _parseSignerInfo(substrate, signerInfos, info):
+    signerInfo = next(tlv.iterTlvs(substrate, signerInfos[2], signerInfos[3]),
+                      None)
+    if signerInfo is None:
+        raise error.PyAsn1Error('The time-stamp token has no SignerInfo')
+
+    members = tlv.children(substrate, signerInfo[0])
+    info.signerIdentifier = bytes(substrate[members[1][0]:members[1][4]])
+    info.digestAlgorithm = bytes(substrate[members[2][0]:members[2][4]])
+    position = 3
+    if members[3][1] == _SIGNED_ATTRS:
+        signedAttrs = members[3]
+        info.signedAttrs = tlv.encodeTlv(
+            tlv.SET, bytes(substrate[signedAttrs[2]:signedAttrs[3]]))
+        position = 4
+    signatureAlgorithm, signature = members[position:position + 2]
+    info.signatureAlgorithm = bytes(
+        substrate[signatureAlgorithm[0]:signatureAlgorithm[4]])
+    info.signature = bytes(substrate[signature[2]:signature[3]])
+
+
+def _items(substrate, item):
+    return [bytes(substrate[member[0]:member[4]])
+            for member in tlv.iterTlvs(substrate, item[2], item[3])]
+
+
+def _token(substrate):
+    """Return the offset of the ContentInfo, looking inside a
+    TimeStampResp if that is what substrate holds."""
+    members = tlv.children(substrate)
+    if not members or members[0][1] != tlv.SEQUENCE:
+        return 0
+
+    status = _integer(substrate, tlv.children(substrate, members[0][0])[0])
+    if status not in (0, 1):
+        raise error.PyAsn1Error(
+            'The time-stamp request was rejected with status %d' % status)
+    if len(members) < 2:
+        raise error.PyAsn1Error('The TimeStampResp has no token')
+    return members[1][0]
+
+
+def _signedData(substrate):
+    """Return the members of the SignedData and the DER TSTInfo."""
+    contentInfo = tlv.children(substrate, _token(substrate))
+    if bytes(substrate[contentInfo[0][0]:contentInfo[0][4]]) != _SIGNED_DATA:
+        raise error.PyAsn1Error('The time-stamp token is not a SignedData')
+    signedDataOffset = tlv.readTlv(substrate, contentInfo[1][0])[1]
+    signedData = tlv.children(substrate, signedDataOffset)
+
+    encapContentInfo = tlv.children(substrate, signedData[2][0])
+    if bytes(substrate[encapContentInfo[0][0]:
+                       encapContentInfo[0][4]]) != _TST_INFO:
+        raise error.PyAsn1Error('The time-stamp token has no TSTInfo')
+    eContent = tlv.readTlv(substrate, encapContentInfo[1][0])[1]
+    return signedData, tlv.stringValue(substrate, eContent)
+
+
+def encodedTstInfo(token):
+    """Return the DER TSTInfo of an encoded time-stamp token or
+    TimeStampResp, without looking at anything else."""
+    return _signedData(memoryview(token))[1]
+
+
+def extract(token, certificates=False):
+    """Return the TimeStampInfo of a time-stamp token.
+
+    The token is a TimeStampToken (a ContentInfo) or a TimeStampResp,
+    either encoded or as a pyasn1 object.  A TimeStampResp without a
+    granted status raises PyAsn1Error.  With certificates=True, the
+    certificates and crls of the SignedData are returned as well.
+    """
+    if not isinstance(token, (bytes, bytearray, memoryview)):
+        token = der_encoder(token)
+    substrate = memoryview(token)
+    signedData, encoded = _signedData(substrate)
+
+    info = TimeStampInfo()
+    info.tstInfo = encoded
+    _parseTstInfo(encoded, info)
+    _parseSignerInfo(substrate, signedData[-1], info)
+
+    if certificates:
+        info.certificates = []
+        info.crls = []
+        for item in signedData[3:-1]:
+            if item[1] == _CERTIFICATES:
+                info.certificates = _items(substrate, item)
+            elif item[1] == _CRLS:
+                info.crls = _items(substrate, item)
+
+    return info
+
+
+def extractMany(tokens, certificates=False, strict=False):
+    """Return the TimeStampInfo of each token in a list.
+
+    A token that cannot be read gives None in its position, unless
+    strict is True, in which case the error is raised.
+    """
+    results = []
+    append = results.append
+    for token in tokens:
+        try:
+            append(extract(token, certificates))
+        except (error.PyAsn1Error, IndexError, ValueError):
+            if strict:
+                raise
+            append(None)
+    return results
@@ -0,0 +1,180 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# Warming up a process before it forks its workers.  prewarm() imports
+# the modules of a profile, which fills in the opentype maps, makes one
+# instance of every ASN.1 type that they define, and then moves all of
+# the objects of the process into the permanent generation of the
+# garbage collector with gc.freeze().  The collector of a worker then
+# never writes to them, so the pages that hold them stay shared with
+# the parent instead of being copied into each worker.
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+
+import gc
+import importlib
+import os
+import sys
+import time
+
+from pyasn1 import error
+from pyasn1.type import base
+
+from pyasn1_alt_modules import opentypemap
+from pyasn1_alt_modules import snapshot
+
+
+# The modules of each profile; the modules that they import are loaded
+# with them.  The 'all' profile is every rfc module.
+PROFILES = {
+    'pkix': (
+        'rfc2986', 'rfc3279', 'rfc3709', 'rfc3739', 'rfc3779', 'rfc4055',
+        'rfc5280', 'rfc5480', 'rfc5755', 'rfc5913', 'rfc5914', 'rfc6960',
+        'rfc6962', 'rfc8410', 'rfc8692', 'rfc9399', 'rfc9608', 'rfc9654',
+        'rfc9802', 'rfc9881', 'rfc9909', 'rfc9935',
+    ),
+    'cms': (
+        'rfc3161', 'rfc3274', 'rfc3370', 'rfc3565', 'rfc4073', 'rfc4108',
+        'rfc5035', 'rfc5083', 'rfc5084', 'rfc5126', 'rfc5544', 'rfc5652',
+        'rfc5751', 'rfc5752', 'rfc5753', 'rfc5958', 'rfc5990', 'rfc6211',
+        'rfc8419', 'rfc8702', 'rfc9629', 'rfc9688', 'rfc9690', 'rfc9708',
+        'rfc9814', 'rfc9882', 'rfc9936',
+    ),
+    'rpki': (
+        'rfc3779', 'rfc6482', 'rfc6484', 'rfc6486', 'rfc6487', 'rfc6492',
+        'rfc6493', 'rfc8209', 'rfc8360', 'rfc9092', 'rfc9286', 'rfc9323',
+        'rfc9582', 'rfc9632', 'rfc9691',
+    ),
+    'cmp': (
+        'rfc4210', 'rfc4211', 'rfc4212', 'rfc6402', 'rfc9480', 'rfc9481',
+        'rfc9810',
+    ),
+    'all': None,
+}
+
+_PREFIX = 'pyasn1_alt_modules.'
+
+# One instance of every type of the modules that have been warmed up,
+# by name, such as 'rfc5280.Certificate'.  They can be given to the
+# decoder as the asn1Spec, which is not changed by decoding.
+templates = {}
+
+
+class PrewarmReport(object):
+    """What prewarm() loaded.
+
+    The modules are the rfc modules that are loaded, the types are the
+    ASN.1 types that they define, and mapEntries is the number of
+    entries in all of the opentype maps.  The residentMemory is the
+    growth of the resident set size in octets, or None where it cannot
+    be read, and frozen is the number of objects that gc.freeze() moved
+    out of the way of the garbage collector.
+    """
+
+    __slots__ = ('profile', 'modules', 'types', 'mapEntries',
+                 'residentMemory', 'frozen', 'seconds')
+
+    def __init__(self, profile, modules, types, mapEntries,
+                 residentMemory, frozen, seconds):
+        self.profile = profile
+        self.modules = modules
+        self.types = types
+        self.mapEntries = mapEntries
+        self.residentMemory = residentMemory
+        self.frozen = frozen
+        self.seconds = seconds
+
+    def __repr__(self):
+        return '%s(%s, modules=%d, types=%d, mapEntries=%d, ' \
+            'residentMemory=%s, frozen=%d)' % (
+                self.__class__.__name__, self.profile, self.modules,
+                self.types, self.mapEntries, self.residentMemory,
+                self.frozen)
+
+
+def _residentMemory():
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def profileModules(profile):
+    """Return the names of the modules of a profile, which may be the
+    name of a profile or a sequence of module names."""
+    if isinstance(profile, str):
+        try:
+            modules = PROFILES[profile]
+        except KeyError:
+            raise error.PyAsn1Error('Unknown profile %s' % profile)
+        if modules is None:
+            return snapshot.allModules()
+        return sorted(modules)
+    return sorted(profile)
+
+
+def _loadedModules():
+    return sorted(
+        (name[len(_PREFIX):], module)
+        for name, module in list(sys.modules.items())
+        if name.startswith(_PREFIX + 'rfc') and module is not None)
+
+
+def _buildTemplates(modules):
+    for moduleName, module in modules:
+        for name, value in vars(module).items():
+            if isinstance(value, type) and \
+                    issubclass(value, base.Asn1Type) and \
+                    value.__module__ == module.__name__:
+                key = moduleName + '.' + name
+                if key not in templates:
+                    try:
+                        templates[key] = value()
+                    except error.PyAsn1Error:
+                        pass
+
+
+def prewarm(profile='all', freeze=True, snapshotPath=None):
+    """Import the modules of a profile, make the templates of their
+    types, and freeze the objects of the process for forking.
+
+    The profile is one of the names in PROFILES or a sequence of module
+    names.  With a snapshotPath, the modules are loaded from that
+    snapshot when it can be used, which is when none of its modules has
+    been imported yet.  The garbage collector is disabled while the
+    objects are made, so that they are laid out without holes, and is
+    enabled again, if it was, after gc.freeze().  Returns a
+    PrewarmReport.
+    """
+    start = time.perf_counter()
+    memory = _residentMemory()
+
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        if snapshotPath is not None:
+            snapshot.load(snapshotPath)
+        for name in profileModules(profile):
+            importlib.import_module(_PREFIX + name)
+
+        modules = _loadedModules()
+        _buildTemplates(modules)
+
+        if freeze:
+            gc.freeze()
+        frozen = gc.get_freeze_count()
+    finally:
+        if enabled:
+            gc.enable()
+
+    after = _residentMemory()
+    return PrewarmReport(
+        profile if isinstance(profile, str) else tuple(profile),
+        len(modules), len(templates),
+        sum(len(typeMap)
+            for typeMap in opentypemap.map_of_opentype_maps.values()),
+        None if memory is None or after is None else after - memory,
+        frozen, time.perf_counter() - start)
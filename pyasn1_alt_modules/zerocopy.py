@@ -0,0 +1,216 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# A DER decoder that keeps large BIT STRING values as the octets that
+# were received.  pyasn1 stores a BIT STRING as one big integer, which
+# is built when the value is decoded and turned back into octets each
+# time asOctets() is called or the value is encoded.  The public keys
+# and signatures of the post-quantum algorithms run from a few to tens
+# of KB, so here an octet-aligned BIT STRING of at least largeValue
+# octets keeps a memoryview of the substrate instead: asOctets() and
+# the DER encoder copy the octets out of it, and the integer is only
+# built when the bits themselves are asked for.  The values keep the
+# substrate alive, and it must not be changed while they are in use.
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+
+import io
+
+from pyasn1 import error
+from pyasn1.codec.der import decoder
+from pyasn1.codec.streaming import readFromStream
+from pyasn1.error import SubstrateUnderrunError
+from pyasn1.type import tag
+from pyasn1.type import univ
+
+
+class _DeferredOctets(object):
+    """Mixin for a BitString class whose value is held as octets until
+    the bits themselves are needed."""
+
+    @property
+    def _value(self):
+        values = self.__dict__
+        try:
+            return values['_value']
+        except KeyError:
+            pass
+        value = univ.BitString.fromOctetString(
+            values['_octets'], internalFormat=True)
+        values['_value'] = value
+        return value
+
+    @property
+    def isValue(self):
+        return '_octets' in self.__dict__ or univ.BitString.isValue.fget(self)
+
+    def __len__(self):
+        octets = self.__dict__.get('_octets')
+        if octets is None:
+            return univ.BitString.__len__(self)
+        return len(octets) * 8
+
+    def asOctets(self):
+        octets = self.__dict__.get('_octets')
+        if octets is None:
+            return univ.BitString.asOctets(self)
+        return bytes(octets)
+
+    def asNumbers(self):
+        return tuple(self.asOctets())
+
+    def __reduce_ex__(self, protocol):
+        values = self.__dict__.copy()
+        if '_octets' in values:
+            values.pop('_value', None)
+            values['_octets'] = bytes(values['_octets'])
+        return _restore, (self.__class__.__bases__[1], values)
+
+
+_deferredClasses = {}
+
+
+def _deferredClass(cls):
+    """Return the class that holds the octets of a cls value."""
+    if issubclass(cls, _DeferredOctets):
+        return cls
+    try:
+        return _deferredClasses[cls]
+    except KeyError:
+        pass
+    deferred = type(cls.__name__, (_DeferredOctets, cls), {
+        '__module__': cls.__module__,
+        '__qualname__': cls.__qualname__,
+    })
+    _deferredClasses[cls] = deferred
+    return deferred
+
+
+def _restore(cls, values):
+    if '_octets' in values:
+        cls = _deferredClass(cls)
+    asn1Object = cls.__new__(cls)
+    asn1Object.__dict__.update(values)
+    return asn1Object
+
+
+class _BitStringPayloadDecoder(decoder.BitStringPayloadDecoder):
+
+    def valueDecoder(self, substrate, asn1Spec,
+                     tagSet=None, length=None, state=None,
+                     decodeFun=None, substrateFun=None,
+                     **options):
+        # Only a value the schema adds no constraints to can be made
+        # without looking at its bits.
+        if substrateFun or options.get('native') or \
+                length - 1 < options.get('largeValue', 256) or \
+                tagSet[0].tagFormat != tag.tagFormatSimple or \
+                (asn1Spec is not None and asn1Spec.subtypeSpec):
+            for chunk in decoder.BitStringPayloadDecoder.valueDecoder(
+                    self, substrate, asn1Spec, tagSet, length, state,
+                    decodeFun, substrateFun, **options):
+                yield chunk
+            return
+
+        for trailingBits in readFromStream(substrate, 1, options):
+            if isinstance(trailingBits, SubstrateUnderrunError):
+                yield trailingBits
+
+        trailingBits = ord(trailingBits)
+        if trailingBits > 7:
+            raise error.PyAsn1Error(
+                'Trailing bits overflow %s' % trailingBits)
+
+        chunk = None
+        source = options.get('_source')
+        if source is not None and substrate is source[0]:
+            offset = substrate.tell()
+            chunk = source[1][offset:offset + length - 1]
+            if len(chunk) == length - 1:
+                substrate.seek(offset + length - 1)
+            else:
+                chunk = None
+
+        if chunk is None:
+            # An open type is decoded from a stream of its own.
+            for chunk in readFromStream(substrate, length - 1, options):
+                if isinstance(chunk, SubstrateUnderrunError):
+                    yield chunk
+
+        if trailingBits:
+            yield self._createComponent(
+                asn1Spec, tagSet, self.protoComponent.fromOctetString(
+                    chunk, internalFormat=True, padding=trailingBits),
+                **options)
+            return
+
+        if asn1Spec is None:
+            template = self.protoComponent.clone(tagSet=tagSet)
+        else:
+            template = asn1Spec
+
+        values = template.__dict__.copy()
+        del values['_value']
+        values['_octets'] = chunk
+        yield _restore(template.__class__, values)
+
+
+TAG_MAP = decoder.TAG_MAP.copy()
+TAG_MAP[univ.BitString.tagSet] = _BitStringPayloadDecoder()
+
+TYPE_MAP = decoder.TYPE_MAP.copy()
+TYPE_MAP[univ.BitString.typeId] = TAG_MAP[univ.BitString.tagSet]
+
+
+class SingleItemDecoder(decoder.SingleItemDecoder):
+    __doc__ = decoder.SingleItemDecoder.__doc__
+
+    TAG_MAP = TAG_MAP
+    TYPE_MAP = TYPE_MAP
+
+
+class StreamingDecoder(decoder.StreamingDecoder):
+    __doc__ = decoder.StreamingDecoder.__doc__
+
+    SINGLE_ITEM_DECODER = SingleItemDecoder
+
+
+class Decoder(decoder.Decoder):
+    __doc__ = decoder.Decoder.__doc__
+
+    STREAMING_DECODER = StreamingDecoder
+
+    @classmethod
+    def __call__(cls, substrate, asn1Spec=None, **options):
+        # The values are cut from the substrate by their offset in the
+        # stream, so the stream is made here to know which one it is.
+        if isinstance(substrate, bytes) or \
+                (isinstance(substrate, memoryview) and substrate.readonly):
+            view = memoryview(substrate)
+            substrate = io.BytesIO(view)
+            options['_source'] = (substrate, view)
+        return super(Decoder, cls).__call__(substrate, asn1Spec, **options)
+
+
+#: Decode DER like pyasn1.codec.der.decoder.decode, keeping the octets
+#: of BIT STRING values of at least largeValue octets (default 256).
+decode = Decoder()
+
+
+def isDeferred(bitString):
+    """Return True if the integer value of bitString has not been built
+    from its octets."""
+    values = bitString.__dict__
+    return '_octets' in values and '_value' not in values
+
+
+def octetsView(value):
+    """Return a memoryview of the octets of a BIT STRING or OCTET STRING
+    value, which is a view of the substrate for the values that keep
+    one."""
+    octets = value.__dict__.get('_octets')
+    if octets is None:
+        octets = value.asOctets()
+    return memoryview(octets)
@@ -8,7 +8,24 @@
 import unittest
 
 suite = unittest.TestLoader().loadTestsFromNames(
-    ['tests.test_pem.suite',
+    ['tests.test_algcatalog.suite',
+     'tests.test_asyncdecode.suite',
+     'tests.test_certfields.suite',
+     'tests.test_certintern.suite',
+     'tests.test_cmcbatch.suite',
+     'tests.test_cmpbatch.suite',
+     'tests.test_cmsstream.suite',
+     'tests.test_compact.suite',
+     'tests.test_decodeprof.suite',
+     'tests.test_depgraph.suite',
+     'tests.test_dercache.suite',
+     'tests.test_estscep.suite',
+     'tests.test_evidencerecord.suite',
+     'tests.test_ldapstream.suite',
+     'tests.test_native.suite',
+     'tests.test_pem.suite',
+     'tests.test_pkcs12bags.suite',
+     'tests.test_precert.suite',
      'tests.test_rfc2040.suite',
      'tests.test_rfc2314.suite',
      'tests.test_rfc2315.suite',
@@ -210,7 +227,16 @@ suite = unittest.TestLoader().loadTestsFromNames(
      'tests.test_rfc9909.suite',
      'tests.test_rfc9925.suite',
      'tests.test_rfc9935.suite',
-     'tests.test_rfc9936.suite']
+     'tests.test_rfc9936.suite',
+     'tests.test_sannames.suite',
+     'tests.test_sct.suite',
+     'tests.test_snapshot.suite',
+     'tests.test_snmpfast.suite',
+     'tests.test_timecache.suite',
+     'tests.test_tlv.suite',
+     'tests.test_tstinfo.suite',
+     'tests.test_warmup.suite',
+     'tests.test_zerocopy.suite']
 )
 
 
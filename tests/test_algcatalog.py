@@ -0,0 +1,151 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+import sys
+import unittest
+
+from pyasn1.codec.der.decoder import decode as der_decoder
+from pyasn1.codec.der.encoder import encode as der_encoder
+from pyasn1.error import PyAsn1Error
+from pyasn1.type import namedtype
+from pyasn1.type import tag
+from pyasn1.type import univ
+
+from pyasn1_alt_modules import algcatalog
+from pyasn1_alt_modules import certfields
+from pyasn1_alt_modules import pem
+from pyasn1_alt_modules import rfc4055
+from pyasn1_alt_modules import rfc5280
+from pyasn1_alt_modules import rfc5480
+from pyasn1_alt_modules import rfc8410
+from pyasn1_alt_modules import rfc9814
+from pyasn1_alt_modules import rfc9881
+from pyasn1_alt_modules import tlv
+
+from tests import test_certfields
+from tests import test_rfc9881
+
+
+def _algorithmIdentifier(algorithm, parameters=None):
+    algorithmIdentifier = rfc5280.AlgorithmIdentifier()
+    algorithmIdentifier['algorithm'] = algorithm
+    if parameters is not None:
+        algorithmIdentifier['parameters'] = parameters
+    return algorithmIdentifier
+
+
+class AlgorithmCatalogTestCase(unittest.TestCase):
+
+    def testConstants(self):
+        for name, value in (
+                ('rfc4055.sha256Identifier', rfc4055.sha256Identifier),
+                ('rfc9881.sa_ml_dsa_65', rfc9881.sa_ml_dsa_65),
+                ('rfc9814.sa_slh_dsa_shake_256f',
+                 rfc9814.sa_slh_dsa_shake_256f)):
+            encoding = der_encoder(value)
+            descriptor = algcatalog.lookup(encoding)
+            self.assertEqual(name, descriptor.name)
+            self.assertEqual(value['algorithm'], descriptor.algorithm)
+            self.assertEqual(encoding, descriptor.encoding)
+            self.assertIs(descriptor, algcatalog.lookup(memoryview(encoding)))
+            self.assertIs(descriptor, algcatalog.lookup(bytearray(encoding)))
+            self.assertIs(descriptor, algcatalog.lookup(
+                memoryview(bytearray(encoding))))
+            self.assertEqual(encoding, algcatalog.encoding(name))
+
+        self.assertIsNone(
+            algcatalog.lookup(der_encoder(rfc9881.sa_ml_dsa_65)[:-1]))
+
+    def testGeneratedEntries(self):
+        # NULL parameters from the algorithmIdentifierMap.
+        descriptor = algcatalog.lookup(der_encoder(_algorithmIdentifier(
+            rfc5480.rsaEncryption, univ.Null(''))))
+        self.assertEqual(b'\x05\x00', descriptor.parameters)
+
+        # Absent parameters without a constant in the module.
+        descriptor = algcatalog.lookup(der_encoder(_algorithmIdentifier(
+            rfc8410.id_X448)))
+        self.assertEqual('rfc8410.id_X448', descriptor.name)
+        self.assertIsNone(descriptor.parameters)
+
+        self.assertIsNone(algcatalog.lookup(der_encoder(_algorithmIdentifier(
+            rfc8410.id_Ed25519, univ.Null('')))))
+        self.assertEqual(der_encoder(_algorithmIdentifier(rfc8410.id_Ed25519)),
+                         algcatalog.encoding(rfc8410.id_Ed25519))
+        self.assertRaises(PyAsn1Error, algcatalog.encoding, '1.2.3.4')
+
+    def testDescriptors(self):
+        catalog = algcatalog.AlgorithmCatalog()
+        self.assertGreater(len(catalog), 100)
+        for descriptor in catalog:
+            algorithmIdentifier, rest = der_decoder(
+                descriptor.encoding, asn1Spec=rfc5280.AlgorithmIdentifier())
+            self.assertEqual(descriptor.algorithm,
+                             algorithmIdentifier['algorithm'])
+            self.assertIs(descriptor, catalog.match(algorithmIdentifier))
+            self.assertEqual(descriptor.encoding,
+                             der_encoder(algorithmIdentifier))
+
+    def testDescribe(self):
+        substrate = pem.readBase64fromText(
+            test_rfc9881.MLDSACertificateTestCase.pem_text)
+        fields = certfields.tbsFields(substrate)
+        signatureAlgorithm = tlv.children(substrate)[1][0]
+        spki = tlv.children(substrate, fields['subjectPublicKeyInfo'][0])
+
+        for offset in (fields['signature'][0], signatureAlgorithm,
+                       spki[0][0]):
+            descriptor = algcatalog.describe(substrate, offset)
+            self.assertEqual('rfc9881.sa_ml_dsa_65', descriptor.name)
+            self.assertIs(descriptor, algcatalog.describe(
+                bytearray(substrate), offset))
+
+        self.assertRaises(PyAsn1Error, algcatalog.describe,
+                          substrate, spki[1][0])
+
+    def testEncode(self):
+        for pem_text in (test_certfields.CertificateFieldsTestCase.pem_text,
+                         test_rfc9881.MLDSACertificateTestCase.pem_text):
+            substrate = pem.readBase64fromText(pem_text)
+            certificate, rest = der_decoder(
+                substrate, asn1Spec=rfc5280.Certificate())
+            self.assertEqual(substrate, algcatalog.encode(certificate))
+
+        # A tagged AlgorithmIdentifier is encoded as usual.
+        tagged = rfc5280.AlgorithmIdentifier().subtype(
+            implicitTag=tag.Tag(tag.tagClassContext, tag.tagFormatSimple, 1))
+        tagged['algorithm'] = rfc9881.id_ml_dsa_44
+        self.assertIsNone(algcatalog.lookup(der_encoder(tagged)))
+        self.assertEqual(der_encoder(tagged), algcatalog.encode(tagged))
+
+        unknown = _algorithmIdentifier(univ.ObjectIdentifier('1.2.3.4'))
+        self.assertEqual(der_encoder(unknown), algcatalog.encode(unknown))
+
+    def testPlainSequences(self):
+        # Plain univ.Sequence objects share the class but not the shape.
+        shaped = univ.Sequence(componentType=namedtype.NamedTypes(
+            namedtype.NamedType('algorithm', univ.ObjectIdentifier()),
+            namedtype.OptionalNamedType('parameters', univ.Any())))
+        shaped['algorithm'] = rfc9881.id_ml_dsa_65
+        self.assertEqual(der_encoder(rfc9881.sa_ml_dsa_65),
+                         algcatalog.encode(shaped))
+
+        other = univ.Sequence(componentType=namedtype.NamedTypes(
+            namedtype.NamedType('version', univ.Integer())))
+        other['version'] = 1
+        self.assertEqual(der_encoder(other), algcatalog.encode(other))
+
+    def testModules(self):
+        catalog = algcatalog.AlgorithmCatalog(modules=('rfc9881',))
+        self.assertEqual(der_encoder(rfc9881.sa_ml_dsa_87),
+                         catalog.encoding(rfc9881.id_ml_dsa_87))
+
+
+suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+if __name__ == '__main__':
+    result = unittest.TextTestRunner(verbosity=2).run(suite)
+    sys.exit(not result.wasSuccessful())
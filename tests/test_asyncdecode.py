@@ -0,0 +1,148 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+import asyncio
+import sys
+import threading
+import unittest
+from concurrent import futures
+
+from pyasn1 import error
+from pyasn1.codec.der.encoder import encode as der_encoder
+
+from pyasn1_alt_modules import asyncdecode
+from pyasn1_alt_modules import pem
+from pyasn1_alt_modules import rfc5280
+from pyasn1_alt_modules import tlv
+
+from tests import test_certfields
+from tests import test_rfc9881
+
+
+class AsyncCodecTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.certificates = [
+            pem.readBase64fromText(pem_text) for pem_text in (
+                test_certfields.CertificateFieldsTestCase.pem_text,
+                test_rfc9881.MLDSACertificateTestCase.pem_text)]
+        # The first certificate is decoded inline, the second one not.
+        self.threshold = len(self.certificates[1])
+        self.assertLess(len(self.certificates[0]), self.threshold)
+
+    def testDecode(self):
+        async def run():
+            with futures.ThreadPoolExecutor(1) as executor:
+                codec = asyncdecode.AsyncCodec(
+                    executor, threshold=self.threshold)
+                return codec, [
+                    await codec.decode(substrate,
+                                       asn1Spec=rfc5280.Certificate())
+                    for substrate in self.certificates]
+
+        codec, decoded = asyncio.run(run())
+        self.assertEqual((1, 1), (codec.inline, codec.offloaded))
+        for substrate, (asn1Object, rest) in zip(self.certificates, decoded):
+            self.assertFalse(rest)
+            self.assertEqual(substrate, der_encoder(asn1Object))
+
+        asn1Object, rest = asyncio.run(asyncdecode.decode(
+            self.certificates[0], asn1Spec=rfc5280.Certificate()))
+        self.assertEqual(self.certificates[0], der_encoder(asn1Object))
+
+    def testProcessExecutor(self):
+        async def run():
+            with futures.ProcessPoolExecutor(1) as executor:
+                codec = asyncdecode.AsyncCodec(executor, threshold=0)
+                asn1Object, rest = await codec.decode(
+                    bytearray(self.certificates[1]),
+                    asn1Spec=rfc5280.Certificate())
+                return asn1Object, await codec.encode(asn1Object)
+
+        asn1Object, substrate = asyncio.run(run())
+        self.assertEqual(self.certificates[1], substrate)
+        self.assertEqual(self.certificates[1], der_encoder(asn1Object))
+
+    def testEncode(self):
+        certificates = [
+            asyncio.run(asyncdecode.decode(
+                substrate, asn1Spec=rfc5280.Certificate()))[0]
+            for substrate in self.certificates]
+        self.assertLess(
+            asyncdecode.estimateSize(certificates[0]), self.threshold)
+        self.assertGreaterEqual(
+            asyncdecode.estimateSize(certificates[1]), self.threshold)
+
+        async def run():
+            codec = asyncdecode.AsyncCodec(threshold=self.threshold)
+            encoded = [await codec.encode(certificate)
+                       for certificate in certificates]
+            encoded.append(await codec.encode(certificates[0], offload=True))
+            return codec, encoded
+
+        codec, encoded = asyncio.run(run())
+        self.assertEqual(self.certificates + self.certificates[:1], encoded)
+        self.assertEqual((1, 2), (codec.inline, codec.offloaded))
+
+    def testCancel(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def block():
+            started.set()
+            release.wait(10)
+
+        async def run():
+            with futures.ThreadPoolExecutor(1) as executor:
+                codec = asyncdecode.AsyncCodec(executor, threshold=0)
+                # The only worker is busy, so the decode is still queued.
+                blocker = asyncio.get_running_loop().run_in_executor(
+                    executor, block)
+                await asyncio.get_running_loop().run_in_executor(
+                    None, started.wait)
+                task = asyncio.ensure_future(codec.decode(
+                    self.certificates[1], asn1Spec=rfc5280.Certificate()))
+                await asyncio.sleep(0)
+                task.cancel()
+                release.set()
+                await blocker
+                with self.assertRaises(asyncio.CancelledError):
+                    await task
+
+        asyncio.run(run())
+
+    def testDecodeStream(self):
+        bundle = b''.join(self.certificates * 2)
+
+        async def run(data, **options):
+            reader = asyncio.StreamReader()
+            for offset in range(0, len(data), 1000):
+                reader.feed_data(data[offset:offset + 1000])
+            reader.feed_eof()
+            codec = asyncdecode.AsyncCodec(threshold=self.threshold)
+            decoded = []
+            async for asn1Object in codec.decodeStream(
+                    reader, asn1Spec=rfc5280.Certificate(), **options):
+                decoded.append(der_encoder(asn1Object))
+            return codec, decoded
+
+        codec, decoded = asyncio.run(run(bundle))
+        self.assertEqual(self.certificates * 2, decoded)
+        self.assertEqual((2, 2), (codec.inline, codec.offloaded))
+
+        with self.assertRaises(error.SubstrateUnderrunError):
+            asyncio.run(run(bundle[:-1]))
+        with self.assertRaises(error.PyAsn1Error):
+            asyncio.run(run(bundle, maxSize=self.threshold - 1))
+        with self.assertRaises(error.PyAsn1Error):
+            asyncio.run(run(bytes([tlv.SEQUENCE, 0x80, 0, 0])))
+
+
+suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+if __name__ == '__main__':
+    result = unittest.TextTestRunner(verbosity=2).run(suite)
+    sys.exit(not result.wasSuccessful())
@@ -0,0 +1,84 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+import sys
+import unittest
+
+from pyasn1.codec.der.decoder import decode as der_decoder
+from pyasn1.codec.der.encoder import encode as der_encoder
+
+from pyasn1_alt_modules import pem
+from pyasn1_alt_modules import rfc5280
+from pyasn1_alt_modules import certfields
+
+
+class CertificateFieldsTestCase(unittest.TestCase):
+    pem_text = """\
+MIIC4jCCAkugAwIBAgIBCDANBgkqhkiG9w0BAQUFADBYMQswCQYDVQQGEwJHQjEn
+MCUGA1UEChMeQ2VydGlmaWNhdGUgVHJhbnNwYXJlbmN5IFByZUNBMQ4wDAYDVQQI
+EwVXYWxlczEQMA4GA1UEBxMHRXJ3IFdlbjAeFw0xMjA2MDEwMDAwMDBaFw0yMjA2
+MDEwMDAwMDBaMFIxCzAJBgNVBAYTAkdCMSEwHwYDVQQKExhDZXJ0aWZpY2F0ZSBU
+cmFuc3BhcmVuY3kxDjAMBgNVBAgTBVdhbGVzMRAwDgYDVQQHEwdFcncgV2VuMIGf
+MA0GCSqGSIb3DQEBAQUAA4GNADCBiQKBgQCvrurKxRq3zr356srn3RdSleGTlVoX
+mJrvjZerfN/3dhCTwLgj0qTjpRoXuG8oFitmolOJNevs3BA2Iz2i3WUxsMY7zGh2
+Hr3IVAN7dzmSRrhwp7crFMmxZn3gmpZA7Z8/PHJdlQtNJlWYaf5/HpGaZut201wB
+F8a80NjP0hAosQIDAQABo4HBMIG+MB0GA1UdDgQWBBRhLGTvrHm3KDl8nZPm34ZG
+X6dqiDB9BgNVHSMEdjB0gBQH77NAIzT3nv4jgIOy4g1c6hB9QKFZpFcwVTELMAkG
+A1UEBhMCR0IxJDAiBgNVBAoTG0NlcnRpZmljYXRlIFRyYW5zcGFyZW5jeSBDQTEO
+MAwGA1UECBMFV2FsZXMxEDAOBgNVBAcTB0VydyBXZW6CAQEwCQYDVR0TBAIwADAT
+BgorBgEEAdZ5AgQDAQH/BAIFADANBgkqhkiG9w0BAQUFAAOBgQBCPm+dvVk8wR1Z
+qGE8r38KCOWa80OWwJpc9vjyLZ5MjKmnqutpIMSdyY6fxJczDGxj5rYk+JObNhfW
+C9XZboSDJ3ucsf6MGikdqYiO7sPkhBqr1u5YVce01dDCioQwT1xIjm+/bNuPp/Sp
+8BnJrf7EjKd08DTtXMr5VlMFqG62Vg==
+"""
+
+    def setUp(self):
+        self.substrate = pem.readBase64fromText(self.pem_text)
+        self.certificate, rest = der_decoder(
+            self.substrate, asn1Spec=rfc5280.Certificate())
+
+    def testTbsFields(self):
+        tbs = self.certificate['tbsCertificate']
+        tbsOffset, tbsEnd = certfields.tbsCertificate(self.substrate)
+        self.assertEqual(der_encoder(tbs), self.substrate[tbsOffset:tbsEnd])
+        self.assertEqual((tbsOffset, tbsEnd),
+                         certfields.tbsCertificate(self.substrate, tbsOffset))
+
+        fields = certfields.tbsFields(self.substrate)
+        for name in ('version', 'serialNumber', 'issuer', 'subject',
+                     'subjectPublicKeyInfo'):
+            item = fields[name]
+            self.assertEqual(der_encoder(tbs[name]),
+                             self.substrate[item[0]:item[4]])
+        self.assertNotIn('issuerUniqueID', fields)
+        self.assertIn('extensions', fields)
+
+    def testExtensions(self):
+        extensions = list(certfields.iterExtensions(self.substrate))
+        self.assertEqual(len(self.certificate['tbsCertificate']['extensions']),
+                         len(extensions))
+
+        for extn, found in zip(self.certificate['tbsCertificate']['extensions'],
+                               extensions):
+            extnID, critical, extnValue, extnOffset, extnEnd = found
+            self.assertEqual(der_encoder(extn['extnID']), extnID)
+            self.assertEqual(bool(extn['critical']), critical)
+            self.assertEqual(extn['extnValue'], extnValue)
+            self.assertEqual(der_encoder(extn),
+                             self.substrate[extnOffset:extnEnd])
+
+        extnValue = certfields.findExtension(
+            self.substrate, rfc5280.id_ce_basicConstraints)
+        self.assertEqual(b'\x30\x00', extnValue)
+        self.assertIsNone(certfields.findExtension(
+            self.substrate, rfc5280.id_ce_keyUsage))
+
+
+suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+if __name__ == '__main__':
+    result = unittest.TextTestRunner(verbosity=2).run(suite)
+    sys.exit(not result.wasSuccessful())
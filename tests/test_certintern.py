@@ -0,0 +1,174 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+import sys
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from pyasn1.codec.der.decoder import decode as der_decoder
+from pyasn1.codec.der.encoder import encode as der_encoder
+from pyasn1.type import univ
+
+from pyasn1_alt_modules import certintern
+from pyasn1_alt_modules import pem
+from pyasn1_alt_modules import rfc2315
+from pyasn1_alt_modules import rfc3279
+from pyasn1_alt_modules import rfc5055
+from pyasn1_alt_modules import rfc5280
+from pyasn1_alt_modules import rfc5652
+from pyasn1_alt_modules import rfc7296
+from pyasn1_alt_modules import tlv
+
+from tests import test_certfields
+from tests import test_rfc9881
+
+
+class CertificateInternerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.certificates = [
+            pem.readBase64fromText(pem_text) for pem_text in (
+                test_certfields.CertificateFieldsTestCase.pem_text,
+                test_rfc9881.MLDSACertificateTestCase.pem_text)]
+        self.interner = certintern.CertificateInterner()
+
+    def _certificate(self, index):
+        return der_decoder(self.certificates[index],
+                           asn1Spec=rfc5280.Certificate())[0]
+
+    def testSignedData(self):
+        signedData = rfc5652.SignedData()
+        signedData['version'] = 1
+        signedData['encapContentInfo']['eContentType'] = rfc5652.id_data
+        certificates = signedData['certificates']
+        for index in (0, 1, 0, 1):
+            certificateChoices = certificates.componentType.clone()
+            certificateChoices['certificate'] = self._certificate(index)
+            certificates.append(certificateChoices)
+        substrate = der_encoder(signedData)
+
+        asn1Object, rest = self.interner.decode(
+            substrate, asn1Spec=rfc5652.SignedData())
+        self.assertEqual(substrate, der_encoder(asn1Object))
+        self.assertEqual((2, 2), (self.interner.hits, self.interner.misses))
+        self.assertEqual(2, len(self.interner))
+
+        decoded = [choices['certificate']
+                   for choices in asn1Object['certificates']]
+        self.assertEqual(2, len(set(id(value) for value in decoded)))
+
+        asn1Object, rest = self.interner.decode(
+            substrate, asn1Spec=rfc5652.SignedData())
+        self.assertEqual((6, 2), (self.interner.hits, self.interner.misses))
+        self.assertEqual(0.75, self.interner.hitRate)
+        self.assertIs(decoded[0], asn1Object['certificates'][0]['certificate'])
+
+    def testBundles(self):
+        certBundle = rfc5055.CertBundle()
+        for index in (0, 1, 1):
+            certBundle.append(self._certificate(index))
+        substrate = der_encoder(certBundle)
+        asn1Object, rest = certintern.decode(
+            substrate, asn1Spec=rfc5055.CertBundle())
+        self.assertEqual(substrate, der_encoder(asn1Object))
+        self.assertIs(asn1Object[1], asn1Object[2])
+
+        # The [0] EXPLICIT certificates are kept apart from the others.
+        cert = tlv.encodeTlv(tlv.contextTag(0), self.certificates[1])
+        substrate = tlv.encodeTlv(tlv.SEQUENCE, cert + cert)
+        asn1Object, rest = self.interner.decode(
+            substrate, asn1Spec=rfc7296.CertificateBundle())
+        self.assertEqual(substrate, der_encoder(asn1Object))
+        self.assertIs(asn1Object[0]['cert'], asn1Object[1]['cert'])
+        self.assertIsNot(self.interner.intern(self.certificates[1]),
+                         asn1Object[0]['cert'])
+        self.assertEqual((1, 2), (self.interner.hits, self.interner.misses))
+
+    def testPkcs7(self):
+        signedData = rfc2315.SignedData()
+        signedData['version'] = 1
+        signedData['contentInfo']['contentType'] = rfc2315.data
+        certificates = signedData['certificates']
+        for index in (1, 1):
+            certificate = certificates.componentType.clone()
+            certificate['certificate'] = self._certificate(index)
+            certificates.append(certificate)
+        substrate = der_encoder(signedData)
+
+        asn1Object, rest = self.interner.decode(
+            substrate, asn1Spec=rfc2315.SignedData())
+        self.assertEqual(substrate, der_encoder(asn1Object))
+        self.assertIs(asn1Object['certificates'][0]['certificate'],
+                      asn1Object['certificates'][1]['certificate'])
+
+    def testCacheSize(self):
+        interner = certintern.CertificateInterner(cacheSize=1)
+        first = interner.internAll(self.certificates)
+        self.assertEqual(1, len(interner))
+        self.assertIs(first[1], interner.intern(self.certificates[1]))
+        self.assertIsNot(first[0], interner.intern(self.certificates[0]))
+        self.assertEqual((1, 3), (interner.hits, interner.misses))
+
+        interner.clear()
+        self.assertEqual(0, len(interner))
+        self.assertEqual(
+            self.certificates[0],
+            der_encoder(interner.intern(bytearray(self.certificates[0]))))
+
+    def testDecodeOptions(self):
+        # rfc3279 gives the NULL parameters of rsaEncryption.
+        self.assertIn(rfc3279.rsaEncryption,
+                      rfc5280.algorithmIdentifierMap)
+        asn1Spec = rfc5280.Certificate()
+        first = self.interner.intern(self.certificates[0])
+        decoded, rest = self.interner.decode(
+            self.certificates[0], asn1Spec=asn1Spec, decodeOpenTypes=True)
+        self.assertIsNot(first, decoded)
+        self.assertIsInstance(
+            first['tbsCertificate']['subjectPublicKeyInfo']['algorithm'][
+                'parameters'], univ.Any)
+        self.assertIsInstance(
+            decoded['tbsCertificate']['subjectPublicKeyInfo']['algorithm'][
+                'parameters'], univ.Null)
+
+        openTypes = {}
+        other, rest = self.interner.decode(
+            self.certificates[0], asn1Spec=asn1Spec, decodeOpenTypes=True,
+            openTypes=openTypes)
+        self.assertIsNot(decoded, other)
+        self.assertIs(decoded, self.interner.decode(
+            self.certificates[0], asn1Spec=asn1Spec,
+            decodeOpenTypes=True)[0])
+        self.assertIs(other, self.interner.decode(
+            self.certificates[0], asn1Spec=asn1Spec, decodeOpenTypes=True,
+            openTypes=openTypes)[0])
+        self.assertEqual((2, 3), (self.interner.hits, self.interner.misses))
+
+    def testThreads(self):
+        interner = certintern.CertificateInterner(cacheSize=1)
+        certificates = self.certificates * 200
+        with ThreadPoolExecutor(8) as executor:
+            results = list(executor.map(interner.intern, certificates))
+        self.assertEqual(certificates,
+                         [der_encoder(result) for result in results])
+        self.assertEqual(400, interner.hits + interner.misses)
+        self.assertEqual(1, len(interner))
+
+    def testOtherTypes(self):
+        # Other SEQUENCE types can be interned too.
+        interner = certintern.CertificateInterner(
+            types=(rfc5280.TBSCertificate,))
+        certificate, rest = interner.decode(
+            self.certificates[0], asn1Spec=rfc5280.Certificate())
+        self.assertEqual((0, 1), (interner.hits, interner.misses))
+        self.assertEqual(self.certificates[0], der_encoder(certificate))
+
+
+suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+if __name__ == '__main__':
+    result = unittest.TextTestRunner(verbosity=2).run(suite)
+    sys.exit(not result.wasSuccessful())
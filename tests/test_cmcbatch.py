@@ -0,0 +1,277 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+import hashlib
+import io
+import pickle
+import sys
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from pyasn1.codec.ber.decoder import decode as ber_decoder
+from pyasn1.codec.der.decoder import decode as der_decoder
+from pyasn1.codec.der.encoder import encode as der_encoder
+from pyasn1.error import PyAsn1Error
+from pyasn1.type import univ
+
+from pyasn1_alt_modules import cmcbatch
+from pyasn1_alt_modules import rfc4211
+from pyasn1_alt_modules import rfc5280
+from pyasn1_alt_modules import rfc6402
+
+
+# The requests are "signed" with a SHA-256 digest of the signed data,
+# which is enough to check that the right octets are found.
+
+def toySignature(data):
+    return univ.BitString.fromOctetString(hashlib.sha256(data).digest())
+
+
+def toyVerify(request):
+    pop = request.popInput()
+    if pop is None:
+        return True
+    return hashlib.sha256(pop.signedData).digest() == pop.signature
+
+
+def publicKey(number):
+    spki = rfc5280.SubjectPublicKeyInfo()
+    spki['algorithm']['algorithm'] = univ.ObjectIdentifier('1.3.101.112')
+    spki['subjectPublicKey'] = univ.BitString.fromOctetString(
+        bytes((number,)) * 32)
+    return spki
+
+
+def tcr(bodyPartID, good=True):
+    request = rfc6402.TaggedRequest()
+    tagged = request['tcr']
+    tagged['bodyPartID'] = bodyPartID
+    csr = tagged['certificationRequest']
+    cri = csr['certificationRequestInfo']
+    cri['version'] = 0
+    cri['subject']['rdnSequence'] = rfc5280.RDNSequence()
+    cri['subjectPublicKeyInfo']['algorithm']['algorithm'] = \
+        univ.ObjectIdentifier('1.3.101.112')
+    cri['subjectPublicKeyInfo']['subjectPublicKey'] = \
+        univ.BitString.fromOctetString(bytes((bodyPartID,)) * 32)
+    cri['attributes'].clear()
+    csr['signatureAlgorithm']['algorithm'] = univ.ObjectIdentifier(
+        '1.3.101.112')
+    signed = der_encoder(cri) + (b'' if good else b'x')
+    csr['signature'] = toySignature(signed)
+    return request
+
+
+def crm(certReqId, poposkInput=False, good=True):
+    request = rfc6402.TaggedRequest()
+    certReqMsg = request['crm']
+    certRequest = certReqMsg['certReq']
+    certRequest['certReqId'] = certReqId
+    template = certRequest['certTemplate']
+    spki = publicKey(certReqId)
+    popo = certReqMsg['popo']['signature']
+    popo['algorithmIdentifier']['algorithm'] = univ.ObjectIdentifier(
+        '1.3.101.112')
+    if poposkInput:
+        signingInput = popo['poposkInput']
+        signingInput['authInfo']['sender']['rfc822Name'] = 'a@example.com'
+        signingInput['publicKey'] = spki
+        signingKeyInput = rfc4211.POPOSigningKeyInput()
+        signingKeyInput['authInfo']['sender']['rfc822Name'] = 'a@example.com'
+        signingKeyInput['publicKey'] = spki
+        signed = der_encoder(signingKeyInput)
+    else:
+        template['publicKey']['algorithm'] = spki['algorithm']
+        template['publicKey']['subjectPublicKey'] = spki['subjectPublicKey']
+        signed = der_encoder(certRequest)
+    popo['signature'] = toySignature(signed + (b'' if good else b'x'))
+    return request
+
+
+def orm(bodyPartID):
+    request = rfc6402.TaggedRequest()
+    other = request['orm']
+    other['bodyPartID'] = bodyPartID
+    other['requestMessageType'] = univ.ObjectIdentifier('1.2.3.4')
+    other['requestMessageValue'] = der_encoder(univ.Null(''))
+    return request
+
+
+def pkiData(requests):
+    asn1Object = rfc6402.PKIData()
+    control = asn1Object['controlSequence'].componentType.clone()
+    control['bodyPartID'] = 100
+    control['attrType'] = rfc6402.id_cmc_senderNonce
+    control['attrValues'].append(der_encoder(univ.OctetString(b'nonce')))
+    asn1Object['controlSequence'].append(control)
+    asn1Object['reqSequence'].extend(requests)
+    asn1Object['cmsSequence'].clear()
+    asn1Object['otherMsgSequence'].clear()
+    return der_encoder(asn1Object)
+
+
+class RequestViewTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.requests = [tcr(1), crm(2), crm(3, poposkInput=True), orm(4),
+                         tcr(5, good=False), crm(6, good=False)]
+        self.pkiData = pkiData(self.requests)
+
+    def testViews(self):
+        views = list(cmcbatch.iterRequests(self.pkiData))
+        self.assertEqual(['tcr', 'crm', 'crm', 'orm', 'tcr', 'crm'],
+                         [view.kind for view in views])
+        self.assertEqual([1, 2, 3, 4, 5, 6],
+                         [view.bodyPartID for view in views])
+
+        tagged = self.requests[0]['tcr']
+        csr = tagged['certificationRequest']
+        self.assertEqual(der_encoder(csr), views[0].certificationRequest)
+        self.assertEqual(der_encoder(csr['certificationRequestInfo']),
+                         views[0].certificationRequestInfo)
+        self.assertEqual(der_encoder(self.requests[1]['crm']['certReq']),
+                         views[1].certRequest)
+        self.assertRaises(PyAsn1Error, lambda: views[1].certificationRequest)
+
+        for view, request in zip(views, self.requests):
+            self.assertEqual(der_encoder(request), der_encoder(view.decode()))
+
+        copy = pickle.loads(pickle.dumps(views[2]))
+        self.assertEqual(3, copy.bodyPartID)
+
+    def testPopInput(self):
+        views = list(cmcbatch.iterRequests(self.pkiData))
+        self.assertEqual([True, True, True, True, False, False],
+                         [toyVerify(view) for view in views])
+        self.assertIsNone(views[3].popInput())
+
+        spki = der_encoder(publicKey(3))
+        self.assertEqual(spki, views[2].popInput().subjectPublicKeyInfo)
+        spki = der_encoder(publicKey(2))
+        self.assertEqual(spki, views[1].popInput().subjectPublicKeyInfo)
+        pop = views[0].popInput()
+        self.assertEqual(der_encoder(
+            self.requests[0]['tcr']['certificationRequest']
+            ['certificationRequestInfo']['subjectPublicKeyInfo']),
+            pop.subjectPublicKeyInfo)
+
+    def testControls(self):
+        controls = list(cmcbatch.iterControls(self.pkiData))
+        self.assertEqual(1, len(controls))
+        bodyPartID, attrType, values = controls[0]
+        self.assertEqual(100, bodyPartID)
+        self.assertEqual(rfc6402.id_cmc_senderNonce, attrType)
+        self.assertEqual(der_encoder(univ.OctetString(b'nonce')), values[0])
+
+
+class CMCPipelineTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.requests = [tcr(number, good=number % 3 != 0)
+                         for number in range(1, 21)]
+        self.pkiData = pkiData(self.requests)
+
+    def checkResponse(self, substrate, decoder):
+        response, rest = decoder(substrate, asn1Spec=rfc6402.PKIResponse())
+        self.assertFalse(rest)
+        self.assertEqual(20, len(response['controlSequence']))
+
+        for number, control in enumerate(response['controlSequence'], 1):
+            self.assertEqual(number, control['bodyPartID'])
+            self.assertEqual(rfc6402.id_cmc_statusInfoV2, control['attrType'])
+            statusInfo, rest = der_decoder(
+                control['attrValues'][0],
+                asn1Spec=rfc6402.CMCStatusInfoV2())
+            self.assertEqual(
+                number, statusInfo['bodyList'][0]['bodyPartID'])
+            if number % 3:
+                self.assertEqual('success', str(statusInfo['cMCStatus']))
+                self.assertFalse(statusInfo['otherInfo'].isValue)
+            else:
+                self.assertEqual('failed', str(statusInfo['cMCStatus']))
+                self.assertEqual(
+                    'popFailed', str(statusInfo['otherInfo']['failInfo']))
+        return response
+
+    def testDer(self):
+        output = io.BytesIO()
+        pipeline = cmcbatch.CMCPipeline(toyVerify, window=7)
+        self.assertEqual((14, 6), pipeline.respond(self.pkiData, output,
+                                                   der=True))
+        response = self.checkResponse(output.getvalue(), der_decoder)
+        self.assertEqual(output.getvalue(), der_encoder(response))
+
+    def testBerExecutor(self):
+        output = io.BytesIO()
+        with ThreadPoolExecutor(4) as executor:
+            pipeline = cmcbatch.CMCPipeline(toyVerify, executor, window=5)
+            self.assertEqual((14, 6), pipeline.respond(self.pkiData, output))
+        self.assertEqual(b'\x30\x80', output.getvalue()[:2])
+        self.checkResponse(output.getvalue(), ber_decoder)
+
+    def testStatusInfo(self):
+        statusInfo = rfc6402.CMCStatusInfoV2()
+        statusInfo['cMCStatus'] = 'pending'
+        bodyPart = statusInfo['bodyList'].componentType.clone()
+        bodyPart['bodyPartID'] = 9
+        statusInfo['bodyList'].append(bodyPart)
+        statusInfo['statusString'] = 'later'
+        statusInfo['otherInfo']['failInfo'] = 'badRequest'
+        self.assertEqual(der_encoder(statusInfo), cmcbatch.encodeStatusInfoV2(
+            'pending', [9], 'later', 'badRequest'))
+
+        pipeline = cmcbatch.CMCPipeline(lambda request: statusInfo)
+        results = list(pipeline.results(self.pkiData))
+        self.assertEqual(20, len(results))
+        request, result = results[0]
+        self.assertEqual(der_encoder(statusInfo),
+                         pipeline.statusInfo(request, result))
+
+    def testStatusCounts(self):
+        def verify(request):
+            number = request.bodyPartID
+            if number % 4 == 0:
+                statusInfo = rfc6402.CMCStatusInfoV2()
+                statusInfo['cMCStatus'] = 'success'
+                bodyPart = statusInfo['bodyList'].componentType.clone()
+                bodyPart['bodyPartID'] = number
+                statusInfo['bodyList'].append(bodyPart)
+                return statusInfo
+            if number % 4 == 1:
+                return cmcbatch.encodeStatusInfoV2('success', [number])
+            if number % 4 == 2:
+                return cmcbatch.encodeStatusInfoV2('pending', [number])
+            return number % 3 != 0
+
+        output = io.BytesIO()
+        pipeline = cmcbatch.CMCPipeline(verify)
+        # 10 success results from the verifier, 5 pending, and 5 plain
+        # results of which 2 fail.
+        self.assertEqual((13, 7), pipeline.respond(self.pkiData, output,
+                                                   der=True))
+
+    def testWriter(self):
+        output = io.BytesIO()
+        writer = cmcbatch.PKIResponseWriter(output, der=True)
+        writer.addStatus('success', [1, 2])
+        writer.addControl(rfc6402.id_cmc_senderNonce,
+                          [der_encoder(univ.OctetString(b'nonce'))], 7)
+        writer.close()
+        self.assertRaises(PyAsn1Error, writer.close)
+
+        response, rest = der_decoder(output.getvalue(),
+                                     asn1Spec=rfc6402.PKIResponse())
+        self.assertFalse(rest)
+        self.assertEqual(output.getvalue(), der_encoder(response))
+        self.assertEqual([1, 7], [control['bodyPartID']
+                                  for control in response['controlSequence']])
+
+
+suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+if __name__ == '__main__':
+    result = unittest.TextTestRunner(verbosity=2).run(suite)
+    sys.exit(not result.wasSuccessful())
@@ -0,0 +1,225 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+import pickle
+import sys
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from pyasn1.codec.der.decoder import decode as der_decoder
+from pyasn1.codec.der.encoder import encode as der_encoder
+from pyasn1.error import PyAsn1Error
+from pyasn1.type import char
+from pyasn1.type import univ
+
+from pyasn1_alt_modules import cmpbatch
+from pyasn1_alt_modules import pem
+from pyasn1_alt_modules import rfc9810
+
+
+cert_pem_text = """\
+MIIC4jCCAkugAwIBAgIBCDANBgkqhkiG9w0BAQUFADBYMQswCQYDVQQGEwJHQjEn
+MCUGA1UEChMeQ2VydGlmaWNhdGUgVHJhbnNwYXJlbmN5IFByZUNBMQ4wDAYDVQQI
+EwVXYWxlczEQMA4GA1UEBxMHRXJ3IFdlbjAeFw0xMjA2MDEwMDAwMDBaFw0yMjA2
+MDEwMDAwMDBaMFIxCzAJBgNVBAYTAkdCMSEwHwYDVQQKExhDZXJ0aWZpY2F0ZSBU
+cmFuc3BhcmVuY3kxDjAMBgNVBAgTBVdhbGVzMRAwDgYDVQQHEwdFcncgV2VuMIGf
+MA0GCSqGSIb3DQEBAQUAA4GNADCBiQKBgQCvrurKxRq3zr356srn3RdSleGTlVoX
+mJrvjZerfN/3dhCTwLgj0qTjpRoXuG8oFitmolOJNevs3BA2Iz2i3WUxsMY7zGh2
+Hr3IVAN7dzmSRrhwp7crFMmxZn3gmpZA7Z8/PHJdlQtNJlWYaf5/HpGaZut201wB
+F8a80NjP0hAosQIDAQABo4HBMIG+MB0GA1UdDgQWBBRhLGTvrHm3KDl8nZPm34ZG
+X6dqiDB9BgNVHSMEdjB0gBQH77NAIzT3nv4jgIOy4g1c6hB9QKFZpFcwVTELMAkG
+A1UEBhMCR0IxJDAiBgNVBAoTG0NlcnRpZmljYXRlIFRyYW5zcGFyZW5jeSBDQTEO
+MAwGA1UECBMFV2FsZXMxEDAOBgNVBAcTB0VydyBXZW6CAQEwCQYDVR0TBAIwADAT
+BgorBgEEAdZ5AgQDAQH/BAIFADANBgkqhkiG9w0BAQUFAAOBgQBCPm+dvVk8wR1Z
+qGE8r38KCOWa80OWwJpc9vjyLZ5MjKmnqutpIMSdyY6fxJczDGxj5rYk+JObNhfW
+C9XZboSDJ3ucsf6MGikdqYiO7sPkhBqr1u5YVce01dDCioQwT1xIjm+/bNuPp/Sp
+8BnJrf7EjKd08DTtXMr5VlMFqG62Vg==
+"""
+
+
+def header(transactionID):
+    pkiHeader = rfc9810.PKIHeader()
+    pkiHeader['pvno'] = 'cmp2000'
+    pkiHeader['sender']['rfc822Name'] = 'client@example.com'
+    pkiHeader['recipient']['rfc822Name'] = 'ca@example.com'
+    pkiHeader['transactionID'] = transactionID
+    return pkiHeader
+
+
+def irMessage(transactionID, certReqIds):
+    message = rfc9810.PKIMessage()
+    message['header'] = header(transactionID)
+    body = message['body']['ir']
+    for certReqId in certReqIds:
+        certReqMsg = body.componentType.clone()
+        certReqMsg['certReq']['certReqId'] = certReqId
+        certReqMsg['certReq']['certTemplate']['serialNumber'] = certReqId
+        body.append(certReqMsg)
+    message['protection'] = message['protection'].clone(
+        univ.BitString.fromOctetString(b'signature-' + transactionID))
+    extraCert, rest = der_decoder(
+        pem.readBase64fromText(cert_pem_text),
+        asn1Spec=rfc9810.CMPCertificate())
+    message['extraCerts'].append(extraCert)
+    return message
+
+
+def genmMessage(transactionID):
+    message = rfc9810.PKIMessage()
+    message['header'] = header(transactionID)
+    body = message['body']['genm']
+    itav = body.componentType.clone()
+    itav['infoType'] = rfc9810.id_it_implicitConfirm
+    itav['infoValue'] = der_encoder(univ.Null(''))
+    body.append(itav)
+    itav = body.componentType.clone()
+    itav['infoType'] = rfc9810.id_it_suppLangTags
+    tags = rfc9810.SuppLangTagsValue()
+    tags.append(char.UTF8String('en'))
+    itav['infoValue'] = der_encoder(tags)
+    body.append(itav)
+    itav = body.componentType.clone()
+    itav['infoType'] = rfc9810.id_it_caCerts
+    body.append(itav)
+    return message
+
+
+def nestedMessage(transactionID, inner):
+    message = rfc9810.PKIMessage()
+    message['header'] = header(transactionID)
+    nested = message['body']['nested']
+    for item in inner:
+        nested.append(der_encoder(item))
+    return message
+
+
+def pkiMessages(messages):
+    sequence = rfc9810.PKIMessages()
+    sequence.extend(messages)
+    return der_encoder(sequence)
+
+
+def irHandler(message):
+    return ('ir', [int(certReqMsg['certReq']['certReqId'])
+                   for certReqMsg in message.body()])
+
+
+class LazyPKIMessageTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.message = irMessage(b'T1', [1, 2])
+        self.substrate = der_encoder(self.message)
+
+    def testParts(self):
+        view = cmpbatch.LazyPKIMessage(self.substrate)
+        self.assertEqual('ir', view.bodyName)
+        self.assertEqual(b'signature-T1', view.protection)
+
+        protectedPart = rfc9810.ProtectedPart()
+        protectedPart['header'] = self.message['header']
+        protectedPart['body'] = self.message['body']
+        self.assertEqual(der_encoder(protectedPart), view.protectedPart)
+
+        self.assertEqual(b'T1', view.header()['transactionID'])
+        self.assertEqual(2, len(view.body()))
+        self.assertEqual(1, len(view.extraCerts))
+        self.assertEqual(der_encoder(self.message['extraCerts'][0]),
+                         view.extraCerts[0])
+        self.assertEqual(self.substrate, der_encoder(view.toAsn1()))
+
+        copy = pickle.loads(pickle.dumps(view))
+        self.assertEqual(bytes(view.substrate), bytes(copy.substrate))
+        self.assertEqual('ir', copy.bodyName)
+
+    def testInfoTypeAndValues(self):
+        view = cmpbatch.LazyPKIMessage(der_encoder(genmMessage(b'T2')))
+        self.assertIsNone(view.protection)
+        self.assertEqual([], view.extraCerts)
+
+        itavs = view.infoTypeAndValues()
+        self.assertEqual(
+            [rfc9810.id_it_implicitConfirm, rfc9810.id_it_suppLangTags,
+             rfc9810.id_it_caCerts], [infoType for infoType, value in itavs])
+        self.assertIsNone(itavs[2][1])
+        tags = cmpbatch.decodeInfoValue(*itavs[1])
+        self.assertEqual('en', tags[0])
+        self.assertRaises(PyAsn1Error, view.nestedMessages)
+
+    def testNotPKIMessage(self):
+        self.assertRaises(PyAsn1Error, cmpbatch.LazyPKIMessage,
+                          der_encoder(univ.Integer(1)))
+
+
+class CMPBatchProcessorTestCase(unittest.TestCase):
+
+    def setUp(self):
+        inner = [irMessage(b'N1', [10]), genmMessage(b'N2'),
+                 irMessage(b'N3', [11, 12])]
+        self.substrate = pkiMessages([
+            irMessage(b'T1', [1, 2]),
+            nestedMessage(b'T2', inner),
+            genmMessage(b'T3'),
+            irMessage(b'T4', [3]),
+        ])
+
+    def makeProcessor(self, executor=None):
+        processor = cmpbatch.CMPBatchProcessor(executor=executor)
+        processor.register('ir', irHandler)
+        processor.register('genm', lambda message: (
+            'genm', len(message.infoTypeAndValues())))
+        return processor
+
+    def testSerial(self):
+        results = self.makeProcessor().processMessages(self.substrate)
+        self.assertEqual([
+            ('ir', [1, 2]),
+            [('ir', [10]), ('genm', 3), ('ir', [11, 12])],
+            ('genm', 3),
+            ('ir', [3]),
+        ], results)
+
+    def testExecutor(self):
+        expected = self.makeProcessor().processMessages(self.substrate)
+        with ThreadPoolExecutor(4) as executor:
+            processor = self.makeProcessor(executor)
+            self.assertEqual(expected,
+                             processor.processMessages(self.substrate))
+
+    def testNestedHandler(self):
+        processor = self.makeProcessor()
+        processor.register('nested', lambda message: 'nested')
+        self.assertEqual('nested',
+                         processor.processMessages(self.substrate)[1])
+
+    def testNoHandler(self):
+        processor = cmpbatch.CMPBatchProcessor({'ir': irHandler})
+        self.assertRaises(PyAsn1Error, processor.processMessages,
+                          self.substrate)
+        processor.defaultHandler = lambda message: message.bodyName
+        self.assertEqual('genm', processor.processMessages(self.substrate)[2])
+        self.assertRaises(PyAsn1Error, processor.register, 'bogus', irHandler)
+
+    def testProcessMessage(self):
+        processor = self.makeProcessor()
+        self.assertEqual(('ir', [5]), processor.processMessage(
+            der_encoder(irMessage(b'T5', [5]))))
+
+    def testPickle(self):
+        processor = cmpbatch.CMPBatchProcessor({'ir': irHandler})
+        processor.executor = ThreadPoolExecutor(1)
+        try:
+            copy = pickle.loads(pickle.dumps(processor.handle))
+        finally:
+            processor.executor.shutdown()
+        self.assertEqual(('ir', [5]), copy(cmpbatch.LazyPKIMessage(
+            der_encoder(irMessage(b'T5', [5])))))
+
+
+suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+if __name__ == '__main__':
+    result = unittest.TextTestRunner(verbosity=2).run(suite)
+    sys.exit(not result.wasSuccessful())
@@ -0,0 +1,435 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+import hashlib
+import io
+import sys
+import unittest
+
+from pyasn1.codec.ber.decoder import decode as ber_decoder
+from pyasn1.codec.ber.encoder import encode as ber_encoder
+from pyasn1.codec.der.decoder import decode as der_decoder
+from pyasn1.codec.der.encoder import encode as der_encoder
+from pyasn1.error import PyAsn1Error
+from pyasn1.type import univ
+
+from pyasn1_alt_modules import pem
+from pyasn1_alt_modules import rfc4055
+from pyasn1_alt_modules import rfc4108
+from pyasn1_alt_modules import rfc5083
+from pyasn1_alt_modules import rfc5280
+from pyasn1_alt_modules import rfc5652
+from pyasn1_alt_modules import cmsstream
+from pyasn1_alt_modules import tlv
+
+from tests import test_rfc3281
+
+
+class SignedDataReaderTestCase(unittest.TestCase):
+    pem_text = """\
+MIIEvAYJKoZIhvcNAQcCoIIErTCCBKkCAQExDTALBglghkgBZQMEAgEwggIVBgsq
+hkiG9w0BCRABEKCCAgQEggIA3ntqPr5kDpx+//pgWGfHCH/Ht4pbenGwXv80txyE
+Y0I2mT9BUGz8ILkbhD7Xz89pBS5KhEJpthxH8WREJtvS+wL4BqYLt23wjWoZy5Gt
+5dPzWgaNlV/aQ5AdfAY9ljmnNYnK8D8r8ur7bQM4cKUdxry+QA0nqXHMAOSpx4Um
+8impCc0BICXaFfL3zBrNxyPubbFO9ofbYOAWaNmmIAhzthXf12vDrLostIqmYrP4
+LMRCjTr4LeYaVrAWfKtbUbByN6IuBef3Qt5cJaChr74udz3JvbYFsUvCpl64kpRq
+g2CT6R+xE4trO/pViJlI15dvJVz04BBYQ2jQsutJwChi97/DDcjIv03VBmrwRE0k
+RJNFP9vpDM8CxJIqcobC5Kuv8b0GqGfGl6ouuQKEVMfBcrupgjk3oc3KL1iVdSr1
++74amb1vDtTMWNm6vWRqh+Kk17NGEi2mNvYkkZUTIHNGH7OgiDclFU8dSMZd1fun
+/D9dmiFiErDB3Fzr4+8Qz0aKedNE/1uvM+dhu9qjuRdkDzZ4S7txTfk6y9pG9iyk
+aEeTV2kElKXblgi+Cf0Ut4f5he8rt6jveHdMo9X36YiUQVvevj2cgN7lFivEnFYV
+QY0xugpP7lvEFDfsi2+0ozgP8EKOLYaCUKpuvttlYJ+vdtUFEijizEZ4cx02RsXm
+EesxggJ6MIICdgIBA4AUnutnybladNRNLxY5ZoDoAbXLpJwwCwYJYIZIAWUDBAIB
+oIG8MBoGCSqGSIb3DQEJAzENBgsqhkiG9w0BCRABEDArBgsqhkiG9w0BCRACJDEc
+MBoGCysGAQQBjb9BAQEqBgsrBgEEAY2/QQEBMDAvBgkqhkiG9w0BCQQxIgQgAJfv
+uasB4P6WDLOkOyvj33YPgZW4olHbidzyh1EKP9YwQAYLKoZIhvcNAQkQAikxMTAv
+MAsGCWCGSAFlAwQCAQQgAJfvuasB4P6WDLOkOyvj33YPgZW4olHbidzyh1EKP9Yw
+CwYJKoZIhvcNAQELBIIBgDivAlSLbMPPu+zV+pPcYpNp+A1mwVOytjMBzSo31kR/
+qEu+hVrDknAOk9IdCaDvcz612CcfNT85/KzrYvWWxOP2woU/vZj253SnndALpfNN
+n3/crJjF6hKgkjUwoXebI7kuj5WCh2q5lkd6xUa+jkCw+CINcN43thtS66UsVI4d
+mv02EvsS2cxPY/508uaQZ6AYAacm667bgX8xEjbzACMOeMCuvKQXWAuh3DkNk+gV
+xizHDw7xZxXgMGMAnJglAeBtd3Si5ztILw9U2gKUqFn/nOgy+eW63JuU/q31/Hgg
+ZATjyBznSzneTZrw8/ePoSCj7E9vBeCTUkeFbVB2tJK1iYDMblp6HUuwgYuGKXy/
+ZwKL3GvB11qg7ntdEyjdLq0xcVrht/K0d2dPo4iO4Ac7c1xbFMDAlWOt4FMPWh6O
+iTh55YvT7hAJjTbB5ebgMA9QJnAczQPFnaIePnlFrkETd3YyLK4yHwnoIGo1GiW/
+dsnhVtIdkPtfJIvcYteYJg==
+"""
+
+    cert_pem_text = """\
+MIIC4jCCAkugAwIBAgIBCDANBgkqhkiG9w0BAQUFADBYMQswCQYDVQQGEwJHQjEn
+MCUGA1UEChMeQ2VydGlmaWNhdGUgVHJhbnNwYXJlbmN5IFByZUNBMQ4wDAYDVQQI
+EwVXYWxlczEQMA4GA1UEBxMHRXJ3IFdlbjAeFw0xMjA2MDEwMDAwMDBaFw0yMjA2
+MDEwMDAwMDBaMFIxCzAJBgNVBAYTAkdCMSEwHwYDVQQKExhDZXJ0aWZpY2F0ZSBU
+cmFuc3BhcmVuY3kxDjAMBgNVBAgTBVdhbGVzMRAwDgYDVQQHEwdFcncgV2VuMIGf
+MA0GCSqGSIb3DQEBAQUAA4GNADCBiQKBgQCvrurKxRq3zr356srn3RdSleGTlVoX
+mJrvjZerfN/3dhCTwLgj0qTjpRoXuG8oFitmolOJNevs3BA2Iz2i3WUxsMY7zGh2
+Hr3IVAN7dzmSRrhwp7crFMmxZn3gmpZA7Z8/PHJdlQtNJlWYaf5/HpGaZut201wB
+F8a80NjP0hAosQIDAQABo4HBMIG+MB0GA1UdDgQWBBRhLGTvrHm3KDl8nZPm34ZG
+X6dqiDB9BgNVHSMEdjB0gBQH77NAIzT3nv4jgIOy4g1c6hB9QKFZpFcwVTELMAkG
+A1UEBhMCR0IxJDAiBgNVBAoTG0NlcnRpZmljYXRlIFRyYW5zcGFyZW5jeSBDQTEO
+MAwGA1UECBMFV2FsZXMxEDAOBgNVBAcTB0VydyBXZW6CAQEwCQYDVR0TBAIwADAT
+BgorBgEEAdZ5AgQDAQH/BAIFADANBgkqhkiG9w0BAQUFAAOBgQBCPm+dvVk8wR1Z
+qGE8r38KCOWa80OWwJpc9vjyLZ5MjKmnqutpIMSdyY6fxJczDGxj5rYk+JObNhfW
+C9XZboSDJ3ucsf6MGikdqYiO7sPkhBqr1u5YVce01dDCioQwT1xIjm+/bNuPp/Sp
+8BnJrf7EjKd08DTtXMr5VlMFqG62Vg==
+"""
+
+    def setUp(self):
+        self.substrate = pem.readBase64fromText(self.pem_text)
+        contentInfo, rest = der_decoder(
+            self.substrate, asn1Spec=rfc5652.ContentInfo())
+        self.signedData, rest = der_decoder(
+            contentInfo['content'], asn1Spec=rfc5652.SignedData())
+
+    def testDerInput(self):
+        reader = cmsstream.SignedDataReader(
+            io.BytesIO(self.substrate), chunkSize=100)
+        self.assertEqual(rfc5652.id_signedData, reader.contentType)
+        self.assertEqual(1, reader.version)
+        self.assertEqual(rfc4108.id_ct_firmwarePackage, reader.eContentType)
+        self.assertEqual(self.signedData['digestAlgorithms'],
+                         reader.digestAlgorithms)
+        self.assertFalse(reader.detached)
+
+        chunks = list(reader.iterContent())
+        self.assertTrue(max(len(chunk) for chunk in chunks) <= 100)
+        eContent = self.signedData['encapContentInfo']['eContent']
+        self.assertEqual(eContent, b''.join(chunks))
+
+        self.assertEqual([], list(reader.iterCertificates()))
+        self.assertEqual([], list(reader.iterCrls()))
+        signerInfos = list(reader.iterSignerInfos())
+        self.assertEqual(1, len(signerInfos))
+        self.assertEqual(der_encoder(self.signedData['signerInfos'][0]),
+                         der_encoder(signerInfos[0]))
+
+    def testIndefiniteLengthInput(self):
+        eContent = bytes(range(256)) * 1024
+        self.signedData['encapContentInfo']['eContent'] = eContent
+        substrate = ber_encoder(self.signedData, defMode=False,
+                                maxChunkSize=1000)
+
+        reader = cmsstream.SignedDataReader(io.BytesIO(substrate))
+        self.assertEqual(rfc5652.id_signedData, reader.contentType)
+
+        digest = hashlib.sha256()
+        stream = reader.contentStream()
+        for block in iter(lambda: stream.read(4096), b''):
+            digest.update(block)
+        self.assertEqual(hashlib.sha256(eContent).digest(), digest.digest())
+
+        signerInfos = list(reader.iterSignerInfos())
+        self.assertEqual(1, len(signerInfos))
+        self.assertEqual(rfc5652.id_messageDigest,
+                         signerInfos[0]['signedAttrs'][2]['attrType'])
+
+    def testSkipContent(self):
+        reader = cmsstream.SignedDataReader(io.BytesIO(self.substrate))
+        signerInfos = list(reader.iterSignerInfos())
+        self.assertEqual(1, len(signerInfos))
+        self.assertEqual([], list(reader.iterContent()))
+        self.assertEqual([], list(reader.iterCertificates()))
+
+    def testDetachedWithCertificates(self):
+        encap = rfc5652.EncapsulatedContentInfo()
+        encap['eContentType'] = rfc5652.id_data
+        self.signedData['encapContentInfo'] = encap
+
+        cert, rest = der_decoder(
+            pem.readBase64fromText(self.cert_pem_text),
+            asn1Spec=rfc5280.Certificate())
+        choice = rfc5652.CertificateChoices()
+        choice['certificate'] = cert
+        self.signedData['certificates'].append(choice)
+        substrate = der_encoder(self.signedData)
+
+        reader = cmsstream.SignedDataReader(io.BytesIO(substrate))
+        self.assertTrue(reader.detached)
+        self.assertEqual(rfc5652.id_data, reader.eContentType)
+        self.assertEqual([], list(reader.iterContent()))
+
+        certificates = list(reader.iterCertificates())
+        self.assertEqual(1, len(certificates))
+        self.assertEqual(cert['tbsCertificate']['serialNumber'],
+            certificates[0]['certificate']['tbsCertificate']['serialNumber'])
+        self.assertEqual([], list(reader.iterCrls()))
+        self.assertEqual(1, len(list(reader.iterSignerInfos())))
+
+    def testPartialRead(self):
+        reader = cmsstream.SignedDataReader(
+            io.BytesIO(self.substrate), chunkSize=16)
+        chunks = reader.iterContent()
+        self.assertTrue(next(chunks))
+        self.assertEqual(1, len(list(reader.iterSignerInfos())))
+        self.assertEqual([], list(chunks))
+
+    def testNotSignedData(self):
+        contentInfo = rfc5652.ContentInfo()
+        contentInfo['contentType'] = rfc5652.id_data
+        contentInfo['content'] = der_encoder(univ.OctetString(b'data'))
+        substrate = der_encoder(contentInfo)
+        self.assertRaises(PyAsn1Error, cmsstream.SignedDataReader,
+                          io.BytesIO(substrate))
+
+
+class _XorEncryptor(object):
+
+    def update(self, data):
+        return bytes(octet ^ 0x5A for octet in data)
+
+    def finalize(self):
+        return b'\x5A' * 4
+
+
+class StreamingWriterTestCase(unittest.TestCase):
+    cert_der = pem.readBase64fromText(SignedDataReaderTestCase.cert_pem_text)
+
+    def setUp(self):
+        sid = rfc5652.SignerIdentifier()
+        sid['subjectKeyIdentifier'] = b'\x01' * 20
+        digestAlgorithm = rfc5280.AlgorithmIdentifier()
+        digestAlgorithm['algorithm'] = rfc4055.id_sha256
+        self.signatureAlgorithm = rfc5280.AlgorithmIdentifier()
+        self.signatureAlgorithm['algorithm'] = rfc4055.sha256WithRSAEncryption
+
+        self.signed = []
+
+        def sign(toBeSigned):
+            self.signed.append(toBeSigned)
+            return b'signature'
+
+        self.signer = cmsstream.Signer(
+            sid, digestAlgorithm, self.signatureAlgorithm,
+            hashlib.sha256, sign)
+
+        self.recipientInfo = rfc5652.RecipientInfo()
+        kekri = self.recipientInfo['kekri']
+        kekri['version'] = 4
+        kekri['kekid']['keyIdentifier'] = b'kek'
+        kekri['keyEncryptionAlgorithm']['algorithm'] = rfc4055.id_sha256
+        kekri['encryptedKey'] = b'\x02' * 24
+
+        self.content = bytes(range(256)) * 300
+
+    def _writeContent(self, writer):
+        for offset in range(0, len(self.content), 777):
+            writer.write(self.content[offset:offset + 777])
+        writer.close()
+
+    def testSignedDataBer(self):
+        output = io.BytesIO()
+        self._writeContent(cmsstream.SignedDataWriter(
+            output, [self.signer], chunkSize=1000))
+        substrate = output.getvalue()
+        self.assertEqual(b'\x30\x80', substrate[:2])
+
+        reader = cmsstream.SignedDataReader(io.BytesIO(substrate))
+        self.assertEqual(3, reader.version)
+        self.assertEqual(rfc5652.id_data, reader.eContentType)
+        self.assertEqual(self.content, b''.join(reader.iterContent()))
+
+        signerInfos = list(reader.iterSignerInfos())
+        self.assertEqual(1, len(signerInfos))
+        signedAttrs = signerInfos[0]['signedAttrs']
+        toBeSigned = der_encoder(signedAttrs)
+        self.assertEqual([b'\x31' + toBeSigned[1:]], self.signed)
+
+        for attr in signedAttrs:
+            if attr['attrType'] == rfc5652.id_messageDigest:
+                digest, rest = der_decoder(
+                    attr['attrValues'][0], asn1Spec=rfc5652.MessageDigest())
+                self.assertEqual(hashlib.sha256(self.content).digest(), digest)
+
+    def testSignedDataDer(self):
+        output = io.BytesIO()
+        with cmsstream.SignedDataWriter(
+                output, [self.signer], certificates=[self.cert_der],
+                der=True) as writer:
+            writer.write(self.content)
+        substrate = output.getvalue()
+
+        contentInfo, rest = der_decoder(
+            substrate, asn1Spec=rfc5652.ContentInfo())
+        self.assertFalse(rest)
+        self.assertEqual(substrate, der_encoder(contentInfo))
+
+        signedData, rest = der_decoder(
+            contentInfo['content'], asn1Spec=rfc5652.SignedData())
+        self.assertFalse(rest)
+        self.assertEqual(self.content,
+                         signedData['encapContentInfo']['eContent'])
+        self.assertEqual(self.cert_der, der_encoder(
+            signedData['certificates'][0]['certificate']))
+
+    def testDetachedSignedData(self):
+        for der in (False, True):
+            del self.signed[:]
+            output = io.BytesIO()
+            writer = cmsstream.SignedDataWriter(
+                output, [self.signer], detached=True, contentInfo=False,
+                der=der)
+            # Nothing is signed before the content is complete.
+            self.assertEqual([], self.signed)
+            self._writeContent(writer)
+            self.assertTrue(len(output.getvalue()) < 1000)
+
+            signedData, rest = ber_decoder(
+                output.getvalue(), asn1Spec=rfc5652.SignedData())
+            self.assertFalse(rest)
+            self.assertFalse(
+                signedData['encapContentInfo']['eContent'].isValue)
+            self.assertEqual(1, len(self.signed))
+
+            signedAttrs = signedData['signerInfos'][0]['signedAttrs']
+            digests = [
+                der_decoder(attr['attrValues'][0],
+                            asn1Spec=rfc5652.MessageDigest())[0]
+                for attr in signedAttrs
+                if attr['attrType'] == rfc5652.id_messageDigest]
+            self.assertEqual([hashlib.sha256(self.content).digest()],
+                             digests)
+
+    def testEnvelopedData(self):
+        expected = _XorEncryptor().update(self.content) + b'\x5A' * 4
+        for der in (False, True):
+            output = io.BytesIO()
+            self._writeContent(cmsstream.EnvelopedDataWriter(
+                output, [self.recipientInfo], self.signatureAlgorithm,
+                _XorEncryptor(), contentInfo=False, der=der))
+            substrate = output.getvalue()
+
+            envelopedData, rest = ber_decoder(
+                substrate, asn1Spec=rfc5652.EnvelopedData())
+            self.assertFalse(rest)
+            self.assertEqual(2, envelopedData['version'])
+            self.assertEqual(expected, envelopedData['encryptedContentInfo']['encryptedContent'])
+            if der:
+                self.assertEqual(substrate, der_encoder(envelopedData))
+
+    def _signedDataVersion(self, signers=None, **options):
+        output = io.BytesIO()
+        self._writeContent(cmsstream.SignedDataWriter(
+            output, signers or [self.signer], **options))
+        # Only the version is read, as the made up v1AttrCert below is
+        # a version 2 attribute certificate that does not decode.
+        reader = cmsstream.SignedDataReader(io.BytesIO(output.getvalue()))
+        return reader.version
+
+    def testSignedDataVersions(self):
+        cert, rest = der_decoder(self.cert_der, asn1Spec=rfc5280.Certificate())
+        sid = rfc5652.SignerIdentifier()
+        sid['issuerAndSerialNumber']['issuer'] = \
+            cert['tbsCertificate']['issuer']
+        sid['issuerAndSerialNumber']['serialNumber'] = \
+            cert['tbsCertificate']['serialNumber']
+        signer = cmsstream.Signer(
+            sid, self.signer.digestAlgorithm, self.signatureAlgorithm,
+            hashlib.sha256, lambda toBeSigned: b'signature')
+
+        attrCert = pem.readBase64fromText(
+            test_rfc3281.AttributeCertificateTestCase.pem_text)
+        v1AttrCert = tlv.encodeTlv(
+            tlv.contextTag(1), attrCert[tlv.readTlv(attrCert)[1]:])
+        v2AttrCert = tlv.encodeTlv(
+            tlv.contextTag(2), attrCert[tlv.readTlv(attrCert)[1]:])
+        otherCert = rfc5652.CertificateChoices()
+        otherCert['other']['otherCertFormat'] = univ.ObjectIdentifier('1.2.3')
+        otherCert['other']['otherCert'] = der_encoder(univ.Null(''))
+        otherCrl = rfc5652.RevocationInfoChoice()
+        otherCrl['other']['otherRevInfoFormat'] = \
+            univ.ObjectIdentifier('1.2.3')
+        otherCrl['other']['otherRevInfo'] = der_encoder(univ.Null(''))
+
+        self.assertEqual(1, self._signedDataVersion(
+            [signer], certificates=[self.cert_der]))
+        self.assertEqual(3, self._signedDataVersion())
+        self.assertEqual(3, self._signedDataVersion(
+            [signer], eContentType=rfc4108.id_ct_firmwarePackage))
+        self.assertEqual(3, self._signedDataVersion(
+            [signer], certificates=[v1AttrCert]))
+        self.assertEqual(4, self._signedDataVersion(
+            [signer], certificates=[self.cert_der, v2AttrCert]))
+        self.assertEqual(5, self._signedDataVersion(
+            [signer], certificates=[v2AttrCert, otherCert]))
+        self.assertEqual(5, self._signedDataVersion(
+            [signer], crls=[der_encoder(otherCrl)]))
+
+    def _envelopedDataVersion(self, recipientInfos, **options):
+        output = io.BytesIO()
+        self._writeContent(cmsstream.EnvelopedDataWriter(
+            output, recipientInfos, self.signatureAlgorithm,
+            _XorEncryptor(), contentInfo=False, **options))
+        envelopedData, rest = ber_decoder(
+            output.getvalue(), asn1Spec=rfc5652.EnvelopedData())
+        return envelopedData['version']
+
+    def testEnvelopedDataVersions(self):
+        ktri = rfc5652.RecipientInfo()
+        ktri['ktri']['version'] = 0
+        cert, rest = der_decoder(self.cert_der, asn1Spec=rfc5280.Certificate())
+        issuerAndSerialNumber = ktri['ktri']['rid']['issuerAndSerialNumber']
+        issuerAndSerialNumber['issuer'] = cert['tbsCertificate']['issuer']
+        issuerAndSerialNumber['serialNumber'] = \
+            cert['tbsCertificate']['serialNumber']
+        ktri['ktri']['keyEncryptionAlgorithm']['algorithm'] = \
+            rfc4055.id_RSAES_OAEP
+        ktri['ktri']['encryptedKey'] = b'\x02' * 24
+
+        pwri = rfc5652.RecipientInfo()
+        pwri['pwri']['version'] = 0
+        pwri['pwri']['keyEncryptionAlgorithm']['algorithm'] = \
+            rfc4055.id_sha256
+        pwri['pwri']['encryptedKey'] = b'\x02' * 24
+
+        attrCert = pem.readBase64fromText(
+            test_rfc3281.AttributeCertificateTestCase.pem_text)
+        v2AttrCert, rest = der_decoder(
+            tlv.encodeTlv(tlv.contextTag(2),
+                          attrCert[tlv.readTlv(attrCert)[1]:]),
+            asn1Spec=rfc5652.CertificateChoices())
+        withAttrCert = rfc5652.OriginatorInfo()
+        withAttrCert['certs'].append(v2AttrCert)
+
+        otherCrl = rfc5652.RevocationInfoChoice()
+        otherCrl['other']['otherRevInfoFormat'] = \
+            univ.ObjectIdentifier('1.2.3')
+        otherCrl['other']['otherRevInfo'] = der_encoder(univ.Null(''))
+        withOtherCrl = rfc5652.OriginatorInfo()
+        withOtherCrl['crls'].append(otherCrl)
+
+        self.assertEqual(0, self._envelopedDataVersion([ktri]))
+        self.assertEqual(2, self._envelopedDataVersion(
+            [ktri], originatorInfo=rfc5652.OriginatorInfo()))
+        self.assertEqual(2, self._envelopedDataVersion([self.recipientInfo]))
+        self.assertEqual(3, self._envelopedDataVersion([ktri, pwri]))
+        self.assertEqual(3, self._envelopedDataVersion(
+            [ktri], originatorInfo=withAttrCert))
+        self.assertEqual(4, self._envelopedDataVersion(
+            [ktri, pwri], originatorInfo=withOtherCrl))
+
+    def testAuthEnvelopedData(self):
+        for der in (False, True):
+            output = io.BytesIO()
+            self._writeContent(cmsstream.AuthEnvelopedDataWriter(
+                output, [self.recipientInfo], self.signatureAlgorithm,
+                _XorEncryptor(), lambda: b'\x03' * 16, contentInfo=False,
+                der=der))
+            substrate = output.getvalue()
+
+            authEnvelopedData, rest = ber_decoder(
+                substrate, asn1Spec=rfc5083.AuthEnvelopedData())
+            self.assertFalse(rest)
+            self.assertEqual(0, authEnvelopedData['version'])
+            self.assertEqual(b'\x03' * 16, authEnvelopedData['mac'])
+            if der:
+                self.assertEqual(substrate, der_encoder(authEnvelopedData))
+
+
+suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+if __name__ == '__main__':
+    result = unittest.TextTestRunner(verbosity=2).run(suite)
+    sys.exit(not result.wasSuccessful())
@@ -0,0 +1,160 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+import sys
+import unittest
+
+from pyasn1.codec.der.decoder import decode as der_decoder
+from pyasn1.codec.der.encoder import encode as der_encoder
+from pyasn1.error import PyAsn1Error
+
+from pyasn1_alt_modules import compact
+from pyasn1_alt_modules import pem
+from pyasn1_alt_modules import rfc5280
+from pyasn1_alt_modules import tlv
+
+from tests import test_certfields
+
+
+class CompactViewTestCase(unittest.TestCase):
+    pem_text = test_certfields.CertificateFieldsTestCase.pem_text
+
+    def setUp(self):
+        self.substrate = pem.readBase64fromText(self.pem_text)
+        self.asn1Object, rest = der_decoder(
+            self.substrate, asn1Spec=rfc5280.Certificate())
+
+    def testFields(self):
+        view = compact.decode(self.substrate, rfc5280.Certificate())
+        tbs = view.tbsCertificate
+        asn1Tbs = self.asn1Object['tbsCertificate']
+
+        self.assertEqual(int(asn1Tbs['version']), tbs.version)
+        self.assertEqual(int(asn1Tbs['serialNumber']), tbs['serialNumber'])
+        self.assertEqual(str(asn1Tbs['signature']['algorithm']),
+                         tbs.signature.algorithm)
+        self.assertEqual(asn1Tbs['signature']['parameters'].asOctets(),
+                         tbs.signature.parameters)
+        self.assertEqual('utcTime', tbs.validity.notBefore.name)
+        self.assertEqual(str(asn1Tbs['validity']['notBefore']['utcTime']),
+                         tbs.validity.notBefore.value)
+        self.assertIsNone(tbs.issuerUniqueID)
+
+        rdnSequence = tbs.subject['rdnSequence']
+        self.assertIsInstance(rdnSequence, tuple)
+        self.assertEqual(len(asn1Tbs['subject'][0]), len(rdnSequence))
+        self.assertEqual(str(rfc5280.id_at_countryName),
+                         rdnSequence[0][0].type)
+
+        extensions = tbs.extensions
+        self.assertEqual(len(asn1Tbs['extensions']), len(extensions))
+        for extension, asn1Extension in zip(extensions, asn1Tbs['extensions']):
+            self.assertEqual(str(asn1Extension['extnID']), extension.extnID)
+            self.assertEqual(bool(asn1Extension['critical']),
+                             extension.critical)
+            self.assertEqual(asn1Extension['extnValue'].asOctets(),
+                             extension.extnValue)
+
+        self.assertEqual(['algorithm', 'parameters'],
+                         list(view.signatureAlgorithm))
+        self.assertEqual(self.asn1Object['signature'].asOctets(),
+                         view.signature)
+
+    def testToAsn1(self):
+        view = compact.decode(self.substrate, rfc5280.Certificate())
+        self.assertEqual(self.substrate, der_encoder(view.toAsn1()))
+        self.assertEqual(self.substrate, view.encoded)
+
+        tbs = view.tbsCertificate.toAsn1()
+        self.assertIsInstance(tbs, rfc5280.TBSCertificate)
+        self.assertEqual(der_encoder(self.asn1Object['tbsCertificate']),
+                         der_encoder(tbs))
+
+        notBefore = view.tbsCertificate.validity.notBefore.toAsn1()
+        self.assertEqual(self.asn1Object['tbsCertificate']['validity'][
+            'notBefore'], notBefore)
+
+    def testTaggedComponents(self):
+        extension = compact.decode(
+            self.substrate, rfc5280.Certificate()).tbsCertificate.extensions[1]
+        self.assertEqual(str(rfc5280.id_ce_authorityKeyIdentifier),
+                         extension.extnID)
+
+        asn1Object, rest = der_decoder(
+            bytes(extension.extnValue),
+            asn1Spec=rfc5280.AuthorityKeyIdentifier())
+        view = compact.decode(extension.extnValue,
+                              rfc5280.AuthorityKeyIdentifier())
+
+        self.assertEqual(asn1Object['keyIdentifier'].asOctets(),
+                         view.keyIdentifier)
+        self.assertEqual(int(asn1Object['authorityCertSerialNumber']),
+                         view.authorityCertSerialNumber)
+
+        generalName = view.authorityCertIssuer[0]
+        self.assertEqual('directoryName', generalName.name)
+        name = generalName.value.toAsn1()
+        self.assertIsInstance(name, rfc5280.Name)
+        self.assertEqual(
+            asn1Object['authorityCertIssuer'][0]['directoryName'], name)
+
+        # [4] EXPLICIT around the Name is put back for the GeneralName.
+        self.assertEqual(
+            der_encoder(asn1Object['authorityCertIssuer'][0]),
+            generalName.encoded)
+
+    def testLargeValues(self):
+        view = compact.decode(self.substrate, rfc5280.Certificate())
+        self.assertIsInstance(view.signature, bytes)
+
+        decoder = compact.CompactDecoder(largeValue=64)
+        view = decoder.decode(self.substrate, rfc5280.Certificate())
+        self.assertIsInstance(view.signature, memoryview)
+        self.assertIs(view._buffer, view.signature.obj)
+        self.assertEqual(self.asn1Object['signature'].asOctets(),
+                         view.signature)
+        key = view.tbsCertificate.subjectPublicKeyInfo.subjectPublicKey
+        self.assertIsInstance(key, memoryview)
+        keyId = view.tbsCertificate.extensions[0].extnValue
+        self.assertIsInstance(keyId, bytes)
+
+    def testReadOnly(self):
+        view = compact.decode(self.substrate, rfc5280.Certificate())
+        self.assertRaises(AttributeError, setattr, view, 'signature', b'')
+        self.assertRaises(AttributeError, setattr, view, 'other', 1)
+        self.assertRaises(AttributeError, delattr, view, 'signature')
+        self.assertFalse(hasattr(view, '__dict__'))
+        self.assertFalse(hasattr(view.tbsCertificate.subject, '__dict__'))
+
+    def testViewClass(self):
+        cls = compact.viewClass(rfc5280.Certificate())
+        self.assertEqual('CompactCertificate', cls.__name__)
+        self.assertEqual(
+            ('_buffer', '_start', '_end'),
+            compact.CompactView.__slots__)
+        self.assertEqual(
+            ('tbsCertificate', 'signatureAlgorithm', 'signature'),
+            cls.__slots__)
+
+        view = compact.decode(self.asn1Object, rfc5280.Certificate())
+        self.assertIs(cls, view.__class__)
+        self.assertRaises(PyAsn1Error, compact.viewClass,
+                          rfc5280.CertificateSerialNumber())
+
+    def testErrors(self):
+        self.assertRaises(PyAsn1Error, compact.decode,
+                          self.substrate + b'\x00', rfc5280.Certificate())
+        self.assertRaises(PyAsn1Error, compact.decode,
+                          tlv.encodeTlv(tlv.SET, b''), rfc5280.Certificate())
+        self.assertRaises(PyAsn1Error, compact.decode,
+                          self.substrate[:100], rfc5280.Certificate())
+
+
+suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+if __name__ == '__main__':
+    result = unittest.TextTestRunner(verbosity=2).run(suite)
+    sys.exit(not result.wasSuccessful())
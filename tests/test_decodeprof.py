@@ -0,0 +1,98 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+import sys
+import unittest
+
+from pyasn1.codec.der.decoder import decode as der_decoder
+from pyasn1.codec.der.encoder import encode as der_encoder
+
+from pyasn1_alt_modules import decodeprof
+from pyasn1_alt_modules import pem
+from pyasn1_alt_modules import rfc5280
+
+from tests import test_certfields
+
+
+class DecodeProfilerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.substrate = pem.readBase64fromText(
+            test_certfields.CertificateFieldsTestCase.pem_text)
+        self.profiler = decodeprof.DecodeProfiler()
+
+    def testStats(self):
+        asn1Object, rest = self.profiler.decode(
+            self.substrate, asn1Spec=rfc5280.Certificate())
+        self.assertEqual(self.substrate, der_encoder(asn1Object))
+        self.assertFalse(rest)
+
+        stats = self.profiler.stats()
+        certificate = stats['rfc5280.Certificate']
+        self.assertEqual(1, certificate.calls)
+        self.assertEqual(len(self.substrate) - 4, certificate.octets)
+        self.assertEqual(8, stats['rfc5280.AttributeTypeAndValue'].calls)
+        self.assertEqual(3, stats['rfc5280.AlgorithmIdentifier'].calls)
+        self.assertIn('univ.ObjectIdentifier', stats)
+        self.assertEqual(0, certificate.allocated)
+
+        for value in stats.values():
+            self.assertGreaterEqual(value.time, value.selfTime)
+            self.assertLessEqual(value.time, certificate.time)
+        self.assertAlmostEqual(
+            certificate.time, sum(value.selfTime for value in stats.values()))
+
+        self.profiler.decode(self.substrate, asn1Spec=rfc5280.Certificate())
+        self.assertEqual(2, self.profiler.stats()['rfc5280.Certificate'].calls)
+
+    def testSchemaless(self):
+        asn1Object, rest = self.profiler.decode(self.substrate)
+        self.assertEqual(self.substrate, der_encoder(asn1Object))
+        self.assertEqual(1, len(self.profiler.top(1)))
+        self.assertEqual('univ.SequenceOrSequenceOf',
+                         self.profiler.top(1)[0].name)
+
+    def testFoldedStacks(self):
+        self.profiler.decode(self.substrate, asn1Spec=rfc5280.Certificate(),
+                             decodeOpenTypes=True)
+        lines = self.profiler.foldedStacks().splitlines()
+        paths = [line.rsplit(' ', 1)[0] for line in lines]
+        self.assertIn('rfc5280.Certificate', paths)
+        self.assertIn('rfc5280.Certificate;rfc5280.TBSCertificate;'
+                      'rfc5280.Validity;rfc5280.Time;useful.UTCTime', paths)
+        for line in lines:
+            self.assertTrue(line.rsplit(' ', 1)[1].isdigit())
+
+        report = self.profiler.report(count=3)
+        self.assertEqual(4, len(report.splitlines()))
+        self.assertIn('rfc5280.Certificate', report.splitlines()[1])
+
+        self.profiler.clear()
+        self.assertEqual({}, self.profiler.stats())
+        self.assertEqual('', self.profiler.foldedStacks())
+
+    def testAllocations(self):
+        profiler = decodeprof.DecodeProfiler(traceAllocations=True)
+        profiler.decode(self.substrate, asn1Spec=rfc5280.Certificate())
+        self.assertGreater(
+            profiler.stats()['rfc5280.Certificate'].allocated, 0)
+        self.assertEqual('rfc5280.Certificate',
+                         profiler.top(1, key='allocated')[0].name)
+
+    def testDecoderWithoutProfiler(self):
+        asn1Object, rest = decodeprof.Decoder()(
+            self.substrate, asn1Spec=rfc5280.Certificate())
+        self.assertEqual(self.substrate, der_encoder(asn1Object))
+        expected, rest = der_decoder(
+            self.substrate, asn1Spec=rfc5280.Certificate())
+        self.assertEqual(der_encoder(expected), der_encoder(asn1Object))
+
+
+suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+if __name__ == '__main__':
+    result = unittest.TextTestRunner(verbosity=2).run(suite)
+    sys.exit(not result.wasSuccessful())
@@ -0,0 +1,89 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+import sys
+import unittest
+
+from pyasn1.error import PyAsn1Error
+
+from pyasn1_alt_modules import depgraph
+from pyasn1_alt_modules import rfc2985
+from pyasn1_alt_modules import rfc5280
+from pyasn1_alt_modules import rfc5652
+from pyasn1_alt_modules import rfc6482
+
+
+class DependencyGraphTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.graph = depgraph._graph()
+
+    def testImports(self):
+        self.assertIn('rfc5280', self.graph.imports['rfc5652'])
+        self.assertGreater(len(self.graph.importers('rfc5280')), 100)
+        self.assertEqual([], self.graph.importers('rfc9936'))
+
+        order = self.graph.order()
+        self.assertEqual(sorted(self.graph.imports), sorted(order))
+        for name, imported in self.graph.imports.items():
+            for importedName in imported:
+                self.assertLess(order.index(importedName), order.index(name))
+
+        self.assertIn('rfc5280', self.graph.closure(['rfc6482']))
+        self.assertRaises(PyAsn1Error, self.graph.closure, ['rfc0000'])
+
+    def testRegistrations(self):
+        contentTypes = self.graph.registrations['cmsContentTypesMap']
+        self.assertEqual(['rfc6482', 'rfc9582'],
+                         contentTypes[str(rfc6482.id_ct_routeOriginAuthz)])
+        self.assertEqual(
+            ['rfc2985', 'rfc5280'],
+            self.graph.registrants(rfc2985.pkcs_9_at_emailAddress,
+                                   'certificateAttributesMap'))
+        self.assertEqual(
+            [], self.graph.registrants(rfc6482.id_ct_routeOriginAuthz,
+                                       'certificateExtensionsMap'))
+
+    def testMinimalModules(self):
+        modules = depgraph.minimalModules(
+            [rfc6482.id_ct_routeOriginAuthz, '2.5.29.17'])
+        self.assertEqual(self.graph.closure(['rfc6482']), modules)
+        self.assertNotIn('rfc4210', modules)
+
+        # The module that adds the fewest modules is chosen.
+        self.assertEqual(['rfc5280'], depgraph.minimalModules(
+            [rfc2985.pkcs_9_at_emailAddress]))
+        self.assertRaises(PyAsn1Error, depgraph.minimalModules, ['1.2.3.4'])
+
+        imports = depgraph.importList([rfc5652.id_signedData])
+        self.assertIn('from pyasn1_alt_modules import rfc5280\n', imports)
+        self.assertTrue(imports.endswith(
+            'from pyasn1_alt_modules import rfc5652\n'))
+        self.assertIn(str(rfc5280.id_ce_subjectAltName),
+                      self.graph.registrations['certificateExtensionsMap'])
+
+    def testSmallestSet(self):
+        # Choosing for each OID the module that adds the fewest modules
+        # gives rfcx, rfcy and rfcz, but rfcbig and rfcbase cover all.
+        graph = depgraph.DependencyGraph.__new__(depgraph.DependencyGraph)
+        graph.imports = {'rfcbase': set(), 'rfcbig': {'rfcbase'},
+                         'rfcx': set(), 'rfcy': set(), 'rfcz': set()}
+        graph.registrations = {'cmsContentTypesMap': {
+            '1.2.3.1': ['rfcbig', 'rfcx'],
+            '1.2.3.2': ['rfcbig', 'rfcy'],
+            '1.2.3.3': ['rfcbig', 'rfcz']}}
+        oids = ['1.2.3.1', '1.2.3.2', '1.2.3.3']
+        self.assertEqual(['rfcbase', 'rfcbig'], graph.minimalModules(oids))
+        self.assertEqual(['rfcx', 'rfcy', 'rfcz'],
+                         graph.minimalModules(oids, searchLimit=0))
+        self.assertEqual(['rfcx'], graph.minimalModules(['1.2.3.1']))
+
+
+suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+if __name__ == '__main__':
+    result = unittest.TextTestRunner(verbosity=2).run(suite)
+    sys.exit(not result.wasSuccessful())
@@ -0,0 +1,135 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+import sys
+import unittest
+
+from pyasn1.codec.der.decoder import decode as der_decoder
+from pyasn1.codec.der.encoder import encode as der_encoder
+from pyasn1.type import univ
+from pyasn1.type import useful
+
+from pyasn1_alt_modules import dercache
+from pyasn1_alt_modules import pem
+from pyasn1_alt_modules import rfc5280
+from pyasn1_alt_modules import rfc9881
+
+from tests import test_certfields
+from tests import test_rfc9881
+
+
+def _tbsCertificate(pem_text):
+    substrate = pem.readBase64fromText(pem_text)
+    certificate, rest = der_decoder(substrate, asn1Spec=rfc5280.Certificate())
+    return der_encoder(certificate['tbsCertificate'])
+
+
+def _copy(asn1Object):
+    return der_decoder(der_encoder(asn1Object), asn1Spec=asn1Object)[0]
+
+
+class EncodingCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.substrate = _tbsCertificate(
+            test_rfc9881.MLDSACertificateTestCase.pem_text)
+        self.cache = dercache.EncodingCache()
+        self.tbs = self.cache.decode(self.substrate, rfc5280.TBSCertificate())
+
+    def testUnchanged(self):
+        self.assertEqual(self.cache.misses, len(self.cache))
+        misses = self.cache.misses
+        self.assertEqual(self.substrate, self.cache.encode(self.tbs))
+        self.assertEqual(misses, self.cache.misses)
+        self.assertEqual(1, self.cache.hits)
+        self.assertTrue(self.cache.isClean(self.tbs))
+
+    def testTemplate(self):
+        spki = self.tbs['subjectPublicKeyInfo']
+        self.assertEqual(rfc9881.id_ml_dsa_65, spki['algorithm']['algorithm'])
+
+        for serialNumber in (1, 2, 3):
+            self.tbs['serialNumber'] = serialNumber
+            self.tbs['validity']['notAfter']['utcTime'] = \
+                useful.UTCTime('3%d1231235959Z' % serialNumber)
+            self.tbs['subject'] = _copy(self.tbs['issuer'])
+            self.cache.hits = self.cache.misses = 0
+
+            substrate = self.cache.encode(self.tbs)
+            self.assertEqual(der_encoder(self.tbs), substrate)
+            self.assertTrue(self.cache.isClean(spki))
+            self.assertTrue(self.cache.hits)
+
+        # The TBSCertificate, the serialNumber, the Validity, the Time,
+        # and the UTCTime are encoded again.
+        self.tbs['serialNumber'] = 4
+        self.tbs['validity']['notAfter']['utcTime'] = \
+            useful.UTCTime('341231235959Z')
+        self.cache.hits = self.cache.misses = 0
+        self.assertEqual(der_encoder(self.tbs), self.cache.encode(self.tbs))
+        self.assertEqual(5, self.cache.misses)
+
+    def testNestedChange(self):
+        extension = self.tbs['extensions'][0]
+        self.assertTrue(self.cache.isClean(extension))
+        extension['critical'] = not extension['critical']
+        self.assertFalse(self.cache.isClean(extension))
+        self.assertFalse(self.cache.isClean(self.tbs))
+        self.assertTrue(self.cache.isClean(self.tbs['extensions'][1]))
+
+        substrate = self.cache.encode(self.tbs)
+        self.assertNotEqual(self.substrate, substrate)
+        self.assertEqual(der_encoder(self.tbs), substrate)
+
+        extension['critical'] = not extension['critical']
+        self.assertEqual(self.substrate, self.cache.encode(self.tbs))
+
+    def testListChanges(self):
+        extensions = self.tbs['extensions']
+        extension = _copy(extensions[0])
+        extension['extnID'] = univ.ObjectIdentifier('1.2.3.4')
+        extensions.append(extension)
+        self.assertEqual(der_encoder(self.tbs), self.cache.encode(self.tbs))
+
+        extensions[-1] = extensions[0]
+        self.assertEqual(der_encoder(self.tbs), self.cache.encode(self.tbs))
+
+        # An empty OPTIONAL list is left out of the encoding.
+        extensions.clear()
+        substrate = self.cache.encode(self.tbs)
+        self.assertEqual(der_encoder(self.tbs), substrate)
+        self.assertLess(len(substrate), len(self.substrate))
+
+    def testDroppedEntries(self):
+        count = len(self.cache)
+        subject = self.tbs['subject']
+        self.tbs['subject'] = _copy(self.tbs['issuer'])
+        self.cache.encode(self.tbs)
+        self.assertFalse(self.cache.isClean(subject))
+        self.assertEqual(count, len(self.cache))
+
+        self.cache.clear()
+        self.assertEqual(0, len(self.cache))
+        self.assertFalse(self.cache.isClean(self.tbs))
+        self.assertEqual(der_encoder(self.tbs), self.cache.encode(self.tbs))
+
+    def testCertificate(self):
+        substrate = pem.readBase64fromText(
+            test_certfields.CertificateFieldsTestCase.pem_text)
+        certificate = self.cache.decode(substrate, rfc5280.Certificate())
+        self.assertEqual(substrate, self.cache.encode(certificate))
+
+        name = certificate['tbsCertificate']['subject'][0][0][0]
+        name['value'] = univ.Any(der_encoder(rfc5280.X520countryName('US')))
+        self.assertEqual(der_encoder(certificate),
+                         self.cache.encode(certificate))
+
+
+suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+if __name__ == '__main__':
+    result = unittest.TextTestRunner(verbosity=2).run(suite)
+    sys.exit(not result.wasSuccessful())
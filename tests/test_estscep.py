@@ -0,0 +1,245 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+import base64
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+from pyasn1.codec.der.decoder import decode as der_decoder
+from pyasn1.codec.der.encoder import encode as der_encoder
+from pyasn1.error import PyAsn1Error
+from pyasn1.type import char
+from pyasn1.type import univ
+
+from pyasn1_alt_modules import estscep
+from pyasn1_alt_modules import pem
+from pyasn1_alt_modules import rfc4055
+from pyasn1_alt_modules import rfc5280
+from pyasn1_alt_modules import rfc5652
+from pyasn1_alt_modules import rfc7030
+from pyasn1_alt_modules import rfc8894
+from pyasn1_alt_modules import tlv
+
+from tests import test_certfields
+from tests import test_cmpbatch
+from tests import test_rfc7030
+
+
+def attribute(attrType, value):
+    attr = rfc5652.Attribute()
+    attr['attrType'] = attrType
+    attr['attrValues'].append(der_encoder(value))
+    return attr
+
+
+class CertsOnlyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.certificates = [
+            pem.readBase64fromText(
+                test_certfields.CertificateFieldsTestCase.pem_text),
+            pem.readBase64fromText(test_cmpbatch.cert_pem_text)]
+
+    def expected(self, certificates):
+        signedData = rfc5652.SignedData()
+        signedData['version'] = 1
+        signedData['digestAlgorithms'].clear()
+        signedData['encapContentInfo']['eContentType'] = rfc5652.id_data
+        for substrate in certificates:
+            certificate, rest = der_decoder(
+                substrate, asn1Spec=rfc5280.Certificate())
+            choice = rfc5652.CertificateChoices()
+            choice['certificate'] = certificate
+            signedData['certificates'].append(choice)
+        signedData['signerInfos'].clear()
+
+        contentInfo = rfc5652.ContentInfo()
+        contentInfo['contentType'] = rfc5652.id_signedData
+        contentInfo['content'] = der_encoder(signedData)
+        return der_encoder(contentInfo)
+
+    def testCertsOnly(self):
+        self.assertEqual(self.expected(self.certificates),
+                         estscep.certsOnly(self.certificates))
+        self.assertEqual(self.expected(self.certificates),
+                         estscep.certsOnly(reversed(self.certificates)))
+
+        substrate = estscep.certsOnly(self.certificates[:1],
+                                      crls=[b'\x30\x00'])
+        signedData = tlv.children(
+            substrate, tlv.children(substrate)[1][2])
+        self.assertEqual([0xA0, 0xA1], [item[1] for item in signedData[3:5]])
+        self.assertEqual(b'\xA1\x02\x30\x00',
+                         substrate[signedData[4][0]:signedData[4][4]])
+
+    def testCsrAttrs(self):
+        substrate = pem.readBase64fromText(
+            test_rfc7030.CSRAttrsTestCase.pem_text)
+        csrAttrs, rest = der_decoder(substrate, asn1Spec=rfc7030.CsrAttrs())
+        self.assertEqual(substrate, estscep.encodeCsrAttrs(csrAttrs))
+
+        items = []
+        for item in csrAttrs:
+            if item.getName() == 'oid':
+                items.append(item['oid'])
+            else:
+                attr = item['attribute']
+                items.append((attr['attrType'], list(attr['attrValues'])))
+        self.assertEqual(substrate, estscep.encodeCsrAttrs(items))
+
+
+class EnrolmentCacheTestCase(CertsOnlyTestCase):
+
+    def testResponses(self):
+        csrAttrs = [univ.ObjectIdentifier('1.2.840.113549.1.9.7')]
+        cache = estscep.EnrolmentCache(csrAttrs, self.certificates)
+        self.assertEqual(estscep.encodeCsrAttrs(csrAttrs), cache.csrAttrs)
+        self.assertEqual(cache.csrAttrs,
+                         base64.b64decode(cache.csrAttrsBase64))
+
+        caCerts = cache.caCerts
+        self.assertEqual(self.expected(self.certificates), caCerts)
+        self.assertIs(caCerts, cache.caCerts)
+        self.assertEqual(caCerts, base64.b64decode(cache.caCertsBase64))
+        self.assertEqual(('application/x-x509-ca-ra-cert', caCerts),
+                         cache.getCACert())
+
+        fingerprint = cache.fingerprint
+        self.assertFalse(cache.setCACertificates(list(self.certificates)))
+        self.assertIs(caCerts, cache.caCerts)
+        self.assertTrue(cache.setCACertificates(self.certificates[:1]))
+        self.assertNotEqual(fingerprint, cache.fingerprint)
+        self.assertEqual(self.expected(self.certificates[:1]), cache.caCerts)
+        self.assertEqual(
+            ('application/x-x509-ca-cert', self.certificates[0]),
+            cache.getCACert())
+
+        cache.setCsrAttrs(csrAttrs * 2)
+        self.assertEqual(estscep.encodeCsrAttrs(csrAttrs * 2),
+                         base64.b64decode(cache.csrAttrsBase64))
+
+        empty = estscep.EnrolmentCache()
+        self.assertRaises(PyAsn1Error, lambda: empty.csrAttrs)
+        self.assertRaises(PyAsn1Error, empty.getCACert)
+
+    def testBundlePath(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'ca.pem')
+
+        def write(certificates):
+            with open(path, 'w') as fileObj:
+                for certificate in certificates:
+                    fileObj.write('-----BEGIN CERTIFICATE-----\n')
+                    fileObj.write(base64.encodebytes(certificate).decode())
+                    fileObj.write('-----END CERTIFICATE-----\n')
+
+        write(self.certificates)
+        cache = estscep.EnrolmentCache(caBundlePath=path)
+        self.assertEqual(self.certificates, cache.caCertificates)
+        caCerts = cache.caCerts
+        self.assertIs(caCerts, cache.caCerts)
+
+        write(self.certificates[1:])
+        os.utime(path, ns=(0, 0))
+        self.assertEqual(self.expected(self.certificates[1:]), cache.caCerts)
+
+
+class ScepTestCase(unittest.TestCase):
+
+    def setUp(self):
+        certificate, rest = der_decoder(
+            pem.readBase64fromText(test_cmpbatch.cert_pem_text),
+            asn1Spec=rfc5280.Certificate())
+
+        signerInfo = rfc5652.SignerInfo()
+        signerInfo['version'] = 1
+        sid = signerInfo['sid']['issuerAndSerialNumber']
+        sid['issuer'] = certificate['tbsCertificate']['issuer']
+        sid['serialNumber'] = certificate['tbsCertificate']['serialNumber']
+        signerInfo['digestAlgorithm']['algorithm'] = rfc4055.id_sha256
+        signedAttrs = signerInfo['signedAttrs']
+        signedAttrs.append(attribute(rfc5652.id_contentType,
+                                     rfc5652.id_data))
+        signedAttrs.append(attribute(rfc5652.id_messageDigest,
+                                     univ.OctetString(b'\x11' * 32)))
+        signedAttrs.append(attribute(rfc8894.id_messageType,
+                                     char.PrintableString('3')))
+        signedAttrs.append(attribute(rfc8894.id_pkiStatus,
+                                     char.PrintableString('2')))
+        signedAttrs.append(attribute(rfc8894.id_failInfo,
+                                     char.PrintableString('4')))
+        signedAttrs.append(attribute(rfc8894.id_transactionID,
+                                     char.PrintableString('abc123')))
+        signedAttrs.append(attribute(rfc8894.id_senderNonce,
+                                     univ.OctetString(b'\x01' * 16)))
+        signedAttrs.append(attribute(rfc8894.id_recipientNonce,
+                                     univ.OctetString(b'\x02' * 16)))
+        signerInfo['signatureAlgorithm']['algorithm'] = \
+            rfc4055.sha256WithRSAEncryption
+        signerInfo['signature'] = b'\x00' * 64
+        self.signerInfo = signerInfo
+
+        signedData = rfc5652.SignedData()
+        signedData['version'] = 1
+        algorithm = signedData['digestAlgorithms'].componentType.clone()
+        algorithm['algorithm'] = rfc4055.id_sha256
+        signedData['digestAlgorithms'].append(algorithm)
+        signedData['encapContentInfo']['eContentType'] = rfc5652.id_data
+        signedData['encapContentInfo']['eContent'] = b'\x30\x03\x02\x01\x07'
+        choice = rfc5652.CertificateChoices()
+        choice['certificate'] = certificate
+        signedData['certificates'].append(choice)
+        signedData['signerInfos'].append(signerInfo)
+
+        contentInfo = rfc5652.ContentInfo()
+        contentInfo['contentType'] = rfc5652.id_signedData
+        contentInfo['content'] = der_encoder(signedData)
+        self.pkiMessage = der_encoder(contentInfo)
+
+    def check(self, attributes):
+        self.assertEqual(3, attributes.messageType)
+        self.assertEqual('CertRep', attributes.messageTypeName)
+        self.assertEqual(2, attributes.pkiStatus)
+        self.assertEqual('FAILURE', estscep.pkiStatuses[attributes.pkiStatus])
+        self.assertEqual('badCertId', estscep.failInfos[attributes.failInfo])
+        self.assertEqual('abc123', attributes.transactionID)
+        self.assertEqual(b'\x01' * 16, attributes.senderNonce)
+        self.assertEqual(b'\x02' * 16, attributes.recipientNonce)
+        self.assertEqual(b'\x11' * 32, attributes.messageDigest)
+        signedAttrs = rfc5652.SignedAttributes()
+        signedAttrs.extend(self.signerInfo['signedAttrs'])
+        self.assertEqual(der_encoder(signedAttrs), attributes.signedAttrs)
+
+    def testSignerInfo(self):
+        self.check(estscep.scepAttributes(self.signerInfo))
+        self.check(estscep.scepAttributes(der_encoder(self.signerInfo)))
+
+    def testPkiMessage(self):
+        attributes, envelope = estscep.pkiMessage(self.pkiMessage)
+        self.check(attributes)
+        self.assertEqual(b'\x30\x03\x02\x01\x07', envelope)
+
+    def testErrors(self):
+        self.signerInfo['signedAttrs'].clear()
+        self.assertRaises(PyAsn1Error, estscep.scepAttributes,
+                          self.signerInfo)
+
+        contentInfo = rfc5652.ContentInfo()
+        contentInfo['contentType'] = rfc5652.id_data
+        contentInfo['content'] = der_encoder(univ.OctetString(b'x'))
+        self.assertRaises(PyAsn1Error, estscep.pkiMessage,
+                          der_encoder(contentInfo))
+
+
+suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+if __name__ == '__main__':
+    result = unittest.TextTestRunner(verbosity=2).run(suite)
+    sys.exit(not result.wasSuccessful())
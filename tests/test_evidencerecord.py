@@ -0,0 +1,280 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+import hashlib
+import sys
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from pyasn1.codec.der.decoder import decode as der_decoder
+from pyasn1.codec.der.encoder import encode as der_encoder
+from pyasn1.error import PyAsn1Error
+from pyasn1.type import univ
+from pyasn1.type import useful
+
+from pyasn1_alt_modules import evidencerecord
+from pyasn1_alt_modules import pem
+from pyasn1_alt_modules import rfc3161
+from pyasn1_alt_modules import rfc4055
+from pyasn1_alt_modules import rfc4998
+from pyasn1_alt_modules import rfc5652
+from pyasn1_alt_modules import tlv
+
+from tests import test_rfc4998
+
+
+def timeStampToken(digest, hashAlgorithm=rfc4055.id_sha256, serial=1):
+    """Return an unsigned RFC 3161 token over digest, which is all that
+    the hash tree checks look at."""
+    tstInfo = rfc3161.TSTInfo()
+    tstInfo['version'] = 1
+    tstInfo['policy'] = univ.ObjectIdentifier('1.2.3.4.5')
+    tstInfo['messageImprint']['hashAlgorithm']['algorithm'] = hashAlgorithm
+    tstInfo['messageImprint']['hashedMessage'] = digest
+    tstInfo['serialNumber'] = serial
+    tstInfo['genTime'] = useful.GeneralizedTime('20260101000000Z')
+
+    signedData = rfc5652.SignedData()
+    signedData['version'] = 3
+    algorithm = signedData['digestAlgorithms'].componentType.clone()
+    algorithm['algorithm'] = hashAlgorithm
+    signedData['digestAlgorithms'].append(algorithm)
+    encap = signedData['encapContentInfo']
+    encap['eContentType'] = rfc3161.id_ct_TSTInfo
+    encap['eContent'] = der_encoder(tstInfo)
+    signedData['signerInfos'].clear()
+
+    contentInfo = rfc5652.ContentInfo()
+    contentInfo['contentType'] = rfc5652.id_signedData
+    contentInfo['content'] = der_encoder(signedData)
+    return der_encoder(contentInfo)
+
+
+def archiveTimeStamp(timeStamp, digestAlgorithm=None):
+    parts = []
+    if digestAlgorithm is not None:
+        encoded = der_encoder(digestAlgorithm)
+        tag, valueOffset, valueEnd, tlvEnd = tlv.readTlv(encoded)
+        parts.append(tlv.encodeTlv(tlv.contextTag(0),
+                                   encoded[valueOffset:valueEnd]))
+    return tlv.encodeTlv(tlv.SEQUENCE, b''.join(parts) + timeStamp)
+
+
+class RealRecordTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.substrate = pem.readBase64fromText(
+            test_rfc4998.EvidenceRecordTestCase.pem_text)
+        self.record, rest = der_decoder(
+            self.substrate, asn1Spec=rfc4998.EvidenceRecord())
+        ats = self.record['archiveTimeStampSequence'][0][0]
+        self.leaves = list(ats['reducedHashtree'][0])
+
+    def testVerify(self):
+        verifier = evidencerecord.EvidenceRecordVerifier()
+        for leaf in self.leaves:
+            digests = {rfc4055.id_sha256: bytes(leaf)}
+            verifier.check(self.record, digests)
+            self.assertTrue(verifier.verify(self.substrate, digests))
+        self.assertFalse(verifier.verify(
+            self.substrate, {rfc4055.id_sha256: b'\x00' * 32}))
+        self.assertFalse(verifier.verify(self.substrate, {}))
+        self.assertFalse(verifier.verify(self.substrate, b'data'))
+        self.assertEqual(2, verifier.cache.misses)
+        self.assertEqual(6, verifier.cache.hits)
+
+    def testMessageImprint(self):
+        timeStamp = self.record['archiveTimeStampSequence'][0][0]['timeStamp']
+        name, hashedMessage = evidencerecord.messageImprint(
+            der_encoder(timeStamp))
+        signedData, rest = der_decoder(
+            timeStamp['content'], asn1Spec=rfc5652.SignedData())
+        tstInfo, rest = der_decoder(
+            signedData['encapContentInfo']['eContent'],
+            asn1Spec=rfc3161.TSTInfo())
+        self.assertEqual('sha256', name)
+        self.assertEqual(tstInfo['messageImprint']['hashedMessage'],
+                         hashedMessage)
+
+
+class HashtreeTestCase(unittest.TestCase):
+
+    def build(self, count, branching=2, digestAlgorithm=rfc4055.id_sha256):
+        builder = evidencerecord.HashtreeBuilder(digestAlgorithm, branching)
+        self.objects = [b'object %d' % number for number in range(count)]
+        builder.extend(self.objects)
+        self.assertEqual(count, len(builder))
+        self.timeStamp = timeStampToken(builder.build(), digestAlgorithm)
+        return builder
+
+    def testTrees(self):
+        for count in (1, 2, 5, 16, 33):
+            for branching in (2, 3):
+                builder = self.build(count, branching)
+                verifier = evidencerecord.EvidenceRecordVerifier()
+                for index, dataObject in enumerate(self.objects):
+                    substrate = builder.encodeEvidenceRecord(
+                        index, self.timeStamp)
+                    record, rest = der_decoder(
+                        substrate, asn1Spec=rfc4998.EvidenceRecord())
+                    self.assertFalse(rest)
+                    self.assertEqual(substrate, der_encoder(record))
+                    self.assertTrue(verifier.verify(record, dataObject))
+                    self.assertTrue(verifier.verify(substrate, dataObject))
+                    self.assertFalse(verifier.verify(
+                        substrate, dataObject + b'!'))
+
+    def testReducedHashtree(self):
+        builder = self.build(5)
+        digests = [hashlib.sha256(dataObject).digest()
+                   for dataObject in self.objects]
+        partialHashtrees = builder.reducedHashtree(4)
+        # The fifth leaf moves up on its own until it meets the root
+        # of the first four.
+        self.assertEqual(1, len(partialHashtrees))
+        self.assertEqual(digests[4], partialHashtrees[0][1])
+        partialHashtrees = builder.reducedHashtree(1)
+        self.assertEqual(digests[:2], partialHashtrees[0])
+        self.assertEqual(3, len(partialHashtrees))
+        self.assertRaises(IndexError, builder.reducedHashtree, 5)
+
+        single = self.build(1)
+        self.assertEqual([], single.reducedHashtree(0))
+        self.assertEqual(digests[0], single.root)
+        self.assertRaises(PyAsn1Error,
+                          evidencerecord.HashtreeBuilder().build)
+
+    def testSha512(self):
+        builder = self.build(7, digestAlgorithm=rfc4055.id_sha512)
+        verifier = evidencerecord.EvidenceRecordVerifier()
+        substrate = builder.encodeEvidenceRecord(3, self.timeStamp)
+        self.assertTrue(verifier.verify(substrate, self.objects[3]))
+        self.assertTrue(verifier.verify(substrate, {
+            rfc4055.id_sha512: hashlib.sha512(self.objects[3]).digest()}))
+        self.assertFalse(verifier.verify(substrate, {
+            rfc4055.id_sha256: hashlib.sha256(self.objects[3]).digest()}))
+
+    def testCache(self):
+        builder = self.build(64)
+        verifier = evidencerecord.EvidenceRecordVerifier()
+        records = [builder.encodeEvidenceRecord(index, self.timeStamp)
+                   for index in range(64)]
+        self.assertEqual([True] * 64, verifier.verifyMany(
+            zip(records, self.objects)))
+        # 63 inner nodes, each computed once
+        self.assertEqual(63, verifier.cache.misses)
+        self.assertEqual(64 * 6 - 63, verifier.cache.hits)
+
+        cache = evidencerecord.NodeCache(maxSize=4)
+        verifier = evidencerecord.EvidenceRecordVerifier(cache=cache)
+        self.assertEqual([True] * 64, verifier.verifyMany(
+            zip(records, self.objects)))
+        self.assertEqual(4, len(cache._nodes))
+
+    def testExecutor(self):
+        builder = self.build(40, branching=4)
+        records = [builder.encodeEvidenceRecord(index, self.timeStamp)
+                   for index in range(40)]
+        objects = list(self.objects)
+        objects[7] = b'tampered'
+        records[9] = b'\x30\x00'
+        with ThreadPoolExecutor(4) as executor:
+            verifier = evidencerecord.EvidenceRecordVerifier(
+                executor=executor)
+            results = verifier.verifyMany(zip(records, objects))
+        expected = [True] * 40
+        expected[7] = expected[9] = False
+        self.assertEqual(expected, results)
+
+    def testSharedCache(self):
+        cache = evidencerecord.NodeCache(maxSize=8)
+        values = [[bytes([index % 32]) * 32] for index in range(2000)]
+        with ThreadPoolExecutor(8) as executor:
+            results = list(executor.map(
+                lambda value: cache.node('sha256', value), values))
+        self.assertEqual([hashlib.sha256(value[0]).digest()
+                          for value in values], results)
+        self.assertEqual(2000, cache.hits + cache.misses)
+        self.assertLessEqual(len(cache._nodes), 8)
+
+    def testCheckTimeStamp(self):
+        builder = self.build(8)
+        calls = []
+
+        def checkTimeStamp(timeStamp):
+            calls.append(timeStamp)
+            return False
+
+        verifier = evidencerecord.EvidenceRecordVerifier(checkTimeStamp)
+        for index in range(8):
+            substrate = builder.encodeEvidenceRecord(index, self.timeStamp)
+            self.assertRaisesRegex(PyAsn1Error, 'rejected', verifier.check,
+                                   substrate, self.objects[index])
+        self.assertEqual([self.timeStamp], calls)
+
+
+class RenewalTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.dataObject = b'archived document'
+        digest = hashlib.sha256(self.dataObject).digest()
+        self.firstTimeStamp = timeStampToken(digest)
+        first = archiveTimeStamp(self.firstTimeStamp)
+
+        # Timestamp renewal covers the previous timestamp
+        renewal = archiveTimeStamp(timeStampToken(
+            hashlib.sha256(self.firstTimeStamp).digest(), serial=2))
+        self.firstChain = tlv.encodeTlv(tlv.SEQUENCE, first + renewal)
+
+        # Hash-tree renewal covers the data and the earlier chains
+        algorithm = rfc5652.DigestAlgorithmIdentifier()
+        algorithm['algorithm'] = rfc4055.id_sha512
+        earlier = hashlib.sha512(
+            tlv.encodeTlv(tlv.SEQUENCE, self.firstChain)).digest()
+        covered = hashlib.sha512(
+            hashlib.sha512(self.dataObject).digest() + earlier).digest()
+        self.secondChain = tlv.encodeTlv(tlv.SEQUENCE, archiveTimeStamp(
+            timeStampToken(covered, serial=3), algorithm))
+
+    def record(self, *chains):
+        return tlv.encodeTlv(tlv.SEQUENCE, b''.join((
+            b'\x02\x01\x01', tlv.encodeTlv(tlv.SEQUENCE, b''),
+            tlv.encodeTlv(tlv.SEQUENCE, b''.join(chains)))))
+
+    def testRenewals(self):
+        verifier = evidencerecord.EvidenceRecordVerifier()
+        substrate = self.record(self.firstChain, self.secondChain)
+        record, rest = der_decoder(substrate,
+                                   asn1Spec=rfc4998.EvidenceRecord())
+        self.assertFalse(rest)
+        verifier.check(record, self.dataObject)
+        verifier.check(substrate, self.dataObject)
+        verifier.check(self.record(self.firstChain), self.dataObject)
+
+        self.assertRaisesRegex(
+            PyAsn1Error, 'chain 0', verifier.check,
+            self.record(self.secondChain), self.dataObject)
+        self.assertRaisesRegex(
+            PyAsn1Error, 'chain 1', verifier.check,
+            substrate, {rfc4055.id_sha256: hashlib.sha256(
+                self.dataObject).digest(), rfc4055.id_sha512: b'\x00' * 64})
+
+    def testBrokenTimeStampRenewal(self):
+        chain = tlv.children(self.firstChain)
+        renewal = archiveTimeStamp(timeStampToken(
+            hashlib.sha256(b'other').digest(), serial=2))
+        brokenChain = tlv.encodeTlv(tlv.SEQUENCE, self.firstChain[
+            chain[0][0]:chain[0][4]] + renewal)
+        verifier = evidencerecord.EvidenceRecordVerifier()
+        self.assertFalse(verifier.verify(
+            self.record(brokenChain), self.dataObject))
+
+
+suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+if __name__ == '__main__':
+    result = unittest.TextTestRunner(verbosity=2).run(suite)
+    sys.exit(not result.wasSuccessful())
@@ -0,0 +1,225 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+import asyncio
+import sys
+import unittest
+
+from pyasn1.codec.ber.encoder import encode as ber_encoder
+from pyasn1.error import PyAsn1Error
+from pyasn1.error import SubstrateUnderrunError
+
+from pyasn1_alt_modules import ldapstream
+from pyasn1_alt_modules import rfc2251
+
+
+def searchResultEntry(messageID, dn, attributes):
+    entry = rfc2251.SearchResultEntry()
+    entry['objectName'] = dn
+    for attrType, values in attributes:
+        attr = entry['attributes'].componentType.clone()
+        attr['type'] = attrType
+        for value in values:
+            attr['vals'].append(value)
+        entry['attributes'].append(attr)
+
+    message = rfc2251.LDAPMessage()
+    message['messageID'] = messageID
+    message['protocolOp']['searchResEntry'] = entry
+    return ber_encoder(message)
+
+
+def searchResultDone(messageID):
+    done = rfc2251.SearchResultDone()
+    done['resultCode'] = 'success'
+    done['matchedDN'] = ''
+    done['errorMessage'] = ''
+    message = rfc2251.LDAPMessage()
+    message['messageID'] = messageID
+    message['protocolOp']['searchResDone'] = done
+    return ber_encoder(message)
+
+
+class LDAPMessageDecoderTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.entry = searchResultEntry(
+            7, b'cn=alice,dc=example,dc=com',
+            [(b'cn', [b'alice']),
+             (b'mail', [b'alice@example.com', b'a@example.com']),
+             (b'jpegPhoto', [b'\xff' * 300])])
+        self.stream = self.entry + self.entry + searchResultDone(7)
+
+    def testByteByByte(self):
+        decoder = ldapstream.LDAPMessageDecoder()
+        messages = []
+        for position in range(len(self.stream)):
+            messages.extend(decoder.feed(self.stream[position:position + 1]))
+
+        self.assertEqual(3, len(messages))
+        self.assertEqual(0, decoder.pending)
+        decoder.close()
+
+        entry = messages[0]['protocolOp']['searchResEntry']
+        self.assertEqual(7, messages[0]['messageID'])
+        self.assertEqual(b'cn=alice,dc=example,dc=com', entry['objectName'])
+        self.assertEqual(3, len(entry['attributes']))
+        self.assertEqual(
+            'searchResDone', messages[2]['protocolOp'].getName())
+
+    def testOneChunk(self):
+        decoder = ldapstream.LDAPMessageDecoder()
+        self.assertEqual(3, len(decoder.feed(self.stream)))
+
+    def testLazyEntries(self):
+        decoder = ldapstream.LDAPMessageDecoder(lazyEntries=True)
+        messages = decoder.feed(self.stream)
+
+        entry = messages[0]
+        self.assertIsInstance(entry, ldapstream.LazySearchResultEntry)
+        self.assertEqual(7, entry.messageID)
+        self.assertEqual(b'cn=alice,dc=example,dc=com', entry.objectName)
+        self.assertIsNone(entry.controls)
+
+        attributes = list(entry.iterAttributes())
+        self.assertEqual([b'cn', b'mail', b'jpegPhoto'],
+                         [attrType for attrType, values in attributes])
+        self.assertEqual([b'alice@example.com', b'a@example.com'],
+                         entry.attribute('MAIL'))
+        self.assertEqual([b'\xff' * 300], entry.attribute(b'jpegPhoto'))
+        self.assertIsNone(entry.attribute('sn'))
+
+        full = entry.toAsn1()
+        self.assertEqual(self.entry, ber_encoder(full))
+
+        self.assertIsInstance(messages[2], rfc2251.LDAPMessage)
+
+    def testTruncated(self):
+        decoder = ldapstream.LDAPMessageDecoder()
+        self.assertEqual([], decoder.feed(self.entry[:-1]))
+        self.assertEqual(len(self.entry) - 1, decoder.pending)
+        self.assertRaises(SubstrateUnderrunError, decoder.close)
+
+    def testBadMessage(self):
+        # A framed message whose messageID is an OCTET STRING.
+        bad = b'\x30\x03\x04\x01\x00'
+        decoder = ldapstream.LDAPMessageDecoder()
+        messages = decoder.feed(self.entry + bad + self.entry)
+        self.assertEqual([7], [message['messageID'] for message in messages])
+        self.assertRaises(PyAsn1Error, decoder.feed, b'')
+        self.assertEqual(
+            [7], [message['messageID'] for message in decoder.feed(b'')])
+        decoder.close()
+
+        decoder = ldapstream.LDAPMessageDecoder()
+        self.assertRaises(PyAsn1Error, decoder.feed, bad)
+
+    def testMaxMessageSize(self):
+        decoder = ldapstream.LDAPMessageDecoder(maxMessageSize=100)
+        self.assertRaises(PyAsn1Error, decoder.feed, self.entry[:4])
+
+    def testNotSequence(self):
+        decoder = ldapstream.LDAPMessageDecoder()
+        self.assertRaises(PyAsn1Error, decoder.feed, b'\x04\x00')
+
+    def testIndefiniteLength(self):
+        decoder = ldapstream.LDAPMessageDecoder()
+        self.assertRaises(PyAsn1Error, decoder.feed, b'\x30\x80')
+
+
+class FakeTransport(object):
+
+    def __init__(self):
+        self.reading = True
+        self.closed = False
+
+    def pause_reading(self):
+        self.reading = False
+
+    def resume_reading(self):
+        self.reading = True
+
+    def close(self):
+        self.closed = True
+
+
+class LDAPMessageProtocolTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.entry = searchResultEntry(
+            2, b'cn=bob,dc=example,dc=com', [(b'cn', [b'bob'])])
+
+    def testBackpressure(self):
+        async def run():
+            protocol = ldapstream.LDAPMessageProtocol(
+                lazyEntries=True, highWater=4, lowWater=1)
+            transport = FakeTransport()
+            protocol.connection_made(transport)
+
+            stream = self.entry * 5
+            protocol.data_received(stream[:10])
+            self.assertTrue(transport.reading)
+            protocol.data_received(stream[10:])
+            self.assertFalse(transport.reading)
+            protocol.connection_lost(None)
+
+            names = []
+            async for message in protocol:
+                names.append(message.objectName)
+                if len(names) == 3:
+                    self.assertFalse(transport.reading)
+            self.assertTrue(transport.reading)
+            return names
+
+        names = asyncio.run(run())
+        self.assertEqual([b'cn=bob,dc=example,dc=com'] * 5, names)
+
+    def testTruncatedStream(self):
+        async def run():
+            protocol = ldapstream.LDAPMessageProtocol()
+            protocol.connection_made(FakeTransport())
+            protocol.data_received(self.entry + self.entry[:5])
+            protocol.connection_lost(None)
+            message = await protocol.get()
+            self.assertEqual(2, message['messageID'])
+            with self.assertRaises(SubstrateUnderrunError):
+                await protocol.get()
+            self.assertIsNone(await protocol.get())
+
+        asyncio.run(run())
+
+    def testGoodThenBad(self):
+        async def run():
+            protocol = ldapstream.LDAPMessageProtocol()
+            transport = FakeTransport()
+            protocol.connection_made(transport)
+            protocol.data_received(self.entry + b'\x30\x03\x04\x01\x00')
+            self.assertTrue(transport.closed)
+            message = await protocol.get()
+            self.assertEqual(2, message['messageID'])
+            with self.assertRaises(PyAsn1Error):
+                await protocol.get()
+
+        asyncio.run(run())
+
+    def testDecodingError(self):
+        async def run():
+            protocol = ldapstream.LDAPMessageProtocol()
+            transport = FakeTransport()
+            protocol.connection_made(transport)
+            protocol.data_received(b'\x04\x00')
+            self.assertTrue(transport.closed)
+            with self.assertRaises(PyAsn1Error):
+                await protocol.get()
+
+        asyncio.run(run())
+
+
+suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+if __name__ == '__main__':
+    result = unittest.TextTestRunner(verbosity=2).run(suite)
+    sys.exit(not result.wasSuccessful())
@@ -0,0 +1,198 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+import json
+import sys
+import unittest
+
+from pyasn1.codec.der.decoder import decode as der_decoder
+from pyasn1.error import PyAsn1Error
+
+from pyasn1_alt_modules import pem
+from pyasn1_alt_modules import rfc2985
+from pyasn1_alt_modules import rfc3279
+from pyasn1_alt_modules import rfc3565
+from pyasn1_alt_modules import rfc4108
+from pyasn1_alt_modules import rfc5280
+from pyasn1_alt_modules import rfc5652
+from pyasn1_alt_modules import rfc8018
+from pyasn1_alt_modules import rfc9481
+from pyasn1_alt_modules import native
+
+
+class CertificateToNativeTestCase(unittest.TestCase):
+    pem_text = """\
+\
+MIIDWTCCAsKgAwIBAgIBBzANBgkqhkiG9w0BAQUFADBVMQswCQYDVQQGEwJHQjEk
+MCIGA1UEChMbQ2VydGlmaWNhdGUgVHJhbnNwYXJlbmN5IENBMQ4wDAYDVQQIEwVX
+YWxlczEQMA4GA1UEBxMHRXJ3IFdlbjAeFw0xMjA2MDEwMDAwMDBaFw0yMjA2MDEw
+MDAwMDBaMFIxCzAJBgNVBAYTAkdCMSEwHwYDVQQKExhDZXJ0aWZpY2F0ZSBUcmFu
+c3BhcmVuY3kxDjAMBgNVBAgTBVdhbGVzMRAwDgYDVQQHEwdFcncgV2VuMIGfMA0G
+CSqGSIb3DQEBAQUAA4GNADCBiQKBgQC+75jnwmh3rjhfdTJaDB0ym+3xj6r015a/
+BH634c4VyVui+A7kWL19uG+KSyUhkaeb1wDDjpwDibRc1NyaEgqyHgy0HNDnKAWk
+EM2cW9tdSSdyba8XEPYBhzd+olsaHjnu0LiBGdwVTcaPfajjDK8VijPmyVCfSgWw
+FAn/Xdh+tQIDAQABo4IBOjCCATYwHQYDVR0OBBYEFCAxVBryXAX/2GWLaEN5T16Q
+Nve0MH0GA1UdIwR2MHSAFF+diA3Ic+ZU1PgN2OawwSS0R8NVoVmkVzBVMQswCQYD
+VQQGEwJHQjEkMCIGA1UEChMbQ2VydGlmaWNhdGUgVHJhbnNwYXJlbmN5IENBMQ4w
+DAYDVQQIEwVXYWxlczEQMA4GA1UEBxMHRXJ3IFdlboIBADAJBgNVHRMEAjAAMIGK
+BgorBgEEAdZ5AgQCBHwEegB4AHYA3xwuwRUAlFJHqWFoMl3cXHlZ6PfG04j8AC4L
+vT9012QAAAE92yffkwAABAMARzBFAiBIL2dRrzXbplQ2vh/WZA89v5pBQpSVkkUw
+KI+j5eI+BgIhAOTtwNs6xXKx4vXoq2poBlOYfc9BAn3+/6EFUZ2J7b8IMA0GCSqG
+SIb3DQEBBQUAA4GBAIoMS+8JnUeSea+goo5on5HhxEIb4tJpoupspOghXd7dyhUE
+oR58h8S3foDw6XkDUmjyfKIOFmgErlVvMWmB+Wo5Srer/T4lWsAERRP+dlcMZ5Wr
+5HAxM9MD+J86+mu8/FFzGd/ZW5NCQSEfY0A1w9B4MHpoxgdaLiDInza4kQyg
+"""
+
+    def setUp(self):
+        substrate = pem.readBase64fromText(self.pem_text)
+        self.asn1Object, rest = der_decoder(
+            substrate, asn1Spec=rfc5280.Certificate())
+
+    def testToNative(self):
+        result = native.toNative(self.asn1Object)
+        tbs = result['tbsCertificate']
+        self.assertEqual('v3', tbs['version'])
+        self.assertEqual(7, tbs['serialNumber'])
+        self.assertEqual('sha1WithRSAEncryption', tbs['signature']['algorithm'])
+        self.assertEqual({'utcTime': '120601000000Z'},
+                         tbs['validity']['notBefore'])
+
+        countryName = tbs['subject']['rdnSequence'][0][0]
+        self.assertEqual({'type': 'id_at_countryName', 'value': 'GB'},
+                         countryName)
+
+        extensions = dict((extn['extnID'], extn['extnValue'])
+                          for extn in tbs['extensions'])
+        self.assertEqual(0, extensions['id_ce_authorityKeyIdentifier'][
+            'authorityCertSerialNumber'])
+        self.assertEqual({}, extensions['id_ce_basicConstraints'])
+        self.assertEqual('2031541af25c05ffd8658b6843794f5e9036f7b4',
+                         extensions['id_ce_subjectKeyIdentifier'])
+
+        self.assertEqual(result, native.toNative(self.asn1Object))
+
+    def testOptions(self):
+        converter = native.Converter(
+            bytesMode='bytes', oidNames=False, openTypes=False)
+        result = converter.toNative(self.asn1Object)
+        tbs = result['tbsCertificate']
+        self.assertEqual('1.2.840.113549.1.1.5', tbs['signature']['algorithm'])
+        self.assertEqual(b'\x05\x00', tbs['signature']['parameters'])
+        self.assertIsInstance(tbs['extensions'][0]['extnValue'], bytes)
+        self.assertIsInstance(result['signature'], bytes)
+
+        self.assertRaises(PyAsn1Error, native.Converter, bytesMode='text')
+
+    def testToJson(self):
+        text = native.toJson(self.asn1Object, sort_keys=True)
+        self.assertEqual(native.toNative(self.asn1Object), json.loads(text))
+
+    def testFreshResults(self):
+        converter = native.Converter()
+        result = converter.toNative(self.asn1Object)
+        result['tbsCertificate']['extensions'][1]['extnValue'].clear()
+        result['tbsCertificate']['signature']['parameters'] = 'changed'
+
+        again = converter.toNative(self.asn1Object)
+        self.assertEqual(0, again['tbsCertificate']['extensions'][1][
+            'extnValue']['authorityCertSerialNumber'])
+        self.assertIsNone(again['tbsCertificate']['signature']['parameters'])
+
+    def testDecodedOpenTypes(self):
+        asn1Object, rest = der_decoder(
+            pem.readBase64fromText(self.pem_text),
+            asn1Spec=rfc5280.Certificate(), decodeOpenTypes=True)
+        self.assertEqual(native.toNative(self.asn1Object),
+                         native.toNative(asn1Object))
+
+        # The open types that the decoder has decoded are converted as
+        # they are, even when the converter does not decode them.
+        converter = native.Converter(openTypes=False)
+        tbs = converter.toNative(asn1Object)['tbsCertificate']
+        self.assertIsNone(tbs['signature']['parameters'])
+        self.assertEqual('GB', tbs['issuer']['rdnSequence'][0][0]['value'])
+        self.assertEqual({'printableString': 'Wales'},
+                         tbs['issuer']['rdnSequence'][2][0]['value'])
+
+
+class SignedDataToNativeTestCase(unittest.TestCase):
+    pem_text = """\
+MIIEvAYJKoZIhvcNAQcCoIIErTCCBKkCAQExDTALBglghkgBZQMEAgEwggIVBgsq
+hkiG9w0BCRABEKCCAgQEggIA3ntqPr5kDpx+//pgWGfHCH/Ht4pbenGwXv80txyE
+Y0I2mT9BUGz8ILkbhD7Xz89pBS5KhEJpthxH8WREJtvS+wL4BqYLt23wjWoZy5Gt
+5dPzWgaNlV/aQ5AdfAY9ljmnNYnK8D8r8ur7bQM4cKUdxry+QA0nqXHMAOSpx4Um
+8impCc0BICXaFfL3zBrNxyPubbFO9ofbYOAWaNmmIAhzthXf12vDrLostIqmYrP4
+LMRCjTr4LeYaVrAWfKtbUbByN6IuBef3Qt5cJaChr74udz3JvbYFsUvCpl64kpRq
+g2CT6R+xE4trO/pViJlI15dvJVz04BBYQ2jQsutJwChi97/DDcjIv03VBmrwRE0k
+RJNFP9vpDM8CxJIqcobC5Kuv8b0GqGfGl6ouuQKEVMfBcrupgjk3oc3KL1iVdSr1
++74amb1vDtTMWNm6vWRqh+Kk17NGEi2mNvYkkZUTIHNGH7OgiDclFU8dSMZd1fun
+/D9dmiFiErDB3Fzr4+8Qz0aKedNE/1uvM+dhu9qjuRdkDzZ4S7txTfk6y9pG9iyk
+aEeTV2kElKXblgi+Cf0Ut4f5he8rt6jveHdMo9X36YiUQVvevj2cgN7lFivEnFYV
+QY0xugpP7lvEFDfsi2+0ozgP8EKOLYaCUKpuvttlYJ+vdtUFEijizEZ4cx02RsXm
+EesxggJ6MIICdgIBA4AUnutnybladNRNLxY5ZoDoAbXLpJwwCwYJYIZIAWUDBAIB
+oIG8MBoGCSqGSIb3DQEJAzENBgsqhkiG9w0BCRABEDArBgsqhkiG9w0BCRACJDEc
+MBoGCysGAQQBjb9BAQEqBgsrBgEEAY2/QQEBMDAvBgkqhkiG9w0BCQQxIgQgAJfv
+uasB4P6WDLOkOyvj33YPgZW4olHbidzyh1EKP9YwQAYLKoZIhvcNAQkQAikxMTAv
+MAsGCWCGSAFlAwQCAQQgAJfvuasB4P6WDLOkOyvj33YPgZW4olHbidzyh1EKP9Yw
+CwYJKoZIhvcNAQELBIIBgDivAlSLbMPPu+zV+pPcYpNp+A1mwVOytjMBzSo31kR/
+qEu+hVrDknAOk9IdCaDvcz612CcfNT85/KzrYvWWxOP2woU/vZj253SnndALpfNN
+n3/crJjF6hKgkjUwoXebI7kuj5WCh2q5lkd6xUa+jkCw+CINcN43thtS66UsVI4d
+mv02EvsS2cxPY/508uaQZ6AYAacm667bgX8xEjbzACMOeMCuvKQXWAuh3DkNk+gV
+xizHDw7xZxXgMGMAnJglAeBtd3Si5ztILw9U2gKUqFn/nOgy+eW63JuU/q31/Hgg
+ZATjyBznSzneTZrw8/ePoSCj7E9vBeCTUkeFbVB2tJK1iYDMblp6HUuwgYuGKXy/
+ZwKL3GvB11qg7ntdEyjdLq0xcVrht/K0d2dPo4iO4Ac7c1xbFMDAlWOt4FMPWh6O
+iTh55YvT7hAJjTbB5ebgMA9QJnAczQPFnaIePnlFrkETd3YyLK4yHwnoIGo1GiW/
+dsnhVtIdkPtfJIvcYteYJg==
+"""
+
+    def testOpenTypes(self):
+        substrate = pem.readBase64fromText(self.pem_text)
+        asn1Object, rest = der_decoder(
+            substrate, asn1Spec=rfc5652.ContentInfo())
+
+        result = native.toNative(asn1Object)
+        self.assertEqual('id_signedData', result['contentType'])
+
+        signedData = result['content']
+        self.assertEqual('v1', signedData['version'])
+        self.assertEqual('id_ct_firmwarePackage',
+                         signedData['encapContentInfo']['eContentType'])
+
+        signerInfo = signedData['signerInfos'][0]
+        self.assertEqual('v3', signerInfo['version'])
+        self.assertIn('subjectKeyIdentifier', signerInfo['sid'])
+
+        attributes = dict((attr['attrType'], attr['attrValues'])
+                          for attr in signerInfo['signedAttrs'])
+        self.assertEqual(['id_ct_firmwarePackage'],
+                         attributes['id_contentType'])
+
+        asn1Object, rest = der_decoder(
+            substrate, asn1Spec=rfc5652.ContentInfo(), decodeOpenTypes=True)
+        self.assertEqual(result, native.toNative(asn1Object))
+
+
+class OidNameTestCase(unittest.TestCase):
+
+    def testDefiningModule(self):
+        # rfc9481 imports the constant from rfc3565, and rfc8018 has
+        # another constant for the same OID.
+        self.assertEqual('id_aes128_CBC', native.oidName(rfc3565.id_aes128_CBC))
+        self.assertEqual('id_aes128_CBC', native.oidName(rfc8018.aes128_CBC_PAD))
+        self.assertIs(rfc3565.id_aes128_CBC, rfc9481.id_aes128_CBC)
+
+        # rfc2985 gives its own name to the constant of rfc5280.
+        self.assertEqual('id_emailAddress',
+                         native.oidName(rfc2985.pkcs_9_at_emailAddress))
+
+        self.assertIsNone(native.oidName('1.2.3.4.5.6.7.8'))
+
+
+suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+if __name__ == '__main__':
+    result = unittest.TextTestRunner(verbosity=2).run(suite)
+    sys.exit(not result.wasSuccessful())
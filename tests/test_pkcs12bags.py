@@ -0,0 +1,174 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+import sys
+import unittest
+
+from pyasn1.codec.ber.encoder import encode as ber_encoder
+from pyasn1.codec.der.decoder import decode as der_decoder
+from pyasn1.codec.der.encoder import encode as der_encoder
+from pyasn1.error import PyAsn1Error
+from pyasn1.type import univ
+
+from pyasn1_alt_modules import pkcs12bags
+from pyasn1_alt_modules import rfc5652
+from pyasn1_alt_modules import rfc7292
+
+
+def fakeCertificate(number):
+    sequence = univ.SequenceOf(componentType=univ.Integer())
+    sequence.extend([number, number * 1000])
+    return der_encoder(sequence)
+
+
+def certBag(certificate, name=None, keyId=None):
+    bag = rfc7292.CertBag()
+    bag['certId'] = rfc7292.x509Certificate['certId']
+    bag['certValue'] = der_encoder(univ.OctetString(certificate))
+    return safeBag(rfc7292.id_certBag, bag, name, keyId)
+
+
+def safeBag(bagId, bagValue, name=None, keyId=None):
+    bag = rfc7292.SafeBag()
+    bag['bagId'] = bagId
+    bag['bagValue'] = der_encoder(bagValue)
+    if name is not None:
+        attr = rfc7292.PKCS12Attribute()
+        attr['attrType'] = rfc7292.pkcs_9_at_friendlyName
+        attr['attrValues'].append(der_encoder(rfc7292.FriendlyName(name)))
+        bag['bagAttributes'].append(attr)
+    if keyId is not None:
+        attr = rfc7292.PKCS12Attribute()
+        attr['attrType'] = rfc7292.pkcs_9_at_localKeyId
+        attr['attrValues'].append(der_encoder(univ.OctetString(keyId)))
+        bag['bagAttributes'].append(attr)
+    return bag
+
+
+def dataContentInfo(safeContents, encoder=der_encoder):
+    contentInfo = rfc5652.ContentInfo()
+    contentInfo['contentType'] = rfc5652.id_data
+    contentInfo['content'] = encoder(univ.OctetString(encoder(safeContents)))
+    return contentInfo
+
+
+def pfx(authenticatedSafe, encoder=der_encoder):
+    asn1Object = rfc7292.PFX()
+    asn1Object['version'] = 3
+    asn1Object['authSafe']['contentType'] = rfc5652.id_data
+    asn1Object['authSafe']['content'] = encoder(
+        univ.OctetString(encoder(authenticatedSafe)))
+    return encoder(asn1Object)
+
+
+class SafeBagTestCase(unittest.TestCase):
+
+    def setUp(self):
+        keyBag = rfc7292.KeyBag()
+        keyBag['version'] = 0
+        keyBag['privateKeyAlgorithm']['algorithm'] = univ.ObjectIdentifier(
+            '1.2.840.113549.1.1.1')
+        keyBag['privateKey'] = b'\x30\x00'
+
+        self.certificates = [fakeCertificate(number) for number in range(5)]
+
+        first = rfc7292.SafeContents()
+        first.append(safeBag(rfc7292.id_keyBag, keyBag, keyId=b'\x01'))
+        first.append(certBag(self.certificates[0], 'first', b'\x01'))
+        first.append(certBag(self.certificates[1]))
+
+        nested = rfc7292.SafeContents()
+        nested.append(certBag(self.certificates[2], 'nested'))
+        first.append(safeBag(rfc7292.id_safeContentsBag, nested))
+
+        second = rfc7292.SafeContents()
+        second.append(certBag(self.certificates[3]))
+        second.append(certBag(self.certificates[4]))
+
+        # An EncryptedData ContentInfo whose "ciphertext" is the plaintext
+        encryptedData = rfc5652.EncryptedData()
+        encryptedData['version'] = 0
+        eci = encryptedData['encryptedContentInfo']
+        eci['contentType'] = rfc5652.id_data
+        eci['contentEncryptionAlgorithm']['algorithm'] = \
+            rfc7292.pbeWithSHAAnd3_KeyTripleDES_CBC
+        eci['encryptedContent'] = der_encoder(second)
+        encrypted = rfc5652.ContentInfo()
+        encrypted['contentType'] = rfc5652.id_encryptedData
+        encrypted['content'] = der_encoder(encryptedData)
+
+        self.authenticatedSafe = rfc7292.AuthenticatedSafe()
+        self.authenticatedSafe.append(dataContentInfo(first))
+        self.authenticatedSafe.append(encrypted)
+        self.pfx = pfx(self.authenticatedSafe)
+
+    def decrypt(self, contentType, contentInfo):
+        self.assertEqual(rfc5652.id_encryptedData, contentType)
+        contentInfo, rest = der_decoder(
+            bytes(contentInfo), asn1Spec=rfc5652.ContentInfo())
+        encryptedData, rest = der_decoder(
+            contentInfo['content'], asn1Spec=rfc5652.EncryptedData())
+        return encryptedData['encryptedContentInfo']['encryptedContent']
+
+    def testIterSafeBags(self):
+        bags = list(pkcs12bags.iterSafeBags(self.pfx))
+        self.assertEqual(
+            [rfc7292.id_keyBag] + [rfc7292.id_certBag] * 3,
+            [bag.bagId for bag in bags])
+
+        keyBag = bags[0]
+        self.assertEqual(b'\x01', keyBag.localKeyId)
+        self.assertIsNone(keyBag.friendlyName)
+        privateKey = keyBag.decode()
+        self.assertEqual(b'\x30\x00', privateKey['privateKey'])
+
+        bagId, attributes, bagValue = bags[1]
+        self.assertEqual(2, len(attributes))
+        self.assertEqual('first', bags[1].friendlyName)
+        certBag = bags[1].decode()
+        self.assertEqual(rfc7292.x509Certificate['certId'], certBag['certId'])
+        self.assertEqual('nested', bags[3].friendlyName)
+
+    def testNotNested(self):
+        bags = list(pkcs12bags.iterSafeBags(self.pfx, nested=False))
+        self.assertEqual(rfc7292.id_safeContentsBag, bags[-1].bagId)
+        safeContents = bags[-1].decode()
+        self.assertEqual(1, len(safeContents))
+
+    def testDecrypt(self):
+        bags = list(pkcs12bags.iterSafeBags(self.pfx, decrypt=self.decrypt))
+        self.assertEqual(6, len(bags))
+
+    def testCertificates(self):
+        self.assertEqual(self.certificates[:3],
+                         pkcs12bags.certificates(self.pfx))
+        self.assertEqual(self.certificates, pkcs12bags.certificates(
+            self.pfx, decrypt=self.decrypt))
+
+    def testIndefiniteLength(self):
+        def encoder(asn1Object):
+            return ber_encoder(asn1Object, defMode=False, maxChunkSize=100)
+
+        safeContents = rfc7292.SafeContents()
+        for certificate in self.certificates:
+            safeContents.append(certBag(certificate))
+        authenticatedSafe = rfc7292.AuthenticatedSafe()
+        authenticatedSafe.append(dataContentInfo(safeContents, encoder))
+
+        substrate = pfx(authenticatedSafe, encoder)
+        self.assertEqual(self.certificates,
+                         pkcs12bags.certificates(substrate))
+
+    def testNotPfx(self):
+        self.assertRaises(PyAsn1Error, pkcs12bags.certificates,
+                          fakeCertificate(1))
+
+
+suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+if __name__ == '__main__':
+    result = unittest.TextTestRunner(verbosity=2).run(suite)
+    sys.exit(not result.wasSuccessful())
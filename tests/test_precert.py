@@ -0,0 +1,136 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+import sys
+import unittest
+
+from pyasn1.codec.der.decoder import decode as der_decoder
+from pyasn1.codec.der.encoder import encode as der_encoder
+from pyasn1.error import PyAsn1Error
+
+from pyasn1_alt_modules import pem
+from pyasn1_alt_modules import rfc5280
+from pyasn1_alt_modules import rfc6962
+from pyasn1_alt_modules import precert
+
+
+class PrecertTbsTestCase(unittest.TestCase):
+    sct_pem_text = """\
+\
+MIIDWTCCAsKgAwIBAgIBBzANBgkqhkiG9w0BAQUFADBVMQswCQYDVQQGEwJHQjEk
+MCIGA1UEChMbQ2VydGlmaWNhdGUgVHJhbnNwYXJlbmN5IENBMQ4wDAYDVQQIEwVX
+YWxlczEQMA4GA1UEBxMHRXJ3IFdlbjAeFw0xMjA2MDEwMDAwMDBaFw0yMjA2MDEw
+MDAwMDBaMFIxCzAJBgNVBAYTAkdCMSEwHwYDVQQKExhDZXJ0aWZpY2F0ZSBUcmFu
+c3BhcmVuY3kxDjAMBgNVBAgTBVdhbGVzMRAwDgYDVQQHEwdFcncgV2VuMIGfMA0G
+CSqGSIb3DQEBAQUAA4GNADCBiQKBgQC+75jnwmh3rjhfdTJaDB0ym+3xj6r015a/
+BH634c4VyVui+A7kWL19uG+KSyUhkaeb1wDDjpwDibRc1NyaEgqyHgy0HNDnKAWk
+EM2cW9tdSSdyba8XEPYBhzd+olsaHjnu0LiBGdwVTcaPfajjDK8VijPmyVCfSgWw
+FAn/Xdh+tQIDAQABo4IBOjCCATYwHQYDVR0OBBYEFCAxVBryXAX/2GWLaEN5T16Q
+Nve0MH0GA1UdIwR2MHSAFF+diA3Ic+ZU1PgN2OawwSS0R8NVoVmkVzBVMQswCQYD
+VQQGEwJHQjEkMCIGA1UEChMbQ2VydGlmaWNhdGUgVHJhbnNwYXJlbmN5IENBMQ4w
+DAYDVQQIEwVXYWxlczEQMA4GA1UEBxMHRXJ3IFdlboIBADAJBgNVHRMEAjAAMIGK
+BgorBgEEAdZ5AgQCBHwEegB4AHYA3xwuwRUAlFJHqWFoMl3cXHlZ6PfG04j8AC4L
+vT9012QAAAE92yffkwAABAMARzBFAiBIL2dRrzXbplQ2vh/WZA89v5pBQpSVkkUw
+KI+j5eI+BgIhAOTtwNs6xXKx4vXoq2poBlOYfc9BAn3+/6EFUZ2J7b8IMA0GCSqG
+SIb3DQEBBQUAA4GBAIoMS+8JnUeSea+goo5on5HhxEIb4tJpoupspOghXd7dyhUE
+oR58h8S3foDw6XkDUmjyfKIOFmgErlVvMWmB+Wo5Srer/T4lWsAERRP+dlcMZ5Wr
+5HAxM9MD+J86+mu8/FFzGd/ZW5NCQSEfY0A1w9B4MHpoxgdaLiDInza4kQyg
+"""
+
+    poison_pem_text = """\
+\
+MIIC4jCCAkugAwIBAgIBCDANBgkqhkiG9w0BAQUFADBYMQswCQYDVQQGEwJHQjEn
+MCUGA1UEChMeQ2VydGlmaWNhdGUgVHJhbnNwYXJlbmN5IFByZUNBMQ4wDAYDVQQI
+EwVXYWxlczEQMA4GA1UEBxMHRXJ3IFdlbjAeFw0xMjA2MDEwMDAwMDBaFw0yMjA2
+MDEwMDAwMDBaMFIxCzAJBgNVBAYTAkdCMSEwHwYDVQQKExhDZXJ0aWZpY2F0ZSBU
+cmFuc3BhcmVuY3kxDjAMBgNVBAgTBVdhbGVzMRAwDgYDVQQHEwdFcncgV2VuMIGf
+MA0GCSqGSIb3DQEBAQUAA4GNADCBiQKBgQCvrurKxRq3zr356srn3RdSleGTlVoX
+mJrvjZerfN/3dhCTwLgj0qTjpRoXuG8oFitmolOJNevs3BA2Iz2i3WUxsMY7zGh2
+Hr3IVAN7dzmSRrhwp7crFMmxZn3gmpZA7Z8/PHJdlQtNJlWYaf5/HpGaZut201wB
+F8a80NjP0hAosQIDAQABo4HBMIG+MB0GA1UdDgQWBBRhLGTvrHm3KDl8nZPm34ZG
+X6dqiDB9BgNVHSMEdjB0gBQH77NAIzT3nv4jgIOy4g1c6hB9QKFZpFcwVTELMAkG
+A1UEBhMCR0IxJDAiBgNVBAoTG0NlcnRpZmljYXRlIFRyYW5zcGFyZW5jeSBDQTEO
+MAwGA1UECBMFV2FsZXMxEDAOBgNVBAcTB0VydyBXZW6CAQEwCQYDVR0TBAIwADAT
+BgorBgEEAdZ5AgQDAQH/BAIFADANBgkqhkiG9w0BAQUFAAOBgQBCPm+dvVk8wR1Z
+qGE8r38KCOWa80OWwJpc9vjyLZ5MjKmnqutpIMSdyY6fxJczDGxj5rYk+JObNhfW
+C9XZboSDJ3ucsf6MGikdqYiO7sPkhBqr1u5YVce01dDCioQwT1xIjm+/bNuPp/Sp
+8BnJrf7EjKd08DTtXMr5VlMFqG62Vg==
+"""
+
+    def setUp(self):
+        self.substrate = pem.readBase64fromText(self.sct_pem_text)
+        self.certificate, rest = der_decoder(
+            self.substrate, asn1Spec=rfc5280.Certificate())
+
+    def _expected(self, tbs, removed):
+        kept = [extn for extn in tbs['extensions']
+                if extn['extnID'] not in removed]
+        extensions = tbs['extensions'].clone()
+        extensions.extend(kept)
+        tbs['extensions'] = extensions
+        return der_encoder(tbs)
+
+    def testEmbeddedSct(self):
+        tbs = self.certificate['tbsCertificate']
+        expected = self._expected(tbs, [rfc6962.id_ce_embeddedSCT])
+        self.assertEqual(expected, precert.precertTbs(self.substrate))
+
+        tbsOnly = der_encoder(self.certificate['tbsCertificate'])
+        self.assertEqual(tbsOnly, precert.precertTbs(tbsOnly))
+
+    def testPoison(self):
+        substrate = pem.readBase64fromText(self.poison_pem_text)
+        certificate, rest = der_decoder(
+            substrate, asn1Spec=rfc5280.Certificate())
+        expected = self._expected(certificate['tbsCertificate'],
+                                  [rfc6962.id_ce_criticalPoison])
+        self.assertEqual(expected, precert.precertTbs(substrate))
+
+    def testRemoveAllExtensions(self):
+        tbs = self.certificate['tbsCertificate']
+        extnIDs = [extn['extnID'] for extn in tbs['extensions']]
+        result = precert.rewriteTbs(self.substrate, removeExtensions=extnIDs)
+
+        expected = rfc5280.TBSCertificate()
+        for name in tbs:
+            if name != 'extensions' and tbs[name].isValue:
+                expected[name] = tbs[name]
+        self.assertEqual(der_encoder(expected), result)
+
+    def testReplaceIssuerAndAuthorityKeyIdentifier(self):
+        tbs = self.certificate['tbsCertificate']
+        issuer = tbs['subject']
+        akid = precert.authorityKeyIdentifierExtension(b'\x42' * 20)
+
+        result = precert.precertTbs(
+            self.substrate, issuer=der_encoder(issuer),
+            authorityKeyIdentifier=akid)
+
+        tbs['issuer'] = issuer
+        for index, extn in enumerate(tbs['extensions']):
+            if extn['extnID'] == rfc5280.id_ce_authorityKeyIdentifier:
+                newExtn, rest = der_decoder(akid, asn1Spec=rfc5280.Extension())
+                tbs['extensions'][index] = newExtn
+        expected = self._expected(tbs, [rfc6962.id_ce_embeddedSCT])
+        self.assertEqual(expected, result)
+
+        decoded, rest = der_decoder(result, asn1Spec=rfc5280.TBSCertificate())
+        self.assertFalse(rest)
+        self.assertEqual(issuer, decoded['issuer'])
+
+    def testReplaceMissingExtension(self):
+        extension = rfc5280.Extension()
+        extension['extnID'] = rfc5280.id_ce_keyUsage
+        extension['extnValue'] = b'\x03\x02\x07\x80'
+        self.assertRaises(PyAsn1Error, precert.replaceExtension,
+                          self.substrate, extension)
+
+
+suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+if __name__ == '__main__':
+    result = unittest.TextTestRunner(verbosity=2).run(suite)
+    sys.exit(not result.wasSuccessful())
@@ -0,0 +1,186 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+import ipaddress
+import sys
+import unittest
+
+from pyasn1 import error
+from pyasn1.codec.der.decoder import decode as der_decoder
+from pyasn1.codec.der.encoder import encode as der_encoder
+from pyasn1.type import char
+from pyasn1.type import univ
+
+from pyasn1_alt_modules import pem
+from pyasn1_alt_modules import rfc4985
+from pyasn1_alt_modules import rfc5280
+from pyasn1_alt_modules import rfc8398
+from pyasn1_alt_modules import sannames
+from pyasn1_alt_modules import tlv
+
+from tests import test_certfields
+from tests import test_rfc4985
+from tests import test_rfc8398
+
+
+class SubjectAltNamesTestCase(unittest.TestCase):
+
+    def _generalName(self, name, value):
+        generalName = rfc5280.GeneralName()
+        if name == 'directoryName':
+            generalName[name]['rdnSequence'] = value
+        else:
+            generalName[name] = value
+        return generalName
+
+    def testCertificate(self):
+        substrate = pem.readBase64fromText(
+            test_rfc4985.XMPPCertificateTestCase.xmpp_server_cert_pem_text)
+        names = sannames.subjectAltNames(substrate)
+        self.assertEqual(['im.example.com'], names.dns)
+        self.assertEqual(4, len(names))
+
+        srvNames = names.otherNames(rfc4985.id_on_dnsSRV)
+        self.assertEqual(['_xmpp-client.im.example.com',
+                          '_xmpp-server.im.example.com'],
+                         [str(value) for value in srvNames])
+        self.assertEqual(
+            [bytes(value) for value in names.otherName[
+                str(rfc4985.id_on_dnsSRV)]],
+            [der_encoder(value) for value in srvNames])
+
+        self.assertIsNone(sannames.subjectAltNames(pem.readBase64fromText(
+            test_certfields.CertificateFieldsTestCase.pem_text)))
+
+    def testGeneralNames(self):
+        name = rfc5280.RDNSequence()
+        rdn = rfc5280.RelativeDistinguishedName()
+        attribute = rfc5280.AttributeTypeAndValue()
+        attribute['type'] = rfc5280.id_at_countryName
+        attribute['value'] = der_encoder(char.PrintableString('US'))
+        rdn.append(attribute)
+        name.append(rdn)
+
+        eai, rest = der_decoder(
+            pem.readBase64fromText(test_rfc8398.EAITestCase.pem_text),
+            asn1Spec=rfc5280.GeneralName())
+
+        generalNames = rfc5280.GeneralNames()
+        for kind, value in (
+                ('dNSName', 'www.example.com'),
+                ('iPAddress', bytes([192, 0, 2, 1])),
+                ('dNSName', '*.example.net'),
+                ('uniformResourceIdentifier', 'https://example.com/'),
+                ('rfc822Name', 'alice@example.com'),
+                ('registeredID', '1.2.3.4'),
+                ('iPAddress', ipaddress.ip_address('2001:db8::1').packed),
+                ('directoryName', name)):
+            generalNames.append(self._generalName(kind, value))
+        generalNames.append(eai)
+        substrate = der_encoder(generalNames)
+
+        names = sannames.parseGeneralNames(substrate)
+        self.assertEqual(['www.example.com', '*.example.net'], names.dns)
+        self.assertEqual([ipaddress.ip_address('192.0.2.1'),
+                          ipaddress.ip_address('2001:db8::1')], names.ip)
+        self.assertEqual(['https://example.com/'], names.uri)
+        self.assertEqual(['alice@example.com'], names.email)
+        self.assertEqual(['1.2.3.4'], names.registeredID)
+        self.assertEqual([name], [value['rdnSequence']
+                                  for value in names.directoryNames()])
+        self.assertEqual([eai['otherName']['value']],
+                         [bytes(value) for value in names.otherName[
+                             str(rfc8398.id_on_SmtpUTF8Mailbox)]])
+        self.assertEqual(u'老師@example.com', str(
+            names.otherNames(rfc8398.id_on_SmtpUTF8Mailbox)[0]))
+        self.assertEqual(9, len(names))
+
+        # An unknown type-id is decoded as univ.Any.
+        other = rfc5280.GeneralName()
+        other['otherName']['type-id'] = univ.ObjectIdentifier('1.2.3.5')
+        other['otherName']['value'] = der_encoder(univ.Integer(7))
+        names = sannames.parseGeneralNames(
+            der_encoder(rfc5280.GeneralNames().setComponents(other)))
+        self.assertEqual([der_encoder(univ.Integer(7))],
+                         [bytes(value) for value in
+                          names.otherNames('1.2.3.5')])
+
+    def testErrors(self):
+        typeId = der_encoder(univ.ObjectIdentifier('1.2.3'))
+        for substrate in (
+                tlv.encodeTlv(tlv.SET, b''),
+                tlv.encodeTlv(tlv.SEQUENCE, tlv.encodeTlv(
+                    sannames.IP_ADDRESS, b'\x01\x02\x03')),
+                tlv.encodeTlv(tlv.SEQUENCE, tlv.encodeTlv(
+                    sannames.DNS_NAME, b'\xe2\x80\x8b')),
+                tlv.encodeTlv(tlv.SEQUENCE, tlv.encodeTlv(0x89, b'')),
+                tlv.encodeTlv(tlv.SEQUENCE, tlv.encodeTlv(
+                    sannames.OTHER_NAME, tlv.encodeTlv(tlv.INTEGER, b'\x01'))),
+                # An otherName with an empty value, then a dNSName.
+                tlv.encodeTlv(tlv.SEQUENCE, tlv.encodeTlv(
+                    sannames.OTHER_NAME, typeId + tlv.encodeTlv(
+                        tlv.contextTag(0), b'')) + tlv.encodeTlv(
+                    sannames.DNS_NAME, b'a')),
+                # An otherName with octets after its value.
+                tlv.encodeTlv(tlv.SEQUENCE, tlv.encodeTlv(
+                    sannames.OTHER_NAME, typeId + tlv.encodeTlv(
+                        tlv.contextTag(0),
+                        tlv.encodeTlv(tlv.INTEGER, b'\x01') + b'\x00')))):
+            with self.assertRaises(error.PyAsn1Error):
+                sannames.parseGeneralNames(substrate)
+
+
+class HostnameIndexTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.index = sannames.HostnameIndex(
+            ['www.Example.com', '*.example.net', 'example.org.',
+             'mail.example.org', 'example.com.evil.net', 'w*.example.edu'])
+
+    def testMatch(self):
+        self.assertEqual(6, len(self.index))
+        for hostname in ('www.example.com', 'WWW.EXAMPLE.COM.',
+                         'a.example.net', 'example.org'):
+            self.assertIn(hostname, self.index)
+        for hostname in ('example.com', 'example.net', 'a.b.example.net',
+                         '.example.net', 'www.example.edu', 'other.org'):
+            self.assertNotIn(hostname, self.index)
+        self.assertIn('w*.example.edu', self.index)
+
+    def testSubtrees(self):
+        self.assertEqual(['www.example.com'],
+                         self.index.withinSubtree('example.com'))
+        self.assertEqual(['example.org', 'mail.example.org'],
+                         self.index.withinSubtree('Example.ORG'))
+        self.assertEqual(['mail.example.org'],
+                         self.index.withinSubtree('.example.org'))
+        self.assertEqual(['*.example.net', 'example.com.evil.net'],
+                         self.index.withinSubtree('net'))
+        self.assertEqual([], self.index.withinSubtree('ample.com'))
+        self.assertEqual(6, len(self.index.withinSubtree('')))
+        self.assertEqual(['example.com.evil.net', 'w*.example.edu'],
+                         self.index.outside(['example.com', 'example.org',
+                                             'example.net']))
+
+        self.index.add('api.example.com')
+        self.assertEqual(['api.example.com', 'www.example.com'],
+                         self.index.withinSubtree('example.com'))
+
+    def testFromNames(self):
+        names = sannames.SubjectAltNames()
+        names.dns.extend('host%d.example.com' % number
+                         for number in range(1000))
+        index = names.hostnameIndex()
+        self.assertIn('host999.example.com', index)
+        self.assertNotIn('host1000.example.com', index)
+        self.assertEqual(1000, len(index.withinSubtree('example.com')))
+
+
+suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+if __name__ == '__main__':
+    result = unittest.TextTestRunner(verbosity=2).run(suite)
+    sys.exit(not result.wasSuccessful())
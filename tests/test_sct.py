@@ -0,0 +1,97 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+import sys
+import unittest
+
+from pyasn1.codec.der.decoder import decode as der_decoder
+from pyasn1.error import PyAsn1Error
+
+from pyasn1_alt_modules import pem
+from pyasn1_alt_modules import rfc5280
+from pyasn1_alt_modules import rfc6962
+from pyasn1_alt_modules import sct
+
+
+class EmbeddedSCTTestCase(unittest.TestCase):
+    pem_text = """\
+\
+MIIDWTCCAsKgAwIBAgIBBzANBgkqhkiG9w0BAQUFADBVMQswCQYDVQQGEwJHQjEk
+MCIGA1UEChMbQ2VydGlmaWNhdGUgVHJhbnNwYXJlbmN5IENBMQ4wDAYDVQQIEwVX
+YWxlczEQMA4GA1UEBxMHRXJ3IFdlbjAeFw0xMjA2MDEwMDAwMDBaFw0yMjA2MDEw
+MDAwMDBaMFIxCzAJBgNVBAYTAkdCMSEwHwYDVQQKExhDZXJ0aWZpY2F0ZSBUcmFu
+c3BhcmVuY3kxDjAMBgNVBAgTBVdhbGVzMRAwDgYDVQQHEwdFcncgV2VuMIGfMA0G
+CSqGSIb3DQEBAQUAA4GNADCBiQKBgQC+75jnwmh3rjhfdTJaDB0ym+3xj6r015a/
+BH634c4VyVui+A7kWL19uG+KSyUhkaeb1wDDjpwDibRc1NyaEgqyHgy0HNDnKAWk
+EM2cW9tdSSdyba8XEPYBhzd+olsaHjnu0LiBGdwVTcaPfajjDK8VijPmyVCfSgWw
+FAn/Xdh+tQIDAQABo4IBOjCCATYwHQYDVR0OBBYEFCAxVBryXAX/2GWLaEN5T16Q
+Nve0MH0GA1UdIwR2MHSAFF+diA3Ic+ZU1PgN2OawwSS0R8NVoVmkVzBVMQswCQYD
+VQQGEwJHQjEkMCIGA1UEChMbQ2VydGlmaWNhdGUgVHJhbnNwYXJlbmN5IENBMQ4w
+DAYDVQQIEwVXYWxlczEQMA4GA1UEBxMHRXJ3IFdlboIBADAJBgNVHRMEAjAAMIGK
+BgorBgEEAdZ5AgQCBHwEegB4AHYA3xwuwRUAlFJHqWFoMl3cXHlZ6PfG04j8AC4L
+vT9012QAAAE92yffkwAABAMARzBFAiBIL2dRrzXbplQ2vh/WZA89v5pBQpSVkkUw
+KI+j5eI+BgIhAOTtwNs6xXKx4vXoq2poBlOYfc9BAn3+/6EFUZ2J7b8IMA0GCSqG
+SIb3DQEBBQUAA4GBAIoMS+8JnUeSea+goo5on5HhxEIb4tJpoupspOghXd7dyhUE
+oR58h8S3foDw6XkDUmjyfKIOFmgErlVvMWmB+Wo5Srer/T4lWsAERRP+dlcMZ5Wr
+5HAxM9MD+J86+mu8/FFzGd/ZW5NCQSEfY0A1w9B4MHpoxgdaLiDInza4kQyg
+"""
+
+    def setUp(self):
+        self.substrate = pem.readBase64fromText(self.pem_text)
+
+    def testCertificateScts(self):
+        scts = sct.certificateScts(self.substrate)
+        self.assertEqual(1, len(scts))
+
+        entry = scts[0]
+        self.assertEqual(sct.v1, entry.version)
+        self.assertEqual(
+            'df1c2ec11500945247a96168325ddc5c7959e8f7c6d388fc002e0bbd3f74d764',
+            entry.logId.hex())
+        self.assertEqual(1365181456275, entry.timestamp)
+        self.assertEqual(b'', entry.extensions)
+        self.assertEqual('sha256', sct.hashAlgorithmNames[entry.hashAlgorithm])
+        self.assertEqual('ecdsa',
+                         sct.signatureAlgorithmNames[entry.signatureAlgorithm])
+        self.assertEqual(71, len(entry.signature))
+        self.assertIsInstance(entry.signature, memoryview)
+        self.assertIn('sha256/ecdsa', repr(entry))
+
+    def testRoundTrip(self):
+        certificate, rest = der_decoder(
+            self.substrate, asn1Spec=rfc5280.Certificate())
+        for extn in certificate['tbsCertificate']['extensions']:
+            if extn['extnID'] == rfc6962.id_ce_embeddedSCT:
+                extnValue = extn['extnValue'].asOctets()
+
+        scts = sct.parseExtensionValue(extnValue)
+        self.assertEqual(extnValue, sct.buildExtensionValue(scts))
+
+        sctList, rest = der_decoder(
+            extnValue, asn1Spec=rfc6962.SignedCertificateTimestampList())
+        self.assertEqual(scts, sct.parseSctList(sctList.asOctets()))
+
+        copy = sct.SignedCertificateTimestamp(
+            logId=bytes(scts[0].logId), timestamp=scts[0].timestamp,
+            signature=bytes(scts[0].signature))
+        self.assertEqual(scts[0], copy)
+
+    def testScanCertificates(self):
+        found = list(sct.scanCertificates([self.substrate, self.substrate]))
+        self.assertEqual([0, 1], [index for index, entry in found])
+
+    def testMalformed(self):
+        sctList = sct.buildSctList(sct.certificateScts(self.substrate))
+        self.assertRaises(PyAsn1Error, sct.parseSctList, sctList[:-1])
+        self.assertRaises(PyAsn1Error, sct.parseSctList, sctList + b'\x00')
+        self.assertRaises(PyAsn1Error, sct.buildSctList, [])
+
+
+suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+if __name__ == '__main__':
+    result = unittest.TextTestRunner(verbosity=2).run(suite)
+    sys.exit(not result.wasSuccessful())
@@ -0,0 +1,116 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+import marshal
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import types
+import unittest
+
+from pyasn1_alt_modules import rfc5280
+from pyasn1_alt_modules import rfc7191
+from pyasn1_alt_modules import snapshot
+
+from tests import test_certfields
+
+
+# Decodes a certificate with the modules put back from a snapshot, or
+# imported when the argument is 'import'.
+LOAD = '''
+import sys
+from pyasn1_alt_modules import snapshot
+if sys.argv[1] != 'import':
+    print(snapshot.load(sys.argv[1]))
+from pyasn1.codec.der.decoder import decode
+from pyasn1.codec.der.encoder import encode
+from pyasn1_alt_modules import opentypemap, pem, rfc5280, rfc5652
+substrate = pem.readBase64fromText(sys.stdin.read())
+certificate, rest = decode(substrate, asn1Spec=rfc5280.Certificate(),
+                           decodeOpenTypes=True)
+print(encode(certificate) == substrate)
+print(sorted(str(oid) for oid in opentypemap.get('cmsContentTypesMap')))
+print(rfc5652.ContentInfo.componentType['content'].openType._OpenType__typeMap is
+      opentypemap.get('cmsContentTypesMap'))
+'''
+
+
+class SnapshotTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.path = os.path.join(self.directory, 'modules.snapshot')
+
+    def _run(self, *args, **kwargs):
+        environment = dict(os.environ)
+        environment['PYTHONPATH'] = os.path.dirname(
+            os.path.dirname(os.path.abspath(snapshot.__file__)))
+        output = subprocess.run(
+            (sys.executable, '-c') + args, env=environment, check=True,
+            stdout=subprocess.PIPE, universal_newlines=True, **kwargs)
+        return output.stdout.splitlines()
+
+    def testLoad(self):
+        self._run('from pyasn1_alt_modules import snapshot;'
+                  'snapshot.build(%r, ["rfc5652"])' % self.path)
+        pem_text = test_certfields.CertificateFieldsTestCase.pem_text
+        imported = self._run(LOAD, 'import', input=pem_text)
+        loaded = self._run(LOAD, self.path, input=pem_text)
+        self.assertEqual(['True'] + imported, loaded)
+        self.assertEqual(['True', 'True'], imported[::2])
+
+    def testFunctions(self):
+        self._run('from pyasn1_alt_modules import snapshot;'
+                  'snapshot.build(%r, ["rfc5280", "rfc7191"])' % self.path)
+
+        # The snapshot holds no bytecode.
+        with open(self.path, 'rb') as snapshotFile:
+            marshal.load(snapshotFile)
+            roots, table = marshal.load(snapshotFile)
+        self.assertFalse([entry for entry in table
+                          if any(isinstance(item, types.CodeType)
+                                 for item in entry)])
+
+        output = self._run(
+            'import sys; from pyasn1_alt_modules import snapshot;'
+            'print(snapshot.load(sys.argv[1]));'
+            'from pyasn1_alt_modules import rfc5280, rfc7191;'
+            'print(rfc5280._buildOid(rfc5280.id_pkix, 99));'
+            'print(rfc7191.siren_dn()["sirenType"]);'
+            'print(rfc5280._buildOid.__code__.co_firstlineno)', self.path)
+        self.assertEqual(['True', '1.3.6.1.5.5.7.99', str(rfc7191.id_dn),
+                          str(rfc5280._buildOid.__code__.co_firstlineno)],
+                         output)
+
+    def testStale(self):
+        self.assertFalse(snapshot.load(self.path))
+
+        with open(self.path, 'wb') as output:
+            marshal.dump(snapshot._header(['rfc5280'])[:-2] +
+                         (b'\0' * 32, ('rfc5280',)), output)
+        self.assertFalse(snapshot.load(self.path))
+
+        with open(self.path, 'wb') as output:
+            output.write(b'not a snapshot')
+        self.assertFalse(snapshot.load(self.path))
+
+    def testImported(self):
+        self.assertIn('rfc5280', snapshot.allModules())
+        self.assertGreater(snapshot.build(self.path, ['rfc5280']), 1000)
+        # The modules that this process has imported are not replaced.
+        self.assertFalse(snapshot.load(self.path))
+        self.assertFalse(snapshot.loadOrBuild(self.path, ['rfc5280']))
+        self.assertEqual(32, len(snapshot.sourceDigest()))
+
+
+suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+if __name__ == '__main__':
+    result = unittest.TextTestRunner(verbosity=2).run(suite)
+    sys.exit(not result.wasSuccessful())
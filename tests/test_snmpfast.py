@@ -0,0 +1,253 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+import sys
+import unittest
+
+from pyasn1.codec.ber.decoder import decode as ber_decoder
+from pyasn1.codec.ber.encoder import encode as ber_encoder
+from pyasn1.error import PyAsn1Error
+from pyasn1.error import SubstrateUnderrunError
+from pyasn1.type import tag
+from pyasn1.type import univ
+
+from pyasn1_alt_modules import rfc1157
+from pyasn1_alt_modules import rfc1901
+from pyasn1_alt_modules import rfc1902
+from pyasn1_alt_modules import rfc1905
+from pyasn1_alt_modules import rfc3412
+from pyasn1_alt_modules import rfc3414
+from pyasn1_alt_modules import snmpfast
+from pyasn1_alt_modules import tlv
+
+
+def v2cPdu(requestID):
+    pdu = rfc1905.GetRequestPDU()
+    pdu['request-id'] = requestID
+    pdu['error-status'] = 0
+    pdu['error-index'] = 0
+    varBind = pdu['variable-bindings'].componentType.clone()
+    varBind['name'] = '1.3.6.1.2.1.1.3.0'
+    varBind.getComponentByPosition(1)['unSpecified'] = ''
+    pdu['variable-bindings'].append(varBind)
+    varBind = pdu['variable-bindings'].componentType.clone()
+    varBind['name'] = '1.3.6.1.2.1.2.2.1.10.1'
+    varBind.getComponentByPosition(1)['value']['application-wide']['counter-value'] = 4000000000
+    pdu['variable-bindings'].append(varBind)
+    return pdu
+
+
+class SnmpV2cTestCase(unittest.TestCase):
+
+    def setUp(self):
+        pdus = rfc1905.PDUs()
+        pdus['get-request'] = v2cPdu(-12345)
+        message = rfc1901.Message()
+        message['version'] = 1
+        message['community'] = b'public'
+        message['data'] = ber_encoder(pdus)
+        self.datagram = ber_encoder(message)
+
+    def testDecode(self):
+        message = snmpfast.decodeMessage(self.datagram)
+        self.assertEqual(snmpfast.VERSION_2C, message.version)
+        self.assertEqual(b'public', message.community)
+
+        pdu = message.pdu
+        self.assertEqual(snmpfast.GET_REQUEST, pdu.tag)
+        self.assertEqual(-12345, pdu.requestID)
+        self.assertEqual(2, len(pdu.varBinds))
+
+        name, tag, value = pdu.varBinds[1]
+        self.assertEqual('1.3.6.1.2.1.2.2.1.10.1', snmpfast.decodeOid(name))
+        self.assertEqual(snmpfast.COUNTER32, tag)
+        self.assertEqual(4000000000, snmpfast.decodeValue(tag, value))
+        self.assertEqual(snmpfast.NULL, pdu.varBinds[0][1])
+
+    def testRoundTrip(self):
+        message = snmpfast.decodeMessage(self.datagram)
+        self.assertEqual(self.datagram, snmpfast.encodeMessage(message))
+
+    def testResponse(self):
+        request = snmpfast.decodeMessage(self.datagram)
+        reply = snmpfast.response(request, [
+            snmpfast.varBind('1.3.6.1.2.1.1.3.0', snmpfast.TIME_TICKS, 1234),
+            snmpfast.varBind('1.3.6.1.2.1.1.5.0', snmpfast.OCTET_STRING,
+                             b'router'),
+        ])
+        substrate = snmpfast.encodeMessage(reply)
+
+        asn1Object, rest = ber_decoder(substrate, asn1Spec=rfc1901.Message())
+        self.assertFalse(rest)
+        pdus, rest = ber_decoder(asn1Object['data'], asn1Spec=rfc1905.PDUs())
+        self.assertFalse(rest)
+        self.assertEqual('response', pdus.getName())
+        pdu = pdus['response']
+        self.assertEqual(-12345, pdu['request-id'])
+        value = pdu['variable-bindings'][1][1]['value']
+        self.assertEqual(b'router', value['simple']['string-value'])
+        self.assertEqual(snmpfast.decodeMessage(substrate), reply)
+
+    def testBatch(self):
+        datagrams = [self.datagram, b'\x30\x03\x02\x01', self.datagram[:-1],
+                     self.datagram]
+        messages = snmpfast.decodeBatch(datagrams)
+        self.assertEqual(4, len(messages))
+        self.assertIsNone(messages[1])
+        self.assertIsNone(messages[2])
+        self.assertEqual(messages[0], messages[3])
+
+        self.assertRaises(PyAsn1Error, snmpfast.decodeBatch, datagrams,
+                          strict=True)
+
+        replies = snmpfast.respondBatch(datagrams, snmpfast.response)
+        self.assertEqual([True, False, False, True],
+                         [reply is not None for reply in replies])
+        self.assertEqual(snmpfast.RESPONSE,
+                         snmpfast.decodeMessage(replies[0]).pdu.tag)
+
+    def testErrors(self):
+        self.assertRaises(SubstrateUnderrunError, snmpfast.decodeMessage,
+                          self.datagram[:-1])
+        self.assertRaises(PyAsn1Error, snmpfast.decodeMessage,
+                          self.datagram + b'\x00')
+
+
+class SnmpV1TrapTestCase(unittest.TestCase):
+
+    def setUp(self):
+        # RFC 1157 tags the Trap-PDU with [4] IMPLICIT
+        trap = rfc1157.TrapPDU().subtype(implicitTag=tag.Tag(
+            tag.tagClassContext, tag.tagFormatConstructed, 4))
+        trap['enterprise'] = '1.3.6.1.4.1.9'
+        trap['agent-addr']['internet'] = b'\xc0\x00\x02\x01'
+        trap['generic-trap'] = 'linkDown'
+        trap['specific-trap'] = 0
+        trap['time-stamp'] = 4294967295
+        varBind = trap['variable-bindings'].componentType.clone()
+        varBind['name'] = '1.3.6.1.2.1.2.2.1.1.2'
+        varBind['value']['simple']['number'] = 2
+        trap['variable-bindings'].append(varBind)
+
+        self.datagram = tlv.encodeTlv(tlv.SEQUENCE, b''.join((
+            ber_encoder(rfc1157.Version(0)),
+            ber_encoder(rfc1157.Community(b'private')),
+            ber_encoder(trap))))
+
+    def testDecode(self):
+        message = snmpfast.decodeMessage(self.datagram)
+        self.assertEqual(snmpfast.VERSION_1, message.version)
+        trap = message.pdu
+        self.assertIsInstance(trap, snmpfast.TrapPdu)
+        self.assertEqual('1.3.6.1.4.1.9', snmpfast.decodeOid(trap.enterprise))
+        self.assertEqual('192.0.2.1', snmpfast.decodeValue(
+            snmpfast.IP_ADDRESS, trap.agentAddr))
+        self.assertEqual(2, trap.genericTrap)
+        self.assertEqual(4294967295, trap.timeStamp)
+        self.assertEqual(
+            [(snmpfast.encodeOid('1.3.6.1.2.1.2.2.1.1.2'), snmpfast.INTEGER,
+              b'\x02')], trap.varBinds)
+        self.assertEqual(self.datagram, snmpfast.encodeMessage(message))
+        self.assertRaises(PyAsn1Error, snmpfast.response, message)
+
+
+class SnmpV3TestCase(unittest.TestCase):
+
+    def setUp(self):
+        usm = rfc3414.UsmSecurityParameters()
+        usm['msgAuthoritativeEngineID'] = b'\x80\x00\x1f\x88\x04engine'
+        usm['msgAuthoritativeEngineBoots'] = 3
+        usm['msgAuthoritativeEngineTime'] = 86400
+        usm['msgUserName'] = b'monitor'
+        usm['msgAuthenticationParameters'] = b'\x00' * 12
+        usm['msgPrivacyParameters'] = b''
+
+        message = rfc3412.SNMPv3Message()
+        message['msgVersion'] = 3
+        message['msgGlobalData']['msgID'] = 99
+        message['msgGlobalData']['msgMaxSize'] = 65507
+        message['msgGlobalData']['msgFlags'] = b'\x05'
+        message['msgGlobalData']['msgSecurityModel'] = 3
+        message['msgSecurityParameters'] = ber_encoder(usm)
+        scoped = message['msgData']['plaintext']
+        scoped['contextEngineId'] = b'\x80\x00\x1f\x88\x04engine'
+        scoped['contextName'] = b''
+        scoped['data']['get-request'] = v2cPdu(7)
+        self.datagram = ber_encoder(message)
+
+    def testDecode(self):
+        message = snmpfast.decodeMessage(self.datagram)
+        self.assertEqual(snmpfast.VERSION_3, message.version)
+        self.assertIsNone(message.community)
+        self.assertEqual(99, message.msgID)
+        self.assertEqual(0x05, message.msgFlags)
+        self.assertEqual(b'monitor', message.securityParameters.userName)
+        self.assertEqual(86400, message.securityParameters.engineTime)
+        self.assertEqual(7, message.pdu.requestID)
+        self.assertEqual(self.datagram, snmpfast.encodeMessage(message))
+
+    def testResponse(self):
+        reply = snmpfast.response(snmpfast.decodeMessage(self.datagram))
+        self.assertEqual(snmpfast.AUTH_FLAG, reply.msgFlags)
+
+        asn1Object, rest = ber_decoder(
+            snmpfast.encodeMessage(reply), asn1Spec=rfc3412.SNMPv3Message())
+        self.assertFalse(rest)
+        scoped = asn1Object['msgData']['plaintext']
+        self.assertEqual('response', scoped['data'].getName())
+        self.assertEqual(7, scoped['data']['response']['request-id'])
+
+    def testEncrypted(self):
+        message = snmpfast.decodeMessage(self.datagram)
+        plaintext = snmpfast.encodeScopedPdu(message)
+        message.pdu = None
+        message.encryptedPDU = b'ciphertext'
+        message.msgFlags |= snmpfast.PRIV_FLAG
+
+        decoded = snmpfast.decodeMessage(snmpfast.encodeMessage(message))
+        self.assertIsNone(decoded.pdu)
+        self.assertEqual(b'ciphertext', decoded.encryptedPDU)
+        self.assertRaises(PyAsn1Error, snmpfast.response, decoded)
+
+        snmpfast.decodeScopedPdu(decoded, plaintext + b'\x00' * 3)
+        self.assertEqual(7, decoded.pdu.requestID)
+
+
+class ValueTestCase(unittest.TestCase):
+
+    def testIntegers(self):
+        expected = {
+            0: b'\x00', 127: b'\x7f', 128: b'\x00\x80', 256: b'\x01\x00',
+            -1: b'\xff', -128: b'\x80', -129: b'\xff\x7f',
+            2147483647: b'\x7f\xff\xff\xff',
+            -2147483648: b'\x80\x00\x00\x00',
+        }
+        for value, octets in expected.items():
+            self.assertEqual(octets, snmpfast.encodeValue(
+                snmpfast.INTEGER, value))
+            self.assertEqual(value, snmpfast.decodeValue(
+                snmpfast.INTEGER, octets))
+            self.assertEqual(value, ber_decoder(
+                b'\x02' + bytes((len(octets),)) + octets,
+                asn1Spec=rfc1902.Integer32())[0])
+
+        octets = snmpfast.encodeValue(snmpfast.COUNTER64, 2 ** 64 - 1)
+        self.assertEqual(ber_encoder(rfc1902.Counter64(2 ** 64 - 1))[2:],
+                         octets)
+
+    def testOids(self):
+        for oid in ('1.3.6.1.2.1.1.1.0', '2.999.3', '0.39.1234567890'):
+            octets = snmpfast.encodeOid(oid)
+            self.assertEqual(ber_encoder(univ.ObjectIdentifier(oid))[2:],
+                             octets)
+            self.assertEqual(oid, snmpfast.decodeOid(octets))
+
+
+suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+if __name__ == '__main__':
+    result = unittest.TextTestRunner(verbosity=2).run(suite)
+    sys.exit(not result.wasSuccessful())
@@ -0,0 +1,165 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+import datetime
+import sys
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from pyasn1.codec.der.decoder import decode as der_decoder
+from pyasn1.codec.der.encoder import encode as der_encoder
+from pyasn1.error import PyAsn1Error
+from pyasn1.type import useful
+
+from pyasn1_alt_modules import pem
+from pyasn1_alt_modules import rfc5280
+from pyasn1_alt_modules import rfc6960
+from pyasn1_alt_modules import timecache
+
+from tests import test_rfc5280
+
+
+def _time(text):
+    time = rfc5280.Time()
+    if len(text) == 13:
+        time['utcTime'] = useful.UTCTime(text)
+    else:
+        time['generalTime'] = useful.GeneralizedTime(text)
+    return time
+
+
+class TimeDecoderTestCase(unittest.TestCase):
+
+    def testForms(self):
+        expected = datetime.datetime(
+            2026, 3, 15, 12, 34, 56, tzinfo=datetime.timezone.utc)
+        epoch = int(expected.timestamp())
+        values = [
+            useful.UTCTime('260315123456Z'),
+            useful.GeneralizedTime('20260315123456Z'),
+            _time('260315123456Z'),
+            _time('20260315123456Z'),
+            der_encoder(useful.UTCTime('260315123456Z')),
+            der_encoder(useful.GeneralizedTime('20260315123456Z')),
+            b'260315123456Z',
+            '20260315123456Z',
+            memoryview(b'20260315123456Z'),
+        ]
+        decoder = timecache.TimeDecoder()
+        for value in values:
+            self.assertEqual(epoch, decoder.toEpoch(value))
+            self.assertEqual(expected, decoder.toDateTime(value))
+
+    def testAgainstPyasn1(self):
+        for text in ('491231235959Z', '000229120000Z',
+                     '19500101000000Z', '20491231235959.5Z',
+                     '99991231235959Z', '20260315123456.123456789Z',
+                     '2603151234Z', '20260315123456+0130'):
+            if len(text.split('+')[0].rstrip('Z')) in (10, 12):
+                asn1Object = useful.UTCTime(text)
+            else:
+                asn1Object = useful.GeneralizedTime(text)
+            expected = asn1Object.asDateTime
+            self.assertEqual(expected, timecache.toDateTime(asn1Object))
+            self.assertEqual(int(expected.timestamp()),
+                             timecache.toEpoch(asn1Object))
+
+    def testTwoDigitYears(self):
+        # RFC 5280 section 4.1.2.5.1, which pyasn1 does not follow for 50.
+        self.assertEqual(1950, timecache.toDateTime('500101000000Z').year)
+        self.assertEqual(1999, timecache.toDateTime('991231235959Z').year)
+        self.assertEqual(2049, timecache.toDateTime('491231235959Z').year)
+
+    def testInvalid(self):
+        for text in ('20230229000000Z', '20261301000000Z', '260315126056Z',
+                     '2026031512345xZ'):
+            self.assertRaises(PyAsn1Error, timecache.toEpoch, text)
+
+    def testCache(self):
+        decoder = timecache.TimeDecoder(cacheSize=2)
+        decoder.toEpoch('20260101000000Z')
+        decoder.toEpoch('20260102000000Z')
+        decoder.toEpoch('20260101000000Z')
+        self.assertEqual((1, 2), (decoder.hits, decoder.misses))
+
+        # The least recently used value is the one that goes.
+        decoder.toEpoch('20260103000000Z')
+        decoder.toEpoch('20260101000000Z')
+        self.assertEqual((2, 3), (decoder.hits, decoder.misses))
+        decoder.toEpoch('20260102000000Z')
+        self.assertEqual((2, 4), (decoder.hits, decoder.misses))
+
+        self.assertIs(decoder.toDateTime('20260102000000Z'),
+                      decoder.toDateTime(b'20260102000000Z'))
+        decoder.clear()
+        decoder.toEpoch('20260102000000Z')
+        self.assertEqual(5, decoder.misses)
+
+    def testSharedDecoder(self):
+        decoder = timecache.TimeDecoder(cacheSize=4)
+        values = ['202601%02d000000Z' % (index % 28 + 1)
+                  for index in range(2000)]
+        with ThreadPoolExecutor(8) as executor:
+            results = list(executor.map(decoder.toEpoch, values))
+        self.assertEqual([timecache.toEpoch(value) for value in values],
+                         results)
+        self.assertEqual(2000, decoder.hits + decoder.misses)
+        self.assertLessEqual(len(decoder._cache), 4)
+
+    def testOcspTimes(self):
+        singleResponse = rfc6960.SingleResponse()
+        singleResponse['thisUpdate'] = useful.GeneralizedTime(
+            '20260315000000Z')
+        singleResponse['nextUpdate'] = singleResponse['nextUpdate'].clone(
+            '20260322000000Z')
+        epochs = timecache.epochArray(
+            [singleResponse['thisUpdate'], singleResponse['nextUpdate']])
+        self.assertEqual('q', epochs.typecode)
+        self.assertEqual(7 * 86400, epochs[1] - epochs[0])
+
+
+class RevocationEpochsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        substrate = pem.readBase64fromText(
+            test_rfc5280.CertificateListTestCase.pem_text)
+        self.crl, rest = der_decoder(
+            substrate, asn1Spec=rfc5280.CertificateList())
+
+        self.dates = ['260101000000Z', '260101000000Z', '20510101000000Z',
+                      '260102123000Z']
+        revoked = self.crl['tbsCertList']['revokedCertificates']
+        for serialNumber, text in enumerate(self.dates):
+            entry = revoked.componentType.clone()
+            entry['userCertificate'] = serialNumber + 1
+            entry['revocationDate'] = _time(text)
+            revoked.append(entry)
+
+    def testRevocationEpochs(self):
+        expected = [timecache.toEpoch(text) for text in self.dates]
+
+        decoder = timecache.TimeDecoder()
+        epochs = decoder.revocationEpochs(der_encoder(self.crl))
+        self.assertEqual('q', epochs.typecode)
+        self.assertEqual(expected, list(epochs))
+        self.assertEqual((1, 3), (decoder.hits, decoder.misses))
+
+        self.assertEqual(expected, list(timecache.revocationEpochs(self.crl)))
+        self.assertEqual(expected, list(timecache.revocationEpochs(
+            der_encoder(self.crl['tbsCertList']))))
+
+    def testNoRevokedCertificates(self):
+        self.crl['tbsCertList']['revokedCertificates'].clear()
+        self.crl['tbsCertList']['nextUpdate'] = _time('20510101000000Z')
+        epochs = timecache.revocationEpochs(self.crl)
+        self.assertEqual(0, len(epochs))
+
+
+suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+if __name__ == '__main__':
+    result = unittest.TextTestRunner(verbosity=2).run(suite)
+    sys.exit(not result.wasSuccessful())
@@ -0,0 +1,70 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+import sys
+import unittest
+
+from pyasn1.codec.ber.encoder import encode as ber_encoder
+from pyasn1.codec.der.encoder import encode as der_encoder
+from pyasn1.error import PyAsn1Error
+from pyasn1.error import SubstrateUnderrunError
+from pyasn1.type import univ
+
+from pyasn1_alt_modules import tlv
+
+
+class TlvTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.seq = univ.SequenceOf(componentType=univ.OctetString())
+        self.seq.extend([b'a' * 10, b'b' * 300, b'c'])
+
+    def testDefiniteLength(self):
+        substrate = der_encoder(self.seq)
+        tag, valueOffset, valueEnd, tlvEnd = tlv.readTlv(substrate)
+        self.assertEqual(tlv.SEQUENCE, tag)
+        self.assertEqual(len(substrate), tlvEnd)
+
+        items = tlv.children(substrate)
+        self.assertEqual(3, len(items))
+        self.assertEqual(tlv.OCTET_STRING, items[1][1])
+        self.assertEqual(300, items[1][3] - items[1][2])
+        self.assertEqual(b'b' * 300, tlv.stringValue(substrate, items[1][0]))
+
+    def testIndefiniteLength(self):
+        substrate = ber_encoder(self.seq, defMode=False, maxChunkSize=64)
+        tag, valueOffset, valueEnd, tlvEnd = tlv.readTlv(substrate)
+        self.assertEqual(len(substrate), tlvEnd)
+        self.assertEqual(tlv.EOC, substrate[valueEnd:tlvEnd])
+
+        items = tlv.children(substrate)
+        self.assertEqual(tlv.CONSTRUCTED_OCTET_STRING, items[1][1])
+        self.assertEqual(b'b' * 300, tlv.stringValue(substrate, items[1][0]))
+
+    def testHeaders(self):
+        for length in (0, 127, 128, 255, 256, 70000):
+            header = tlv.encodeHeader(tlv.contextTag(3), length)
+            self.assertEqual((0xA3, len(header), length),
+                             tlv.readHeader(header + b'\x00' * length))
+
+        self.assertEqual(b'\x24\x80', tlv.encodeHeader(0x24, None))
+        self.assertEqual(0xBF8A1F, tlv.readHeader(b'\xbf\x8a\x1f\x00')[0])
+        self.assertEqual(b'\xbf\x8a\x1f', tlv.encodeTag(0xBF8A1F))
+        self.assertTrue(tlv.isConstructed(0xBF8A1F))
+        self.assertFalse(tlv.isConstructed(tlv.contextTag(1, False)))
+
+    def testErrors(self):
+        self.assertRaises(SubstrateUnderrunError, tlv.readTlv, b'\x04\x05abc')
+        self.assertRaises(PyAsn1Error, tlv.readTlv, b'\x04\x80\x00\x00')
+        self.assertRaises(PyAsn1Error, list,
+                          tlv.iterTlvs(b'\x30\x03\x04\x02ab', 2, 4))
+
+
+suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+if __name__ == '__main__':
+    result = unittest.TextTestRunner(verbosity=2).run(suite)
+    sys.exit(not result.wasSuccessful())
@@ -0,0 +1,143 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+import sys
+import unittest
+
+from pyasn1.codec.der.decoder import decode as der_decoder
+from pyasn1.codec.der.encoder import encode as der_encoder
+from pyasn1.error import PyAsn1Error
+from pyasn1.type import univ
+
+from pyasn1_alt_modules import pem
+from pyasn1_alt_modules import rfc3161
+from pyasn1_alt_modules import rfc4998
+from pyasn1_alt_modules import rfc5652
+from pyasn1_alt_modules import tstinfo
+
+from tests import test_rfc3161
+from tests import test_rfc4998
+
+
+class ExtractTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.response = pem.readBase64fromText(
+            test_rfc3161.TSPResponseTestCase.tsp_response_pem_text)
+        record, rest = der_decoder(
+            pem.readBase64fromText(
+                test_rfc4998.EvidenceRecordTestCase.pem_text),
+            asn1Spec=rfc4998.EvidenceRecord())
+        self.token = der_encoder(
+            record['archiveTimeStampSequence'][0][0]['timeStamp'])
+
+    def expected(self, token):
+        contentInfo, rest = der_decoder(token, asn1Spec=rfc5652.ContentInfo())
+        signedData, rest = der_decoder(contentInfo['content'],
+                                       asn1Spec=rfc5652.SignedData())
+        tstInfo, rest = der_decoder(
+            signedData['encapContentInfo']['eContent'],
+            asn1Spec=rfc3161.TSTInfo())
+        return signedData, tstInfo
+
+    def check(self, info, token):
+        signedData, tstInfo = self.expected(token)
+        self.assertEqual(tstInfo['version'], info.version)
+        self.assertEqual(tstInfo['policy'], info.policy)
+        self.assertEqual(tstInfo['serialNumber'], info.serialNumber)
+        self.assertEqual(str(tstInfo['genTime']), info.genTime)
+        self.assertEqual(tstInfo['genTime'].asDateTime,
+                         info.genTimeAsDateTime)
+        imprint = tstInfo['messageImprint']
+        self.assertEqual(imprint['hashAlgorithm']['algorithm'],
+                         info.hashAlgorithm)
+        self.assertEqual(imprint['hashedMessage'], info.hashedMessage)
+        self.assertEqual(bool(tstInfo['ordering']), info.ordering)
+        self.assertEqual(signedData['encapContentInfo']['eContent'],
+                         info.tstInfo)
+
+        signerInfo = signedData['signerInfos'][0]
+        self.assertEqual(der_encoder(signerInfo['sid']),
+                         info.signerIdentifier)
+        self.assertEqual(der_encoder(signerInfo['digestAlgorithm']),
+                         info.digestAlgorithm)
+        self.assertEqual(der_encoder(signerInfo['signatureAlgorithm']),
+                         info.signatureAlgorithm)
+        self.assertEqual(signerInfo['signature'], info.signature)
+        signedAttrs = rfc5652.SignedAttributes()
+        signedAttrs.extend(signerInfo['signedAttrs'])
+        self.assertEqual(der_encoder(signedAttrs), info.signedAttrs)
+        return signedData, tstInfo
+
+    def testResponse(self):
+        info = tstinfo.extract(self.response)
+        signedData, tstInfo = self.check(info, bytes(self.expectedToken()))
+        self.assertEqual(983620, info.serialNumber)
+        self.assertTrue(info.ordering)
+        self.assertIsNone(info.nonce)
+        self.assertEqual(der_encoder(tstInfo['tsa']['directoryName']),
+                         info.tsa)
+        self.assertIsNone(info.certificates)
+
+    def expectedToken(self):
+        response, rest = der_decoder(self.response,
+                                     asn1Spec=rfc3161.TimeStampResp())
+        return der_encoder(response['timeStampToken'])
+
+    def testToken(self):
+        info = tstinfo.extract(self.token, certificates=True)
+        signedData, tstInfo = self.check(info, self.token)
+        self.assertEqual('20170210140752.5Z', info.genTime)
+        self.assertEqual(
+            [der_encoder(certificate)
+             for certificate in signedData['certificates']],
+            info.certificates)
+        # The exceet token carries an OCSP response as
+        # OtherRevocationInfoFormat
+        self.assertEqual(
+            [der_encoder(crl) for crl in signedData['crls']], info.crls)
+        self.assertEqual(1, len(info.crls))
+        self.assertEqual(tstInfo['nonce'], info.nonce)
+
+    def testDecodedInput(self):
+        response, rest = der_decoder(self.response,
+                                     asn1Spec=rfc3161.TimeStampResp())
+        self.assertEqual(983620, tstinfo.extract(response).serialNumber)
+        self.assertEqual(983620, tstinfo.extract(
+            response['timeStampToken']).serialNumber)
+        self.assertEqual(self.expected(self.expectedToken())[0]
+                         ['encapContentInfo']['eContent'],
+                         tstinfo.encodedTstInfo(self.response))
+
+    def testRejected(self):
+        response = rfc3161.TimeStampResp()
+        response['status']['status'] = 'rejection'
+        substrate = der_encoder(response)
+        self.assertRaisesRegex(PyAsn1Error, 'status 2',
+                               tstinfo.extract, substrate)
+
+        contentInfo = rfc5652.ContentInfo()
+        contentInfo['contentType'] = rfc5652.id_data
+        contentInfo['content'] = der_encoder(univ.OctetString(b'x'))
+        self.assertRaisesRegex(PyAsn1Error, 'not a SignedData',
+                               tstinfo.extract, der_encoder(contentInfo))
+
+    def testMany(self):
+        results = tstinfo.extractMany(
+            [self.response, b'\x30\x03\x02\x01', self.token])
+        self.assertEqual(983620, results[0].serialNumber)
+        self.assertIsNone(results[1])
+        self.assertEqual(self.expected(self.token)[1]['serialNumber'],
+                         results[2].serialNumber)
+        self.assertRaises(PyAsn1Error, tstinfo.extractMany,
+                          [b'\x30\x03\x02\x01'], strict=True)
+
+
+suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+if __name__ == '__main__':
+    result = unittest.TextTestRunner(verbosity=2).run(suite)
+    sys.exit(not result.wasSuccessful())
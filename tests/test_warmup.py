@@ -0,0 +1,64 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+import gc
+import sys
+import unittest
+
+from pyasn1.codec.der.decoder import decode as der_decoder
+from pyasn1.codec.der.encoder import encode as der_encoder
+from pyasn1.error import PyAsn1Error
+
+from pyasn1_alt_modules import opentypemap
+from pyasn1_alt_modules import pem
+from pyasn1_alt_modules import warmup
+
+from tests import test_certfields
+
+
+class PrewarmTestCase(unittest.TestCase):
+
+    def testProfile(self):
+        report = warmup.prewarm('cmp', freeze=False)
+        self.assertEqual('cmp', report.profile)
+        self.assertIn('pyasn1_alt_modules.rfc9810', sys.modules)
+        self.assertGreaterEqual(report.modules, len(warmup.PROFILES['cmp']))
+        self.assertEqual(len(warmup.templates), report.types)
+        self.assertEqual(
+            sum(len(typeMap) for typeMap in
+                opentypemap.map_of_opentype_maps.values()),
+            report.mapEntries)
+        self.assertIn('cmp', repr(report))
+
+        substrate = pem.readBase64fromText(
+            test_certfields.CertificateFieldsTestCase.pem_text)
+        certificate, rest = der_decoder(
+            substrate, asn1Spec=warmup.templates['rfc5280.Certificate'])
+        self.assertEqual(substrate, der_encoder(certificate))
+        self.assertFalse(warmup.templates['rfc5280.Certificate'].isValue)
+
+    def testModules(self):
+        self.assertEqual(['rfc5280', 'rfc6960'],
+                         warmup.profileModules(('rfc6960', 'rfc5280')))
+        self.assertEqual(210, len(warmup.profileModules('all')))
+        self.assertRaises(PyAsn1Error, warmup.profileModules, 'ldap')
+        self.assertRaises(PyAsn1Error, warmup.prewarm, 'ldap')
+
+    def testFreeze(self):
+        self.addCleanup(gc.unfreeze)
+        enabled = gc.isenabled()
+        report = warmup.prewarm(['rfc6960'])
+        self.assertEqual(('rfc6960',), report.profile)
+        self.assertGreater(report.frozen, 0)
+        self.assertGreater(gc.get_freeze_count(), 0)
+        self.assertEqual(enabled, gc.isenabled())
+
+
+suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+if __name__ == '__main__':
+    result = unittest.TextTestRunner(verbosity=2).run(suite)
+    sys.exit(not result.wasSuccessful())
@@ -0,0 +1,133 @@
+#
+# This file is part of pyasn1-alt-modules software.
+#
+# Copyright (c) 2021-2026, Vigil Security, LLC
+# License: http://vigilsec.com/pyasn1-alt-modules-license.txt
+#
+import io
+import pickle
+import sys
+import unittest
+
+from pyasn1.codec.der.decoder import decode as der_decoder
+from pyasn1.codec.der.encoder import encode as der_encoder
+from pyasn1.error import PyAsn1Error
+from pyasn1.type import univ
+
+from pyasn1_alt_modules import pem
+from pyasn1_alt_modules import rfc5280
+from pyasn1_alt_modules import rfc9881
+from pyasn1_alt_modules import zerocopy
+
+from tests import test_certfields
+from tests import test_rfc9881
+
+
+class ZeroCopyDecoderTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.substrate = pem.readBase64fromText(
+            test_rfc9881.MLDSACertificateTestCase.pem_text)
+        self.expected, rest = der_decoder(
+            self.substrate, asn1Spec=rfc5280.Certificate())
+        self.asn1Object, rest = zerocopy.decode(
+            self.substrate, asn1Spec=rfc5280.Certificate())
+        self.assertFalse(rest)
+
+    def testLargeValues(self):
+        spki = self.asn1Object['tbsCertificate']['subjectPublicKeyInfo']
+        self.assertEqual(rfc9881.id_ml_dsa_65, spki['algorithm']['algorithm'])
+
+        for name, bitString, expected in (
+                ('key', spki['subjectPublicKey'],
+                 self.expected['tbsCertificate']['subjectPublicKeyInfo'][
+                     'subjectPublicKey']),
+                ('signature', self.asn1Object['signature'],
+                 self.expected['signature'])):
+            self.assertTrue(zerocopy.isDeferred(bitString), name)
+            self.assertIsInstance(bitString, univ.BitString)
+            self.assertTrue(bitString.isValue)
+            self.assertEqual(len(expected), len(bitString))
+            self.assertEqual(expected.asOctets(), bitString.asOctets())
+
+            view = zerocopy.octetsView(bitString)
+            self.assertIs(self.substrate, view.obj)
+            self.assertEqual(expected.asOctets(), view)
+            self.assertTrue(zerocopy.isDeferred(bitString), name)
+
+            # The integer is built when the bits are looked at.
+            self.assertEqual(expected[0], bitString[0])
+            self.assertEqual(expected, bitString)
+            self.assertFalse(zerocopy.isDeferred(bitString), name)
+            self.assertEqual(expected.asOctets(), bitString.asOctets())
+
+    def testEncode(self):
+        self.assertEqual(self.substrate, der_encoder(self.asn1Object))
+        self.assertTrue(zerocopy.isDeferred(self.asn1Object['signature']))
+
+        asn1Object, rest = zerocopy.decode(self.substrate)
+        self.assertEqual(self.substrate, der_encoder(asn1Object))
+        self.assertTrue(zerocopy.isDeferred(asn1Object[2]))
+
+        # A new value replaces the octets.
+        signature = self.asn1Object['signature'].clone(
+            univ.BitString.fromOctetString(b'\x01\x02'))
+        self.assertFalse(zerocopy.isDeferred(signature))
+        self.assertEqual(b'\x01\x02', signature.asOctets())
+        self.assertEqual(16, len(signature))
+
+    def testPickle(self):
+        signature = pickle.loads(pickle.dumps(self.asn1Object['signature']))
+        self.assertTrue(zerocopy.isDeferred(signature))
+        self.assertIsInstance(signature.asOctets(), bytes)
+        self.assertEqual(der_encoder(self.expected['signature']),
+                         der_encoder(signature))
+
+    def testSmallValues(self):
+        substrate = pem.readBase64fromText(
+            test_certfields.CertificateFieldsTestCase.pem_text)
+        asn1Object, rest = zerocopy.decode(
+            substrate, asn1Spec=rfc5280.Certificate())
+        self.assertFalse(zerocopy.isDeferred(asn1Object['signature']))
+        self.assertIs(univ.BitString, asn1Object['signature'].__class__)
+        self.assertEqual(substrate, der_encoder(asn1Object))
+
+        asn1Object, rest = zerocopy.decode(
+            substrate, asn1Spec=rfc5280.Certificate(), largeValue=64)
+        self.assertTrue(zerocopy.isDeferred(asn1Object['signature']))
+        self.assertEqual(substrate, der_encoder(asn1Object))
+
+        # Values that are not octet-aligned keep their integer.
+        substrate = der_encoder(univ.BitString("'1011'B"))
+        bitString, rest = zerocopy.decode(substrate, largeValue=0)
+        self.assertFalse(zerocopy.isDeferred(bitString))
+        self.assertEqual((1, 0, 1, 1), tuple(bitString))
+
+    def testOtherSubstrates(self):
+        # The octets of a stream are read out of it.
+        asn1Object, rest = zerocopy.decode(
+            io.BytesIO(self.substrate), asn1Spec=rfc5280.Certificate())
+        self.assertTrue(zerocopy.isDeferred(asn1Object['signature']))
+        self.assertIsInstance(asn1Object['signature'].asOctets(), bytes)
+        self.assertEqual(self.substrate, der_encoder(asn1Object))
+
+        view = memoryview(self.substrate)
+        asn1Object, rest = zerocopy.decode(
+            view, asn1Spec=rfc5280.Certificate())
+        self.assertIs(self.substrate,
+                      zerocopy.octetsView(asn1Object['signature']).obj)
+
+    def testErrors(self):
+        self.assertRaises(PyAsn1Error, zerocopy.decode,
+                          self.substrate[:-1], asn1Spec=rfc5280.Certificate())
+        substrate = bytearray(der_encoder(univ.BitString(
+            hexValue='00' * 300)))
+        substrate[4] = 8
+        self.assertRaises(PyAsn1Error, zerocopy.decode, bytes(substrate))
+
+
+suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+if __name__ == '__main__':
+    result = unittest.TextTestRunner(verbosity=2).run(suite)
+    sys.exit(not result.wasSuccessful())